@@ -0,0 +1,112 @@
+"""
+Grounding latency benchmark: live network vs. the offline grounding index.
+
+Runs ScriptGenerator._fetch_context over a list of topics twice:
+  - network: an empty index and no disk cache, i.e. every lookup goes to
+    Wikipedia (and DuckDuckGo for conceptual topics) — grounding before the
+    offline index;
+  - offline: the index built by footybitez/pipelines/grounding_index_build.py,
+    with the network only for what it misses.
+
+Build the index first, then:
+    python benchmark_grounding.py
+    python benchmark_grounding.py --topics topics.txt   # one topic per line
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+from unittest import mock
+from dotenv import load_dotenv
+
+# Ensure root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+if sys.platform.startswith('win'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+
+from footybitez.content import script_generator
+from footybitez.content.grounding_index import GroundingIndex, get_grounding_index
+from footybitez.content.script_generator import ScriptGenerator
+from footybitez.content.wiki_grounding import WikiGrounding
+
+DEFAULT_TOPICS = [
+    "Lionel Messi's World Cup record",
+    "Cristiano Ronaldo vs Lionel Messi",
+    "Erling Haaland: the goal machine",
+    "Real Madrid's Champions League dominance",
+    "Why Pelé is a legend",
+    "Argentina vs France",
+    "How tiki-taka really works",
+    "Gegenpressing explained",
+    "Why the offside rule confuses everyone",
+    "Why penalties are psychological",
+]
+
+
+def run(topics: list, grounding: WikiGrounding, index: GroundingIndex) -> list:
+    """(topic, seconds, context chars) per topic with the given grounding backends."""
+    generator = ScriptGenerator()
+    results = []
+    with mock.patch.object(script_generator, "get_wiki_grounding", return_value=grounding), \
+            mock.patch.object(script_generator, "get_grounding_index", return_value=index):
+        for topic in topics:
+            start = time.perf_counter()
+            context = generator._fetch_context(topic)
+            elapsed = time.perf_counter() - start
+            results.append((topic, elapsed, 0 if context == "__NO_CONTEXT__" else len(context)))
+    return results
+
+
+def report(label: str, results: list):
+    times = sorted(t for _, t, _ in results)
+    p95 = times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))]
+    grounded = sum(1 for _, _, chars in results if chars)
+    print(f"\n--- {label} ---")
+    for topic, elapsed, chars in results:
+        print(f"  {elapsed * 1000:8.0f} ms  {chars:5d} chars  {topic}")
+    print(f"  median {statistics.median(times) * 1000:.0f} ms | p95 {p95 * 1000:.0f} ms | "
+          f"total {sum(times):.2f} s | grounded {grounded}/{len(results)}")
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--topics", help="File with one topic per line (default: a built-in mix)")
+    args = parser.parse_args()
+
+    topics = DEFAULT_TOPICS
+    if args.topics:
+        with open(args.topics, "r", encoding="utf-8") as f:
+            topics = [line.strip() for line in f if line.strip()]
+
+    index = get_grounding_index()
+    stats = index.stats()
+    if not stats["pages"]:
+        print(f"Offline index at {index.db_path} is empty — run footybitez/pipelines/grounding_index_build.py first.")
+        return
+    print(f"Offline index: {stats['pages']} pages, {stats['names']} names ({index.db_path})")
+
+    scratch = tempfile.mkdtemp()
+    empty_index = GroundingIndex(db_path=os.path.join(scratch, "empty.db"))
+    network = run(topics, WikiGrounding(cache_dir=os.path.join(scratch, "network"), ttl_hours=0,
+                                        index=empty_index), empty_index)
+    offline = run(topics, WikiGrounding(cache_dir=os.path.join(scratch, "offline"), ttl_hours=0,
+                                        index=index), index)
+
+    before = report("network (no index, cold cache)", network)
+    after = report("offline index", offline)
+    print(f"\nMedian grounding latency: {before * 1000:.0f} ms -> {after * 1000:.0f} ms "
+          f"({before / after if after else float('inf'):.1f}x); "
+          f"{index.hits}/{index.hits + index.misses} index lookups hit.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Points every persistent cache and health store at a throwaway directory for the
+test session, so tests that build a real MediaSourcer (or hit a process-wide
+singleton) never read or write the pipeline's footybitez/data/cache/.
+"""
+
+import os
+import tempfile
+
+_root = tempfile.mkdtemp(prefix="footybitez-tests-")
+
+for _var, _name in [
+    ("MEDIA_CACHE_DIR", "media"),
+    ("PEXELS_VIDEO_CACHE_DIR", "pexels_videos"),
+    ("AI_IMAGE_CACHE_DIR", "ai_images"),
+    ("SEARCH_CACHE_DIR", "search"),
+    ("LLM_CACHE_DIR", "llm"),
+    ("ENTITY_INDEX_DIR", "entity_index"),
+    ("WIKI_GROUNDING_CACHE_DIR", "wiki_grounding"),
+    ("MEDIA_NORMALIZE_CACHE_DIR", "normalized"),
+    ("PROVIDER_HEALTH_FILE", "provider_health.json"),
+    ("LLM_HEALTH_FILE", "llm_health.json"),
+    ("LLM_HEDGE_STATS_FILE", "llm_hedge_stats.json"),
+    ("VISION_VERDICTS_FILE", "vision_verdicts.json"),
+]:
+    os.environ[_var] = os.path.join(_root, _name)
@@ -5,6 +5,7 @@ import time
 import logging
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -42,37 +43,22 @@ class DocumentaryGenerator:
         """Try all Gemini keys in order using new google-genai SDK.
         On 429, waits the suggested retry-after delay and retries once per key.
         """
-        try:
-            from google import genai
-            from google.genai import types
-        except ImportError:
+        gateway = get_llm_gateway()
+        if not gateway.sdk_available("gemini"):
             logger.error("google-genai not installed. Run: pip install google-genai>=1.0.0")
             return None
 
-        for i, key in enumerate(self.gemini_keys):
+        for i, key, model in gateway.combos("gemini", self.gemini_keys, GEMINI_TEXT_MODELS[:1]):
             for attempt in range(2):  # 2 attempts per key (initial + 1 retry after 429)
                 try:
                     logger.info(f"Attempting script generation with Gemini key #{i+1} (attempt {attempt+1})...")
-                    client = genai.Client(api_key=key)
-                    response = client.models.generate_content(
-                        model=GEMINI_TEXT_MODELS[0],
-                        contents=f"{system_prompt}\n\n{user_prompt}",
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json",
-                            temperature=0.7,
-                            thinking_config=types.ThinkingConfig(thinking_budget=0)
-                        )
-                    )
-                    text = response.text.strip()
-                    # Strip markdown code fences if present
-                    if text.startswith("```"):
-                        text = text.split("\n", 1)[-1]
-                    if text.endswith("```"):
-                        text = text.rsplit("```", 1)[0]
-                    return json.loads(text.strip())
+                    return gateway.complete_json("gemini", key, model, user_prompt, system=system_prompt,
+                                                 temperature=0.7)
                 except Exception as e:
                     err_str = str(e)
-                    if "429" in err_str and attempt == 0:
+                    # A quota with a known window is now marked dead by the gateway —
+                    # only an unclear 429 is worth one wait-and-retry on this key.
+                    if "429" in err_str and attempt == 0 and gateway.available("gemini", key, model):
                         delay = self._parse_retry_delay(err_str)
                         logger.warning(f"Gemini key #{i+1} hit 429. Waiting {delay:.0f}s before retry...")
                         time.sleep(delay)
@@ -97,51 +83,41 @@ class DocumentaryGenerator:
         """Try all Groq keys × model fallback chain.
         400 Bad Request on one model automatically tries the next model.
         """
-        from groq import Groq
+        gateway = get_llm_gateway()
 
         # Groq json_object mode requires the word "json" in the messages.
         # Append a reminder to the user prompt to be safe.
         groq_user_prompt = user_prompt + "\n\nRespond ONLY with valid JSON matching the schema above."
 
-        for i, key in enumerate(self.groq_keys):
-            client = Groq(api_key=key)
-
-            for model in self.GROQ_MODELS:
-                logger.info(f"Groq key #{i+1} — trying model '{model}'...")
-                temperatures = [0.7, 0.3, 0.1]
-                for attempt, temp in enumerate(temperatures):
-                    try:
-                        logger.info(f"  Attempt {attempt+1}/3 (temp={temp})...")
-                        completion = client.chat.completions.create(
-                            model=model,
-                            messages=[
-                                {"role": "system", "content": system_prompt},
-                                {"role": "user",   "content": groq_user_prompt}
-                            ],
-                            response_format={"type": "json_object"},
-                            temperature=temp,
-                            max_tokens=4096,
-                        )
-                        content = completion.choices[0].message.content
-                        return json.loads(content)
-                    except json.JSONDecodeError as jde:
-                        logger.warning(f"  JSON decode error: {jde}. Retrying with lower temp...")
-                    except Exception as e:
-                        err_msg = str(e)
-                        if "json_validate_failed" in err_msg or "Failed to generate JSON" in err_msg:
-                            logger.warning(f"  Schema validation failed: {e}. Retrying with lower temp...")
-                        elif "400" in err_msg or "Bad Request" in err_msg:
-                            # 400 means this model rejected the request — try next model
-                            logger.warning(f"  Model '{model}' returned 400. Falling back to next model...")
-                            break  # break temperature loop → next model
-                        elif "429" in err_msg:
+        for i, key, model in gateway.combos("groq", self.groq_keys, self.GROQ_MODELS):
+            logger.info(f"Groq key #{i+1} — trying model '{model}'...")
+            temperatures = [0.7, 0.3, 0.1]
+            for attempt, temp in enumerate(temperatures):
+                try:
+                    logger.info(f"  Attempt {attempt+1}/3 (temp={temp})...")
+                    return gateway.complete_json("groq", key, model, groq_user_prompt, system=system_prompt,
+                                                 temperature=temp, max_tokens=4096)
+                except json.JSONDecodeError as jde:
+                    logger.warning(f"  JSON decode error: {jde}. Retrying with lower temp...")
+                except Exception as e:
+                    err_msg = str(e)
+                    if "json_validate_failed" in err_msg or "Failed to generate JSON" in err_msg:
+                        logger.warning(f"  Schema validation failed: {e}. Retrying with lower temp...")
+                    elif "400" in err_msg or "Bad Request" in err_msg:
+                        # 400 means this model rejected the request — try next model
+                        logger.warning(f"  Model '{model}' returned 400. Falling back to next model...")
+                        break  # break temperature loop → next model
+                    elif "429" in err_msg:
+                        if gateway.available("groq", key, model):
                             delay = self._parse_retry_delay(err_msg, default=30.0)
                             logger.warning(f"  Groq key #{i+1} rate limited. Waiting {delay:.0f}s...")
                             time.sleep(delay)
-                            break  # break temperature loop → next key
                         else:
-                            logger.warning(f"  Groq key #{i+1} / model '{model}' error: {e}. Trying next key...")
-                            break  # break temperature loop → next key
+                            logger.warning(f"  Groq key #{i+1} / '{model}' quota exhausted. Moving on...")
+                        break  # break temperature loop → next key
+                    else:
+                        logger.warning(f"  Groq key #{i+1} / model '{model}' error: {e}. Trying next key...")
+                        break  # break temperature loop → next key
         return None
 
     def generate_script(self, topic, hook_style="verdict_first", tone="investigative", length_words=850):
@@ -217,6 +193,7 @@ Type-specific fields:
   - leaderboard: include "leaderboard_data" array of up to 5 objects (each with "rank" integer, "name" string, "club" string, "value" number, "unit" string)
   - head_to_head: include "head_to_head_data" object with "playerA" and "playerB" objects (each with "name" string, "value" number, "color" "amber"|"red"|"teal"), and "metric" string (e.g. "Champions League Goals")
   - timeline: include "timeline_data" array of objects (each with "year" integer, "value" number, and optional "event" string), and "timeline_title" string
+  - ai_image for a tactical diagram: include "formation" (e.g. "4-3-3", outfield lines adding up to 10) when the narration names one
   - image / image_tag / ai_image / ai_video:
       * "named_entities": list of objects (each with "name" string, "type" "player"|"club"|"stadium"|"event", "wikipedia_lookup" boolean). Mark "wikipedia_lookup": true only for the single primary subject.
       * "ken_burns_style": one of "zoom_in_center" | "zoom_in_topleft" | "zoom_out_center" | "pan_left" | "pan_right" | "pan_diagonal" | "tilt_up" | "tilt_down" — CYCLE through these; never repeat two consecutive scenes with the same style.
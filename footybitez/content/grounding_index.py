@@ -0,0 +1,284 @@
+"""
+grounding_index.py
+Offline SQLite FTS5 index of football Wikipedia extracts for script grounding.
+
+Even with WikiGrounding's disk cache, a cold CI cache (or an expired entry)
+meant every grounding lookup went to live Wikipedia, and conceptual topics
+went to DuckDuckGo — slow, rate-limited and sometimes flaky on GitHub's
+runners. pipelines/grounding_index_build.py now ingests football pages ahead
+of time (World Cup teams and squads, a seed list of clubs, tournaments and
+concepts) into one SQLite database, footybitez/data/cache/grounding_index.db
+(GROUNDING_INDEX_DB to override), which the workflows persist with the other
+caches.
+
+Each page is stored the way WikiGrounding.page returns it — title, summary
+and the TARGET_SECTIONS (Honours, Career statistics, Records...) — plus the
+names it is looked up by. Two FTS5 tables sit on top:
+  - names: page titles and aliases. An entity resolves to the most specific
+    name whose every word appears in it ("lionel messi's world cup" ->
+    "Lionel Messi"), so a topic string needs no exact alias. Words are
+    accent-folded like FTS5's unicode61 tokenizer ("mbappe" -> "Kylian
+    Mbappé"). Concept pages are left to docs, so "Mbappé hat-trick vs
+    Argentina" doesn't resolve to "Hat-trick".
+  - docs: title, summary and sections, ranked with bm25 (title weighted
+    highest), for conceptual topics that name no entity ("how tiki-taka
+    works"). A page must cover at least MIN_TEXT_COVERAGE of the topic's
+    keywords to count as a hit.
+
+WikiGrounding.fetch_context and ScriptGenerator._fetch_context query the
+index first and only go to the network for entities (or topics) it misses:
+a topic that names no indexed entity is tried against docs — requiring every
+keyword, so an unindexed name in it isn't ignored — before any request. Pages older than GROUNDING_INDEX_MAX_AGE_DAYS (default 30; 0 = never
+stale) are treated as misses so career stats don't drift. A missing database
+is simply an empty index — it is never created on a lookup.
+
+Usage:
+    from footybitez.content.grounding_index import get_grounding_index
+
+    index = get_grounding_index()
+    page = index.lookup("lionel messi")          # same dict as WikiGrounding.page
+    hits = index.search_text("why penalties are psychological")
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from footybitez.utils.keyword_matcher import TOPIC_FILTER
+
+logger = logging.getLogger(__name__)
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_DB_PATH = "footybitez/data/cache/grounding_index.db"
+DEFAULT_MAX_AGE_DAYS = 30
+TEXT_RESULTS = 4
+MIN_TEXT_COVERAGE = 0.6        # share of a topic's keywords a conceptual hit must contain
+DOCS_WEIGHTS = (10.0, 2.0, 1.0)  # bm25 weights for title, summary, body
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "best", "by", "did", "do", "does", "explained",
+    "for", "from", "greatest", "how", "in", "is", "it", "its", "most", "of", "on", "or", "really",
+    "s", "so", "the", "this", "to", "top", "vs", "versus", "was", "what", "when", "who", "why",
+    "with", "work", "works", "men", "soccer", "football",
+}
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    title TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    sections TEXT NOT NULL DEFAULT '{}',
+    fetched_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(name, page_id UNINDEXED);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(title, summary, body);
+"""
+
+
+def tokenize(text: str) -> list:
+    """
+    Lower-case, accent-free word tokens (as entity_index.normalize_entity folds
+    them), possessives dropped ("Mbappé's" -> "mbappe").
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.findall(r"[^\W_]+", re.sub(r"['’]s\b", "", text))
+
+
+def keywords(text: str) -> list:
+    return list(dict.fromkeys(t for t in tokenize(text) if t not in STOPWORDS))
+
+
+def _fts_any(tokens) -> str:
+    """FTS5 query matching any of the tokens (each quoted, so no token is read as syntax)."""
+    return " OR ".join(f'"{t}"' for t in tokens)
+
+
+class GroundingIndex:
+    def __init__(self, db_path: str | None = None, max_age_days: float | None = None):
+        self.db_path = db_path or os.getenv("GROUNDING_INDEX_DB", DEFAULT_DB_PATH)
+        if max_age_days is None:
+            max_age_days = float(os.getenv("GROUNDING_INDEX_MAX_AGE_DAYS", str(DEFAULT_MAX_AGE_DAYS)))
+        self.max_age = max_age_days * 86400
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ── storage ──────────────────────────────────────────────────────────────
+
+    def _connect(self, create: bool = False):
+        """Open connection, or None when the database doesn't exist and create is False."""
+        if self._conn is None:
+            if not create and not os.path.exists(self.db_path):
+                return None
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def add(self, page: dict, aliases=(), kind: str = "") -> int:
+        """
+        Stores (or refreshes) a page in WikiGrounding.page's shape under its title
+        and aliases. Returns the page id.
+        """
+        title = page["title"]
+        sections = page.get("sections", {}) or {}
+        names = list(dict.fromkeys(n.strip() for n in [title, *aliases] if n and n.strip()))
+        with self._lock:
+            conn = self._connect(create=True)
+            with conn:
+                row = conn.execute("SELECT id FROM pages WHERE title = ?", (title,)).fetchone()
+                if row:
+                    page_id = row[0]
+                    conn.execute("UPDATE pages SET kind = ?, summary = ?, sections = ?, fetched_at = ? WHERE id = ?",
+                                 (kind, page.get("summary", ""), json.dumps(sections), time.time(), page_id))
+                    known = {r[0] for r in conn.execute("SELECT name FROM names WHERE page_id = ?", (page_id,))}
+                    names = [n for n in names if n not in known]
+                    conn.execute("DELETE FROM docs WHERE rowid = ?", (page_id,))
+                else:
+                    page_id = conn.execute(
+                        "INSERT INTO pages (title, kind, summary, sections, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                        (title, kind, page.get("summary", ""), json.dumps(sections), time.time())).lastrowid
+                conn.executemany("INSERT INTO names (name, page_id) VALUES (?, ?)", [(n, page_id) for n in names])
+                conn.execute("INSERT INTO docs (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+                             (page_id, title, page.get("summary", ""), "\n".join(sections.values())))
+        return page_id
+
+    def has(self, name: str) -> bool:
+        """True if a fresh page is indexed under exactly this title or alias (any case)."""
+        tokens = tokenize(name)
+        if not tokens:
+            return False
+        rows = self._query("SELECT names.name, p.fetched_at FROM names JOIN pages p ON p.id = names.page_id "
+                           "WHERE names MATCH ?", (_fts_any(tokens),))
+        wanted = name.strip().lower()
+        return any(n.lower() == wanted and self._fresh(t) for n, t in rows)
+
+    def _query(self, sql: str, params) -> list:
+        """Rows for a read query; [] when there is no database or it can't be read."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                return [] if conn is None else conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"[GroundingIndex] Query failed on {self.db_path}: {e}")
+                return []
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return self.max_age <= 0 or time.time() - fetched_at <= self.max_age
+
+    @staticmethod
+    def _page(row) -> dict:
+        return {"title": row[0], "summary": row[1], "sections": json.loads(row[2] or "{}")}
+
+    # ── lookups ──────────────────────────────────────────────────────────────
+
+    def lookup(self, entity: str) -> dict | None:
+        """
+        Page for the most specific indexed name contained in `entity`, or None.
+        Concept pages ("Offside", "Hat-trick") are skipped — they are for
+        search_text — and summaries matching TOPIC_FILTER are never returned.
+        """
+        page = self._resolve(entity)
+        with self._lock:
+            if page:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return page
+
+    def covers(self, entity: str) -> bool:
+        """True if lookup(entity) would hit, without counting it as a lookup."""
+        return self._resolve(entity) is not None
+
+    def _resolve(self, entity: str) -> dict | None:
+        query_tokens = set(tokenize(entity))
+        page = None
+        if query_tokens:
+            rows = self._query(
+                "SELECT names.name, p.title, p.summary, p.sections, p.fetched_at, names.rank "
+                "FROM names JOIN pages p ON p.id = names.page_id "
+                "WHERE names MATCH ? AND p.kind != 'concept' ORDER BY names.rank LIMIT 50",
+                (_fts_any(sorted(query_tokens)),))
+            best = None
+            for name, title, summary, sections, fetched_at, rank in rows:
+                name_tokens = set(tokenize(name))
+                if not name_tokens or not name_tokens <= query_tokens or not self._fresh(fetched_at):
+                    continue
+                # More matched words wins; bm25 rank (lower is better) breaks ties.
+                score = (len(name_tokens), -rank)
+                if best is None or score > best[0]:
+                    best = (score, (title, summary, sections))
+            if best and not TOPIC_FILTER.find(best[1][1]):
+                page = self._page(best[1])
+        return page
+
+    def search_text(self, topic: str, limit: int = TEXT_RESULTS,
+                    min_coverage: float = MIN_TEXT_COVERAGE) -> list:
+        """
+        Pages best matching a conceptual topic by full-text bm25, each covering
+        at least `min_coverage` of the topic's keywords. [] on a miss.
+        """
+        terms = keywords(topic)
+        results = []
+        if terms:
+            rows = self._query(
+                "SELECT p.title, p.summary, p.sections, p.fetched_at, docs.body "
+                "FROM docs JOIN pages p ON p.id = docs.rowid "
+                "WHERE docs MATCH ? ORDER BY bm25(docs, ?, ?, ?) LIMIT ?",
+                (_fts_any(terms), *DOCS_WEIGHTS, limit * 5))
+            for title, summary, sections, fetched_at, body in rows:
+                covered = set(terms) & set(tokenize(f"{title} {summary} {body}"))
+                if (len(covered) / len(terms) < min_coverage or not self._fresh(fetched_at)
+                        or TOPIC_FILTER.find(f"{title} {summary}")):
+                    continue
+                results.append(self._page((title, summary, sections)))
+                if len(results) >= limit:
+                    break
+        with self._lock:
+            if results:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return results
+
+    def stats(self) -> dict:
+        pages = self._query("SELECT COUNT(*) FROM pages", ())
+        names = self._query("SELECT COUNT(*) FROM names", ())
+        with self._lock:
+            return {"pages": pages[0][0] if pages else 0, "names": names[0][0] if names else 0,
+                    "hits": self.hits, "misses": self.misses}
+
+    def log_stats(self):
+        s = self.stats()
+        total = s["hits"] + s["misses"]
+        if total:
+            logger.info(f"[GroundingIndex] {s['hits']}/{total} lookups served offline "
+                        f"({s['pages']} pages, {s['names']} names indexed).")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_grounding_index() -> GroundingIndex:
+    """Process-wide GroundingIndex, sharing one SQLite connection."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = GroundingIndex()
+        return _instance
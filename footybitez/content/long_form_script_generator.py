@@ -5,6 +5,7 @@ import random
 import google.generativeai as genai
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 # Load environment variables
 load_dotenv()
@@ -110,20 +111,12 @@ class LongFormScriptGenerator:
         - Avoid copyrighted references. Avoid Wikipedia tone. Tell a dynamic story.
         """
 
+        gateway = get_llm_gateway()
         if self.groq_keys:
-            for j, gkey in enumerate(self.groq_keys):
+            for j, gkey, model in gateway.combos("groq", self.groq_keys, [GROQ_SCRIPT_MODEL]):
                 try:
-                    from groq import Groq
-                    client = Groq(api_key=gkey)
                     logger.info(f"Generating long-form script with Groq key #{j+1}...")
-                    completion = client.chat.completions.create(
-                        model=GROQ_SCRIPT_MODEL,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.7,
-                        max_tokens=4096,
-                        response_format={"type": "json_object"}
-                    )
-                    data = json.loads(completion.choices[0].message.content)
+                    data = gateway.complete_json("groq", gkey, model, prompt, temperature=0.7, max_tokens=4096)
                     if self._validate_long_script(data):
                         return data
                 except Exception as e:
@@ -133,6 +126,11 @@ class LongFormScriptGenerator:
         if self.gemini_keys:
             for i, key in enumerate(self.gemini_keys):
                 for model_name in self.models:
+                    # Legacy SDK (global configure), so no pooled client — but the
+                    # gateway's registry still decides whether this combo is alive.
+                    registry_model = model_name.split("/", 1)[-1]
+                    if not gateway.available("gemini", key, registry_model):
+                        continue
                     try:
                         logger.info(f"Trying Gemini key #{i+1} ({model_name}) for long-form script...")
                         genai.configure(api_key=key)
@@ -146,6 +144,7 @@ class LongFormScriptGenerator:
                             return data
                     except Exception as e:
                         logger.error(f"Gemini key #{i+1} ({model_name}) failed for long-form: {e}")
+                        gateway.record_error("gemini", key, registry_model, e)
 
         return None
 
@@ -3,7 +3,13 @@ import time
 import json
 import logging
 from dotenv import load_dotenv
-from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.utils.llm_models import CLAUDE_SCRIPT_MODEL, GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.content.grounding_index import MIN_TEXT_COVERAGE, get_grounding_index
+from footybitez.content.wiki_grounding import get_wiki_grounding
+from footybitez.utils.llm_cache import get_llm_cache
+from footybitez.utils.llm_gateway import get_llm_gateway
+from footybitez.utils.llm_hedge import hedge_delay, hedge_enabled, hedged_call
+from footybitez.utils.keyword_matcher import TOPIC_FILTER, TOPIC_TERMS
 
 # Load environment variables
 load_dotenv()
@@ -27,26 +33,9 @@ class ScriptGenerator:
     # a rule that's only ever *asked for* and never *checked* gets violated by the
     # model exactly when it matters (see: an entire fabricated NWSL stat surviving
     # validation because only the visual_keyword field was ever scanned).
-    # NOTE: deliberately excludes "handball" — unlike media_sourcer.py's image-query
-    # filter (where it's fine to steer an image search away from it), "handball" is a
-    # routine, legitimate football term (a foul/VAR decision) that would otherwise get
-    # a perfectly good, on-topic script rejected outright.
-    # NOTE on "racing": deliberately NOT included bare — several real football
-    # clubs are literally named "Racing" (Racing Santander, Racing Club,
-    # Racing Genk), so a bare match would reject genuine football stories.
-    # "horse racing" / "racecourse" / "jockey" are specific enough to avoid
-    # that collision while still catching the motorsport/equestrian content a
-    # general sports feed can mix in (see general_news_pipeline.py, which
-    # discovered its Sky Sports feed ID was actually their all-sports feed).
-    BAD_TOPIC_KEYWORDS = [
-        "nfl", "gridiron", "american football", "superbowl", "super bowl", "touchdown",
-        "rugby", "cricket", "hockey", "nhl", "baseball", "basketball", "nba",
-        "tennis", "golf", "boxing", "mma", "volleyball",
-        "formula 1", "formula one", "motogp", "grand prix",
-        "horse racing", "racecourse", "jockey", "snooker", "darts",
-        "women", "woman", "female", "ladies", "girl",
-        "nwsl", "wsl", "nwt", "women's national", "womens",
-    ]
+    # The list, its word-boundary rules and its exceptions ("handball" and bare
+    # "racing" are deliberately NOT banned here) live in utils/keyword_matcher.py.
+    BAD_TOPIC_KEYWORDS = TOPIC_TERMS
 
     def __init__(self):
         self.gemini_keys = _get_keys("GEMINI_API_KEY")
@@ -55,36 +44,49 @@ class ScriptGenerator:
         if not self.gemini_keys:
             logger.warning("No GEMINI_API_KEY found. Will rely on Groq or Wikipedia fallback.")
 
-    def _try_claude(self, prompt: str) -> dict | None:
-        """Try Claude using the Anthropic API key."""
-        if not self.anthropic_api_key:
+    def _cached_script(self, call_type: str, models: list, prompt: str, temperature,
+                       cacheable=None) -> dict | None:
+        """
+        A cached response to this prompt from any of `models` that still validates
+        (utils/llm_cache.py). `cacheable`, when given, is the caller's own
+        acceptance check on top of _validate_script_data (e.g. the breaking-news
+        word count): the _try_* methods only store, and only serve from cache,
+        scripts that pass it — an unaccepted script is still returned for the
+        caller's retry loop, but never replayed.
+        """
+        cache = get_llm_cache()
+        for model in models:
+            data = cache.get(call_type, model, prompt, temperature)
+            if data is not None and self._validate_script_data(data) and (cacheable is None or cacheable(data)):
+                logger.info(f"Using cached {call_type} response from {model}.")
+                return data
+        return None
+
+    def _try_claude(self, prompt: str, cancel=None, call_type: str = "script", cacheable=None) -> dict | None:
+        """Try Claude using the Anthropic API key; `cacheable` as in _cached_script."""
+        if not self.anthropic_api_key or (cancel is not None and cancel.is_set()):
+            return None
+        cached = self._cached_script(call_type, [CLAUDE_SCRIPT_MODEL], prompt, None, cacheable)
+        if cached:
+            return cached
+        gateway = get_llm_gateway()
+        if not gateway.available("anthropic", self.anthropic_api_key, CLAUDE_SCRIPT_MODEL):
+            logger.info(f"Skipping Claude ({CLAUDE_SCRIPT_MODEL}) — marked unavailable until its quota resets.")
             return None
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.anthropic_api_key)
-            logger.info("Generating script with Claude (claude-3-5-sonnet-20241022)...")
-            message = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1500,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            text = message.content[0].text.strip()
-            # Strip markdown code fences if present
-            if text.startswith("```"):
-                text = text.split("\n", 1)[-1]
-            if text.endswith("```"):
-                text = text.rsplit("```", 1)[0]
-            data = json.loads(text.strip())
+            logger.info(f"Generating script with Claude ({CLAUDE_SCRIPT_MODEL})...")
+            data = gateway.complete_json("anthropic", self.anthropic_api_key, CLAUDE_SCRIPT_MODEL, prompt,
+                                         temperature=None, max_tokens=1500)
             if self._validate_script_data(data):
                 logger.info("Claude script generation successful.")
+                if cacheable is None or cacheable(data):
+                    get_llm_cache().put(call_type, CLAUDE_SCRIPT_MODEL, prompt, data)
                 return data
         except Exception as e:
             logger.error(f"Claude script generation failed: {e}")
         return None
 
-    def _try_gemini_raw_json(self, prompt: str) -> dict | None:
+    def _try_gemini_raw_json(self, prompt: str, call_type: str = "raw_json", validate=None) -> dict | None:
         """
         Same Gemini key/model fallback loop as _try_gemini, but for callers that
         need arbitrary JSON back — NOT a script. _try_gemini gates success on
@@ -96,76 +98,109 @@ class ScriptGenerator:
         giving up — which is exactly what was happening: headline selection was
         never actually working via the Gemini fallback, wasting up to 6 API calls
         every run before defaulting to "just pick the first article".
+        `validate` (default: any JSON object) is the caller's check for its own
+        shape: a response failing it moves on to the next key/model, and only
+        responses passing it are cached (under `call_type`) or served from cache.
         """
-        try:
-            from google import genai
-            from google.genai import types
-        except ImportError:
+        if validate is None:
+            validate = lambda data: isinstance(data, dict)
+        cache = get_llm_cache()
+        for model_name in GEMINI_TEXT_MODELS:
+            data = cache.get(call_type, model_name, prompt, 0.3)
+            if data is not None and validate(data):
+                logger.info(f"Using cached {call_type} response from {model_name}.")
+                return data
+
+        gateway = get_llm_gateway()
+        if not gateway.sdk_available("gemini"):
             logger.error("google-genai not installed. Run: pip install google-genai>=1.0.0")
             return None
 
-        for i, key in enumerate(self.gemini_keys):
-            for model_name in GEMINI_TEXT_MODELS:
-                try:
-                    client = genai.Client(api_key=key)
-                    response = client.models.generate_content(
-                        model=model_name,
-                        contents=prompt,
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json",
-                            temperature=0.3,
-                            thinking_config=types.ThinkingConfig(thinking_budget=0)
-                        )
-                    )
-                    text = response.text.strip()
-                    if text.startswith("```"):
-                        text = text.split("\n", 1)[-1]
-                    if text.endswith("```"):
-                        text = text.rsplit("```", 1)[0]
-                    data = json.loads(text.strip())
+        for i, key, model_name in gateway.combos("gemini", self.gemini_keys, GEMINI_TEXT_MODELS):
+            try:
+                data = gateway.complete_json("gemini", key, model_name, prompt, temperature=0.3)
+                if validate(data):
                     logger.info(f"Gemini key #{i+1} ({model_name}) succeeded (raw JSON).")
+                    cache.put(call_type, model_name, prompt, data, temperature=0.3)
                     return data
-                except Exception as e:
-                    logger.warning(f"Gemini key #{i+1} model={model_name} failed: {e}")
+                logger.warning(f"Gemini key #{i+1} model={model_name} returned an invalid {call_type} response.")
+            except Exception as e:
+                logger.warning(f"Gemini key #{i+1} model={model_name} failed: {e}")
         return None
 
-    def _try_gemini(self, prompt: str) -> dict | None:
-        """Try all Gemini keys in order using new google-genai SDK."""
-        try:
-            from google import genai
-            from google.genai import types
-        except ImportError:
+    def _try_gemini(self, prompt: str, cancel=None, call_type: str = "script", cacheable=None) -> dict | None:
+        """
+        Try all Gemini keys in order using new google-genai SDK. `cancel` (a
+        threading.Event, set when a hedged race is already won) stops the loop
+        before the next key/model; `cacheable` as in _cached_script.
+        """
+        cached = self._cached_script(call_type, GEMINI_TEXT_MODELS, prompt, 0.7, cacheable)
+        if cached:
+            return cached
+        gateway = get_llm_gateway()
+        if not gateway.sdk_available("gemini"):
             logger.error("google-genai not installed. Run: pip install google-genai>=1.0.0")
             return None
 
-        for i, key in enumerate(self.gemini_keys):
-            for model_name in GEMINI_TEXT_MODELS:
-                try:
-                    logger.info(f"Trying Gemini key #{i+1} model={model_name}...")
-                    client = genai.Client(api_key=key)
-                    response = client.models.generate_content(
-                        model=model_name,
-                        contents=prompt,
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json",
-                            temperature=0.7,
-                            thinking_config=types.ThinkingConfig(thinking_budget=0)
-                        )
-                    )
-                    text = response.text.strip()
-                    # Strip markdown code fences if present
-                    if text.startswith("```"):
-                        text = text.split("\n", 1)[-1]
-                    if text.endswith("```"):
-                        text = text.rsplit("```", 1)[0]
-                    data = json.loads(text.strip())
-                    if self._validate_script_data(data):
-                        logger.info(f"Gemini key #{i+1} ({model_name}) succeeded.")
-                        return data
-                except Exception as e:
-                    logger.warning(f"Gemini key #{i+1} model={model_name} failed: {e}")
+        for i, key, model_name in gateway.combos("gemini", self.gemini_keys, GEMINI_TEXT_MODELS):
+            if cancel is not None and cancel.is_set():
+                return None
+            try:
+                logger.info(f"Trying Gemini key #{i+1} model={model_name}...")
+                data = gateway.complete_json("gemini", key, model_name, prompt, temperature=0.7)
+                if self._validate_script_data(data):
+                    logger.info(f"Gemini key #{i+1} ({model_name}) succeeded.")
+                    if cacheable is None or cacheable(data):
+                        get_llm_cache().put(call_type, model_name, prompt, data, temperature=0.7)
+                    return data
+            except Exception as e:
+                logger.warning(f"Gemini key #{i+1} model={model_name} failed: {e}")
+        return None
+
+    def _try_groq(self, prompt: str, temperature: float = 0.7, cancel=None,
+                  call_type: str = "script", cacheable=None) -> dict | None:
+        """Try all Groq keys in order; `cancel` and `cacheable` as in _try_gemini."""
+        cached = self._cached_script(call_type, [GROQ_SCRIPT_MODEL], prompt, temperature, cacheable)
+        if cached:
+            return cached
+        gateway = get_llm_gateway()
+        for j, gkey, model in gateway.combos("groq", self.groq_keys, [GROQ_SCRIPT_MODEL]):
+            if cancel is not None and cancel.is_set():
+                return None
+            try:
+                logger.info(f"Generating script with Groq key #{j+1} ({model})...")
+                data = gateway.complete_json("groq", gkey, model, prompt, temperature=temperature, max_tokens=1024)
+                if self._validate_script_data(data):
+                    logger.info(f"Groq key #{j+1} generation successful.")
+                    if cacheable is None or cacheable(data):
+                        get_llm_cache().put(call_type, model, prompt, data, temperature=temperature)
+                    return data
+            except Exception as e:
+                logger.error(f"Groq key #{j+1} generation failed: {e}")
         return None
 
+    def _try_hedged(self, prompt: str, groq_temperature: float = 0.7, call_type: str = "script",
+                    cacheable=None) -> dict | None:
+        """
+        Claude, Groq and Gemini as one hedged race (LLM_HEDGE=true, see
+        utils/llm_hedge.py): the next provider is started alongside the current
+        one after LLM_HEDGE_DELAY seconds, and the first script that passes
+        _validate_script_data wins. `cacheable` as in _cached_script.
+        """
+        attempts = []
+        if self.anthropic_api_key:
+            attempts.append(("claude", lambda cancel: self._try_claude(prompt, cancel=cancel, call_type=call_type,
+                                                                       cacheable=cacheable)))
+        if self.groq_keys:
+            attempts.append(("groq", lambda cancel: self._try_groq(prompt, temperature=groq_temperature,
+                                                                   cancel=cancel, call_type=call_type,
+                                                                   cacheable=cacheable)))
+        if self.gemini_keys:
+            attempts.append(("gemini", lambda cancel: self._try_gemini(prompt, cancel=cancel, call_type=call_type,
+                                                                       cacheable=cacheable)))
+        _, result = hedged_call(attempts, delay=hedge_delay(), accept=self._validate_script_data)
+        return result
+
     def generate_script(self, topic, category="General", context=None):
         """
         Generates a short video script using Groq (priority), Gemini, or Wikipedia fallback.
@@ -184,36 +219,29 @@ class ScriptGenerator:
 
         prompt = self._get_prompt(topic, category, context=context)
 
+        # Hedged mode races the providers below instead of trying them in turn.
+        hedged = hedge_enabled()
+        if hedged:
+            logger.info(f"Generating script with hedged providers for category: {category}...")
+            result = self._try_hedged(prompt)
+            if result:
+                return self._sanitize_visual_keywords(result)
+
         # Try Claude first (preferred for premium/high-quality script writing)
-        if self.anthropic_api_key:
+        if self.anthropic_api_key and not hedged:
             result = self._try_claude(prompt)
             if result:
                 return self._sanitize_visual_keywords(result)
 
         # 1. Try Groq (preferred for factual accuracy)
-        if self.groq_keys:
-            for j, gkey in enumerate(self.groq_keys):
-                try:
-                    from groq import Groq
-                    client = Groq(api_key=gkey)
-                    logger.info(f"Generating script with Groq key #{j+1} ({GROQ_SCRIPT_MODEL}) for category: {category}...")
-                    completion = client.chat.completions.create(
-                        model=GROQ_SCRIPT_MODEL,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.7,
-                        max_tokens=1024,
-                        response_format={"type": "json_object"}
-                    )
-                    text = completion.choices[0].message.content
-                    data = json.loads(text)
-                    if self._validate_script_data(data):
-                        logger.info(f"Groq key #{j+1} generation successful.")
-                        return self._sanitize_visual_keywords(data)
-                except Exception as e:
-                    logger.error(f"Groq key #{j+1} generation failed: {e}")
+        if self.groq_keys and not hedged:
+            logger.info(f"Generating script with Groq for category: {category}...")
+            result = self._try_groq(prompt)
+            if result:
+                return self._sanitize_visual_keywords(result)
 
         # 2. Try Gemini (new SDK)
-        if self.gemini_keys:
+        if self.gemini_keys and not hedged:
             logger.info(f"Generating script with Gemini for category: {category}...")
             result = self._try_gemini(prompt)
             if result:
@@ -244,11 +272,14 @@ class ScriptGenerator:
         Fetches background info from Wikipedia to ground the LLM in facts.
         Retries once with a simplified query if the first attempt fails.
         Returns '__NO_CONTEXT__' sentinel if both attempts fail.
+        Pages are fetched concurrently and cached across runs by
+        content/wiki_grounding.py. A topic naming no entity in the offline
+        grounding index is first matched against its concept pages, so an
+        indexed concept ("How tiki-taka really works") needs no request.
         """
-        import wikipedia
         import re
 
-        def _do_fetch(query):
+        def _entities(query):
             clean = query.replace("Most clutch", "").replace("Top 5", "").replace("Why", "").strip()
             clean = re.split(r'[:?]', clean)[0].strip()
             potential_entities = [clean]
@@ -256,75 +287,22 @@ class ScriptGenerator:
                 if joiner in clean.lower():
                     potential_entities = clean.lower().split(joiner)
                     break
+            return potential_entities[:2]
 
-            full_context = []
-            seen_pages = set()
-
-            for ent in potential_entities[:2]:
-                try:
-                    ent = ent.strip()
-                    if not ent or len(ent) < 2:
-                        continue
-
-                    search_query = ent.lower().replace("football", "soccer")
-                    if "soccer" not in search_query and "association" not in search_query:
-                        search_query += " soccer"
-                    # Disambiguate toward men's football the same way media_sourcer.py's
-                    # image search does — a bare "soccer"/"football" query is exactly
-                    # what let a men's-attendance-records topic surface an NWSL page
-                    # as the #1 Wikipedia search hit, which then got trusted as ground
-                    # truth and fabricated the rest of the script from there.
-                    search_query += " men's"
-
-                    # Pull several candidates and skip any that are themselves about
-                    # the wrong sport/gender — taking the literal #1 hit blindly is
-                    # what let a wrong-gender page in as "ground truth" before.
-                    search_res = wikipedia.search(search_query, results=5)
-                    if not search_res:
-                        continue
-
-                    page_title = None
-                    for candidate in search_res:
-                        candidate_lower = candidate.lower()
-                        if any(bad in candidate_lower for bad in ScriptGenerator.BAD_TOPIC_KEYWORDS):
-                            logger.warning(f"[Grounding] Skipping Wikipedia candidate '{candidate}' — matches a banned term.")
-                            continue
-                        if candidate not in seen_pages:
-                            page_title = candidate
-                            break
-                    if not page_title:
-                        continue
-                    seen_pages.add(page_title)
-
-                    page = wikipedia.page(page_title, auto_suggest=False)
-                    # Belt-and-braces: also reject on the actual page summary, in case
-                    # the title alone looked clean but the content is not what we want.
-                    if any(bad in page.summary[:700].lower() for bad in ScriptGenerator.BAD_TOPIC_KEYWORDS):
-                        logger.warning(f"[Grounding] Skipping Wikipedia page '{page.title}' — summary matches a banned term.")
-                        continue
-                    context_parts = [f"ENTITY: {page.title}\nSUMMARY: {page.summary[:700]}"]
-
-                    sections = page.sections
-                    for target in ["Honours", "Career statistics", "Club career",
-                                   "International career", "Records", "Rules"]:
-                        match = next((s for s in sections if target.lower() in s.lower()), None)
-                        if match:
-                            try:
-                                sec_text = page.section(match)
-                                if sec_text:
-                                    context_parts.append(f"--- {match.upper()} ---\n{sec_text[:800]}")
-                            except Exception:
-                                continue
-
-                    full_context.append("\n".join(context_parts))
-                    if len("\n\n".join(full_context)) > 4000:
-                        break
-
-                except Exception as e:
-                    logger.warning(f"Failed to fetch context for {ent}: {e}")
-                    continue
-
-            return "\n\n=====\n\n".join(full_context) if full_context else None
+        def _do_fetch(query):
+            # Each entity's search is steered toward men's football and every
+            # candidate page is checked against TOPIC_FILTER (title and summary) —
+            # a bare "soccer" query once surfaced an NWSL page as the #1 hit,
+            # which then got trusted as ground truth. See WikiGrounding.
+            return get_wiki_grounding().fetch_context(_entities(query))
+
+        index = get_grounding_index()
+        if not any(index.covers(entity) for entity in _entities(topic)):
+            # Every keyword must be covered here: "Mbappé hat-trick" with only
+            # the Hat-trick page indexed still goes to Wikipedia for Mbappé.
+            offline = self._offline_text_context(topic, min_coverage=1.0)
+            if offline:
+                return offline
 
         # First attempt
         try:
@@ -357,6 +335,16 @@ class ScriptGenerator:
 
         return "__NO_CONTEXT__"
 
+    def _offline_text_context(self, topic, min_coverage=MIN_TEXT_COVERAGE):
+        """Concept pages from the offline grounding index in the web-source format, or None."""
+        offline = get_grounding_index().search_text(topic, min_coverage=min_coverage)
+        if not offline:
+            return None
+        logger.info(f"[Grounding] Found {len(offline)} offline index pages for conceptual topic '{topic}'.")
+        return "\n\n=====\n\n".join(
+            f"WEB SOURCE: {page['title']} (Wikipedia)\nSNIPPET: {page['summary'][:500]}" for page in offline
+        )
+
     def _fetch_web_text_context(self, topic):
         """
         Grounding fallback for CONCEPTUAL topics that have no Wikipedia entity page.
@@ -364,7 +352,13 @@ class ScriptGenerator:
         real snippets about the concept, so the model has something to explain the
         "why"/"how" with instead of hedging with vague filler. Returns None (not
         '__NO_CONTEXT__') on failure so the caller's existing fallback path is used.
+        Concept pages in the offline grounding index are used first; the web is
+        only searched when it has nothing covering the topic.
         """
+        offline = self._offline_text_context(topic)
+        if offline:
+            return offline
+
         try:
             from ddgs import DDGS
         except ImportError:
@@ -387,9 +381,9 @@ class ScriptGenerator:
             # off-topic or wrong-gender results.
             clean = []
             for r in results:
-                combined = f"{r.get('title', '')} {r.get('body', '')}".lower()
-                if any(bad in combined for bad in self.BAD_TOPIC_KEYWORDS):
-                    logger.warning(f"[Grounding] Skipping web result '{r.get('title', '')[:60]}' — matches a banned term.")
+                bad = TOPIC_FILTER.find(f"{r.get('title', '')} {r.get('body', '')}")
+                if bad:
+                    logger.warning(f"[Grounding] Skipping web result '{r.get('title', '')[:60]}' — matches banned term '{bad}'.")
                     continue
                 clean.append(r)
 
@@ -711,7 +705,6 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
         replaces any that contain wrong-sport or wrong-gender terms.
         This runs AFTER the LLM response — it's the last line of defense.
         """
-        BAD_KW = self.BAD_TOPIC_KEYWORDS
         primary = script_data.get("primary_entity", "football")
         fallback_kw = f"{primary} association football soccer men"
 
@@ -720,18 +713,24 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
             if not isinstance(seg, dict):
                 continue
             kw = seg.get("visual_keyword", "")
-            kw_lower = kw.lower()
-            for bad in BAD_KW:
-                if bad in kw_lower:
-                    logger.warning(
-                        f"[Sanitizer] Rejected visual_keyword '{kw}' — contains '{bad}'. "
-                        f"Replacing with fallback: '{fallback_kw}'"
-                    )
-                    seg["visual_keyword"] = fallback_kw
-                    break  # One replacement per segment is enough
+            bad = TOPIC_FILTER.find(kw)
+            if bad:
+                logger.warning(
+                    f"[Sanitizer] Rejected visual_keyword '{kw}' — contains '{bad}'. "
+                    f"Replacing with fallback: '{fallback_kw}'"
+                )
+                seg["visual_keyword"] = fallback_kw
 
         return script_data
 
+    @staticmethod
+    def _script_word_count(data: dict) -> int:
+        """Words across hook, segment texts and outro."""
+        hook = data.get("hook", "")
+        segments_text = " ".join([seg.get("text", "") for seg in data.get("segments", []) if isinstance(seg, dict)])
+        outro = data.get("outro", "")
+        return len(f"{hook} {segments_text} {outro}".strip().split())
+
     def _validate_script_data(self, data):
         if "hook" in data and "segments" in data:
             new_segments = []
@@ -768,13 +767,13 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
             # showing unrelated filler pictures — which reads as "random images").
             # Rejecting here sends the pipeline back to try the next model/key, or
             # the Wikipedia/local fallback if every model keeps getting it wrong.
-            for bad in self.BAD_TOPIC_KEYWORDS:
-                if bad in lower_text:
-                    logger.warning(
-                        f"[ContentPolicy] Rejected script — narration contains banned "
-                        f"term '{bad}' (men's-football-only rule). Full text: {full_text[:150]}..."
-                    )
-                    return False
+            bad = TOPIC_FILTER.find(full_text)
+            if bad:
+                logger.warning(
+                    f"[ContentPolicy] Rejected script — narration contains banned "
+                    f"term '{bad}' (men's-football-only rule). Full text: {full_text[:150]}..."
+                )
+                return False
 
             data['full_text'] = full_text
             return True
@@ -783,15 +782,18 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
     def _get_wikipedia_script(self, topic):
         """Fetches a summary from Wikipedia and structures it as a script."""
         try:
-            import wikipedia
-            search_res = wikipedia.search(topic, results=1)
+            grounding = get_wiki_grounding()
+            search_res = grounding.search(topic, limit=1)
             if not search_res:
                 raise Exception("No wikipedia results")
 
-            page = wikipedia.page(search_res[0], auto_suggest=False)
-            sentences = page.summary.split('. ')
+            page = grounding.page(search_res[0])
+            if not page:
+                raise Exception(f"No usable wikipedia page for '{search_res[0]}'")
+            title = page["title"]
+            sentences = page["summary"].split('. ')
 
-            hook = f"Did you know this about *{page.title}*?"
+            hook = f"Did you know this about *{title}*?"
             final_segments = []
             count = 0
             for s in sentences:
@@ -804,14 +806,14 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
                 words = clean_s.split()
                 highlighted_s = []
                 for w in words:
-                    if w.isdigit() or page.title.split()[0] in w:
+                    if w.isdigit() or title.split()[0] in w:
                         highlighted_s.append(f"*{w}*")
                     else:
                         highlighted_s.append(w)
 
                 final_segments.append({
                     "text": " ".join(highlighted_s),
-                    "visual_keyword": f"{page.title} football context"
+                    "visual_keyword": f"{title} football context"
                 })
                 count += 1
                 if count >= 3:
@@ -1022,15 +1024,29 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
         attempt_prompt = prompt
         data = None
         result = None
-        
+        # Only in-range scripts are cached: an out-of-range one still drives the
+        # retry prompt below, but must not be replayed on the next run.
+        in_range = lambda script: 120 <= self._script_word_count(script) <= 140
+
         for attempt in range(3):
+            if hedge_enabled():
+                hedged = self._try_hedged(attempt_prompt, groq_temperature=0.3, call_type="breaking_news",
+                                          cacheable=in_range)
+                if not hedged:
+                    break
+                result = hedged
+                word_count = self._script_word_count(result)
+                if 120 <= word_count <= 140:
+                    logger.info(f"Breaking news script generated via hedged providers (attempt {attempt+1}) with {word_count} words.")
+                    return result
+                logger.warning(f"Hedged script word count {word_count} out of range (120-140). Retrying...")
+                attempt_prompt = prompt + f"\n\nSTRICT REQUIREMENT: Your previous attempt was {word_count} words. You MUST write longer, more detailed descriptions in each segment's text to reach a total word count of between 120 and 140 words. Make each of the 4 segments contain exactly 2-3 long, descriptive sentences!"
+                continue
+
             if self.anthropic_api_key:
-                result = self._try_claude(attempt_prompt)
+                result = self._try_claude(attempt_prompt, call_type="breaking_news", cacheable=in_range)
                 if result:
-                    hook = result.get("hook", "")
-                    segments_text = " ".join([seg.get("text", "") for seg in result.get("segments", []) if isinstance(seg, dict)])
-                    outro = result.get("outro", "")
-                    word_count = len(f"{hook} {segments_text} {outro}".strip().split())
+                    word_count = self._script_word_count(result)
                     if 120 <= word_count <= 140:
                         logger.info(f"Breaking news script generated via Claude (attempt {attempt+1}) with {word_count} words.")
                         return result
@@ -1039,41 +1055,23 @@ VISUAL KEYWORD RULES — MANDATORY (image search will fail if these are violated
                         attempt_prompt = prompt + f"\n\nSTRICT REQUIREMENT: Your previous attempt was {word_count} words. You MUST write longer, more detailed descriptions in each segment's text to reach a total word count of between 120 and 140 words. Make each of the 4 segments contain exactly 2-3 long, descriptive sentences!"
 
             if self.groq_keys:
-                for j, gkey in enumerate(self.groq_keys):
-                    try:
-                        from groq import Groq
-                        client = Groq(api_key=gkey)
-                        completion = client.chat.completions.create(
-                            model=GROQ_SCRIPT_MODEL,
-                            messages=[{"role": "user", "content": attempt_prompt}],
-                            temperature=0.3,
-                            max_tokens=1024,
-                            response_format={"type": "json_object"}
-                        )
-                        data = json.loads(completion.choices[0].message.content)
-                        if self._validate_script_data(data):
-                            hook = data.get("hook", "")
-                            segments_text = " ".join([seg.get("text", "") for seg in data.get("segments", []) if isinstance(seg, dict)])
-                            outro = data.get("outro", "")
-                            word_count = len(f"{hook} {segments_text} {outro}".strip().split())
-                            
-                            if 120 <= word_count <= 140:
-                                logger.info(f"Breaking news script generated via Groq key #{j+1} (attempt {attempt+1}) with {word_count} words.")
-                                return data
-                            else:
-                                logger.warning(f"Groq key #{j+1} script word count {word_count} out of range (120-140). Retrying...")
-                                attempt_prompt = prompt + f"\n\nSTRICT REQUIREMENT: Your previous attempt was {word_count} words. You MUST write longer, more detailed descriptions in each segment's text to reach a total word count of between 120 and 140 words. Make each of the 4 segments contain exactly 2-3 long, descriptive sentences!"
-                                break # break keys loop to run next attempt
-                    except Exception as e:
-                        logger.error(f"Breaking news Groq key #{j+1} generation failed: {e}")
+                groq_result = self._try_groq(attempt_prompt, temperature=0.3, call_type="breaking_news",
+                                             cacheable=in_range)
+                if groq_result:
+                    data = groq_result
+                    word_count = self._script_word_count(data)
+                    
+                    if 120 <= word_count <= 140:
+                        logger.info(f"Breaking news script generated via Groq (attempt {attempt+1}) with {word_count} words.")
+                        return data
+                    else:
+                        logger.warning(f"Groq script word count {word_count} out of range (120-140). Retrying...")
+                        attempt_prompt = prompt + f"\n\nSTRICT REQUIREMENT: Your previous attempt was {word_count} words. You MUST write longer, more detailed descriptions in each segment's text to reach a total word count of between 120 and 140 words. Make each of the 4 segments contain exactly 2-3 long, descriptive sentences!"
 
             if self.gemini_keys:
-                result = self._try_gemini(attempt_prompt)
+                result = self._try_gemini(attempt_prompt, call_type="breaking_news", cacheable=in_range)
                 if result:
-                    hook = result.get("hook", "")
-                    segments_text = " ".join([seg.get("text", "") for seg in result.get("segments", []) if isinstance(seg, dict)])
-                    outro = result.get("outro", "")
-                    word_count = len(f"{hook} {segments_text} {outro}".strip().split())
+                    word_count = self._script_word_count(result)
                     if 120 <= word_count <= 140:
                         logger.info(f"Breaking news script generated via Gemini (attempt {attempt+1}) with {word_count} words.")
                         return result
@@ -0,0 +1,313 @@
+"""
+wiki_grounding.py
+Cached, concurrent Wikipedia grounding for script generation.
+
+ScriptGenerator._fetch_context used the `wikipedia` package one call at a
+time: wikipedia.search, wikipedia.page (which resolves the title), then
+page.sections and page.section() per target section — about eight
+sequential round trips per entity, two entities per topic, and the whole
+thing again on the simplified-query retry. Every short, World Cup pipeline and
+re-run grounding on the same players paid that again from scratch.
+
+WikiGrounding talks to the MediaWiki API directly through the shared HTTP
+client:
+  - one list=search request per entity, then one prop=extracts request per
+    page that returns the intro and every section as plain text — sections
+    are split out locally instead of being fetched one by one;
+  - the entities' searches, and then the first CANDIDATES_PER_ENTITY clean
+    candidates of every entity, are fetched concurrently
+    (WIKI_GROUNDING_WORKERS, default 4);
+  - search results and parsed pages (summary + the grounding sections) are
+    cached on disk as one JSON file each under footybitez/data/cache/grounding/
+    (WIKI_GROUNDING_CACHE_DIR to override), for WIKI_GROUNDING_TTL_HOURS
+    (default 168), and memoised in-process, so a repeat entity costs no
+    request at all.
+
+Entities found in the offline index (content/grounding_index.py, built by
+pipelines/grounding_index_build.py) are grounded from it without any request;
+only the rest go through the searches and page fetches above.
+
+The men's-football-only guard is unchanged: candidates whose title, or whose
+summary, matches TOPIC_FILTER are skipped. A disambiguation page is skipped
+like one, and the next clean candidate is used instead.
+
+Usage:
+    from footybitez.content.wiki_grounding import get_wiki_grounding
+
+    context = get_wiki_grounding().fetch_context(["lionel messi", "cristiano ronaldo"])
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from footybitez.content.grounding_index import GroundingIndex, get_grounding_index
+from footybitez.utils import http_client as http
+from footybitez.utils.keyword_matcher import TOPIC_FILTER
+
+logger = logging.getLogger(__name__)
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+API_URL = "https://en.wikipedia.org/w/api.php"
+HEADERS = {"User-Agent": "FootyBitezBot/1.0"}
+DEFAULT_CACHE_DIR = "footybitez/data/cache/grounding"
+DEFAULT_TTL_HOURS = 24 * 7
+SEARCH_RESULTS = 5
+CANDIDATES_PER_ENTITY = 2     # clean candidates fetched up front per entity
+TARGET_SECTIONS = ["Honours", "Career statistics", "Club career",
+                   "International career", "Records", "Rules"]
+SUMMARY_CHARS = 700
+SECTION_CHARS = 800
+MAX_CONTEXT_CHARS = 4000
+# ─────────────────────────────────────────────────────────────────────────────
+
+_HEADING = re.compile(r"^(={2,6})\s*(.+?)\s*\1\s*$", re.MULTILINE)
+
+
+def split_sections(extract: str) -> tuple:
+    """
+    (intro, [(heading, text)]) from a plain-text extract with "== Heading =="
+    markers. A section's text runs to the next heading of the same or a higher
+    level, so it includes its subsections.
+    """
+    headings = list(_HEADING.finditer(extract or ""))
+    if not headings:
+        return (extract or "").strip(), []
+    intro = extract[:headings[0].start()].strip()
+    sections = []
+    for i, match in enumerate(headings):
+        level = len(match.group(1))
+        end = len(extract)
+        for later in headings[i + 1:]:
+            if len(later.group(1)) <= level:
+                end = later.start()
+                break
+        body = _HEADING.sub(lambda m: m.group(2) + ":", extract[match.end():end]).strip()
+        sections.append((match.group(2), body))
+    return intro, sections
+
+
+class WikiGrounding:
+    def __init__(self, cache_dir: str | None = None, ttl_hours: float | None = None, workers: int | None = None,
+                 index: GroundingIndex | None = None):
+        self.cache_dir = cache_dir or os.getenv("WIKI_GROUNDING_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("WIKI_GROUNDING_TTL_HOURS", str(DEFAULT_TTL_HOURS)))
+        self.ttl = ttl_hours * 3600
+        self.workers = workers or int(os.getenv("WIKI_GROUNDING_WORKERS", "4"))
+        self.index = index or get_grounding_index()
+        self._memo = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ── cache ────────────────────────────────────────────────────────────────
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _cached(self, kind: str, key: str):
+        """(True, value) for a fresh cached entry, else (False, None)."""
+        with self._lock:
+            if (kind, key) in self._memo:
+                self.hits += 1
+                return True, self._memo[(kind, key)]
+        path = self._path(kind, key)
+        if self.ttl > 0 and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if time.time() - entry.get("t", 0) <= self.ttl:
+                    with self._lock:
+                        self._memo[(kind, key)] = entry["data"]
+                        self.hits += 1
+                    return True, entry["data"]
+            except Exception:
+                pass
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def _store(self, kind: str, key: str, data):
+        with self._lock:
+            self._memo[(kind, key)] = data
+        if self.ttl <= 0:
+            return
+        path = self._path(kind, key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"t": time.time(), "key": key, "data": data}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"[Grounding] Failed to cache {kind} '{key}': {e}")
+
+    # ── MediaWiki ────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = SEARCH_RESULTS) -> list:
+        """Titles of the top `limit` search hits (cached). Raises on HTTP errors."""
+        key = f"{' '.join(query.lower().split())}|{limit}"
+        found, titles = self._cached("search", key)
+        if found:
+            return titles
+        r = http.get(API_URL, params={
+            "action": "query", "list": "search", "srsearch": query, "srlimit": limit,
+            "srprop": "", "format": "json", "formatversion": 2,
+        }, headers=HEADERS, timeout=10)
+        r.raise_for_status()
+        titles = [hit["title"] for hit in r.json().get("query", {}).get("search", [])]
+        self._store("search", key, titles)
+        return titles
+
+    def page(self, title: str) -> dict | None:
+        """
+        {"title", "summary", "sections": {heading: text}} for a page (cached),
+        with only the TARGET_SECTIONS kept; None for a missing or disambiguation
+        page. Raises on HTTP errors.
+        """
+        found, page = self._cached("page", title)
+        if found:
+            return page
+        r = http.get(API_URL, params={
+            "action": "query", "prop": "extracts|pageprops", "ppprop": "disambiguation",
+            "explaintext": 1, "exsectionformat": "wiki", "redirects": 1, "titles": title,
+            "format": "json", "formatversion": 2,
+        }, headers=HEADERS, timeout=15)
+        r.raise_for_status()
+        pages = r.json().get("query", {}).get("pages", [])
+        info = pages[0] if pages else {}
+        page = None
+        if info and not info.get("missing") and "disambiguation" not in info.get("pageprops", {}):
+            intro, sections = split_sections(info.get("extract", ""))
+            targets = [t.lower() for t in TARGET_SECTIONS]
+            page = {
+                "title": info.get("title", title),
+                "summary": intro[:2000],
+                "sections": {h: body[:2000] for h, body in sections if any(t in h.lower() for t in targets)},
+            }
+        self._store("page", title, page)
+        return page
+
+    # ── grounding ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def search_query(entity: str) -> str:
+        """Entity -> search query, steered toward men's football like MediaSourcer's image search."""
+        query = entity.lower().replace("football", "soccer")
+        if "soccer" not in query and "association" not in query:
+            query += " soccer"
+        return query + " men's"
+
+    def _candidates(self, entity: str) -> list:
+        try:
+            results = self.search(self.search_query(entity))
+        except Exception as e:
+            logger.warning(f"Failed to fetch context for {entity}: {e}")
+            return []
+        clean = []
+        for candidate in results:
+            bad = TOPIC_FILTER.find(candidate)
+            if bad:
+                logger.warning(f"[Grounding] Skipping Wikipedia candidate '{candidate}' — matches banned term '{bad}'.")
+                continue
+            clean.append(candidate)
+        return clean
+
+    def _page_or_none(self, title: str) -> dict | None:
+        try:
+            return self.page(title)
+        except Exception as e:
+            logger.warning(f"[Grounding] Failed to fetch Wikipedia page '{title}': {e}")
+            return None
+
+    def best_page(self, entity: str) -> dict | None:
+        """First candidate page for an entity that passes TOPIC_FILTER (title and summary), or None."""
+        for title in self._candidates(entity):
+            page = self._page_or_none(title)
+            if not page:
+                continue
+            bad = TOPIC_FILTER.find(page["summary"][:SUMMARY_CHARS])
+            if bad:
+                logger.warning(f"[Grounding] Skipping Wikipedia page '{page['title']}' — summary matches banned term '{bad}'.")
+                continue
+            return page
+        return None
+
+    @staticmethod
+    def render(page: dict) -> str:
+        parts = [f"ENTITY: {page['title']}\nSUMMARY: {page['summary'][:SUMMARY_CHARS]}"]
+        sections = page.get("sections", {})
+        for target in TARGET_SECTIONS:
+            match = next((h for h in sections if target.lower() in h.lower()), None)
+            if match and sections[match]:
+                parts.append(f"--- {match.upper()} ---\n{sections[match][:SECTION_CHARS]}")
+        return "\n".join(parts)
+
+    def fetch_context(self, entities: list) -> str | None:
+        """
+        Grounding text for up to two entities — offline index first, then
+        searches and page fetches for the rest run concurrently, in the old
+        output format. None if nothing usable was found.
+        """
+        entities = [e.strip() for e in entities if e and len(e.strip()) >= 2][:2]
+        if not entities:
+            return None
+        start = time.monotonic()
+        hits_before = self.hits
+        offline = {entity: self.index.lookup(entity) for entity in entities}
+        online = [entity for entity in entities if not offline[entity]]
+        candidate_lists, pages = {}, {}
+        if online:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                candidate_lists = dict(zip(online, pool.map(self._candidates, online)))
+                titles = list(dict.fromkeys(t for cands in candidate_lists.values()
+                                            for t in cands[:CANDIDATES_PER_ENTITY]))
+                pages = dict(zip(titles, pool.map(self._page_or_none, titles)))
+
+        full_context = []
+        seen_pages = set()
+        for entity in entities:
+            page = offline[entity]
+            if page:
+                if page["title"] not in seen_pages:
+                    seen_pages.add(page["title"])
+                    full_context.append(self.render(page))
+            for title in candidate_lists.get(entity, []):
+                if title in seen_pages:
+                    continue
+                # Later candidates are only fetched if the prefetched ones didn't work out.
+                page = pages[title] if title in pages else self._page_or_none(title)
+                if not page:
+                    continue
+                seen_pages.add(title)
+                bad = TOPIC_FILTER.find(page["summary"][:SUMMARY_CHARS])
+                if bad:
+                    logger.warning(f"[Grounding] Skipping Wikipedia page '{page['title']}' — summary matches banned term '{bad}'.")
+                    continue
+                full_context.append(self.render(page))
+                break
+            if len("\n\n".join(full_context)) > MAX_CONTEXT_CHARS:
+                break
+
+        logger.info(f"[Grounding] Context for {len(entities)} entities in {time.monotonic() - start:.2f}s "
+                    f"({len(entities) - len(online)} from the offline index, {self.hits - hits_before} cache hits).")
+        return "\n\n=====\n\n".join(full_context) if full_context else None
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_wiki_grounding() -> WikiGrounding:
+    """Process-wide WikiGrounding, so every pipeline in a run shares the in-memory cache."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = WikiGrounding()
+        return _instance
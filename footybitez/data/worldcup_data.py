@@ -7,11 +7,12 @@ String codes (PL, BL1, etc.) only work for domestic leagues.
 Free tier: 10 requests/minute. Rate limiter enforces 6-second gaps.
 """
 
-import requests
+from footybitez.utils import http_client as http
 import time
 import logging
 from datetime import date, datetime, timezone, timedelta
 from footybitez.utils.llm_models import GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +44,7 @@ class WorldCupData:
         """Makes a GET request to football-data.org, examining response headers for rate limits."""
         for attempt in range(retries):
             try:
-                r = requests.get(url, headers=self.headers, params=params, timeout=15)
+                r = http.get(url, headers=self.headers, params=params, timeout=15)
                 
                 # Check rate limiting headers
                 requests_available = r.headers.get("X-Requests-Available-Minute")
@@ -71,7 +72,7 @@ class WorldCupData:
 
                 r.raise_for_status()
                 return r.json()
-            except requests.HTTPError as e:
+            except http.HTTPError as e:
                 status_code = e.response.status_code if e.response is not None else 'Unknown'
                 logger.error(f"football-data.org HTTP error {status_code}: {e}")
                 if attempt == retries - 1:
@@ -120,6 +121,13 @@ class WorldCupData:
         )
         return data.get("scorers", [])
 
+    def get_teams(self) -> list:
+        """Returns every World Cup team, each with its registered `squad` list."""
+        data = self._rate_limited_get(
+            f"{FOOTBALL_DATA_BASE}/competitions/{WC_2026_ID}/teams"
+        )
+        return data.get("teams", [])
+
     def get_finished_matches_last_2hrs(self) -> list:
         """
         Returns World Cup matches that finished in the last 2 hours.
@@ -213,7 +221,7 @@ class WorldCupData:
             try:
                 # Find the API-Football fixture ID matching this match
                 today = str(date.today())
-                fixtures_resp = requests.get(
+                fixtures_resp = http.get(
                     f"{API_FOOTBALL_BASE}/fixtures",
                     headers=headers,
                     params={
@@ -264,7 +272,7 @@ class WorldCupData:
 
                 if fixture_id:
                     # Get events for that fixture
-                    events_resp = requests.get(
+                    events_resp = http.get(
                         f"{API_FOOTBALL_BASE}/fixtures/events",
                         headers=headers,
                         params={"fixture": fixture_id},
@@ -299,59 +307,58 @@ class WorldCupData:
                 logger.warning("No GEMINI_API_KEY available for match events search fallback.")
                 return []
 
-            for key in gemini_keys:
-                for model_name in GEMINI_TEXT_MODELS:
-                    for attempt in range(3):
-                        try:
-                            from google import genai
-                            from google.genai import types
-                            
-                            client = genai.Client(api_key=key)
-                            
-                            # Step 1: Search match details
-                            search_prompt = (
-                                f"Find the goals (scorers and minute), red cards (player, team, minute), and full match statistics "
-                                f"(possession %, shots, shots on target, corner kicks, offsides, fouls, yellow cards) "
-                                f"for the World Cup match {home_team} vs {away_team} on {date_str}."
-                            )
-                            r1 = client.models.generate_content(
-                                model=model_name,
-                                contents=search_prompt,
-                                config=types.GenerateContentConfig(
-                                    tools=[types.Tool(google_search=types.GoogleSearch())]
-                                )
-                            )
-                            
-                            # Space out calls to avoid hitting free-tier 15 RPM limits
-                            time.sleep(4)
-                            
-                            # Step 2: Parse to JSON list of events and match statistics
-                            parse_prompt = (
-                                "Parse the following match information into a JSON object with two keys:\n"
-                                "1. 'timeline': a list of events, where each event has keys: 'type' ('Goal' or 'Card'), "
-                                "'detail' ('Red Card', 'Yellow Card', or null), 'player' (dict with 'name'), "
-                                "'team' (dict with 'name'), 'time' (dict with 'elapsed' integer).\n"
-                                "2. 'stats': a dict with keys: 'possession' (dict with 'home' and 'away' strings/percentages), "
-                                "'shots' (dict with 'home' and 'away' integers or 'N/A'), 'shots_on_target' (dict with 'home' and 'away' integers or 'N/A'), "
-                                "'fouls' (dict with 'home' and 'away' integers or 'N/A'), 'corners' (dict with 'home' and 'away' integers or 'N/A'), "
-                                "'offsides' (dict with 'home' and 'away' integers or 'N/A'), 'yellow_cards' (dict with 'home' and 'away' integers or 'N/A').\n\n"
-                                f"Match info:\n{r1.text}"
+            gateway = get_llm_gateway()
+            for _, key, model_name in gateway.combos("gemini", gemini_keys, GEMINI_TEXT_MODELS):
+                for attempt in range(3):
+                    if not gateway.available("gemini", key, model_name):
+                        break
+                    try:
+                        from google.genai import types
+
+                        # Step 1: Search match details
+                        search_prompt = (
+                            f"Find the goals (scorers and minute), red cards (player, team, minute), and full match statistics "
+                            f"(possession %, shots, shots on target, corner kicks, offsides, fouls, yellow cards) "
+                            f"for the World Cup match {home_team} vs {away_team} on {date_str}."
+                        )
+                        r1 = gateway.call("gemini", key, model_name, lambda client: client.models.generate_content(
+                            model=model_name,
+                            contents=search_prompt,
+                            config=types.GenerateContentConfig(
+                                tools=[types.Tool(google_search=types.GoogleSearch())]
                             )
-                            r2 = client.models.generate_content(
-                                model=model_name,
-                                contents=parse_prompt,
-                                config=types.GenerateContentConfig(
-                                    response_mime_type="application/json"
-                                )
+                        ))
+                        
+                        # Space out calls to avoid hitting free-tier 15 RPM limits
+                        time.sleep(4)
+                        
+                        # Step 2: Parse to JSON list of events and match statistics
+                        parse_prompt = (
+                            "Parse the following match information into a JSON object with two keys:\n"
+                            "1. 'timeline': a list of events, where each event has keys: 'type' ('Goal' or 'Card'), "
+                            "'detail' ('Red Card', 'Yellow Card', or null), 'player' (dict with 'name'), "
+                            "'team' (dict with 'name'), 'time' (dict with 'elapsed' integer).\n"
+                            "2. 'stats': a dict with keys: 'possession' (dict with 'home' and 'away' strings/percentages), "
+                            "'shots' (dict with 'home' and 'away' integers or 'N/A'), 'shots_on_target' (dict with 'home' and 'away' integers or 'N/A'), "
+                            "'fouls' (dict with 'home' and 'away' integers or 'N/A'), 'corners' (dict with 'home' and 'away' integers or 'N/A'), "
+                            "'offsides' (dict with 'home' and 'away' integers or 'N/A'), 'yellow_cards' (dict with 'home' and 'away' integers or 'N/A').\n\n"
+                            f"Match info:\n{r1.text}"
+                        )
+                        r2 = gateway.call("gemini", key, model_name, lambda client: client.models.generate_content(
+                            model=model_name,
+                            contents=parse_prompt,
+                            config=types.GenerateContentConfig(
+                                response_mime_type="application/json"
                             )
-                            parsed_data = json.loads(r2.text)
-                            if isinstance(parsed_data, dict) and "timeline" in parsed_data:
-                                logger.info(f"Successfully retrieved match data via Gemini Search ({model_name}).")
-                                return parsed_data
-                        except Exception as e:
-                            logger.warning(f"Gemini events search failed (model={model_name}, attempt={attempt+1}): {e}")
-                            time.sleep(5)
-                            continue
+                        ))
+                        parsed_data = json.loads(r2.text)
+                        if isinstance(parsed_data, dict) and "timeline" in parsed_data:
+                            logger.info(f"Successfully retrieved match data via Gemini Search ({model_name}).")
+                            return parsed_data
+                    except Exception as e:
+                        logger.warning(f"Gemini events search failed (model={model_name}, attempt={attempt+1}): {e}")
+                        time.sleep(5)
+                        continue
         return events
 
     def _fetch_wikipedia_match_events(self, home_team: str, away_team: str, date_str: str) -> list:
@@ -371,7 +378,7 @@ class WorldCupData:
                 "format": "json",
                 "srlimit": 3,
             }
-            r = requests.get(search_url, params=params,
+            r = http.get(search_url, params=params,
                              headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10)
             if r.status_code != 200:
                 return []
@@ -392,7 +399,7 @@ class WorldCupData:
                 "explaintext": True,
                 "format": "json",
             }
-            r = requests.get(search_url, params=params,
+            r = http.get(search_url, params=params,
                              headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10)
             if r.status_code != 200:
                 return []
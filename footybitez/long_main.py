@@ -493,7 +493,7 @@ def main():
         # 3. Setup Media Sourcing
         media_dir = "remotion-video/public/assets/images"
         os.makedirs(media_dir, exist_ok=True)
-        media_sourcer = MediaSourcer(download_dir=media_dir)
+        media_sourcer = MediaSourcer(download_dir=media_dir, target_size=(1920, 1080))
 
         # Log quota status at start
         try:
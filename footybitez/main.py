@@ -84,24 +84,12 @@ def main():
             profile_image_path = title_card_path
         
         # 3. Fetch Segment Media (Dynamic)
-        segment_media = []
         logger.info("Fetching Dynamic Segment Media...")
-        
-        # Extract keywords from script segments
-        segments = script.get('segments', [])
-        for seg in segments:
-            # Handle dict vs string (legacy support)
-            visual_kw = topic + " football"
-            if isinstance(seg, dict):
-                visual_kw = seg.get('visual_keyword', visual_kw)
-            
-            # Fetch 2-3 clips/images per segment
-            logger.info(f"Searching for visual: {visual_kw}")
-            # Fetch 2-3 clips/images per segment
-            logger.info(f"Searching for visual: {visual_kw}")
-            paths = media_sourcer.get_media(visual_kw, count=3)
-            segment_media.append(paths) # Append list of paths for this segment
-            
+
+        # One planned pass over every segment's visual_keyword (string segments
+        # fall back to the topic), 3 images per segment.
+        segment_media = media_sourcer.plan_media(script, count=3, default_keyword=topic + " football")
+
         visual_assets = {
             "title_card": title_card_path,
             "profile_image": profile_image_path,
@@ -0,0 +1,248 @@
+"""
+ai_image_cache.py
+Persistent cache for AI-generated images, keyed by prompt.
+
+generate_ai_image, generate_tactical_diagram, MediaSourcer._fetch_pollinations_image
+and MediaSourcer.generate_ai_image_for_shorts generated every image from
+scratch, even though the long-form and title-card prompts repeat across runs
+("football stadium atmosphere cinematic, ...", the same five tactical diagram
+styles). Each accepted image is now filed here under
+(generator, normalized prompt, aspect ratio), together with the safety verdict
+it was accepted with:
+  passed     it went through the vision safety+relevance check for this prompt;
+  unchecked  the generator doesn't run one (football_visual_generator's Gemini
+             path — its callers never did either).
+
+Up to AI_IMAGE_CACHE_VARIANTS (default 3) variants are kept per key; storing
+another one drops that key's oldest. With AI_IMAGE_CACHE_SERVE=true (default)
+the generators hand out a cached variant — least recently served first, so
+repeats rotate — before spending gemini_image quota or waiting up to 30 s on
+Pollinations, but only once the prompt has its full set of variants: until
+then they generate, so a repeated prompt builds up variety instead of getting
+its first image forever. When generation isn't possible (quota exhausted, no
+keys, every attempt failed) they fall back to whatever is cached
+(serve(..., partial=True)). Only "passed" variants are served where the
+generator itself requires a safety check.
+
+Eviction is least-recently-used against AI_IMAGE_CACHE_MAX_MB (default 256).
+Files live under footybitez/data/cache/ai_images/ (AI_IMAGE_CACHE_DIR to
+override), which the workflows persist with actions/cache.
+
+Usage:
+    from footybitez.media.ai_image_cache import get_ai_image_cache
+
+    cache = get_ai_image_cache()
+    if cache.serve("pollinations", prompt, "9:16", output_path, require_safe=True):
+        return True                                    # full variant set: rotate
+    ...                                                # generate and check
+    cache.store("pollinations", prompt, "9:16", output_path, verdict="passed")
+    ...
+    return cache.serve("pollinations", prompt, "9:16", output_path, require_safe=True, partial=True)
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+from footybitez.media.media_cache import stable_hash
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/ai_images"
+DEFAULT_MAX_MB = 256
+DEFAULT_VARIANTS = 3
+VERDICTS = ("passed", "unchecked")
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercased with whitespace collapsed."""
+    return " ".join(str(prompt or "").lower().split())
+
+
+def prompt_key(generator: str, prompt: str, aspect: str) -> str:
+    return stable_hash(f"{generator}|{aspect}|{normalize_prompt(prompt)}", 32)
+
+
+class AiImageCache:
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None,
+                 max_variants: int | None = None, serve_cached: bool | None = None):
+        self.cache_dir = cache_dir or os.getenv("AI_IMAGE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("AI_IMAGE_CACHE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        if max_variants is None:
+            max_variants = int(os.getenv("AI_IMAGE_CACHE_VARIANTS", str(DEFAULT_VARIANTS)))
+        self.max_variants = max(1, max_variants)
+        if serve_cached is None:
+            serve_cached = os.getenv("AI_IMAGE_CACHE_SERVE", "true").lower() != "false"
+        self.serve_cached = serve_cached
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self._index = self._load()
+
+    # ── index persistence ────────────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        """Load the index. Returns an empty index if the file is missing or corrupt."""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data.get("prompts"), dict):
+                    return data
+            except Exception:
+                pass
+        return {"prompts": {}}
+
+    def _save(self):
+        """Atomically write the index so a killed run can't leave it half-written."""
+        tmp = self.index_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self.index_path)
+        except Exception as e:
+            print(f"[AiImageCache] Failed to save index: {e}")
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    # ── public API ───────────────────────────────────────────────────────────
+
+    def lookup(self, generator: str, prompt: str, aspect: str, require_safe: bool = False,
+               min_variants: int = 1) -> dict | None:
+        """
+        The least recently served variant for this prompt (marking it served),
+        as {"path", "verdict", "created"}, or None — also None while fewer than
+        `min_variants` qualify. With `require_safe` only variants that passed
+        the safety check qualify.
+        """
+        key = prompt_key(generator, prompt, aspect)
+        with self._lock:
+            entry = self._index["prompts"].get(key)
+            variants = [v for v in (entry or {}).get("variants", [])
+                        if os.path.exists(self._path(v["file"]))
+                        and (not require_safe or v.get("verdict") == "passed")]
+            if not variants or len(variants) < min_variants:
+                self.misses += 1
+                return None
+            variant = min(variants, key=lambda v: v.get("last_used", 0))
+            variant["last_used"] = time.time()
+            self._save()
+            self.hits += 1
+            return {"path": self._path(variant["file"]), "verdict": variant.get("verdict"),
+                    "created": variant.get("created")}
+
+    def serve(self, generator: str, prompt: str, aspect: str, output_path: str,
+              require_safe: bool = False, partial: bool = False) -> bool:
+        """
+        Copies a cached variant to `output_path` if serving cached images is
+        enabled and the prompt has its full set of max_variants variants — or
+        any variant with `partial`, for callers that can't generate a new one.
+        Returns True when it did.
+        """
+        if not self.serve_cached:
+            return False
+        variant = self.lookup(generator, prompt, aspect, require_safe=require_safe,
+                              min_variants=1 if partial else self.max_variants)
+        if not variant:
+            return False
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            shutil.copy2(variant["path"], output_path)
+        except Exception as e:
+            print(f"[AiImageCache] Failed to stage cached image: {e}")
+            return False
+        print(f"[AiImageCache] Serving cached {generator} image ({variant['verdict']}) "
+              f"for '{normalize_prompt(prompt)[:60]}'")
+        return True
+
+    def store(self, generator: str, prompt: str, aspect: str, src_path: str,
+              verdict: str = "unchecked") -> str | None:
+        """
+        Files `src_path` as a new variant for this prompt with its safety
+        `verdict` ("passed" or "unchecked"). Returns the cached path, or None.
+        """
+        if verdict not in VERDICTS or not os.path.exists(src_path):
+            return None
+        key = prompt_key(generator, prompt, aspect)
+        ext = os.path.splitext(src_path)[1].lower() or ".jpg"
+        try:
+            with self._lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                now = time.time()
+                filename = f"{key}_{stable_hash(f'{now}:{src_path}', 8)}{ext}"
+                shutil.copy2(src_path, self._path(filename))
+                entry = self._index["prompts"].setdefault(key, {
+                    "generator": generator, "aspect": aspect,
+                    "prompt": normalize_prompt(prompt), "variants": [],
+                })
+                entry["variants"].append({
+                    "file": filename, "size": os.path.getsize(self._path(filename)),
+                    "verdict": verdict, "created": now, "last_used": now,
+                })
+                while len(entry["variants"]) > self.max_variants:
+                    oldest = min(entry["variants"], key=lambda v: v.get("created", 0))
+                    self._drop_variant(key, oldest)
+                self._evict()
+                self._save()
+                return self._path(filename)
+        except Exception as e:
+            print(f"[AiImageCache] Failed to cache {os.path.basename(src_path)}: {e}")
+            return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            variants = [v for e in self._index["prompts"].values() for v in e["variants"]]
+            return {
+                "prompts": len(self._index["prompts"]),
+                "variants": len(variants),
+                "bytes": sum(v.get("size", 0) for v in variants),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # ── eviction ─────────────────────────────────────────────────────────────
+
+    def _drop_variant(self, key: str, variant: dict):
+        entry = self._index["prompts"].get(key)
+        if entry:
+            entry["variants"] = [v for v in entry["variants"] if v is not variant]
+            if not entry["variants"]:
+                self._index["prompts"].pop(key, None)
+        try:
+            if os.path.exists(self._path(variant["file"])):
+                os.remove(self._path(variant["file"]))
+        except Exception:
+            pass
+
+    def _evict(self):
+        """Drops least-recently-used variants until the cache fits its size budget."""
+        variants = [(key, v) for key, e in self._index["prompts"].items() for v in e["variants"]]
+        total = sum(v.get("size", 0) for _, v in variants)
+        if total <= self.max_bytes:
+            return
+        for key, variant in sorted(variants, key=lambda kv: kv[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= variant.get("size", 0)
+            self._drop_variant(key, variant)
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_ai_image_cache() -> AiImageCache:
+    """Process-wide shared AiImageCache."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = AiImageCache()
+        return _instance
@@ -4,7 +4,7 @@ asset_orchestrator.py
 
 Scene routing:
   ai_video    → Veo 3.1 → (fallback) Gemini image → Pollinations → ColorCard
-  ai_image    → Tactical Diagram (if applicable) or Gemini image → Pollinations → ColorCard
+  ai_image    → Local tactical diagram (if applicable) → Gemini diagram/image → Pollinations → ColorCard
   image       → Wikimedia → Unsplash → Pixabay → Gemini image → Pollinations → ColorCard
   kinetic_text → pass-through (no asset fetch needed)
   image_with_overlay → same as image, caller adds overlay text after
@@ -218,6 +218,15 @@ def fetch_asset(scene: dict, job_id: str, media_sourcer=None, topic: str = "") -
             except Exception:
                 pass
                 
+        # Orient, convert to sRGB and size for the 1920x1080 frame before the
+        # credit is drawn, so the overlay lands at its final scale.
+        try:
+            from footybitez.media.image_normalizer import LONG_FORM_HEADROOM, LONG_FORM_SIZE, normalize_file
+            img_path = normalize_file(img_path, os.path.join(out_dir, os.path.basename(img_path)),
+                                      size=LONG_FORM_SIZE, headroom=LONG_FORM_HEADROOM)
+        except Exception as e:
+            logger.warning(f"[Orchestrator] Image normalization failed for {img_path}: {e}")
+
         credited_path = _add_image_credit_overlay(img_path, source, artist)
         result["asset_path"] = credited_path
 
@@ -266,9 +275,15 @@ def _fetch_ai_video(scene: dict, out_dir: str, media_sourcer=None) -> dict:
             return {"asset_type": "ai_video", "asset_path": video_path, "overlay_text": None, "kinetic_stat": None}
         logger.warning("[Orchestrator] Veo 3.1 failed or invalid output. Falling back.")
 
-    # Tier 2: Gemini image (degrade from video to still)
+    # Tier 2: Gemini image (degrade from video to still); a cached one costs no
+    # quota — any cached one once the quota is gone, else only a full variant set
     img_path = os.path.join(out_dir, "ai_image.jpg")
-    if quota_tracker.can_use("gemini_image"):
+    gemini_quota = quota_tracker.can_use("gemini_image")
+    if football_visual_generator.serve_cached_ai_image(prompt, img_path, aspect_ratio="16:9",
+                                                       partial=not gemini_quota):
+        _write_meta(img_path, "AI Generated / Google Gemini")
+        return {"asset_type": "image", "asset_path": img_path, "overlay_text": None, "kinetic_stat": None}
+    if gemini_quota:
         logger.info("[Orchestrator] Falling back to Gemini image generation...")
         success = football_visual_generator.generate_ai_image(prompt, img_path, aspect_ratio="16:9")
         if success:
@@ -301,28 +316,48 @@ def _fetch_ai_video(scene: dict, out_dir: str, media_sourcer=None) -> dict:
     }
 
 def _fetch_ai_image(scene: dict, out_dir: str) -> dict:
-    """Tier: Tactical Diagram (if tactical keywords) or standard AI Image → Pollinations → ColorCard"""
-    from footybitez.media import quota_tracker, football_visual_generator
+    """Tier: Local tactical diagram → Gemini diagram (if tactical keywords) or standard AI Image → Pollinations → ColorCard"""
+    from footybitez.media import quota_tracker, football_visual_generator, tactical_renderer
     
     img_path = os.path.join(out_dir, "ai_image.jpg")
     prompt = scene.get("ai_image_prompt", scene.get("image_cue", "football tactics diagram"))
     
     prompt_lower = prompt.lower()
     is_tactical = any(k in prompt_lower for k in ["tactical", "diagram", "formation", "heat map", "heatmap", "passing", "pressure", "gegenpressing", "tiki-taka", "comparison", "stat"])
-    
-    if quota_tracker.can_use("gemini_image"):
+    diagram_type = "formation"
+    if "heat map" in prompt_lower or "heatmap" in prompt_lower:
+        diagram_type = "heat_map"
+    elif "passing" in prompt_lower or "tiki-taka" in prompt_lower:
+        diagram_type = "passing_lanes"
+    elif "pressure" in prompt_lower or "gegenpressing" in prompt_lower:
+        diagram_type = "pressure_map"
+    elif "comparison" in prompt_lower or "stat" in prompt_lower:
+        diagram_type = "comparison_chart"
+
+    # Formation / passing-lane / pressure diagrams are drawn locally from the
+    # scene's formation — no quota, exact player count. No scene carries match
+    # event data, so a "heat map" is drawn as what it can honestly show: the
+    # formation diagram.
+    local_type = "formation" if diagram_type == "heat_map" else diagram_type
+    if is_tactical and local_type in tactical_renderer.DIAGRAM_TYPES:
+        formation = scene.get("formation") or prompt
+        if tactical_renderer.render_tactical_diagram(local_type, img_path, formation=formation):
+            _write_meta(img_path, "FootyBitez tactical diagram")
+            return {"asset_type": "image", "asset_path": img_path, "overlay_text": None, "kinetic_stat": None}
+
+    # A cached Gemini image for the same prompt costs no quota (any cached one
+    # once the quota is gone, else only a full variant set — see ai_image_cache.py)
+    gemini_quota = quota_tracker.can_use("gemini_image")
+    cached = is_tactical and football_visual_generator.serve_cached_ai_image(
+        football_visual_generator.tactical_diagram_prompt(prompt, diagram_type), img_path, partial=not gemini_quota)
+    if cached or football_visual_generator.serve_cached_ai_image(prompt, img_path, aspect_ratio="16:9",
+                                                                 partial=not gemini_quota):
+        _write_meta(img_path, "AI Generated / Google Gemini")
+        return {"asset_type": "image", "asset_path": img_path, "overlay_text": None, "kinetic_stat": None}
+
+    if gemini_quota:
         success = False
         if is_tactical:
-            diagram_type = "formation"
-            if "heat map" in prompt_lower or "heatmap" in prompt_lower:
-                diagram_type = "heat_map"
-            elif "passing" in prompt_lower or "tiki-taka" in prompt_lower:
-                diagram_type = "passing_lanes"
-            elif "pressure" in prompt_lower or "gegenpressing" in prompt_lower:
-                diagram_type = "pressure_map"
-            elif "comparison" in prompt_lower or "stat" in prompt_lower:
-                diagram_type = "comparison_chart"
-                
             logger.info(f"[Orchestrator] Generating tactical diagram ({diagram_type}) for: {prompt[:60]}")
             success = football_visual_generator.generate_tactical_diagram(prompt, diagram_type, img_path)
             
@@ -367,7 +402,7 @@ def _fetch_image(scene: dict, out_dir: str, media_sourcer=None) -> dict:
 
     if media_sourcer is None:
         from footybitez.media.media_sourcer import MediaSourcer
-        media_sourcer = MediaSourcer(download_dir=out_dir)
+        media_sourcer = MediaSourcer(download_dir=out_dir, target_size=(1920, 1080))
 
     # Tier 0: Wikipedia Entity Lookup
     named_entities = scene.get("named_entities", [])
@@ -375,6 +410,10 @@ def _fetch_image(scene: dict, out_dir: str, media_sourcer=None) -> dict:
         if isinstance(entity, dict) and entity.get("wikipedia_lookup") is True:
             entity_name = entity.get("name")
             if entity_name:
+                path = media_sourcer.get_indexed_entity_image(entity_name)
+                if path:
+                    logger.info(f"[Orchestrator] Entity index hit: {path}")
+                    return {"asset_type": "image", "asset_path": path, "overlay_text": None, "kinetic_stat": None}
                 logger.info(f"[Orchestrator] Performing Wikipedia entity image lookup for: '{entity_name}'")
                 path = media_sourcer.get_wikipedia_entity_image(entity_name)
                 if path:
@@ -394,7 +433,12 @@ def _fetch_image(scene: dict, out_dir: str, media_sourcer=None) -> dict:
     if paths:
         return {"asset_type": "image", "asset_path": paths[0], "overlay_text": None, "kinetic_stat": None}
 
-    if quota_tracker.can_use("gemini_image"):
+    gemini_quota = quota_tracker.can_use("gemini_image")
+    if football_visual_generator.serve_cached_ai_image(image_cue, img_path, aspect_ratio="16:9",
+                                                       partial=not gemini_quota):
+        _write_meta(img_path, "AI Generated / Google Gemini")
+        return {"asset_type": "image", "asset_path": img_path, "overlay_text": None, "kinetic_stat": None}
+    if gemini_quota:
         logger.info(f"[Orchestrator] Trying Gemini image for: {image_cue[:60]}...")
         success = football_visual_generator.generate_ai_image(image_cue, img_path, aspect_ratio="16:9")
         if success:
@@ -0,0 +1,125 @@
+"""
+candidate_ranker.py
+Local quality scoring for image search candidates, before anything is
+downloaded in full.
+
+get_media used to keep the first `count` images that passed, in provider
+order, whatever they looked like — so vision quota went on whichever results
+arrived first, and a blurry Commons scan that got rejected downstream meant
+another search → download → vision round trip. In ranked mode
+(MEDIA_RANKED_SELECTION) MediaSourcer lists a wider pool of candidates from
+the stock providers using their search metadata plus a small preview image,
+scores them here, and only downloads and vision-checks the best ones.
+
+Each candidate is a dict with at least "width" and "height" (the full image,
+0 if unknown); MediaSourcer adds "preview_hash" and "sharpness" when it could
+fetch a preview. Scores are in [0, 1]:
+  resolution  how well the full image covers the target frame without upscaling;
+  crop        1 - share of the image lost to the object-fit: cover crop
+              (a landscape photo in a 9:16 Short loses most of its width);
+  sharpness   Laplacian variance of the preview, saturating at SHARPNESS_REF;
+  distinct    pHash distance from images already used this job and from
+              better-ranked candidates; near-duplicates are dropped outright.
+
+Usage:
+    from footybitez.media.candidate_ranker import rank_candidates
+
+    best = rank_candidates(candidates, target_size=(1080, 1920), used_hashes=[...])
+"""
+
+import io
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from footybitez.media.image_hash import FLAT_HASH, hamming
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+WEIGHTS = {"resolution": 0.3, "crop": 0.25, "sharpness": 0.3, "distinct": 0.15}
+SHARPNESS_REF = 150.0     # Laplacian variance of a crisp 320px preview
+DISTINCT_REF = 20         # pHash bits apart that count as "fully different"
+NEUTRAL = 0.5             # score for a component that couldn't be measured
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def resolution_score(width: int, height: int, target_size: tuple) -> float:
+    """1.0 when the image covers the target frame at native size, less the more it must be upscaled."""
+    if not width or not height:
+        return NEUTRAL
+    tw, th = target_size
+    upscale = max(tw / width, th / height)
+    return min(1.0, 1.0 / upscale)
+
+
+def crop_loss(width: int, height: int, target_size: tuple) -> float:
+    """Share of the image's area cropped away when it is fitted to cover the target frame."""
+    if not width or not height:
+        return 0.0
+    tw, th = target_size
+    image_aspect, target_aspect = width / height, tw / th
+    if image_aspect > target_aspect:
+        return 1.0 - target_aspect / image_aspect
+    return 1.0 - image_aspect / target_aspect
+
+
+def preview_sharpness(img) -> float:
+    """Variance of the Laplacian of a preview image (PIL image), computed at 320px."""
+    img = ImageOps.exif_transpose(img).convert("L")
+    img.thumbnail((320, 320))
+    gray = np.asarray(img, dtype=np.float64)
+    if min(gray.shape) < 3:
+        return 0.0
+    laplacian = (gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+                 - 4 * gray[1:-1, 1:-1])
+    return float(laplacian.var())
+
+
+def score_candidate(candidate: dict, target_size: tuple, seen_hashes: list) -> dict:
+    """Per-component scores and their weighted "total" for one candidate."""
+    width, height = candidate.get("width") or 0, candidate.get("height") or 0
+    sharp = candidate.get("sharpness")
+    scores = {
+        "resolution": resolution_score(width, height, target_size),
+        "crop": 1.0 - crop_loss(width, height, target_size),
+        "sharpness": NEUTRAL if sharp is None else min(1.0, sharp / SHARPNESS_REF),
+        "distinct": 1.0,
+    }
+    image_hash = candidate.get("preview_hash")
+    if image_hash is not None and image_hash != FLAT_HASH and seen_hashes:
+        scores["distinct"] = min(1.0, min(hamming(image_hash, h) for h in seen_hashes) / DISTINCT_REF)
+    scores["total"] = sum(WEIGHTS[k] * scores[k] for k in WEIGHTS)
+    return scores
+
+
+def rank_candidates(candidates: list, target_size: tuple, used_hashes: list = (),
+                    max_distance: int = 6) -> list:
+    """
+    Orders `candidates` best first. Greedy: each pick's preview hash counts
+    against the "distinct" score of everything ranked after it, and a candidate
+    within `max_distance` bits of a used image or an earlier pick is dropped.
+    Each returned candidate gets its scores under "scores".
+    """
+    seen = [h for h in used_hashes if h is not None and h != FLAT_HASH]
+    remaining = list(candidates)
+    ranked = []
+    while remaining:
+        scored = [(score_candidate(c, target_size, seen), c) for c in remaining]
+        best_scores, best = max(scored, key=lambda pair: pair[0]["total"])
+        remaining.remove(best)
+        image_hash = best.get("preview_hash")
+        if image_hash is not None and image_hash != FLAT_HASH:
+            if any(hamming(image_hash, h) <= max_distance for h in seen):
+                continue
+            seen.append(image_hash)
+        ranked.append({**best, "scores": best_scores})
+    return ranked
+
+
+def open_preview(data: bytes):
+    """PIL image from preview bytes, or None if they don't decode."""
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+        return img
+    except Exception:
+        return None
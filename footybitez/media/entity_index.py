@@ -0,0 +1,148 @@
+"""
+entity_index.py
+Local, pre-warmed image index for World Cup players and national teams.
+
+Profile lookups (Wikipedia summary → TheSportsDB → API-Football → ...) ran live
+on the hot path of every World Cup short, and API-Football only allows 100
+requests a day. footybitez/pipelines/entity_warmup.py now walks the squads from
+WorldCupData ahead of time, resolves and vision-verifies one image per entity
+with the normal MediaSourcer chain, and files it here together with its credit.
+At run time MediaSourcer checks this index first, so a known player or team is
+a dictionary hit instead of three or four HTTP round trips.
+
+Names are matched after normalize_entity (case, accents and punctuation
+folded), so "Kylian Mbappé" and "kylian mbappe" hit the same entry. Each entry
+can be reached through several aliases (a team's full and short names, "X
+national football team", ...).
+
+Images live under footybitez/data/cache/entity_images/ (ENTITY_INDEX_DIR to
+override), which the workflows persist with actions/cache.
+
+Usage:
+    from footybitez.media.entity_index import get_entity_index
+
+    index = get_entity_index()
+    entry = index.lookup("Lionel Messi")   # {"path", "source", "artist", "entity"} or None
+    ...
+    index.add(["Lionel Messi", "Leo Messi"], staged_path, source="Wikipedia", artist="...")
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_INDEX_DIR = "footybitez/data/cache/entity_images"
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def normalize_entity(name: str) -> str:
+    """Lowercased, accent-free, punctuation-free name with whitespace collapsed."""
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+class EntityImageIndex:
+    def __init__(self, index_dir: str | None = None):
+        self.index_dir = index_dir or os.getenv("ENTITY_INDEX_DIR", DEFAULT_INDEX_DIR)
+        self.index_path = os.path.join(self.index_dir, "index.json")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._index = self._load()
+
+    def _load(self) -> dict:
+        """Load the index. Returns an empty index if the file is missing or corrupt."""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data.get("aliases"), dict) and isinstance(data.get("entities"), dict):
+                    return data
+            except Exception:
+                pass
+        return {"aliases": {}, "entities": {}}
+
+    def _save(self):
+        """Atomically write the index so a killed warm-up can't leave it half-written."""
+        tmp = self.index_path + ".tmp"
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, indent=1)
+            os.replace(tmp, self.index_path)
+        except Exception as e:
+            print(f"[EntityIndex] Failed to save index: {e}")
+
+    def lookup(self, name: str) -> dict | None:
+        """The indexed image for `name` (or any of its aliases), or None."""
+        key = normalize_entity(name)
+        with self._lock:
+            entity_id = self._index["aliases"].get(key) if key else None
+            entry = self._index["entities"].get(entity_id) if entity_id else None
+            path = os.path.join(self.index_dir, entry["file"]) if entry else None
+            if not path or not os.path.exists(path):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {"path": path, "source": entry.get("source", ""),
+                    "artist": entry.get("artist", ""), "entity": entry.get("entity", name)}
+
+    def add(self, names: list, src_path: str, source: str = "", artist: str = "") -> str | None:
+        """
+        Files `src_path` for the entity called names[0], reachable through every
+        name in `names`. Replaces any earlier image for that entity. Returns the
+        indexed path, or None on failure.
+        """
+        keys = [k for k in (normalize_entity(n) for n in names) if k]
+        if not keys or not os.path.exists(src_path):
+            return None
+        entity_id = keys[0]
+        ext = os.path.splitext(src_path)[1].lower() or ".jpg"
+        filename = hashlib.sha1(entity_id.encode("utf-8")).hexdigest()[:16] + ext
+        try:
+            with self._lock:
+                os.makedirs(self.index_dir, exist_ok=True)
+                old = self._index["entities"].get(entity_id)
+                if old and old["file"] != filename:
+                    try:
+                        os.remove(os.path.join(self.index_dir, old["file"]))
+                    except OSError:
+                        pass
+                dest = os.path.join(self.index_dir, filename)
+                shutil.copy2(src_path, dest)
+                self._index["entities"][entity_id] = {
+                    "entity": names[0], "file": filename, "source": source,
+                    "artist": artist, "added": time.time(),
+                }
+                for key in keys:
+                    self._index["aliases"][key] = entity_id
+                self._save()
+                return dest
+        except Exception as e:
+            print(f"[EntityIndex] Failed to index {names[0]}: {e}")
+            return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entities": len(self._index["entities"]), "aliases": len(self._index["aliases"]),
+                    "hits": self.hits, "misses": self.misses}
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_entity_index() -> EntityImageIndex:
+    """Process-wide shared EntityImageIndex."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = EntityImageIndex()
+        return _instance
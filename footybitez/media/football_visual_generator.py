@@ -14,7 +14,10 @@ import os
 import io
 import time
 import logging
-import re
+
+from footybitez.media.ai_image_cache import get_ai_image_cache
+from footybitez.utils.llm_gateway import get_llm_gateway, quota_window, retry_delay
+from footybitez.utils.llm_models import GEMINI_IMAGE_MODEL
 
 logger = logging.getLogger(__name__)
 
@@ -37,52 +40,34 @@ def handle_429_sleep(err_msg: str) -> float:
     'GenerateRequestsPerDayPerProjectPerModel-FreeTier') or a hard 'limit: 0'
     (the key's tier has zero allocation for this model at all). Gemini's API
     still reports a small `retryDelay` (30-60s) on these errors, but that value
-    is meaningless for them — a PerDay quota resets at midnight UTC, not in 45
+    is meaningless for them — a PerDay quota resets at midnight PT, not in 45
     seconds, and 'limit: 0' will never succeed no matter how long you wait.
     Blindly sleeping the suggested delay on every key, every attempt, was
     observed costing 5-7+ minutes per pipeline run retrying keys that could not
     possibly succeed again.
+    The window parsing is shared with llm_gateway.py, which also records the
+    key/model as dead until its quota resets.
     Returns the number of seconds actually slept (0.0 if the wait was skipped).
     """
-    err_lower = err_msg.lower()
+    window = quota_window(err_msg)
 
-    if "perday" in err_lower.replace("_", "").replace("-", "") or re.search(r"limit:\s*0\b", err_lower):
+    if window in ("per_day", "zero_allocation"):
         logger.warning("[Gemini API] Daily quota (or zero-allocation) exhausted for this key/model — "
                         "will not reset for hours. Skipping wait, moving to the next option.")
         return 0.0
 
-    # 1. Parse 'Please retry in 27.61s'
-    delay = 0.0
-    match1 = re.search(r"Please retry in ([0-9.]+)\s*s", err_msg, re.IGNORECASE)
-    if match1:
-        try:
-            delay = float(match1.group(1))
-        except ValueError:
-            pass
-
-    # 2. Parse 'retryDelay: 27s' or 'retryDelay': '27s'
-    if delay == 0.0:
-        match2 = re.search(r"retryDelay[\"']?\s*:\s*[\"']?([0-9.]+)\s*s", err_msg, re.IGNORECASE)
-        if match2:
-            try:
-                delay = float(match2.group(1))
-            except ValueError:
-                pass
-
-    if delay > 0.0 and "perminute" in err_lower.replace("_", "").replace("-", ""):
+    # 'Please retry in 27.61s' or 'retryDelay: 27s'
+    delay = retry_delay(err_msg)
+
+    if delay > 0.0 and window == "per_minute":
         # Confirmed short-lived quota — worth a bounded wait.
         delay = min(delay, 60.0)
         logger.warning(f"[Gemini API] Rate limited (429, per-minute quota). Sleeping {delay:.1f}s.")
         time.sleep(delay)
         return delay
-    elif any(term in err_lower for term in ["429", "resourceexhausted", "quota", "limit"]):
-        # A 429/quota error we can't positively confirm is short-lived — default
-        # to NOT waiting rather than guessing with a blind 30s sleep, since the
-        # daily-quota case (the one actually observed in practice) is common and
-        # a wasted wait compounds fast across multiple keys and pipelines.
-        logger.warning("[Gemini API] Rate limited (429) but quota window is unclear — skipping wait, moving on.")
-        return 0.0
 
+    # Anything else — including a 429 whose window can't be confirmed — moves on
+    # without a blind wait; the gateway has already classified and recorded it.
     return 0.0
 
 
@@ -130,7 +115,6 @@ def generate_ai_image(
         return False
 
     try:
-        from google import genai
         from google.genai import types
         from PIL import Image as PILImage
     except ImportError:
@@ -148,18 +132,17 @@ def generate_ai_image(
     else:
         target_size = (1920, 1080)
 
-    for key_idx, key in enumerate(keys):
+    gateway = get_llm_gateway()
+    for key_idx, key, model in gateway.combos("gemini", keys, [GEMINI_IMAGE_MODEL]):
         try:
             logger.info(f"[GeminiImg] Attempting with key #{key_idx + 1}...")
-            client = genai.Client(api_key=key)
-
-            response = client.models.generate_content(
-                model="gemini-2.5-flash-image",
+            response = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                model=model,
                 contents=full_prompt,
                 config=types.GenerateContentConfig(
                     response_modalities=["TEXT", "IMAGE"]
                 )
-            )
+            ))
 
             for part in response.candidates[0].content.parts:
                 if part.inline_data and part.inline_data.mime_type.startswith("image/"):
@@ -171,6 +154,7 @@ def generate_ai_image(
                     )
                     img.save(output_path, "JPEG", quality=95)
                     logger.info(f"[GeminiImg] Image saved: {output_path}")
+                    get_ai_image_cache().store("gemini_image", prompt, aspect_ratio, output_path)
                     return True
 
             logger.warning(f"[GeminiImg] Key #{key_idx + 1}: no image parts in response.")
@@ -183,9 +167,22 @@ def generate_ai_image(
     logger.warning("[GeminiImg] All keys exhausted. Caller should use Pollinations fallback.")
     return False
 
-def generate_tactical_diagram(prompt: str, diagram_type: str, output_path: str) -> bool:
+
+def serve_cached_ai_image(prompt: str, output_path: str, aspect_ratio: str = "16:9",
+                          partial: bool = False) -> bool:
     """
-    Generates a minimalist tactical diagram using Gemini.
+    Copies a previously generated Gemini image for this prompt to output_path
+    (see ai_image_cache.py). Callers try this before spending gemini_image
+    quota; it only serves once the prompt has its full set of variants, unless
+    `partial` (no quota left to generate one). Returns False when nothing
+    qualifies or AI_IMAGE_CACHE_SERVE=false.
+    """
+    return get_ai_image_cache().serve("gemini_image", prompt, aspect_ratio, output_path, partial=partial)
+
+
+def tactical_diagram_prompt(prompt: str, diagram_type: str) -> str:
+    """
+    The full Gemini prompt for a tactical diagram.
     diagram_type: 'formation', 'heat_map', 'passing_lanes', 'pressure_map', 'comparison_chart'
     """
     style_prompts = {
@@ -197,6 +194,12 @@ def generate_tactical_diagram(prompt: str, diagram_type: str, output_path: str)
     }
     
     style_suffix = style_prompts.get(diagram_type, style_prompts["formation"])
-    full_prompt = f"tactical football graphic: {prompt}. {style_suffix}"
-    
-    return generate_ai_image(full_prompt, output_path, aspect_ratio="16:9")
+    return f"tactical football graphic: {prompt}. {style_suffix}"
+
+
+def generate_tactical_diagram(prompt: str, diagram_type: str, output_path: str) -> bool:
+    """
+    Generates a minimalist tactical diagram using Gemini.
+    diagram_type: 'formation', 'heat_map', 'passing_lanes', 'pressure_map', 'comparison_chart'
+    """
+    return generate_ai_image(tactical_diagram_prompt(prompt, diagram_type), output_path, aspect_ratio="16:9")
@@ -0,0 +1,81 @@
+"""
+image_hash.py
+Perceptual image hashes (pHash / dHash) in plain numpy + Pillow.
+
+Unlike a byte hash, these survive re-encoding, resizing and light recompression,
+so the same Wikimedia Commons photo served by Openverse, DDG and a Wikipedia
+summary under three different URLs still hashes (nearly) identically.
+
+Hashes are 64-bit ints; compare them with hamming().
+
+Usage:
+    from footybitez.media.image_hash import phash, hamming
+
+    if hamming(phash(path_a), phash(path_b)) <= 6:
+        ...  # same picture
+"""
+
+import numpy as np
+from PIL import Image, ImageOps
+
+_DCT_SIZE = 32
+_HASH_SIZE = 8
+# pHash of an image with no structure at all (solid fills, blank cards). Every
+# such image shares it, so it must never be used as an identity key.
+FLAT_HASH = 0
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so the 2-D DCT is just M @ X @ M.T."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0, :] = np.sqrt(1.0 / n)
+    return m
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+def _gray(img_or_path, size: tuple) -> np.ndarray:
+    img = Image.open(img_or_path) if isinstance(img_or_path, str) else img_or_path
+    img = ImageOps.exif_transpose(img).convert("L").resize(size, Image.LANCZOS)
+    return np.asarray(img, dtype=np.float64)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for b in bits.flatten():
+        value = (value << 1) | int(b)
+    return value
+
+
+def phash(img_or_path) -> int:
+    """
+    64-bit DCT perceptual hash of an image path or PIL image. Featureless
+    (flat-colour) images hash to 0 — see FLAT_HASH.
+    """
+    pixels = _gray(img_or_path, (_DCT_SIZE, _DCT_SIZE))
+    dct = _DCT @ pixels @ _DCT.T
+    # Rounded so float noise on a flat image doesn't turn into random bits.
+    low = np.round(dct[:_HASH_SIZE, :_HASH_SIZE].flatten()[1:], 3)  # drop the DC term
+    return _bits_to_int(np.append(low > np.median(low), False))
+
+
+def dhash(img_or_path) -> int:
+    """64-bit difference hash — cheaper than pHash, good for exact-ish copies."""
+    pixels = _gray(img_or_path, (_HASH_SIZE + 1, _HASH_SIZE))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def to_hex(h: int) -> str:
+    return f"{h:016x}"
+
+
+def from_hex(s: str) -> int:
+    return int(s, 16)
@@ -0,0 +1,86 @@
+"""
+image_header.py
+Reads an image's format and pixel dimensions from the first few KB of its bytes.
+
+_download_file used to stream the whole body to disk before looking at it, so
+150px thumbnails, SVG/HTML error pages and 40 MB Commons originals were fully
+downloaded (and often sent to the vision check) before being thrown away.
+Parsing the header from the first chunks lets it abort those after a few KB.
+
+Supports JPEG, PNG, GIF and WebP (lossy, lossless and extended) — what every
+provider in media_sourcer.py actually serves.
+
+Usage:
+    from footybitez.media.image_header import sniff_image_header
+
+    fmt, width, height = sniff_image_header(first_bytes)
+    # fmt None               -> not a recognised image (once >= SIGNATURE_BYTES read)
+    # fmt set, width None    -> recognised, but the header needs more bytes
+"""
+
+import struct
+
+# Enough bytes to tell every supported signature apart.
+SIGNATURE_BYTES = 16
+
+# JPEG start-of-frame markers carry the dimensions (C4/C8/CC are DHT/JPG/DAC).
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers with no length field.
+_JPEG_STANDALONE = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+
+def _jpeg_size(data: bytes):
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return None  # corrupt marker stream — let PIL have the final word
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in _JPEG_STANDALONE:
+            i += 2
+            continue
+        if marker in _JPEG_SOF:
+            if i + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        if marker == 0xDA:  # start of scan without a frame header
+            return None
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
+
+
+def _webp_size(data: bytes):
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = struct.unpack("<I", data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def sniff_image_header(data: bytes) -> tuple:
+    """Returns (format, width, height); see the module docstring for the partial cases."""
+    if data[:3] == b"\xff\xd8\xff":
+        fmt, size = "jpeg", _jpeg_size(data)
+    elif data[:8] == b"\x89PNG\r\n\x1a\n":
+        fmt = "png"
+        size = struct.unpack(">II", data[16:24]) if len(data) >= 24 else None
+    elif data[:6] in (b"GIF87a", b"GIF89a"):
+        fmt = "gif"
+        size = struct.unpack("<HH", data[6:10]) if len(data) >= 10 else None
+    elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        fmt, size = "webp", _webp_size(data)
+    else:
+        return None, None, None
+    if size is None:
+        return fmt, None, None
+    return fmt, int(size[0]), int(size[1])
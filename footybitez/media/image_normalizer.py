@@ -0,0 +1,251 @@
+"""
+image_normalizer.py
+Normalizes downloaded images to exactly what the Remotion composition shows.
+
+RemotionVideoCreator._copy_to_public and asset_orchestrator used to stage raw
+downloads straight into remotion-video/public: 4000px Commons originals,
+phone photos that only look upright because of an EXIF Orientation tag
+(Chromium's headless render honours it inconsistently for <Img> inside
+transforms), Adobe RGB / CMYK files with embedded ICC profiles that render
+washed out, PNGs several MB in size. Remotion then decoded the full-size file
+on every frame of every scene that used it.
+
+Each image is now, before it is staged:
+  - rotated per its EXIF orientation (and the tag dropped);
+  - converted to sRGB through its embedded ICC profile, then to plain RGB
+    (transparency is flattened onto black, the composition background);
+  - cover-resized to the frame plus Ken Burns headroom — the compositions zoom
+    into the image (Main.tsx up to 1.3x, the long-form scenes up to 1.15x), so
+    a 1080x1920 Short needs 1404x2496 pixels to stay sharp at the tightest
+    zoom — and centre-cropped to the frame's aspect ratio, which is what
+    object-fit: cover displays anyway. Images are never upscaled;
+  - encoded as a progressive JPEG.
+An image that is already an upright sRGB JPEG within the target is staged
+as-is. Animated images and anything that fails to decode fall back to a
+plain copy.
+
+Results are cached in a MediaCache keyed by the source file's content hash
+plus the target size and headroom, so the same Commons photo is only resized
+once across runs. normalize_many runs cache misses in a process pool
+(MEDIA_NORMALIZE_WORKERS), since resizing is CPU-bound and holds the GIL.
+
+The cache lives under footybitez/data/cache/normalized/
+(MEDIA_NORMALIZE_CACHE_DIR to override), LRU-evicted past
+MEDIA_NORMALIZE_CACHE_MAX_MB (default 256). MEDIA_NORMALIZE=false restores
+plain copies.
+
+Usage:
+    from footybitez.media.image_normalizer import normalize_many, SHORTS_SIZE
+
+    staged = normalize_many([(src, public_dest), ...], size=SHORTS_SIZE)
+    staged[src]   # path actually written (extension becomes .jpg)
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageCms, ImageOps
+
+from footybitez.media.media_cache import MediaCache
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/normalized"
+DEFAULT_MAX_MB = 256
+SHORTS_SIZE = (1080, 1920)
+LONG_FORM_SIZE = (1920, 1080)
+SHORTS_HEADROOM = 1.3          # Main.tsx Ken Burns zooms between 1.1x and 1.3x
+LONG_FORM_HEADROOM = 1.15      # ImageScene/ImageSlide 1.12x, AIVideoScene 1.15x
+JPEG_QUALITY = 90
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp")
+VERSION = 1                    # bump to invalidate cached outputs
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SRGB = None
+
+
+def enabled() -> bool:
+    return os.getenv("MEDIA_NORMALIZE", "true").lower() != "false"
+
+
+def is_image(path: str) -> bool:
+    return str(path or "").lower().endswith(IMAGE_EXTENSIONS)
+
+
+def output_path(dest: str) -> str:
+    """`dest` with its extension switched to .jpg — normalized images are always JPEG."""
+    return os.path.splitext(dest)[0] + ".jpg"
+
+
+def render_size(size: tuple, headroom: float) -> tuple:
+    """Pixel size an image needs to stay sharp at the composition's tightest zoom."""
+    w, h = size
+    return round(w * headroom), round(h * headroom)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(digest: str, size: tuple, headroom: float) -> str:
+    return f"normalized:v{VERSION}:{digest}:{size[0]}x{size[1]}@{headroom:g}"
+
+
+def _to_srgb(img: Image.Image) -> Image.Image:
+    """Converts through the embedded ICC profile (if any) to sRGB."""
+    global _SRGB
+    icc = img.info.get("icc_profile")
+    if not icc:
+        return img
+    try:
+        if _SRGB is None:
+            _SRGB = ImageCms.createProfile("sRGB")
+        source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+        if img.mode not in ("RGB", "RGBA", "CMYK", "L"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        out_mode = "RGBA" if img.mode == "RGBA" else "RGB"
+        return ImageCms.profileToProfile(img, source, _SRGB, outputMode=out_mode)
+    except Exception:
+        # A broken profile is better ignored than fatal.
+        return img
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, (0, 0, 0, 255))
+        return Image.alpha_composite(background, rgba).convert("RGB")
+    return img.convert("RGB")
+
+
+def _already_normalized(img: Image.Image, target: tuple) -> bool:
+    orientation = img.getexif().get(0x0112, 1)
+    return (img.format == "JPEG" and img.mode == "RGB" and orientation in (0, 1)
+            and not img.info.get("icc_profile")
+            and img.width <= target[0] and img.height <= target[1])
+
+
+def normalize_image(src: str, dest: str, size: tuple = SHORTS_SIZE,
+                    headroom: float = SHORTS_HEADROOM, quality: int = JPEG_QUALITY) -> bool:
+    """
+    Writes the normalized JPEG of `src` to `dest` (see module docstring).
+    Returns True if the image was processed, False if it had to be copied
+    unchanged (animated, undecodable) — `dest` exists either way.
+    """
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    target = render_size(size, headroom)
+    try:
+        with Image.open(src) as img:
+            if getattr(img, "n_frames", 1) > 1:
+                raise ValueError("animated image")
+            if _already_normalized(img, target):
+                if os.path.abspath(src) != os.path.abspath(dest):
+                    shutil.copyfile(src, dest)
+                return True
+            img.load()
+            out = ImageOps.exif_transpose(img)
+            out = _flatten(_to_srgb(out))
+
+        # Cover-crop to the frame's aspect ratio (what object-fit: cover shows),
+        # then shrink to the headroom size if the image is bigger than that.
+        aspect = size[0] / size[1]
+        if out.width / out.height > aspect:
+            crop_w, crop_h = round(out.height * aspect), out.height
+        else:
+            crop_w, crop_h = out.width, round(out.width / aspect)
+        final = target if crop_w > target[0] else (max(1, crop_w), max(1, crop_h))
+        out = ImageOps.fit(out, final, method=Image.LANCZOS, centering=(0.5, 0.5))
+
+        tmp = dest + ".tmp"
+        out.save(tmp, "JPEG", quality=quality, optimize=True, progressive=True)
+        os.replace(tmp, dest)
+        return True
+    except Exception as e:
+        print(f"[ImageNormalizer] Copying {os.path.basename(src)} unchanged: {e}")
+        if os.path.abspath(src) != os.path.abspath(dest):
+            shutil.copyfile(src, dest)
+        return False
+
+
+def _worker_count() -> int:
+    return max(1, int(os.getenv("MEDIA_NORMALIZE_WORKERS", str(min(4, os.cpu_count() or 1)))))
+
+
+def normalize_many(jobs: list, size: tuple = SHORTS_SIZE, headroom: float = SHORTS_HEADROOM,
+                   cache: MediaCache | None = None, workers: int | None = None) -> dict:
+    """
+    Normalizes each (src, dest) pair; `dest`'s extension becomes .jpg.
+    Cached outputs are copied straight in; the rest run in a process pool and
+    are filed in the cache. Returns {src: path written}. With MEDIA_NORMALIZE
+    off, or for non-image files, `src` is copied to `dest` unchanged.
+    """
+    written = {}
+    pending = []
+    cache = cache or get_normalize_cache()
+    for src, dest in jobs:
+        if src in written:
+            continue
+        if not enabled() or not is_image(src):
+            os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+            shutil.copy2(src, dest)
+            written[src] = dest
+            continue
+        key = cache_key(_file_digest(src), size, headroom)
+        final = output_path(dest)
+        cached = cache.lookup(key)
+        if cached:
+            os.makedirs(os.path.dirname(final) or ".", exist_ok=True)
+            shutil.copyfile(cached, final)
+            written[src] = final
+        else:
+            pending.append((src, final, key))
+
+    if not pending:
+        return written
+    workers = workers or _worker_count()
+    if workers <= 1 or len(pending) == 1:
+        results = [normalize_image(src, final, size, headroom) for src, final, _ in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = [pool.submit(normalize_image, src, final, size, headroom) for src, final, _ in pending]
+            results = []
+            for (src, final, _), future in zip(pending, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"[ImageNormalizer] Worker failed on {os.path.basename(src)}: {e}")
+                    shutil.copyfile(src, final)
+                    results.append(False)
+
+    for (src, final, key), ok in zip(pending, results):
+        written[src] = final
+        if ok:
+            cache.store(key, final)
+    return written
+
+
+def normalize_file(src: str, dest: str, size: tuple = SHORTS_SIZE, headroom: float = SHORTS_HEADROOM) -> str:
+    """Single-image normalize_many; returns the path written."""
+    return normalize_many([(src, dest)], size=size, headroom=headroom, workers=1)[src]
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_normalize_cache() -> MediaCache:
+    """Process-wide MediaCache for normalized images, keyed by source hash + target."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            max_mb = float(os.getenv("MEDIA_NORMALIZE_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+            _instance = MediaCache(cache_dir=os.getenv("MEDIA_NORMALIZE_CACHE_DIR", DEFAULT_CACHE_DIR),
+                                   max_bytes=int(max_mb * 1024 * 1024))
+        return _instance
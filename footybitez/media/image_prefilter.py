@@ -0,0 +1,166 @@
+"""
+image_prefilter.py
+Cheap local checks that run on a downloaded candidate before the Gemini vision
+middleware, in plain numpy + Pillow (same as image_hash.py).
+
+Every search-sourced candidate used to go straight to a Gemini call, including
+the obviously unusable ones — flat logos and clip-art, text-heavy graphics,
+tiny or banner-shaped crops, blurry thumbnails. Those are now rejected locally,
+in this order (first failing stage wins):
+  resolution  shorter edge below MEDIA_MIN_IMAGE_SIDE (200px) — catches cached
+              or header-less files the streaming check couldn't measure;
+  aspect      longer/shorter edge above MEDIA_PREFILTER_MAX_ASPECT (3.0);
+  flat        the 8 most common colours cover more than
+              MEDIA_PREFILTER_FLAT_RATIO (0.9) of the image — logos, cards;
+  text        edge density above MEDIA_PREFILTER_TEXT_EDGES (0.08) on a mostly
+              flat background — infographics, screenshots, text slides;
+  blur        variance of the Laplacian below MEDIA_PREFILTER_MIN_BLUR (12).
+
+Pitch colour is only a soft signal: plenty of good images (portraits, crowds,
+badges) show no grass, so a pitch-green share below
+MEDIA_PREFILTER_MIN_PITCH (0.03) just deprioritizes the image within its tier.
+
+Per-stage counts are kept for the run log; tune thresholds from those.
+MEDIA_PREFILTER=false turns the stage off.
+
+Usage:
+    from footybitez.media.image_prefilter import get_prefilter
+
+    verdict = get_prefilter().check(path)
+    if not verdict["ok"]:
+        ...  # verdict["stage"] names the failed check
+"""
+
+import os
+import threading
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+_ANALYSIS_SIDE = 256     # images are analysed at this longer edge
+_EDGE_THRESHOLD = 48     # grey-level gradient that counts as an edge
+_TEXT_MIN_FLAT = 0.5     # text graphics sit on a largely flat background
+# Grass green on PIL's 0-255 HSV scale: hue ~70-150 degrees, reasonably
+# saturated and not in deep shadow.
+_PITCH_HUE = (50, 106)
+_PITCH_MIN_SAT = 60
+_PITCH_MIN_VAL = 40
+STAGES = ("resolution", "aspect", "flat", "text", "blur")
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def analyze(path: str) -> dict:
+    """Raw metrics for an image file (see the module docstring for their use)."""
+    img = ImageOps.exif_transpose(Image.open(path)).convert("RGB")
+    width, height = img.size
+    img.thumbnail((_ANALYSIS_SIDE, _ANALYSIS_SIDE))
+
+    rgb = np.asarray(img, dtype=np.uint8)
+    # 32 levels per channel: fine enough that photo texture and noise spread
+    # over many bins, while a logo's solid fills stay in a handful.
+    q = (rgb >> 3).astype(np.int32)
+    codes = (q[..., 0] << 10) | (q[..., 1] << 5) | q[..., 2]
+    counts = np.bincount(codes.ravel(), minlength=32768)
+    flat_ratio = float(np.sort(counts)[-8:].sum() / codes.size)
+
+    gray = np.asarray(img.convert("L"), dtype=np.float64)
+    if min(gray.shape) >= 3:
+        gx = np.abs(gray[1:-1, 2:] - gray[1:-1, :-2])
+        gy = np.abs(gray[2:, 1:-1] - gray[:-2, 1:-1])
+        edge_density = float(((gx + gy) > _EDGE_THRESHOLD).mean())
+        laplacian = (gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+                     - 4 * gray[1:-1, 1:-1])
+        blur = float(laplacian.var())
+    else:
+        edge_density, blur = 0.0, 0.0
+
+    hsv = np.asarray(img.convert("HSV"), dtype=np.uint8)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    pitch = (h >= _PITCH_HUE[0]) & (h <= _PITCH_HUE[1]) & (s >= _PITCH_MIN_SAT) & (v >= _PITCH_MIN_VAL)
+
+    return {
+        "width": width,
+        "height": height,
+        "aspect": max(width, height) / max(1, min(width, height)),
+        "flat_ratio": flat_ratio,
+        "edge_density": edge_density,
+        "blur": blur,
+        "pitch_ratio": float(pitch.mean()),
+    }
+
+
+class ImagePrefilter:
+    def __init__(self):
+        self.enabled = os.getenv("MEDIA_PREFILTER", "true").lower() != "false"
+        self.min_side = int(os.getenv("MEDIA_MIN_IMAGE_SIDE", "200"))
+        self.max_aspect = float(os.getenv("MEDIA_PREFILTER_MAX_ASPECT", "3.0"))
+        self.flat_ratio = float(os.getenv("MEDIA_PREFILTER_FLAT_RATIO", "0.9"))
+        self.text_edges = float(os.getenv("MEDIA_PREFILTER_TEXT_EDGES", "0.08"))
+        self.min_blur = float(os.getenv("MEDIA_PREFILTER_MIN_BLUR", "12"))
+        self.min_pitch = float(os.getenv("MEDIA_PREFILTER_MIN_PITCH", "0.03"))
+        self._lock = threading.Lock()
+        self._counts = {"checked": 0, "passed": 0, "deprioritized": 0, **{s: 0 for s in STAGES}}
+
+    def _failed_stage(self, m: dict, min_side: int) -> str | None:
+        if min(m["width"], m["height"]) < min_side:
+            return "resolution"
+        if m["aspect"] > self.max_aspect:
+            return "aspect"
+        if m["flat_ratio"] > self.flat_ratio:
+            return "flat"
+        if m["edge_density"] > self.text_edges and m["flat_ratio"] > _TEXT_MIN_FLAT:
+            return "text"
+        if m["blur"] < self.min_blur:
+            return "blur"
+        return None
+
+    def check(self, path: str, min_side: int | None = None) -> dict:
+        """
+        Returns {"ok", "stage", "deprioritize", "metrics"}. `stage` names the
+        failed check when ok is False. Unreadable files pass — PIL and the vision
+        check downstream decide what to do with them.
+        """
+        if not self.enabled:
+            return {"ok": True, "stage": None, "deprioritize": False, "metrics": {}}
+        try:
+            metrics = analyze(path)
+        except Exception:
+            return {"ok": True, "stage": None, "deprioritize": False, "metrics": {}}
+        stage = self._failed_stage(metrics, self.min_side if min_side is None else min_side)
+        deprioritize = stage is None and metrics["pitch_ratio"] < self.min_pitch
+        with self._lock:
+            self._counts["checked"] += 1
+            if stage:
+                self._counts[stage] += 1
+            else:
+                self._counts["passed"] += 1
+                if deprioritize:
+                    self._counts["deprioritized"] += 1
+        return {"ok": stage is None, "stage": stage, "deprioritize": deprioritize, "metrics": metrics}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def log_stats(self):
+        """Prints the run's per-stage reject counts."""
+        s = self.stats()
+        if not s["checked"]:
+            return
+        rejects = ", ".join(f"{stage} {s[stage]}" for stage in STAGES)
+        print(f"[Prefilter] {s['checked']} checked, {s['passed']} passed "
+              f"({s['deprioritized']} deprioritized, no pitch colour); rejected: {rejects}")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_prefilter() -> ImagePrefilter:
+    """Process-wide shared ImagePrefilter, so reject counts cover the whole run."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = ImagePrefilter()
+        return _instance
@@ -0,0 +1,217 @@
+"""
+media_cache.py
+Persistent, content-addressed cache for downloaded images.
+
+MediaSourcer used to wipe footybitez/media/downloads at startup and again after
+every run, so each pipeline re-downloaded the same Messi/Ronaldo/stadium photos
+from Wikimedia and Unsplash every single time. The downloads folder is now just
+per-job staging; every vision-approved download is also filed here, once per
+content hash, with its .json credit sidecar stored next to it. An index maps
+each source URL to the blob it resolved to, so a repeat URL is served from disk.
+
+Eviction is least-recently-used against a size budget (MEDIA_CACHE_MAX_MB,
+default 512). The cache lives under footybitez/data/cache/ (MEDIA_CACHE_DIR to
+override), which the GitHub workflows persist between runs with actions/cache.
+A hit only bumps the blob's access time in memory; those are written out with
+the next store (which is also when eviction runs), by flush(), or at exit, so
+a run full of cache hits doesn't rewrite the index once per image.
+
+Usage:
+    from footybitez.media.media_cache import get_media_cache
+
+    cache = get_media_cache()
+    cached = cache.lookup(url)          # path inside the cache, or None
+    ...
+    cache.store(url, staged_path)       # after the image passed all checks
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/media"
+DEFAULT_MAX_MB = 512
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def stable_hash(text: str, length: int = 16) -> str:
+    """
+    Deterministic short hex digest for building filenames.
+
+    Python's built-in hash() is salted per process (PYTHONHASHSEED), so names
+    like f"wiki_{hash(url)}.jpg" changed on every run and could never be reused.
+    """
+    return hashlib.sha1(str(text).encode("utf-8")).hexdigest()[:length]
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class MediaCache:
+    def __init__(self, cache_dir: str | None = None, max_bytes: int | None = None):
+        self.cache_dir = cache_dir or os.getenv("MEDIA_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("MEDIA_CACHE_MAX_MB", str(DEFAULT_MAX_MB))) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        # Pipelines share one MediaSourcer across concurrent get_media tiers and
+        # the long-form orchestrator builds several — all of them hit this index.
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False   # access times bumped since the last save
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load()
+        atexit.register(self.flush)
+
+    # ── index persistence ────────────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        """Load the index. Returns an empty index if the file is missing or corrupt."""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data.get("urls"), dict) and isinstance(data.get("blobs"), dict):
+                    return data
+            except Exception:
+                pass
+        return {"urls": {}, "blobs": {}}
+
+    def _save(self):
+        """Atomically write the index so a killed run can't leave it half-written."""
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            print(f"[MediaCache] Failed to save index: {e}")
+
+    def flush(self):
+        """Writes out access times recorded by lookup() since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.cache_dir, blob)
+
+    # ── public API ───────────────────────────────────────────────────────────
+
+    def lookup(self, url: str) -> str | None:
+        """Returns the cached file for `url` (marking it recently used), or None."""
+        if not url:
+            return None
+        with self._lock:
+            blob = self._index["urls"].get(stable_hash(url, 40))
+            path = self._blob_path(blob) if blob else None
+            if not path or not os.path.exists(path):
+                if blob:
+                    self._drop_blob(blob)
+                    self._save()
+                self.misses += 1
+                return None
+            self._index["blobs"][blob]["last_used"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            return path
+
+    def store(self, url: str, src_path: str) -> str | None:
+        """
+        Files `src_path` (and its .json sidecar, if present) under its content
+        hash and maps `url` to it. Identical bytes fetched from two different
+        URLs share one blob. Returns the cached path, or None on failure.
+        """
+        if not url or not os.path.exists(src_path):
+            return None
+        try:
+            ext = os.path.splitext(src_path)[1].lower() or ".jpg"
+            blob = _file_digest(src_path)[:32] + ext
+            with self._lock:
+                dest = self._blob_path(blob)
+                if not os.path.exists(dest):
+                    shutil.copy2(src_path, dest)
+                if os.path.exists(src_path + ".json"):
+                    shutil.copy2(src_path + ".json", dest + ".json")
+                self._index["blobs"][blob] = {
+                    "size": os.path.getsize(dest),
+                    "last_used": time.time(),
+                }
+                self._index["urls"][stable_hash(url, 40)] = blob
+                self._evict()
+                self._save()
+                return dest
+        except Exception as e:
+            print(f"[MediaCache] Failed to cache {os.path.basename(src_path)}: {e}")
+            return None
+
+    def write_meta(self, url: str, meta: dict):
+        """Writes the credit sidecar for the blob `url` resolves to."""
+        with self._lock:
+            blob = self._index["urls"].get(stable_hash(url, 40))
+            if not blob or not os.path.exists(self._blob_path(blob)):
+                return
+            try:
+                with open(self._blob_path(blob) + ".json", "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._index["blobs"]),
+                "bytes": sum(b.get("size", 0) for b in self._index["blobs"].values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # ── eviction ─────────────────────────────────────────────────────────────
+
+    def _drop_blob(self, blob: str):
+        self._index["blobs"].pop(blob, None)
+        self._index["urls"] = {k: v for k, v in self._index["urls"].items() if v != blob}
+        for path in (self._blob_path(blob), self._blob_path(blob) + ".json"):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except Exception:
+                pass
+
+    def _evict(self):
+        """Drops least-recently-used blobs until the cache fits its size budget."""
+        blobs = self._index["blobs"]
+        total = sum(b.get("size", 0) for b in blobs.values())
+        if total <= self.max_bytes:
+            return
+        for blob in sorted(blobs, key=lambda k: blobs[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= blobs[blob].get("size", 0)
+            self._drop_blob(blob)
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_media_cache() -> MediaCache:
+    """Process-wide shared MediaCache, so every MediaSourcer sees one index."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = MediaCache()
+        return _instance
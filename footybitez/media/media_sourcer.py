@@ -1,14 +1,36 @@
 import os
 import io
+import itertools
+import math
 import time
-import requests
+from footybitez.utils import http_client as http
 import random
 import re
 import warnings
 import json
 import logging
+import shutil
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from footybitez.utils.llm_models import GEMINI_VISION_MODELS
+from footybitez.utils.llm_models import GEMINI_IMAGE_MODEL, GEMINI_VISION_MODELS
+from footybitez.utils.llm_cache import get_llm_cache
+from footybitez.utils.llm_gateway import ComboUnavailable, classify_error, get_llm_gateway
+from footybitez.media.media_cache import get_media_cache, stable_hash
+from footybitez.media.search_cache import get_search_cache
+from footybitez.media.provider_health import get_provider_health
+from footybitez.media.entity_index import get_entity_index
+from footybitez.media.image_hash import FLAT_HASH, hamming, phash
+from footybitez.media.image_header import SIGNATURE_BYTES, sniff_image_header
+from footybitez.media.image_prefilter import get_prefilter
+from footybitez.media.candidate_ranker import open_preview, preview_sharpness, rank_candidates
+from footybitez.media.vision_verdicts import get_verdict_cache, normalize_context
+from footybitez.media.ai_image_cache import get_ai_image_cache
+from footybitez.media.video_clip import get_video_cache, select_rendition, stage_clip, trim_clip
+from footybitez.utils.keyword_matcher import (
+    ADULT_TEXT_FILTER, ADULT_URL_FILTER, IMAGE_FILTER, IMAGE_METADATA_FILTER,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +49,7 @@ except ImportError:
 
 
 class MediaSourcer:
-    def __init__(self, download_dir="footybitez/media/downloads"):
+    def __init__(self, download_dir="footybitez/media/downloads", target_size: tuple | None = None):
         load_dotenv()
         self.pexels_api_key = os.getenv("PEXELS_API_KEY")
         self.unsplash_api_key = os.getenv("UNSPLASH_ACCESS_KEY")
@@ -39,38 +61,46 @@ class MediaSourcer:
         # In-memory cache so the same entity isn't looked up twice against
         # API-Football's tight daily quota (100 req/day) within one pipeline run.
         self._api_football_cache = {}
-        # (api_key, model) pairs known to be quota-exhausted or unavailable for the
-        # rest of THIS run. Without this, a 429 (quota) or 404 (model retired) on the
-        # very first image check gets rediscovered from scratch on every subsequent
-        # image — observed burning 5+ minutes per image once the free-tier daily
-        # quota was hit, because every candidate re-tried the same dead combination.
-        self._gemini_unusable = set()
-        
-        # Clean directory at startup to ensure no stale cached assets are reused
+        # When True, an image that can't get a real vision verdict is rejected
+        # even from pre-moderated sources (strict=False). The entity warm-up sets
+        # it: whatever it indexes is served to production without another check.
+        self.require_vision_verdict = False
+        # Per-thread sourcing state. In concurrent get_media mode each provider
+        # tier runs on a pool worker that stores the job's cancel Event here, so
+        # _download_file can bail out once enough images have already passed.
+        self._tls = threading.local()
+        # Downloads are staged per job in download_dir; approved ones are also
+        # filed in the persistent, content-addressed cache (see media_cache.py)
+        # so later runs can skip the network for the same source URL.
+        self.media_cache = get_media_cache()
+        # staged filepath -> source URL, so _write_image_meta can mirror the
+        # credit sidecar onto the cached copy.
+        self._staged_urls = {}
+        # Perceptual-hash index of every image staged this job (filepath -> pHash).
+        # URL dedupe (used_urls) misses the same Commons photo served again by
+        # Openverse, DDG or a Wikipedia summary, so a short could show it three
+        # times — see _claim_distinct.
+        self._job_hashes = {}
+        self._job_hashes_lock = threading.Lock()
+        # Staged images the local pre-filter found no pitch colour in; they go
+        # to the back of their tier's results (see image_prefilter.py).
+        self._deprioritized = set()
+        # (width, height) of the composition images are sourced for — 1080x1920
+        # for Shorts (default, MEDIA_TARGET_SIZE), 1920x1080 for long-form.
+        # Wikimedia/Wikipedia are asked for renditions just big enough to cover
+        # it instead of their 4000-6000px originals (see _rendition_params).
+        if target_size is None:
+            target_size = tuple(int(v) for v in os.getenv("MEDIA_TARGET_SIZE", "1080x1920").lower().split("x"))
+        self.target_size = target_size
+
+        # Clean the per-job staging directory at startup so no stale files from a
+        # crashed run are reused. The persistent media cache lives elsewhere.
         self.startup_cleanup()
         os.makedirs(download_dir, exist_ok=True)
         self.used_urls = set()
 
         # ── Football-only filter constants ──────────────────────────────────
-        # Keywords that identify wrong-sport or wrong-gender content
-        self._BAD_KEYWORDS = [
-            # American football
-            "nfl", "gridiron", "american football", "superbowl", "super bowl",
-            "touchdown", "quarterback", "helmet", "nfl draft", "cfl", "afl",
-            # Rugby
-            "rugby", "rugby union", "rugby league",
-            # Other sports
-            "cricket", "hockey", "nhl", "baseball", "basketball", "nba",
-            "tennis", "golf", "boxing", "mma", "handball", "volleyball",
-            # Beach/futsal variants (different from standard association football)
-            "beach socca", "beach soccer", "beach football", "sand soccer",
-            "futsal", "futbol sala", "indoor football", "indoor soccer",
-            "seven-a-side", "five-a-side",
-            # Wrong gender
-            "women", "woman", "female", "ladies", "girls",
-            "nwsl", "wsl", "nwt", "women's national", "women football",
-            "women soccer", "womens",
-        ]
+        # (wrong-sport / wrong-gender terms: IMAGE_FILTER in utils/keyword_matcher.py)
         # Safe suffix appended to every query
         self._FOOTBALL_SAFE_SUFFIX = "association football soccer men"
         # Negative suffix for search engines that support it
@@ -81,7 +111,7 @@ class MediaSourcer:
             os.remove(self.credits_file)
 
     def startup_cleanup(self):
-        """Cleans download folder of any leftover or failed cache files at startup."""
+        """Cleans the per-job staging folder of leftover or failed files at startup."""
         import shutil
         if os.path.exists(self.download_dir):
             try:
@@ -104,18 +134,51 @@ class MediaSourcer:
         return keys
 
     def cleanup(self):
-        """Deletes all downloaded media files to save space."""
+        """
+        Deletes this job's staged media files to save space. The persistent media
+        cache (media_cache.py) is left alone so the next run can reuse it.
+        """
         import shutil
         if os.path.exists(self.download_dir):
             try:
                 shutil.rmtree(self.download_dir)
                 os.makedirs(self.download_dir, exist_ok=True)
+                self._staged_urls = {}
+                self._job_hashes = {}
+                self._deprioritized = set()
                 print(f"Cleaned up {self.download_dir}")
+                cache = getattr(self, "media_cache", None)
+                if cache is not None:
+                    cache.flush()
+                    st = cache.stats()
+                    print(f"[MediaCache] {st['hits']} hits / {st['misses']} misses this run; "
+                          f"{st['entries']} files, {st['bytes'] / 1e6:.1f}/{st['max_bytes'] / 1e6:.0f} MB")
+                get_search_cache().log_stats()
+                get_provider_health().flush()
+                get_provider_health().log_stats()
+                get_prefilter().log_stats()
+                get_llm_gateway().registry.log_stats()
+                get_llm_cache().log_stats()
             except Exception as e:
                 print(f"Cleanup warning: {e}")
 
-    def _add_credit(self, text):
-        """Appends a credit line to the credits file."""
+    def _add_credit(self, text, filepath: str | None = None):
+        """
+        Appends a credit line to the credits file. If `filepath` is still awaiting
+        a batched vision check (see _batched_vision_checks) the line is held back
+        and only written once the image passes. Inside a concurrent get_media
+        tier it is held by the tier until the image is actually picked (see
+        _run_media_tiers_concurrently).
+        """
+        tls = getattr(self, "_tls", None)
+        pending = getattr(tls, "pending", None)
+        if filepath and pending and any(p["filepath"] == filepath for p in pending):
+            tls.pending_credits.setdefault(filepath, []).append(text)
+            return
+        held = getattr(tls, "held_credits", None)
+        if held is not None:
+            held.setdefault(filepath, []).append(text)
+            return
         with open(self.credits_file, "a", encoding="utf-8") as f:
             f.write(text + "\n")
 
@@ -125,8 +188,13 @@ class MediaSourcer:
                 json.dump({"source": source, "artist": artist}, f)
         except Exception:
             pass
+        url = getattr(self, "_staged_urls", {}).get(filepath)
+        cache = getattr(self, "media_cache", None)
+        if url and cache is not None:
+            cache.write_meta(url, {"source": source, "artist": artist})
 
-    def _download_file(self, url, filepath, context_query: str = "", strict: bool = True):
+    def _download_file(self, url, filepath, context_query: str = "", strict: bool = True,
+                       min_side: int | None = None, prefilter: bool = False):
         """
         Downloads a file using requests with headers, then runs it through the
         safety+relevance MIDDLEWARE before it is allowed to remain on disk.
@@ -142,29 +210,59 @@ class MediaSourcer:
           - False (used for pre-moderated sources like Unsplash/Pixabay/TheSportsDB/
             Wikipedia that already apply their own safe-search) -> the file is kept,
             relying on the text-keyword filter that already ran.
+
+        `min_side` is the smallest acceptable shorter edge in pixels (default
+        MEDIA_MIN_IMAGE_SIDE) — see _stream_image for the early-abort rules.
+
+        `prefilter` runs the local numpy checks from image_prefilter.py (flat
+        logos, text graphics, odd crops, blur) on a fresh download before it
+        costs a vision call. Used for open search results; entity sources
+        (crests, cutouts, portraits) skip it.
         """
         if os.path.exists(filepath):
             return
-        try:
-            if "wikimedia.org" in url:
-                headers = {
-                    'User-Agent': 'FootyBitezBot/1.0 (contact: admin@footybitez.com; sudden-developer)'
-                }
-            else:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                                  'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0'
-                }
-            with requests.get(url, headers=headers, stream=True, timeout=15) as r:
-                r.raise_for_status()
-                if 'text/html' in r.headers.get('Content-Type', '').lower():
-                    return
-                with open(filepath, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-        except Exception as e:
-            print(f"Download failed {url}: {e}")
+        if self._sourcing_cancelled():
+            # Concurrent get_media already has enough images from higher-priority
+            # tiers — don't spend bandwidth or vision quota on a result that
+            # will be thrown away.
             return
+        self._note_created(filepath)
+        cache = getattr(self, "media_cache", None)
+        cached = cache.lookup(url) if cache is not None else None
+        if cached:
+            # Served from the persistent cache — still goes through the vision
+            # check below, since this job's context_query may differ from the one
+            # the image was originally approved for.
+            try:
+                shutil.copy2(cached, filepath)
+                if os.path.exists(cached + ".json"):
+                    shutil.copy2(cached + ".json", filepath + ".json")
+                print(f"[MediaCache] Cache hit for {url[:100]}")
+            except Exception as e:
+                print(f"[MediaCache] Failed to stage cached copy of {url[:100]}: {e}")
+                cached = None
+        if not cached:
+            try:
+                if "wikimedia.org" in url:
+                    headers = {
+                        'User-Agent': 'FootyBitezBot/1.0 (contact: admin@footybitez.com; sudden-developer)'
+                    }
+                else:
+                    headers = {
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                                      'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0'
+                    }
+                with http.get(url, headers=headers, stream=True, timeout=15) as r:
+                    r.raise_for_status()
+                    if 'text/html' in r.headers.get('Content-Type', '').lower():
+                        return
+                    if not self._stream_image(r, url, filepath, min_side):
+                        return
+            except Exception as e:
+                print(f"Download failed {url}: {e}")
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                return
 
         if not os.path.exists(filepath):
             return
@@ -173,6 +271,30 @@ class MediaSourcer:
             os.remove(filepath)
             return
 
+        if prefilter and not cached:
+            verdict = get_prefilter().check(filepath, min_side=min_side)
+            if not verdict["ok"]:
+                print(f"[Prefilter] Rejected {os.path.basename(filepath)} ({verdict['stage']}) before the vision check.")
+                os.remove(filepath)
+                return
+            if verdict["deprioritize"] and getattr(self, "_deprioritized", None) is not None:
+                self._deprioritized.add(filepath)
+
+        if not self._claim_distinct(filepath):
+            for path in (filepath, filepath + ".json"):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+
+        pending = getattr(getattr(self, "_tls", None), "pending", None)
+        if pending is not None:
+            # Inside a _batched_vision_checks() block: leave the file staged and
+            # let the block verify every candidate in one Gemini request.
+            pending.append({"filepath": filepath, "url": url, "context_query": context_query,
+                            "strict": strict, "cached": bool(cached),
+                            "provider": getattr(self._tls, "provider", None)})
+            return
+
         # Run post-download visual safety+relevance MIDDLEWARE.
         # This is deliberately OUTSIDE the download try/except above: a bug in (or
         # transient error from) the safety check must never be swallowed and must
@@ -184,15 +306,209 @@ class MediaSourcer:
             print(f"[Filter] Safety check crashed for {os.path.basename(filepath)}: {e}. Rejecting (fail-safe).")
             passed = False
 
+        self._finalize_download(filepath, url, passed, from_cache=bool(cached))
+
+    def _stream_image(self, r, url: str, filepath: str, min_side: int | None = None) -> bool:
+        """
+        Streams response `r` to `filepath`, aborting as soon as the bytes show the
+        download isn't worth having:
+          - Content-Length or the running total exceeds MEDIA_MAX_DOWNLOAD_MB (15);
+          - the first bytes aren't a JPEG/PNG/GIF/WebP (SVG, HTML error pages);
+          - the header's shorter edge is under `min_side` / MEDIA_MIN_IMAGE_SIDE
+            (200px) — thumbnails look terrible scaled up to 1080x1920;
+          - width x height exceeds MEDIA_MAX_IMAGE_PIXELS (36M).
+        Returns True if the whole file was written; on abort the partial file is
+        removed and False returned.
+        """
+        max_bytes = int(float(os.getenv("MEDIA_MAX_DOWNLOAD_MB", "15")) * 1024 * 1024)
+        max_pixels = int(os.getenv("MEDIA_MAX_IMAGE_PIXELS", "36000000"))
+        if min_side is None:
+            min_side = int(os.getenv("MEDIA_MIN_IMAGE_SIDE", "200"))
+
+        reason = None
+        declared = int(r.headers.get("Content-Length") or 0)
+        if declared > max_bytes:
+            reason = f"{declared / 1048576:.1f} MB exceeds the download cap"
+        else:
+            # Headers are normally within the first chunk or two; past this, give
+            # up sniffing (e.g. a JPEG with a huge EXIF block) and let PIL decide.
+            sniff_limit = 64 * 1024
+            head = b""
+            sniffing = True
+            written = 0
+            with open(filepath, "wb") as f:
+                for chunk in r.iter_content(chunk_size=8192):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        reason = f"body exceeds the {max_bytes / 1048576:g} MB download cap"
+                        break
+                    if sniffing:
+                        head += chunk
+                        fmt, width, height = sniff_image_header(head)
+                        if fmt is None and len(head) >= SIGNATURE_BYTES:
+                            reason = "not a JPEG/PNG/GIF/WebP image"
+                            break
+                        if width is not None:
+                            sniffing = False
+                            if min(width, height) < min_side:
+                                reason = f"{width}x{height} {fmt} is below the {min_side}px minimum"
+                                break
+                            if width * height > max_pixels:
+                                reason = f"{width}x{height} {fmt} exceeds the pixel cap"
+                                break
+                        elif len(head) >= sniff_limit:
+                            sniffing = False
+                    f.write(chunk)
+
+        if reason is None:
+            return True
+        print(f"[Download] Skipping {url[:100]}: {reason}")
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        return False
+
+    def _image_phash(self, filepath: str) -> int | None:
+        """pHash of a staged file, reusing the job index entry if it has one."""
+        known = getattr(self, "_job_hashes", {}).get(filepath)
+        if known is not None:
+            return known
+        try:
+            return phash(filepath)
+        except Exception:
+            return None
+
+    def find_duplicate(self, filepath: str) -> str | None:
+        """
+        Returns the image already staged this job that `filepath` is a perceptual
+        near-duplicate of (within MEDIA_DUPLICATE_MAX_DISTANCE bits, default 6),
+        or None.
+        """
+        image_hash = self._image_phash(filepath)
+        if image_hash is None or image_hash == FLAT_HASH:
+            return None
+        max_distance = int(os.getenv("MEDIA_DUPLICATE_MAX_DISTANCE", "6"))
+        for other, other_hash in list(getattr(self, "_job_hashes", {}).items()):
+            if other != filepath and os.path.exists(other) and hamming(image_hash, other_hash) <= max_distance:
+                return other
+        return None
+
+    def _claim_distinct(self, filepath: str) -> bool:
+        """
+        Adds a fresh download to the job's pHash index, or returns False if it
+        is a near-duplicate of an image already staged — before it costs a
+        vision check. Claimed at download time rather than on approval, so two
+        copies inside one batched check can't both get through.
+        """
+        if getattr(self, "_job_hashes", None) is None:
+            return True
+        with self._job_hashes_lock:
+            duplicate = self.find_duplicate(filepath)
+            if duplicate:
+                print(f"[Dedupe] {os.path.basename(filepath)} is a near-duplicate of "
+                      f"{os.path.basename(duplicate)}. Skipping.")
+                return False
+            image_hash = self._image_phash(filepath)
+            if image_hash is not None and image_hash != FLAT_HASH:
+                self._job_hashes[filepath] = image_hash
+            return True
+
+    def _finalize_download(self, filepath: str, url: str, passed: bool, from_cache: bool = False,
+                           provider: str | None = None):
+        """Deletes a rejected download, or records an approved one and files it in the media cache."""
+        provider = provider or getattr(getattr(self, "_tls", None), "provider", None)
+        if provider:
+            get_provider_health().record_vision(provider, passed)
         if not passed:
+            if getattr(self, "_job_hashes", None) is not None:
+                self._job_hashes.pop(filepath, None)
             print(f"[Filter] Visual safety/relevance check failed for: {os.path.basename(filepath)}. Deleting.")
+            for path in (filepath, filepath + ".json"):
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except Exception:
+                    pass
+            return
+        print(f"DEBUG MEDIA: Downloaded {os.path.basename(filepath)} FROM {url}")
+        if getattr(self, "_staged_urls", None) is not None:
+            self._staged_urls[filepath] = url
+        cache = getattr(self, "media_cache", None)
+        if cache is not None and not from_cache:
+            cache.store(url, filepath)
+
+    def _note_created(self, filepath: str):
+        """
+        Records that the current thread's concurrent get_media tier is creating
+        `filepath` in this call — only such files may be un-staged if the tier
+        loses. A path that already existed (a profile image staged earlier,
+        which _download_file short-circuits on) is never recorded.
+        """
+        created = getattr(getattr(self, "_tls", None), "created", None)
+        if created is not None:
+            created.add(filepath)
+
+    def _discard_staged(self, filepath: str):
+        """
+        Un-stages an image that won't be used: deletes it and its sidecar and
+        releases its pHash claim and source URL, so later segments can still
+        use the same picture.
+        """
+        for path in (filepath, filepath + ".json"):
             try:
-                os.remove(filepath)
+                if os.path.exists(path):
+                    os.remove(path)
             except Exception:
                 pass
-        else:
-            print(f"DEBUG MEDIA: Downloaded {os.path.basename(filepath)} FROM {url}")
+        if getattr(self, "_job_hashes", None) is not None:
+            with self._job_hashes_lock:
+                self._job_hashes.pop(filepath, None)
+        url = getattr(self, "_staged_urls", {}).pop(filepath, None)
+        if url:
+            self.used_urls.discard(url)
+        getattr(self, "_deprioritized", set()).discard(filepath)
+
+    @contextmanager
+    def _batched_vision_checks(self):
+        """
+        Defers _download_file's vision check for every download made inside the
+        block (on this thread), then verifies them all with _check_images_batch
+        on exit — one Gemini round trip instead of one per image. Credit lines
+        written for deferred files are held back until they pass.
 
+        Yields a set that, once the block exits, holds the rejected (deleted) paths.
+        """
+        if getattr(self, "_tls", None) is None:
+            self._tls = threading.local()
+        tls = self._tls
+        outer = (getattr(tls, "pending", None), getattr(tls, "pending_credits", None))
+        tls.pending, tls.pending_credits = [], {}
+        rejected = set()
+        try:
+            yield rejected
+        finally:
+            pending, credits = tls.pending, tls.pending_credits
+            tls.pending, tls.pending_credits = outer
+            if pending and self._sourcing_cancelled():
+                # The concurrent get_media job is already satisfied — these
+                # would be thrown away, so don't spend a vision check on them.
+                for item in pending:
+                    self._discard_staged(item["filepath"])
+                    rejected.add(item["filepath"])
+            elif pending:
+                try:
+                    verdicts = self._check_images_batch(
+                        [(p["filepath"], p["context_query"], p["strict"]) for p in pending])
+                except Exception as e:
+                    print(f"[Filter] Batched safety check crashed: {e}. Rejecting {len(pending)} images (fail-safe).")
+                    verdicts = [False] * len(pending)
+                for item, passed in zip(pending, verdicts):
+                    self._finalize_download(item["filepath"], item["url"], bool(passed), from_cache=item["cached"],
+                                            provider=item.get("provider"))
+                    if passed:
+                        for text in credits.get(item["filepath"], []):
+                            self._add_credit(text, item["filepath"])
+                    else:
+                        rejected.add(item["filepath"])
 
     # ─────────────────────────────────────────────────────────
     # FOOTBALL-ONLY FILTER ENGINE
@@ -203,10 +519,8 @@ class MediaSourcer:
         Sanitizes a raw search query to be football-specific.
         Strips bad-sport keywords and appends sport-safe terms.
         """
-        q = raw_query.strip()
         # Remove any bad keywords accidentally in the query
-        for bk in self._BAD_KEYWORDS:
-            q = re.sub(re.escape(bk), "", q, flags=re.IGNORECASE).strip()
+        q = IMAGE_FILTER.remove(raw_query.strip())
         # Always append the safe football suffix
         if self._FOOTBALL_SAFE_SUFFIX not in q.lower():
             q = f"{q} {self._FOOTBALL_SAFE_SUFFIX}"
@@ -217,52 +531,25 @@ class MediaSourcer:
         Returns True if this image should be rejected (wrong sport / wrong gender / adult content).
         Checks URL, filename, title, and tags strings.
         """
-        # 1. Check for adult/NSFW substrings in the URL (case-insensitive)
-        url_lower = url.lower()
-        nsfw_url_substrings = [
-            "porn", "xxx", "nsfw", "erotic", "nude", "nudit", "onlyfans", 
-            "xvideo", "xhamster", "redtube", "youporn", "hentai", "milf", "blowjob", 
-            "vagina", "penis", "pussy", "boobs", "naughty", "playboy", 
-            "sensual", "softcore", "orgasm", "ejaculat", "semen",
-            "fuck", "boob", "naked", "busty", "camgirl", "chaturbate",
-            "xhcdn", "pornhub", "xvideos", "xnxx", "phncdn", "xv-cdn"
-        ]
-        for sub in nsfw_url_substrings:
-            if sub in url_lower:
-                print(f"[Filter] Rejected image — matched adult substring '{sub}' in URL: {url[:120]}")
-                return True
-                
-        # Special check for 'sex' in the URL (excluding geographic / names false positives)
-        if "sex" in url_lower:
-            is_false_positive = False
-            for fp in ["sussex", "essex", "middlesex", "sexton", "sexsmith"]:
-                if fp in url_lower:
-                    is_false_positive = True
-                    break
-            if not is_false_positive:
-                print(f"[Filter] Rejected image — matched 'sex' (non-geographic) in URL: {url[:120]}")
-                return True
+        # 1. Adult/NSFW substrings in the URL ("sex" outside Sussex/Essex/...)
+        bad = ADULT_URL_FILTER.find(url)
+        if bad:
+            print(f"[Filter] Rejected image — matched adult substring '{bad}' in URL: {url[:120]}")
+            return True
 
-        # 2. Check for adult/NSFW keywords in the title and tags (using word boundaries to avoid false positives)
-        title_lower = title.lower() if title else ""
-        tags_lower = tags.lower() if tags else ""
-        
-        # Removed 'adult' (conflicts with adult/senior team), 'hardcore' (conflicts with hardcore fans),
-        # 'escort' (conflicts with player/child escorts), and 'dick' (conflicts with names like Dick Advocaat)
-        adult_keywords_pattern = r"\b(porn|pornography|sex|nude|nudity|erotic|erotica|nsfw|hentai|naked|nakedness|sexy|sensual|busty|milf|xxx|softcore|blowjob|fuck|vagina|penis|boob|boobs|pussy|pornstar|playboy)\b"
-        
-        if re.search(adult_keywords_pattern, title_lower) or re.search(adult_keywords_pattern, tags_lower):
-            print(f"[Filter] Rejected image — matched adult keyword in title or tags: Title='{title_lower[:100]}', Tags='{tags_lower[:100]}'")
+        # 2. Adult/NSFW whole words in the title and tags
+        bad = ADULT_TEXT_FILTER.find(title) or ADULT_TEXT_FILTER.find(tags)
+        if bad:
+            print(f"[Filter] Rejected image — matched adult keyword '{bad}' in title or tags: "
+                  f"Title='{(title or '')[:100]}', Tags='{(tags or '')[:100]}'")
             return True
 
-        # 3. Check existing wrong-sport / wrong-gender keywords
-        combined = f"{url} {title} {tags}".lower()
-        # Normalize underscores to spaces for better matching
-        combined = combined.replace("_", " ").replace("-", " ")
-        for bk in self._BAD_KEYWORDS:
-            if bk in combined:
-                print(f"[Filter] Rejected image — matched bad keyword '{bk}' in: {url[:80]}")
-                return True
+        # 3. Wrong-sport / wrong-gender terms as substrings of the URL, title and
+        #    tags — slugs and tags run words together ("NFLDraft2024", "womenssoccer")
+        bad = IMAGE_METADATA_FILTER.find(f"{url} {title} {tags}")
+        if bad:
+            print(f"[Filter] Rejected image — matched bad keyword '{bad}' in: {url[:80]}")
+            return True
         return False
 
     # Words the VISUAL_KEYWORD_RULES prompt (script_generator.py) reliably injects
@@ -352,12 +639,18 @@ class MediaSourcer:
         """
         filename = os.path.basename(filepath)
 
+        # Reuse a stored verdict for these pixels (or a re-encoded copy of them)
+        # before spending a Gemini call — see vision_verdicts.py.
+        verdicts = get_verdict_cache()
+        image_phash = self._image_phash(filepath)
+        if image_phash is not None:
+            cached = verdicts.lookup(image_phash, context_query)
+            if cached is not None:
+                print(f"[Safety] Reusing cached vision verdict for {filename}.")
+                return self._apply_vision_verdict(filename, cached, context_query)
+
         if not self.gemini_keys:
-            if strict:
-                print(f"[Safety] No GEMINI_API_KEY configured — cannot verify '{filename}' from an uncurated source. Rejecting (fail-safe).")
-                return False
-            print("[Safety] No GEMINI_API_KEY available for visual safety check. Relying on text filter.")
-            return True
+            return self._vision_unverifiable(filename, strict, no_keys=True)
 
         from PIL import Image
         try:
@@ -368,9 +661,6 @@ class MediaSourcer:
             print(f"[Safety] Failed to open image for visual check {filepath}: {e}")
             return False
 
-        from google import genai
-        from google.genai import types
-
         context_clause = (
             f"The image is supposed to depict this specific subject: \"{context_query.strip()[:200]}\". "
             if context_query and context_query.strip() else ""
@@ -385,6 +675,67 @@ class MediaSourcer:
             "'is_nsfw', 'is_football_related', 'matches_context'."
         )
 
+        status, data = self._vision_request([img, prompt], filename)
+        if status == "blocked":
+            print(f"[Safety] Image blocked by Gemini safety filters for {filename}. Rejecting.")
+            if image_phash is not None:
+                verdicts.record(image_phash, context_query, True, False, False)
+            return False
+        if status == "ok" and isinstance(data, dict):
+            verdict = self._parse_vision_verdict(data)
+            if image_phash is not None:
+                verdicts.record(image_phash, context_query, verdict["is_nsfw"],
+                                verdict["is_football_related"], verdict["matches_context"])
+            return self._apply_vision_verdict(filename, verdict, context_query)
+        return self._vision_unverifiable(filename, strict)
+
+    @staticmethod
+    def _parse_vision_verdict(data: dict) -> dict:
+        return {
+            "is_nsfw": data.get("is_nsfw", False),
+            "is_football_related": data.get("is_football_related", True),
+            "matches_context": data.get("matches_context", True),
+        }
+
+    def _vision_unverifiable(self, filename: str, strict: bool, no_keys: bool = False) -> bool:
+        """The strict/fail-open decision when no vision verdict could be obtained."""
+        if getattr(self, "require_vision_verdict", False):
+            print(f"[Safety] No vision verdict for '{filename}' and one is required. Rejecting.")
+            return False
+        if no_keys:
+            if strict:
+                print(f"[Safety] No GEMINI_API_KEY configured — cannot verify '{filename}' from an uncurated source. Rejecting (fail-safe).")
+                return False
+            print("[Safety] No GEMINI_API_KEY available for visual safety check. Relying on text filter.")
+            return True
+        if strict:
+            print(f"[Safety] Gemini API rate limited/offline on ALL keys — cannot verify '{filename}' from an uncurated source. Rejecting (fail-safe).")
+            return False
+        print(f"[Safety] Gemini API rate limited or offline. Falling back to text check for {filename}.")
+        return True
+
+    def vision_available(self) -> bool:
+        """True while some Gemini key/model isn't marked dead by the gateway, i.e. the vision check can still run."""
+        gateway = get_llm_gateway()
+        return any(gateway.available("gemini", key, model)
+                   for key in self.gemini_keys for model in GEMINI_VISION_MODELS)
+
+    def _genai_client(self, key: str):
+        """The gateway's pooled google-genai Client for this API key."""
+        return get_llm_gateway().client("gemini", key)
+
+    def _vision_request(self, contents: list, label: str) -> tuple:
+        """
+        Sends one multimodal JSON request through the Gemini key/model fallback
+        chain used by the vision MIDDLEWARE.
+
+        Returns (status, data):
+          ("ok", parsed_json)     — a verdict came back
+          ("blocked", None)       — Gemini's own safety filter blocked the request
+          ("unavailable", None)   — every key/model is exhausted, retired or failing
+        """
+        from google.genai import types
+
         safety_settings = [
             types.SafetySetting(
                 category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
@@ -398,81 +749,236 @@ class MediaSourcer:
         # now instead of being hardcoded separately in every file that needs it.
         candidate_models = GEMINI_VISION_MODELS
 
-        attempted_any = False
-        for key in self.gemini_keys:
-            for model in candidate_models:
-                combo = (key, model)
-                if combo in self._gemini_unusable:
-                    # Already known dead/exhausted this run — skip straight past it
-                    # instead of re-discovering the same 429/404 on every image.
-                    continue
-                attempted_any = True
-                try:
-                    client = genai.Client(api_key=key)
-                    response = client.models.generate_content(
-                        model=model,
-                        contents=[img, prompt],
-                        config=types.GenerateContentConfig(
-                            safety_settings=safety_settings,
-                            response_mime_type="application/json"
-                        )
+        gateway = get_llm_gateway()
+        # Combinations the gateway has marked dead — this run or a recent one,
+        # until their quota resets — are left out up front instead of
+        # re-discovering the same 429/404 on every image.
+        combos = gateway.combos("gemini", self.gemini_keys, candidate_models)
+        if not combos:
+            print(f"[Safety] All Gemini key/model combinations are marked unusable — skipping API call for '{label}'.")
+        for i, key, model in combos:
+            try:
+                response = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        safety_settings=safety_settings,
+                        response_mime_type="application/json"
                     )
+                ))
+                if not response.text:
+                    return "blocked", None
+                return "ok", json.loads(response.text)
+            except ComboUnavailable:
+                continue  # marked dead by an earlier failure in this loop (e.g. a revoked key)
+            except Exception as e:
+                err_str = str(e).lower()
+                if "safety" in err_str or "blocked" in err_str:
+                    print(f"[Safety] Request blocked during API call for {label}: {e}.")
+                    return "blocked", None
+                # The gateway has already classified and recorded the failure.
+                print(f"[Safety] Gemini visual check failed on key #{i+1} / {model}: {e}")
+                if classify_error(str(e), "gemini")[0] is None:
+                    # Genuinely transient (network blip, 503 momentarily overloaded) —
+                    # worth a brief pause before the next key/model attempt.
+                    time.sleep(1)
 
-                    if not response.text:
-                        print(f"[Safety] Image blocked by Gemini safety filters for {filename}. Rejecting.")
-                        return False
+        return "unavailable", None
 
-                    data = json.loads(response.text)
-                    is_nsfw = data.get("is_nsfw", False)
-                    is_football = data.get("is_football_related", True)
-                    matches_context = data.get("matches_context", True)
+    def check_images_batch(self, filepaths: list, context_query: str = "", strict: bool = True) -> list:
+        """
+        Batched version of _check_image_safety_and_relevance for N candidate
+        images of ONE segment: cached verdicts are applied first, then every
+        remaining image goes to Gemini in a single multimodal request (chunks of
+        VISION_BATCH_SIZE, default 6) that returns a JSON array of per-image
+        verdicts. Same `strict` semantics as the single-image check.
 
-                    if is_nsfw:
-                        print(f"[Safety] Gemini classified image {filename} as NSFW. REJECTED.")
-                        return False
+        Returns a list of booleans aligned with `filepaths` (False = reject).
+        """
+        return self._check_images_batch([(p, context_query, strict) for p in filepaths])
+
+    def _check_images_batch(self, items: list) -> list:
+        """check_images_batch over (filepath, context_query, strict) items that may differ per image."""
+        results = [None] * len(items)
+        verdicts = get_verdict_cache()
+        hashes = [None] * len(items)
+        pending = []
+        for i, (path, ctx, strict) in enumerate(items):
+            hashes[i] = self._image_phash(path)
+            cached = verdicts.lookup(hashes[i], ctx) if hashes[i] is not None else None
+            if cached is not None:
+                print(f"[Safety] Reusing cached vision verdict for {os.path.basename(path)}.")
+                results[i] = self._apply_vision_verdict(os.path.basename(path), cached, ctx)
+            else:
+                pending.append(i)
 
-                    if not is_football:
-                        print(f"[Safety] Gemini classified image {filename} as not football-related. REJECTED.")
-                        return False
+        if pending and not self.gemini_keys:
+            for i in pending:
+                results[i] = self._vision_unverifiable(os.path.basename(items[i][0]), items[i][2], no_keys=True)
+            return results
 
-                    if context_query and not matches_context:
-                        print(f"[Safety] Gemini says image {filename} does NOT match script context '{context_query[:60]}'. REJECTED.")
-                        return False
+        # A one-image "batch" is just the normal check (its prompt is simpler).
+        if len(pending) == 1:
+            i = pending[0]
+            results[i] = self._check_image_safety_and_relevance(items[i][0], context_query=items[i][1], strict=items[i][2])
+            return results
 
-                    print(f"[Safety] Image {filename} passed safety+relevance check" + (f" (context='{context_query[:40]}')" if context_query else "") + ".")
-                    return True
+        from PIL import Image
+        batch_size = max(1, int(os.getenv("VISION_BATCH_SIZE", "6")))
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            images = {}
+            for i in chunk:
+                try:
+                    img = Image.open(items[i][0])
+                    img.verify()
+                    images[i] = Image.open(items[i][0])
                 except Exception as e:
-                    err_str = str(e).lower()
-                    if "safety" in err_str or "blocked" in err_str:
-                        print(f"[Safety] Image blocked during API call for {filename}: {e}. Rejecting.")
-                        return False
-                    is_quota_or_missing = (
-                        "429" in err_str or "resource_exhausted" in err_str or "quota" in err_str
-                        or "404" in err_str or "not_found" in err_str
-                    )
-                    if is_quota_or_missing:
-                        # Daily/rate quota exceeded, or the model no longer exists —
-                        # neither recovers within this run. Mark it dead and move on
-                        # immediately (no sleep — a 1s pause does nothing for a daily
-                        # quota and just adds latency across every remaining image).
-                        self._gemini_unusable.add(combo)
-                        print(f"[Safety] Marking {model} on this key as unusable for the rest of this run: {e}")
+                    print(f"[Safety] Failed to open image for visual check {items[i][0]}: {e}")
+                    results[i] = False
+            chunk = [i for i in chunk if i in images]
+            if not chunk:
+                continue
+            if len(chunk) == 1:
+                i = chunk[0]
+                results[i] = self._check_image_safety_and_relevance(items[i][0], context_query=items[i][1], strict=items[i][2])
+                continue
+
+            contents = [
+                f"You are given {len(chunk)} images, labelled Image 1 to Image {len(chunk)}. "
+                "For EACH image answer three questions:\n"
+                "1. Is there any nudity, pornography, sexually suggestive poses, or NSFW content?\n"
+                "2. Is this image related to association football (soccer) — stadium, fans, players, jerseys, badges, or match action?\n"
+                "3. Does the image plausibly match the specific subject given for it (the right "
+                "player/team/event/topic), not just football in general? If no subject was given, answer true.\n"
+                "Respond strictly with a JSON array of exactly one object per image, in order, each with keys:\n"
+                "'index' (1-based image number), 'is_nsfw', 'is_football_related', 'matches_context'."
+            ]
+            for n, i in enumerate(chunk, start=1):
+                ctx = (items[i][1] or "").strip()[:200]
+                contents.append(f"Image {n}" + (f" — supposed to depict: \"{ctx}\"" if ctx else " — no specific subject") + ":")
+                contents.append(images[i])
+
+            label = f"batch of {len(chunk)} images"
+            status, data = self._vision_request(contents, label)
+            if status == "ok" and isinstance(data, dict):
+                data = data.get("results") or data.get("images") or [data]
+            if status == "ok" and isinstance(data, list):
+                by_index = {}
+                for pos, entry in enumerate(data):
+                    if isinstance(entry, dict):
+                        by_index[entry.get("index", pos + 1)] = entry
+                print(f"[Safety] Verified {len(chunk)} images in one Gemini request.")
+                for n, i in enumerate(chunk, start=1):
+                    path, ctx, strict = items[i]
+                    if n not in by_index:
+                        # Model skipped this one — check it on its own.
+                        results[i] = self._check_image_safety_and_relevance(path, context_query=ctx, strict=strict)
                         continue
-                    # Genuinely transient (network blip, 503 momentarily overloaded) —
-                    # worth a brief pause before the next key/model attempt.
-                    print(f"[Safety] Gemini visual check failed on key/model {model}: {e}")
-                    time.sleep(1)
-                    continue
+                    verdict = self._parse_vision_verdict(by_index[n])
+                    if hashes[i] is not None:
+                        verdicts.record(hashes[i], ctx, verdict["is_nsfw"],
+                                        verdict["is_football_related"], verdict["matches_context"])
+                    results[i] = self._apply_vision_verdict(os.path.basename(path), verdict, ctx)
+            elif status == "blocked":
+                # Can't tell which image tripped Gemini's filter — isolate them.
+                print(f"[Safety] Batch blocked by Gemini safety filters. Re-checking {len(chunk)} images one by one.")
+                for i in chunk:
+                    results[i] = self._check_image_safety_and_relevance(items[i][0], context_query=items[i][1], strict=items[i][2])
+            else:
+                for i in chunk:
+                    results[i] = self._vision_unverifiable(os.path.basename(items[i][0]), items[i][2])
+        return results
 
-        if not attempted_any:
-            print(f"[Safety] All Gemini key/model combinations are marked unusable this run — skipping API call for '{filename}'.")
+    def _apply_vision_verdict(self, filename: str, verdict: dict, context_query: str = "") -> bool:
+        """Turns a vision verdict (fresh from Gemini or cached) into keep/reject."""
+        if verdict.get("is_nsfw", False):
+            print(f"[Safety] Gemini classified image {filename} as NSFW. REJECTED.")
+            return False
 
-        if strict:
-            print(f"[Safety] Gemini API rate limited/offline on ALL keys — cannot verify '{filename}' from an uncurated source. Rejecting (fail-safe).")
+        if not verdict.get("is_football_related", True):
+            print(f"[Safety] Gemini classified image {filename} as not football-related. REJECTED.")
             return False
-        print(f"[Safety] Gemini API rate limited or offline. Falling back to text check for {filename}.")
+
+        if context_query and not verdict.get("matches_context", True):
+            print(f"[Safety] Gemini says image {filename} does NOT match script context '{context_query[:60]}'. REJECTED.")
+            return False
+
+        print(f"[Safety] Image {filename} passed safety+relevance check" + (f" (context='{context_query[:40]}')" if context_query else "") + ".")
         return True
 
+
+    def _get_json(self, url: str, **kwargs):
+        """GET `url` and return its parsed JSON body, or None on a non-200 / non-JSON response."""
+        r = http.get(url, **kwargs)
+        self._tls.last_status = r.status_code
+        self._tls.last_quota = self._is_quota_response(r)
+        if r.status_code != 200 or not r.text.strip():
+            return None
+        try:
+            return r.json()
+        except json.JSONDecodeError:
+            return None
+
+    def _cached_search(self, provider: str, query: str, fetch, variant: str = "", cache_empty: bool = True):
+        """
+        Returns fetch()'s search response through the on-disk search cache (see
+        search_cache.py). `variant` distinguishes requests for the same query
+        that return different data (page size, rendition size). Failed fetches
+        (None) are never cached; empty results only if `cache_empty`.
+
+        Cache misses are timed and recorded in provider_health.py; while the
+        provider's circuit breaker is open the request is skipped (None).
+        """
+        cache = get_search_cache()
+        data = cache.get(provider, query, variant)
+        if data is not None:
+            return data
+        health = get_provider_health()
+        if health.is_open(provider):
+            return None
+        self._tls.last_status = None
+        self._tls.last_quota = False
+        started = time.time()
+        try:
+            data = fetch()
+        except Exception as e:
+            health.record_request(provider, ok=False, latency=time.time() - started,
+                                  quota=self._is_quota_error(e))
+            raise
+        health.record_request(provider, ok=data is not None, latency=time.time() - started,
+                              quota=getattr(self._tls, "last_quota", False))
+        if data is not None and (data or cache_empty):
+            cache.put(provider, query, data, variant)
+        return data
+
+    # Body text a 403 carries when it is a rate limit (Unsplash's "Rate Limit
+    # Exceeded") rather than a per-file refusal (hotlink / User-Agent blocks).
+    _QUOTA_MARKERS = ("rate limit", "ratelimit", "quota", "suspended")
+
+    @classmethod
+    def _is_quota_response(cls, r) -> bool:
+        """
+        True for a 429, or a 403 whose body says it's a rate limit / quota /
+        suspension. Any other 4xx is an ordinary failure: one Commons file
+        refusing a User-Agent must not trip the breaker for the whole provider.
+        """
+        if r.status_code == 429:
+            return True
+        if r.status_code != 403:
+            return False
+        try:
+            text = (r.text or "")[:500].lower()
+        except Exception:
+            return False
+        return any(marker in text for marker in cls._QUOTA_MARKERS)
+
+    @staticmethod
+    def _is_quota_error(e: Exception) -> bool:
+        """Rate-limit / quota errors raised by client libraries (DDGS raises RatelimitException)."""
+        text = f"{type(e).__name__} {e}".lower()
+        return any(marker in text for marker in ("ratelimit", "rate limit", "429", "quota"))
+
     def _fetch_thesportsdb_image(self, entity_name: str) -> str | None:
         """
         Fetches an official player or team image from TheSportsDB free API.
@@ -483,10 +989,11 @@ class MediaSourcer:
         try:
             # Search players
             url = f"https://www.thesportsdb.com/api/v1/json/3/searchplayers.php"
-            r = requests.get(url, params={"p": entity_name},
-                             headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10)
-            if r.status_code == 200:
-                players = r.json().get("player", []) or []
+            data = self._cached_search("thesportsdb", entity_name, lambda: self._get_json(
+                url, params={"p": entity_name}, headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10),
+                variant="players")
+            if data is not None:
+                players = data.get("player", []) or []
                 # Filter: only soccer/football (idSport=17 in TSDB) and men
                 for p in players:
                     sport = (p.get("strSport") or "").lower()
@@ -502,22 +1009,23 @@ class MediaSourcer:
                         continue
                     thumb = p.get("strThumb") or p.get("strCutout")
                     if thumb and thumb not in self.used_urls:
-                        fname = f"tsdb_player_{hash(entity_name)}.jpg"
+                        fname = f"tsdb_player_{stable_hash(entity_name)}.jpg"
                         fpath = os.path.join(self.download_dir, fname)
                         self._download_file(thumb, fpath, context_query=f"{entity_name} (football player)", strict=False)
                         if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
                             self.used_urls.add(thumb)
-                            self._add_credit(f"Image from TheSportsDB (Player: {entity_name})")
+                            self._add_credit(f"Image from TheSportsDB (Player: {entity_name})", fpath)
                             self._write_image_meta(fpath, "TheSportsDB", entity_name)
                             print(f"[TheSportsDB] Got player image for '{entity_name}'")
                             return fpath
 
             # Search teams
             url2 = f"https://www.thesportsdb.com/api/v1/json/3/searchteams.php"
-            r2 = requests.get(url2, params={"t": entity_name},
-                              headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10)
-            if r2.status_code == 200:
-                teams = r2.json().get("teams", []) or []
+            data = self._cached_search("thesportsdb", entity_name, lambda: self._get_json(
+                url2, params={"t": entity_name}, headers={"User-Agent": "FootyBitezBot/1.0"}, timeout=10),
+                variant="teams")
+            if data is not None:
+                teams = data.get("teams", []) or []
                 for t in teams:
                     sport = (t.get("strSport") or "").lower()
                     if sport not in ("soccer", "football", ""):
@@ -528,12 +1036,12 @@ class MediaSourcer:
                     banner = t.get("strTeamBanner")
                     img_url = banner or badge
                     if img_url and img_url not in self.used_urls:
-                        fname = f"tsdb_team_{hash(entity_name)}.jpg"
+                        fname = f"tsdb_team_{stable_hash(entity_name)}.jpg"
                         fpath = os.path.join(self.download_dir, fname)
                         self._download_file(img_url, fpath, context_query=f"{entity_name} (football club)", strict=False)
                         if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
                             self.used_urls.add(img_url)
-                            self._add_credit(f"Image from TheSportsDB (Team: {entity_name})")
+                            self._add_credit(f"Image from TheSportsDB (Team: {entity_name})", fpath)
                             self._write_image_meta(fpath, "TheSportsDB", entity_name)
                             print(f"[TheSportsDB] Got team image for '{entity_name}'")
                             return fpath
@@ -560,6 +1068,12 @@ class MediaSourcer:
         if cache_key in self._api_football_cache:
             return self._api_football_cache[cache_key]
 
+        # A suspended account or spent daily quota trips the breaker for every
+        # later run too, instead of costing a request per entity (see provider_health.py).
+        health = get_provider_health()
+        if health.is_open("api_football"):
+            return None
+
         result = None
         try:
             headers = {
@@ -568,9 +1082,8 @@ class MediaSourcer:
             base_url = "https://v3.football.api-sports.io"
 
             if is_team:
-                r = requests.get(f"{base_url}/teams", headers=headers,
-                                  params={"search": entity_name}, timeout=10)
-                if r.status_code == 200:
+                r = self._api_football_request(health, f"{base_url}/teams", headers, entity_name)
+                if r is not None:
                     response_list = r.json().get("response", []) or []
                     for item in response_list:
                         team = item.get("team", {}) or {}
@@ -578,22 +1091,22 @@ class MediaSourcer:
                             continue
                         logo = team.get("logo")
                         if logo and logo not in self.used_urls:
-                            fname = f"apifootball_team_{hash(entity_name)}.jpg"
+                            fname = f"apifootball_team_{stable_hash(entity_name)}.jpg"
                             fpath = os.path.join(self.download_dir, fname)
+                            # API-Football only serves ~150px crests and headshots.
                             self._download_file(logo, fpath,
                                                  context_query=f"{entity_name} (football player/club)",
-                                                 strict=False)
+                                                 strict=False, min_side=100)
                             if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
                                 self.used_urls.add(logo)
-                                self._add_credit(f"Image from API-Football (Team: {entity_name})")
+                                self._add_credit(f"Image from API-Football (Team: {entity_name})", fpath)
                                 self._write_image_meta(fpath, "API-Football", entity_name)
                                 print(f"[API-Football] Got team logo for '{entity_name}'")
                                 result = fpath
                             break
             else:
-                r = requests.get(f"{base_url}/players", headers=headers,
-                                  params={"search": entity_name}, timeout=10)
-                if r.status_code == 200:
+                r = self._api_football_request(health, f"{base_url}/players", headers, entity_name)
+                if r is not None:
                     response_list = r.json().get("response", []) or []
                     for item in response_list:
                         player = item.get("player", {}) or {}
@@ -601,14 +1114,14 @@ class MediaSourcer:
                             continue
                         photo = player.get("photo")
                         if photo and photo not in self.used_urls:
-                            fname = f"apifootball_player_{hash(entity_name)}.jpg"
+                            fname = f"apifootball_player_{stable_hash(entity_name)}.jpg"
                             fpath = os.path.join(self.download_dir, fname)
                             self._download_file(photo, fpath,
                                                  context_query=f"{entity_name} (football player/club)",
-                                                 strict=False)
+                                                 strict=False, min_side=100)
                             if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
                                 self.used_urls.add(photo)
-                                self._add_credit(f"Image from API-Football (Player: {entity_name})")
+                                self._add_credit(f"Image from API-Football (Player: {entity_name})", fpath)
                                 self._write_image_meta(fpath, "API-Football", entity_name)
                                 print(f"[API-Football] Got player photo for '{entity_name}'")
                                 result = fpath
@@ -620,6 +1133,33 @@ class MediaSourcer:
         self._api_football_cache[cache_key] = result
         return result
 
+    def _api_football_request(self, health, url: str, headers: dict, entity_name: str):
+        """
+        One API-Football search, recorded in provider health. API-Football
+        reports suspensions and spent quotas as HTTP 200 with an `errors` body,
+        so those count as quota errors too. Returns the response, or None.
+        """
+        started = time.time()
+        try:
+            r = http.get(url, headers=headers, params={"search": entity_name}, timeout=10)
+        except Exception:
+            health.record_request("api_football", ok=False, latency=time.time() - started)
+            raise
+        latency = time.time() - started
+        errors = None
+        if r.status_code == 200:
+            try:
+                errors = r.json().get("errors")
+            except ValueError:
+                errors = "invalid JSON"
+        if r.status_code != 200 or errors:
+            print(f"[API-Football] Request failed ({r.status_code}): {errors or r.text[:200]}")
+            health.record_request("api_football", ok=False, latency=latency,
+                                  quota=bool(errors) or self._is_quota_response(r))
+            return None
+        health.record_request("api_football", ok=True, latency=latency)
+        return r
+
     # ─────────────────────────────────────────────────────────
     # PUBLIC API — called by main.py (Shorts pipeline)
     # ─────────────────────────────────────────────────────────
@@ -645,7 +1185,7 @@ class MediaSourcer:
         if not allow_ai:
             path = self._fetch_ddg_image(
                 f"{topic} match action portrait",
-                suffix=f"title_real_{hash(topic)}"
+                suffix=f"title_real_{stable_hash(topic)}"
             )
             if path:
                 return path
@@ -653,7 +1193,7 @@ class MediaSourcer:
         # 1. DuckDuckGo portrait search
         path = self._fetch_ddg_image(
             f"football {topic} stadium crowd action portrait",
-            suffix=f"title_{hash(topic)}"
+            suffix=f"title_{stable_hash(topic)}"
         )
         if path:
             return path
@@ -670,7 +1210,7 @@ class MediaSourcer:
         is_player = self._is_player_query(topic)
 
         # 3. Pollinations.ai (no API key, no quota)
-        poll_path = os.path.join(self.download_dir, f"poll_title_{hash(topic)}.jpg")
+        poll_path = os.path.join(self.download_dir, f"poll_title_{stable_hash(topic)}.jpg")
         
         poll_prompt = f"football {topic} stadium crowd action, portrait vertical, dramatic lighting, dark background, cinematic"
         if is_player:
@@ -685,7 +1225,7 @@ class MediaSourcer:
 
         # 4. Gemini AI image generation (new SDK)
         if self.gemini_keys:
-            ai_path = os.path.join(self.download_dir, f"ai_title_{hash(topic)}.jpg")
+            ai_path = os.path.join(self.download_dir, f"ai_title_{stable_hash(topic)}.jpg")
             
             gemini_prompt = f"football {topic} stadium crowd action, sports photography, dramatic"
             if is_player:
@@ -701,14 +1241,51 @@ class MediaSourcer:
         # 5. PIL solid dark gradient card (ultimate fallback — never crash)
         return self._create_solid_card(topic)
 
-    def get_profile_image(self, entity_query: str) -> str | None:
+    def get_indexed_entity_image(self, entity_name: str) -> str | None:
+        """
+        Stages the pre-warmed image for a World Cup player/team from the local
+        entity index (see entity_index.py). It was vision-verified for this
+        entity when indexed, so no network or Gemini call is made.
+        Returns a staged file path, or None if the entity isn't indexed.
+        """
+        entry = get_entity_index().lookup(entity_name)
+        if not entry:
+            return None
+        src = entry["path"]
+        fpath = os.path.join(self.download_dir, f"entity_{stable_hash(src)}{os.path.splitext(src)[1]}")
+        if os.path.exists(fpath):
+            return None  # already used in this job
+        self._note_created(fpath)
+        try:
+            shutil.copy2(src, fpath)
+        except Exception as e:
+            print(f"[EntityIndex] Failed to stage image for '{entity_name}': {e}")
+            return None
+        if not self._claim_distinct(fpath):
+            os.remove(fpath)
+            return None
+        self._add_credit(f"Image from {entry['source'] or 'Wikipedia'} (Entity: {entry['entity']})", fpath)
+        self._write_image_meta(fpath, entry["source"], entry["artist"])
+        print(f"[EntityIndex] Index hit for '{entity_name}'")
+        return fpath
+
+    def get_profile_image(self, entity_query: str, use_index: bool = True) -> str | None:
         """
         Fetches a portrait image of the primary entity (player/club).
-        Priority chain: Wikipedia → TheSportsDB → API-Football → Wikimedia → Unsplash → Pixabay → Openverse → DDG
+        Priority chain: Entity index → Wikipedia → TheSportsDB → API-Football → Wikimedia → Unsplash → Pixabay → Openverse → DDG
         Returns None if nothing found — caller handles the fallback.
+
+        `use_index=False` skips the pre-warmed entity index (used by the warm-up
+        itself, which is what fills it).
         """
         print(f"Sourcing profile image for: {entity_query}")
 
+        # 0. Pre-warmed entity index (footybitez/pipelines/entity_warmup.py)
+        if use_index:
+            path = self.get_indexed_entity_image(entity_query)
+            if path:
+                return path
+
         # 1. Wikipedia Page Summary (most accurate — exact match for players/clubs)
         path = self.get_wikipedia_entity_image(entity_query)
         if path:
@@ -747,72 +1324,370 @@ class MediaSourcer:
             return paths[0]
 
         # 7. DDG fallback (filtered)
-        return self._fetch_ddg_image(f"{entity_query} soccer portrait", suffix=f"profile_{hash(entity_query)}")
+        return self._fetch_ddg_image(f"{entity_query} soccer portrait", suffix=f"profile_{stable_hash(entity_query)}")
 
-    def get_media(self, visual_keyword: str, count: int = 3, prefer_real_match: bool = False) -> list:
+    def get_media(self, visual_keyword: str, count: int = 3, prefer_real_match: bool = False,
+                  concurrent: bool | None = None, ranked: bool | None = None) -> list:
         """
         Fetches a list of image paths for a given visual keyword.
         Used by Shorts pipeline for segment visuals.
-        Priority: (DDG if prefer_real_match) → Wikipedia entity → TheSportsDB → API-Football → Wikimedia → Unsplash → Pixabay → Openverse → DDG
+        Priority: (DDG if prefer_real_match) → entity index → Wikipedia entity → TheSportsDB → API-Football → Wikimedia → Unsplash → Pixabay → Openverse → DDG
         All queries are filtered to men's association football only.
+
+        `concurrent` (default: MEDIA_CONCURRENT_SOURCING env var, off unless
+        set to "true") queries the tiers in parallel on a bounded worker pool
+        instead of strictly one after another — see _run_media_tiers_concurrently.
+        The priority order above still decides which images are returned.
+
+        `ranked` (default: MEDIA_RANKED_SELECTION, off unless "true") replaces
+        the Wikimedia → Unsplash → Pixabay → Openverse stretch of the chain with
+        one quality-ranked candidate pool — see _get_ranked_pool_media. Takes
+        precedence over `concurrent`.
         """
+        if concurrent is None:
+            concurrent = os.getenv("MEDIA_CONCURRENT_SOURCING", "false").lower() == "true"
+        if ranked is None:
+            ranked = os.getenv("MEDIA_RANKED_SELECTION", "false").lower() == "true"
+
+        tiers = self._media_tiers(visual_keyword, count, prefer_real_match)
+        if os.getenv("MEDIA_ADAPTIVE_TIERS", "true").lower() != "false":
+            # Skip providers whose circuit breaker is open and push poor-yield
+            # ones to the back, from stats kept across runs (provider_health.py).
+            tiers = get_provider_health().order_tiers(tiers, key=lambda tier: self._tier_provider(tier[0]))
+        if ranked:
+            return self._run_media_tiers_ranked(tiers, count, visual_keyword)
+        if concurrent:
+            return self._run_media_tiers_concurrently(tiers, count, visual_keyword)
+
         results = []
+        for name, fetch, batched in tiers:
+            if len(results) >= count:
+                break
+            results.extend(self._run_media_tier(fetch, batched, count - len(results), provider=name))
+        return results[:count]
 
-        if prefer_real_match:
-            print(f"Prioritizing real match visuals from DDG for: {visual_keyword}")
-            ddg_paths = self._fetch_ddg_images(visual_keyword, suffix=f"real_{hash(visual_keyword)}", count=count)
-            results.extend(ddg_paths)
+    # Stock-photo tiers whose search metadata is rich enough to rank candidates
+    # before downloading them.
+    _RANKED_POOL_PROVIDERS = ("wikimedia", "unsplash", "pixabay", "openverse")
+
+    def _run_media_tiers_ranked(self, tiers: list, count: int, visual_keyword: str) -> list:
+        """
+        Ranked get_media: walks the chain like the serial mode, but the stock-photo
+        tiers are pooled into one _get_ranked_pool_media call at the position of
+        the first of them.
+        """
+        pool = [name for name, _, _ in tiers if name in self._RANKED_POOL_PROVIDERS]
+        results = []
+        pooled = False
+        for name, fetch, batched in tiers:
             if len(results) >= count:
-                return results[:count]
+                break
+            if name in self._RANKED_POOL_PROVIDERS:
+                if not pooled:
+                    pooled = True
+                    results.extend(self._get_ranked_pool_media(visual_keyword, pool, count - len(results)))
+                continue
+            results.extend(self._run_media_tier(fetch, batched, count - len(results), provider=name))
+        return results[:count]
 
+    def _get_ranked_pool_media(self, visual_keyword: str, providers: list, count: int) -> list:
+        """
+        Lists up to MEDIA_RANKED_POOL_PER_PROVIDER (default 12) candidates from
+        each of `providers` from search metadata alone, fetches their small
+        previews (MEDIA_RANKED_PREVIEW_WORKERS threads, default 6), and ranks
+        them with candidate_ranker.py on resolution vs the target frame, crop
+        loss, sharpness and pHash distance from this job's images. Only the
+        best `count` are downloaded in full and vision-checked (one batched
+        request); rejections are replaced from further down the ranking, for
+        up to three rounds.
+        """
         safe_query = self._make_football_query(visual_keyword)
+        per_provider = max(1, int(os.getenv("MEDIA_RANKED_POOL_PER_PROVIDER", "12")))
+        listers = {
+            "wikimedia": lambda: itertools.islice(self._wikimedia_candidates(safe_query), per_provider),
+            "unsplash": lambda: self._unsplash_candidates(safe_query, per_page=per_provider),
+            "pixabay": lambda: self._pixabay_candidates(safe_query, per_page=per_provider),
+            "openverse": lambda: self._openverse_candidates(safe_query, page_size=per_provider),
+        }
+        providers = [p for p in providers if p in listers]
+        if not providers:
+            return []
 
-        # 1. If the keyword looks like a named entity, try Wikipedia + TheSportsDB first
-        if self._is_player_query(visual_keyword) or len(visual_keyword.split()) <= 4:
-            wiki_entity = self.get_wikipedia_entity_image(visual_keyword)
-            if wiki_entity:
-                results.append(wiki_entity)
+        candidates = []
+        with ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="media-pool") as pool:
+            futures = {pool.submit(lambda p=p: list(listers[p]())): p for p in providers}
+            for fut in as_completed(futures):
+                try:
+                    candidates.extend(fut.result())
+                except Exception as e:
+                    print(f"[MediaRank] Listing {futures[fut]} candidates failed: {e}")
+        seen_urls = set()
+        candidates = [c for c in candidates if not (c["url"] in seen_urls or seen_urls.add(c["url"]))]
+        if not candidates:
+            return []
 
-            if len(results) < count:
-                tsdb = self._fetch_thesportsdb_image(visual_keyword)
-                if tsdb:
-                    results.append(tsdb)
+        def measure(candidate):
+            if not candidate.get("preview"):
+                return
+            try:
+                r = http.get(candidate["preview"], headers={'User-Agent': 'FootyBitezBot/1.0'}, timeout=10)
+                img = open_preview(r.content) if r.status_code == 200 else None
+                if img is not None:
+                    candidate["sharpness"] = preview_sharpness(img)
+                    candidate["preview_hash"] = phash(img)
+            except Exception:
+                pass
+
+        workers = max(1, int(os.getenv("MEDIA_RANKED_PREVIEW_WORKERS", "6")))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-preview") as pool:
+            list(pool.map(measure, candidates))
+
+        ranked = rank_candidates(candidates, self.target_size,
+                                 used_hashes=list(getattr(self, "_job_hashes", {}).values()),
+                                 max_distance=int(os.getenv("MEDIA_DUPLICATE_MAX_DISTANCE", "6")))
+        best = ", ".join(f"{c['provider']}={c['scores']['total']:.2f}" for c in ranked[:count])
+        print(f"[MediaRank] '{visual_keyword[:60]}': {len(candidates)} candidates from "
+              f"{', '.join(providers)}; {len(ranked)} after dedupe, best {best}")
+
+        results = []
+        start = 0
+        for _ in range(3):
+            if len(results) >= count or start >= len(ranked):
+                break
+            batch = ranked[start:start + count - len(results)]
+            start += len(batch)
+            results.extend(self._stage_candidates_batched(batch))
+        return results
+
+    def plan_media(self, script: dict, count: int = 3, default_keyword: str = "", suffix: str = "") -> list:
+        """
+        Sources segment visuals for a whole script in one pass, instead of one
+        independent get_media chain per segment.
+
+        Every segment's `visual_keyword` (or `default_keyword`, plus `suffix`
+        when given) is normalized with normalize_context, so "Lionel Messi" and
+        "lionel messi football" collapse to one query. Each unique query runs a
+        single get_media for all the segments sharing it, and its images are
+        dealt out round-robin so those segments get distinct pictures. Unique
+        queries run one after another: the chains share used_urls, the
+        API-Football cache and the credits file, which assume a single caller
+        (use MEDIA_CONCURRENT_SOURCING to overlap the tiers within one query).
+
+        Returns one list of paths per segment, aligned with script["segments"]
+        — the same shape the pipelines used to build by hand.
+        """
+        segments = script.get("segments", []) or []
+        keywords = []
+        for seg in segments:
+            kw = seg.get("visual_keyword", default_keyword) if isinstance(seg, dict) else default_keyword
+            keywords.append(f"{kw} {suffix}".strip() if suffix else kw)
+
+        groups = {}  # normalized query -> (query as first written, [segment indexes])
+        for i, kw in enumerate(keywords):
+            key = normalize_context(kw) or kw
+            groups.setdefault(key, (kw, []))[1].append(i)
+        print(f"[MediaPlan] {len(segments)} segments -> {len(groups)} unique visual queries")
+
+        def source(query, members):
+            print(f"[MediaPlan] Searching for visual: {query} ({len(members)} segment(s))")
+            return self.get_media(query, count=count * len(members))
+
+        plan = [[] for _ in segments]
+        for query, members in groups.values():
+            try:
+                paths = source(query, members) or []
+            except Exception as e:
+                print(f"[MediaPlan] Sourcing failed for segment(s) {members}: {e}")
+                paths = []
+            for j, path in enumerate(paths):
+                plan[members[j % len(members)]].append(path)
+            for seg_idx in members:
+                # Fewer images than segments: repeating one beats a blank segment.
+                if not plan[seg_idx] and paths:
+                    plan[seg_idx] = paths[:count]
+        return plan
+
+    def _media_tiers(self, visual_keyword: str, count: int, prefer_real_match: bool) -> list:
+        """
+        Builds get_media's provider chain as an ordered list of
+        (name, fetch(remaining) -> list_of_paths, batched) tiers, highest
+        priority first. Shared by the serial and concurrent sourcing modes so
+        both walk exactly the same providers in the same order.
+
+        `batched` tiers return several candidates per search; their vision
+        checks are deferred and sent as one request (see _run_media_tier).
+        Single-image tiers don't benefit, and Wikimedia batches internally.
+        """
+        safe_query = self._make_football_query(visual_keyword)
 
+        def one(path):
+            return [path] if path else []
+
+        tiers = []
+        if prefer_real_match:
+            print(f"Prioritizing real match visuals from DDG for: {visual_keyword}")
+            tiers.append(("ddg_real", lambda n: self._fetch_ddg_images(
+                visual_keyword, suffix=f"real_{stable_hash(visual_keyword)}", count=n), True))
+
+        # 1. If the keyword looks like a named entity, try the pre-warmed entity
+        #    index, then Wikipedia + TheSportsDB
+        if self._is_player_query(visual_keyword) or len(visual_keyword.split()) <= 4:
+            tiers.append(("entity_index", lambda n: one(self.get_indexed_entity_image(visual_keyword)), False))
+            tiers.append(("wikipedia", lambda n: one(self.get_wikipedia_entity_image(visual_keyword)), False))
+            tiers.append(("thesportsdb", lambda n: one(self._fetch_thesportsdb_image(visual_keyword)), False))
             # API-Football (api-sports.io direct, small daily quota — only spent on
             # entities TheSportsDB couldn't already resolve; no-op without key)
-            if len(results) < count:
-                apif = self._fetch_api_football_image(visual_keyword)
-                if apif:
-                    results.append(apif)
+            tiers.append(("api_football", lambda n: one(self._fetch_api_football_image(visual_keyword)), False))
 
         # 2. Wikimedia Commons (filtered)
-        if len(results) < count:
-            wiki_paths = self._fetch_wikimedia_images(safe_query, count=count - len(results))
-            results.extend(wiki_paths)
-
+        tiers.append(("wikimedia", lambda n: self._fetch_wikimedia_images(safe_query, count=n), False))
         # 3. Unsplash (filtered)
-        if len(results) < count:
-            unsplash_paths = self._fetch_unsplash_image(safe_query, count=count - len(results))
-            results.extend(unsplash_paths)
-
+        tiers.append(("unsplash", lambda n: self._fetch_unsplash_image(safe_query, count=n), True))
         # 4. Pixabay (filtered)
-        if len(results) < count:
-            pix_paths = self._fetch_pixabay_image(safe_query, count=count - len(results))
-            results.extend(pix_paths)
-
+        tiers.append(("pixabay", lambda n: self._fetch_pixabay_image(safe_query, count=n), True))
         # 5. Openverse (filtered) — no API key/account, so no quota to run out of and
         # nothing that can get "suspended" the way API-Football's account did.
-        if len(results) < count:
-            openverse_paths = self._fetch_openverse_image(safe_query, count=count - len(results))
-            results.extend(openverse_paths)
-
+        tiers.append(("openverse", lambda n: self._fetch_openverse_image(safe_query, count=n), True))
         # 6. DDG fallback (filtered)
-        if len(results) < count:
-            path = self._fetch_ddg_image(safe_query, suffix=f"seg_{hash(visual_keyword)}")
-            if path:
-                results.append(path)
+        tiers.append(("ddg", lambda n: one(self._fetch_ddg_image(safe_query, suffix=f"seg_{stable_hash(visual_keyword)}")), False))
+        return tiers
 
-        return results[:count]
+    @staticmethod
+    def _tier_provider(tier_name: str) -> str:
+        """Provider a get_media tier's health stats are filed under."""
+        return "ddg" if tier_name == "ddg_real" else tier_name
+
+    def _run_media_tier(self, fetch, batched: bool, count: int, provider: str = "") -> list:
+        """
+        Runs one get_media tier. Batched tiers download their candidates with the
+        vision check deferred, verify them in a single Gemini request, and get
+        one more pass (fetchers skip already-used URLs, so it yields fresh
+        candidates) if rejections left the tier short.
+
+        With a `provider`, the tier's outcome and its downloads' vision verdicts
+        are recorded in provider_health.py.
+        """
+        provider = self._tier_provider(provider) if provider else ""
+        self._tls.provider = provider or None
+        try:
+            if not batched:
+                found = fetch(count) or []
+            else:
+                found = []
+                for _ in range(2):
+                    with self._batched_vision_checks() as rejected:
+                        paths = fetch(count - len(found)) or []
+                    found.extend(p for p in paths if p not in rejected)
+                    if not paths or len(found) >= count:
+                        break
+        finally:
+            self._tls.provider = None
+        found = list(dict.fromkeys(found))   # a path two passes both returned is one image
+        low = getattr(self, "_deprioritized", set())
+        found.sort(key=lambda path: path in low)
+        if provider and not self._sourcing_cancelled():
+            get_provider_health().record_tier(provider, len(found))
+        return found
+
+    def _sourcing_cancelled(self) -> bool:
+        """True if the current thread's concurrent get_media job no longer needs results."""
+        tls = getattr(self, "_tls", None)
+        event = getattr(tls, "cancel", None) if tls is not None else None
+        return bool(event is not None and event.is_set())
+
+    @staticmethod
+    def _priority_prefix(tier_results: list, count: int) -> list | None:
+        """
+        Returns the first `count` images in tier-priority order once they are
+        settled — i.e. every tier ahead of the last picked image has finished —
+        or None while a higher-priority tier is still running and could still
+        change the pick.
+        """
+        picked = []
+        for paths in tier_results:
+            if paths is None:
+                return None
+            picked.extend(paths)
+            if len(picked) >= count:
+                return picked[:count]
+        return picked
+
+    def _run_media_tiers_concurrently(self, tiers: list, count: int, visual_keyword: str) -> list:
+        """
+        Concurrent get_media: submits every tier to a bounded worker pool
+        (MEDIA_SOURCING_WORKERS, default 4) so the slow search → download →
+        vision-check chains overlap instead of running back to back.
+
+        Each tier asks for the full `count` since it can't know what the others
+        will find. Results are still picked in the original priority order: as
+        soon as the finished tiers at the front of the chain cover `count`
+        images, tiers still queued are cancelled and tiers already in flight
+        see the cancel flag in _download_file and stop before their next
+        download/vision check. The job waits for those to wind down, then
+        un-stages every image a tier created in this call but the job didn't
+        pick (_discard_staged; files that were already on disk are left alone)
+        — credit lines are held per tier and only written for the picked ones.
+        """
+        workers = max(1, int(os.getenv("MEDIA_SOURCING_WORKERS", "4")))
+        cancel = threading.Event()
+        tier_results = [None] * len(tiers)
+        tier_credits = [{} for _ in tiers]
+        tier_created = [set() for _ in tiers]
+
+        def run(i, name, fetch, batched):
+            if cancel.is_set():
+                return []
+            self._tls.cancel = cancel
+            self._tls.held_credits = tier_credits[i]
+            self._tls.created = tier_created[i]
+            try:
+                return self._run_media_tier(fetch, batched, count, provider=name)
+            finally:
+                self._tls.cancel = None
+                self._tls.held_credits = None
+                self._tls.created = None
+
+        def collect(fut, i):
+            try:
+                tier_results[i] = fut.result()
+            except Exception as e:
+                print(f"[MediaSourcer] Tier '{tiers[i][0]}' crashed for '{visual_keyword}': {e}")
+                tier_results[i] = []
+
+        started = time.time()
+        picked = None
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-tier")
+        futures = {}
+        try:
+            futures = {pool.submit(run, i, name, fetch, batched): i
+                       for i, (name, fetch, batched) in enumerate(tiers)}
+            for fut in as_completed(futures):
+                collect(fut, futures[fut])
+                picked = self._priority_prefix(tier_results, count)
+                if picked is not None:
+                    break
+        finally:
+            cancel.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        finished = sum(r is not None for r in tier_results)
+        for fut, i in futures.items():
+            if tier_results[i] is None and fut.done() and not fut.cancelled():
+                collect(fut, i)
+        picked = picked or []
+        kept = set(picked)
+        for i, paths in enumerate(tier_results):
+            for path in paths or []:
+                if path not in kept and path in tier_created[i]:
+                    self._discard_staged(path)
+            for path, lines in tier_credits[i].items():
+                if path in kept:
+                    for text in lines:
+                        self._add_credit(text, path)
+
+        print(f"[MediaSourcer] Concurrent sourcing for '{visual_keyword[:60]}': {len(picked)}/{count} images "
+              f"in {time.time() - started:.1f}s ({finished}/{len(tiers)} tiers finished)")
+        return picked
 
     def get_thumbnail_image(self, query):
         """Fetches a high-contrast image for the thumbnail."""
@@ -859,22 +1734,50 @@ class MediaSourcer:
 
         return assets
 
+    def _rendition_params(self) -> dict:
+        """
+        imageinfo params asking MediaWiki for a thumb URL sized to the target
+        composition. Images are rendered object-fit: cover, so the rendition is
+        constrained along the frame's long axis — height 1920 for a portrait
+        Short, width 1920 for long-form. Smaller originals come back unscaled.
+        """
+        width, height = getattr(self, "target_size", (1080, 1920))
+        return {"iiurlheight": height} if height > width else {"iiurlwidth": width}
+
+    def _summary_rendition_url(self, data: dict) -> str | None:
+        """
+        Picks the URL to download from a Wikipedia page-summary payload: the
+        summary's own thumb URL rewritten to the width that covers the target
+        composition, or the original if that is already small enough.
+        """
+        original = data.get("originalimage") or {}
+        thumb = data.get("thumbnail") or {}
+        orig_url = original.get("source")
+        ow, oh = original.get("width") or 0, original.get("height") or 0
+        if not orig_url or not ow or not oh:
+            return orig_url or thumb.get("source")
+        tw, th = getattr(self, "target_size", (1080, 1920))
+        scale = max(tw / ow, th / oh)
+        thumb_url = thumb.get("source") or ""
+        if scale >= 1 or not re.search(r"/\d+px-", thumb_url):
+            return orig_url
+        return re.sub(r"/\d+px-", f"/{math.ceil(ow * scale)}px-", thumb_url, count=1)
+
     def get_wikipedia_entity_image(self, entity_name: str) -> str | None:
         """
         Fetches the primary image from a Wikipedia article for a named entity.
         This guarantees accuracy — the image is the one Wikipedia uses for this exact person/club.
         Validates that the image is football-relevant before returning.
         """
-        import requests
         try:
             url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + entity_name.replace(" ", "_")
-            r = requests.get(url, headers={'User-Agent': 'FootyBitezBot/1.0 (contact: admin@footybitez.com)'}, timeout=10)
+            r = http.get(url, headers={'User-Agent': 'FootyBitezBot/1.0 (contact: admin@footybitez.com)'}, timeout=10)
             if r.status_code != 200:
                 return None
             
             data = r.json()
-            image_url = (data.get("originalimage", {}).get("source") or
-                         data.get("thumbnail", {}).get("source"))
+            image_url = self._summary_rendition_url(data)
+            original_url = (data.get("originalimage") or {}).get("source")
             
             # Validate that the image is football-relevant
             if image_url:
@@ -887,11 +1790,16 @@ class MediaSourcer:
                         return result
                     return None
                 
-                fname = f"wiki_entity_{hash(image_url)}.jpg"
+                fname = f"wiki_entity_{stable_hash(image_url)}.jpg"
                 fpath = os.path.join(self.download_dir, fname)
                 self._download_file(image_url, fpath, context_query=entity_name, strict=False)
+                if not os.path.exists(fpath) and original_url and original_url != image_url:
+                    # Rewritten thumb width refused (e.g. upload.wikimedia.org
+                    # throttling non-standard sizes) — fall back to the original.
+                    fpath = os.path.join(self.download_dir, f"wiki_entity_{stable_hash(original_url)}.jpg")
+                    self._download_file(original_url, fpath, context_query=entity_name, strict=False)
                 if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
-                    self._add_credit(f"Image from Wikipedia (Entity: {entity_name})")
+                    self._add_credit(f"Image from Wikipedia (Entity: {entity_name})", fpath)
                     self._write_image_meta(fpath, "Wikipedia Page Summary API", entity_name)
                     return fpath
             else:
@@ -908,116 +1816,210 @@ class MediaSourcer:
     
     def _get_wikipedia_images_from_api(self, entity_name: str) -> str | None:
         """
-        Fetches the first football-relevant image from Wikipedia's full images list via MediaWiki API.
-        Filters for images containing entity name + football keywords in the filename.
+        Fetches the best football-relevant image from Wikipedia's full images list via MediaWiki API.
+
+        One generator=images query resolves every image on the page together with
+        its URL, size and MIME type (MediaWiki allows 50 titles per query) instead
+        of one imageinfo request per title. Candidates are ranked locally (see
+        _rank_wiki_api_images) and only the top few are downloaded, in a single
+        batched vision check; the highest-ranked one that passes is returned.
         """
         try:
             api_url = "https://en.wikipedia.org/w/api.php"
             params = {
                 "action": "query",
                 "titles": entity_name,
-                "prop": "images",
+                "generator": "images",
+                "gimlimit": 50,
+                "prop": "imageinfo",
+                "iiprop": "url|size|mime",
                 "format": "json",
                 "redirects": True,
+                **self._rendition_params(),
             }
-            r = requests.get(api_url, params=params, headers={'User-Agent': 'FootyBitezBot/1.0'}, timeout=10)
+            r = http.get(api_url, params=params, headers={'User-Agent': 'FootyBitezBot/1.0'}, timeout=10)
             if r.status_code != 200:
                 return None
-            
-            data = r.json()
-            pages = data.get("query", {}).get("pages", {})
-            if not pages:
+
+            pages = r.json().get("query", {}).get("pages", {})
+            ranked = self._rank_wiki_api_images(pages.values(), entity_name)
+            if not ranked:
                 return None
-            
-            page_id = next(iter(pages))
-            images = pages[page_id].get("images", [])
-            
-            football_keywords = ["playing", "football", "soccer", "goal", "match", "training", "action", "ronaldo", "goalkeeper", "ball", "kit", "stadium"]
-            entity_lower = entity_name.lower().replace(" ", "_")
-            
-            for img in images:
-                img_title = img.get("title", "")
-                img_lower = img_title.lower()
-                
-                # Prefer images with entity name and football keywords
-                has_entity = entity_lower in img_lower or entity_name.split()[0].lower() in img_lower
-                has_football = any(kw in img_lower for kw in football_keywords)
-                
-                if has_entity or has_football:
-                    # Get imageinfo for the image URL
-                    info_params = {
-                        "action": "query",
-                        "titles": img_title,
-                        "prop": "imageinfo",
-                        "iiprop": "url",
-                        "format": "json",
-                    }
-                    info_r = requests.get(api_url, params=info_params, headers={'User-Agent': 'FootyBitezBot/1.0'}, timeout=10)
-                    if info_r.status_code == 200:
-                        info_data = info_r.json()
-                        info_pages = info_data.get("query", {}).get("pages", {})
-                        for info_page in info_pages.values():
-                            imageinfo = info_page.get("imageinfo", [])
-                            if imageinfo:
-                                img_url = imageinfo[0].get("url", "")
-                                if img_url:
-                                    fname = f"wiki_api_{hash(img_url)}.jpg"
-                                    fpath = os.path.join(self.download_dir, fname)
-                                    self._download_file(img_url, fpath, context_query=entity_name, strict=False)
-                                    if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
-                                        self._add_credit(f"Image from Wikipedia (Entity: {entity_name})")
-                                        self._write_image_meta(fpath, "Wikipedia API Images", entity_name)
-                                        return fpath
-            return None
+
+            top_n = max(1, int(os.getenv("WIKI_API_IMAGE_CANDIDATES", "3")))
+            candidates = []
+            for img_url in ranked[:top_n]:
+                fname = f"wiki_api_{stable_hash(img_url)}.jpg"
+                candidates.append((img_url, os.path.join(self.download_dir, fname)))
+
+            existing = {fpath for _, fpath in candidates if os.path.exists(fpath)}
+            with self._batched_vision_checks():
+                for img_url, fpath in candidates:
+                    self._download_file(img_url, fpath, context_query=entity_name, strict=False)
+
+            chosen = None
+            for img_url, fpath in candidates:
+                if not os.path.exists(fpath):
+                    continue
+                if chosen is None and os.path.getsize(fpath) > 5000:
+                    chosen = fpath
+                elif fpath != chosen and fpath not in existing:
+                    # Passed but not needed — it stays in the media cache, not in
+                    # this job's staging folder, and its pHash / URL claims are
+                    # released for later segments.
+                    self._discard_staged(fpath)
+            if chosen:
+                self._add_credit(f"Image from Wikipedia (Entity: {entity_name})", chosen)
+                self._write_image_meta(chosen, "Wikipedia API Images", entity_name)
+            return chosen
         except Exception as e:
             print(f"Wikipedia API images fallback error ({entity_name}): {e}")
             return None
 
-    def fetch_pexels_video(self, query: str, output_path: str) -> bool:
+    def _rank_wiki_api_images(self, pages, entity_name: str) -> list:
+        """
+        Orders the image pages of a generator=images query best-first and
+        returns their download URLs (pre-scaled rendition where available).
+
+        Only titles naming the entity or a football keyword are kept, as before.
+        Bitmaps too small for the frame and non-photo MIME types (SVG crests,
+        audio) are dropped. The rest rank by entity-name match, then football
+        keyword, then resolution.
+        """
+        football_keywords = ["playing", "football", "soccer", "goal", "match", "training", "action", "ronaldo", "goalkeeper", "ball", "kit", "stadium"]
+        entity_lower = entity_name.lower().replace(" ", "_")
+        first_name = entity_name.split()[0].lower() if entity_name.split() else entity_lower
+        min_side = int(os.getenv("MEDIA_MIN_IMAGE_SIDE", "200"))
+
+        scored = []
+        for page in pages:
+            info = (page.get("imageinfo") or [{}])[0]
+            img_url = info.get("thumburl") or info.get("url")
+            if not img_url or img_url in self.used_urls:
+                continue
+            mime = info.get("mime", "")
+            if mime not in ("image/jpeg", "image/png", "image/webp"):
+                continue
+            width, height = info.get("width", 0), info.get("height", 0)
+            if min(width, height) < min_side:
+                continue
+            img_lower = page.get("title", "").lower().replace(" ", "_")
+            has_entity = entity_lower in img_lower or first_name in img_lower
+            has_football = any(kw in img_lower for kw in football_keywords)
+            if not (has_entity or has_football):
+                continue
+            scored.append(((has_entity, has_football, min(width * height, 4_000_000)), img_url))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [url for _, url in scored]
+
+    def fetch_pexels_video(self, query: str, output_path: str, seconds: float | None = None) -> bool:
         """
         Fetches a CC0 stock football video from Pexels.
         Pexels API is free — register at pexels.com/api for a key.
+
+        Downloads the smallest rendition that covers the target frame, trims it
+        to `seconds` (default PEXELS_CLIP_SECONDS) and caches the trimmed clip
+        by Pexels video ID (see video_clip.py).
         """
-        import requests
         
         PEXELS_API_KEY = self.pexels_api_key
         if not PEXELS_API_KEY:
             print("[Pexels] No API Key set.")
             return False
+        if seconds is None:
+            seconds = float(os.getenv("PEXELS_CLIP_SECONDS", "5"))
         
         try:
-            r = requests.get(
+            params = {"query": query, "per_page": 5, "orientation": "landscape"}
+            data = self._cached_search("pexels", query, lambda: self._get_json(
                 "https://api.pexels.com/videos/search",
-                headers={"Authorization": PEXELS_API_KEY},
-                params={"query": query, "per_page": 5, "orientation": "landscape"},
-                timeout=15
-            )
-            
-            if r.status_code != 200:
-                print(f"[Pexels] API error {r.status_code}: {r.text}")
+                headers={"Authorization": PEXELS_API_KEY}, params=params, timeout=15
+            ), variant="videos")
+            if data is None:
+                print(f"[Pexels] API error {getattr(self._tls, 'last_status', None)} for query '{query}'")
                 return False
             
-            videos = r.json().get("videos", [])
+            videos = data.get("videos", [])
             if not videos:
                 print(f"[Pexels] No videos found for query '{query}'")
                 return False
             
+            clip_cache = get_video_cache()
             for video in videos:
-                for vfile in video.get("video_files", []):
-                    if vfile.get("width", 0) >= 1280 and vfile.get("file_type") == "video/mp4":
-                        video_url = vfile["link"]
-                        vid_r = requests.get(video_url, timeout=60, stream=True)
-                        if vid_r.status_code == 200:
-                            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                            with open(output_path, 'wb') as f:
-                                for chunk in vid_r.iter_content(chunk_size=8192):
-                                    f.write(chunk)
-                            print(f"[Pexels] Successfully downloaded video for '{query}' to {output_path}")
-                            return True
+                cache_key = f"pexels:video:{video.get('id')}"
+                cached = clip_cache.lookup(cache_key) if video.get("id") else None
+                if cached and self._clip_seconds(cached) >= seconds:
+                    stage_clip(cached, output_path)
+                    print(f"[Pexels] Using cached clip {video['id']} for '{query}'")
+                    return True
+
+                vfile = select_rendition(video.get("video_files", []))
+                if not vfile:
+                    continue
+                part_path = output_path + ".part"
+                try:
+                    with http.get(vfile["link"], timeout=60, stream=True) as vid_r:
+                        if vid_r.status_code != 200:
+                            continue
+                        if not self._stream_video(vid_r, part_path):
+                            continue
+                    print(f"[Pexels] Downloaded {vfile['width']}x{vfile['height']}@{vfile.get('fps') or '?'}fps "
+                          f"rendition ({os.path.getsize(part_path) / 1e6:.1f} MB) for '{query}'")
+                    trimmed = trim_clip(part_path, output_path, seconds)
+                    if not trimmed:
+                        os.replace(part_path, output_path)
+                finally:
+                    if os.path.exists(part_path):
+                        try:
+                            os.remove(part_path)
+                        except OSError:
+                            pass
+                with open(output_path + ".json", "w", encoding="utf-8") as f:
+                    json.dump({"source": "Pexels", "artist": (video.get("user") or {}).get("name", ""),
+                               "video_id": video.get("id"),
+                               "seconds": seconds if trimmed else video.get("duration") or seconds}, f)
+                if video.get("id"):
+                    clip_cache.store(cache_key, output_path)
+                print(f"[Pexels] Successfully downloaded video for '{query}' to {output_path}")
+                return True
         except Exception as e:
             print(f"[Pexels] Exception during video fetch: {e}")
         return False
 
+    @staticmethod
+    def _stream_video(r, part_path: str) -> bool:
+        """
+        Streams response `r` to `part_path`, giving up once Content-Length or the
+        running total exceeds PEXELS_VIDEO_MAX_MB (default 200) — the rendition
+        metadata can understate a file, and a runaway download would otherwise
+        fill the disk. Returns False (leaving the caller to remove the partial
+        file) if the cap was hit.
+        """
+        max_bytes = int(float(os.getenv("PEXELS_VIDEO_MAX_MB", "200")) * 1024 * 1024)
+        declared = int(r.headers.get("Content-Length") or 0)
+        if declared > max_bytes:
+            print(f"[Pexels] Skipping {declared / 1048576:.1f} MB rendition: exceeds the download cap")
+            return False
+        os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+        written = 0
+        with open(part_path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=65536):
+                written += len(chunk)
+                if written > max_bytes:
+                    print(f"[Pexels] Aborting download: body exceeds the {max_bytes / 1048576:g} MB cap")
+                    return False
+                f.write(chunk)
+        return True
+
+    @staticmethod
+    def _clip_seconds(path: str) -> float:
+        """Length recorded in a cached clip's sidecar (0 if unknown)."""
+        try:
+            with open(path + ".json", "r", encoding="utf-8") as f:
+                return float(json.load(f).get("seconds") or 0)
+        except Exception:
+            return 0.0
+
     # ─────────────────────────────────────────────────────────
     # AI IMAGE GENERATION
     # ─────────────────────────────────────────────────────────
@@ -1033,13 +2035,19 @@ class MediaSourcer:
         image fails the check, generation is retried up to `max_attempts` times before
         giving up so the caller can fall back to the next source tier.
 
+        A cached image that passed the same check for this prompt is served
+        first once the prompt has its full set of variants, or as a last resort
+        when no new one can be generated (see ai_image_cache.py).
+
         Returns True on success, False on any failure.
         """
+        ai_cache = get_ai_image_cache()
+        if ai_cache.serve("gemini_shorts", prompt, "9:16", output_path, require_safe=True):
+            return True
         if not self.gemini_keys:
-            return False
+            return ai_cache.serve("gemini_shorts", prompt, "9:16", output_path, require_safe=True, partial=True)
 
         try:
-            from google import genai
             from google.genai import types
             from PIL import Image as PILImage
         except ImportError:
@@ -1052,26 +2060,24 @@ class MediaSourcer:
             f"family-friendly, safe for work, no text overlays, cinematic quality"
         )
 
-        image_model = "gemini-2.5-flash-image"
+        image_model = GEMINI_IMAGE_MODEL
+        gateway = get_llm_gateway()
 
         for attempt in range(max_attempts):
             generated = False
-            for i, key in enumerate(self.gemini_keys):
-                combo = (key, image_model)
-                if combo in self._gemini_unusable:
-                    # Already confirmed dead (daily quota / zero allocation) earlier
-                    # in this run — skip straight past it instead of re-discovering
-                    # the same failure on every attempt.
-                    continue
+            combos = gateway.combos("gemini", self.gemini_keys, [image_model])
+            if not combos:
+                print("[AI Image] Every Gemini key is marked unusable for image generation — skipping.")
+                return False
+            for i, key, model in combos:
                 try:
-                    client = genai.Client(api_key=key)
-                    response = client.models.generate_content(
-                        model=image_model,
+                    response = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                        model=model,
                         contents=full_prompt,
                         config=types.GenerateContentConfig(
                             response_modalities=["TEXT", "IMAGE"]
                         )
-                    )
+                    ))
                     for part in response.candidates[0].content.parts:
                         if part.inline_data and part.inline_data.mime_type.startswith("image/"):
                             img = PILImage.open(io.BytesIO(part.inline_data.data)).convert("RGB")
@@ -1083,11 +2089,12 @@ class MediaSourcer:
                             break
                     if generated:
                         break
+                except ComboUnavailable:
+                    continue
                 except Exception as e:
+                    # Already classified and recorded by the gateway; only a
+                    # confirmed per-minute quota is worth a short wait.
                     print(f"[AI Image] Key #{i+1} failed: {e}")
-                    err_str = str(e).lower()
-                    if any(term in err_str for term in ["429", "resource_exhausted", "quota", "404", "not_found"]):
-                        self._gemini_unusable.add(combo)
                     try:
                         from footybitez.media.football_visual_generator import handle_429_sleep
                         handle_429_sleep(str(e))
@@ -1104,6 +2111,7 @@ class MediaSourcer:
                 passed = False
 
             if passed:
+                ai_cache.store("gemini_shorts", prompt, "9:16", output_path, verdict="passed")
                 return True
 
             print(f"[AI Image] Generated image REJECTED by safety/relevance check (attempt {attempt+1}/{max_attempts}). Regenerating...")
@@ -1113,7 +2121,7 @@ class MediaSourcer:
                 pass
 
         print(f"[AI Image] Gave up after {max_attempts} attempts — no safe/relevant image could be generated.")
-        return False
+        return ai_cache.serve("gemini_shorts", prompt, "9:16", output_path, require_safe=True, partial=True)
 
     # ─────────────────────────────────────────────────────────
     # PRIVATE FETCH HELPERS
@@ -1127,7 +2135,22 @@ class MediaSourcer:
     def _fetch_wikimedia_images(self, query, count=3):
         """Fetches up to `count` images from Wikimedia Commons with football-only filter."""
         results = []
+        candidates = self._wikimedia_candidates(query)
+        while len(results) < count:
+            # Candidates are verified in one batched vision request per chunk
+            # instead of one Gemini call per image.
+            chunk = list(itertools.islice(candidates, count - len(results)))
+            if not chunk:
+                break
+            results.extend(self._stage_candidates_batched(chunk))
+        return results
 
+    def _wikimedia_candidates(self, query):
+        """
+        Yields Commons search candidates (see _stage_candidate) for `query`,
+        trying progressively looser search phrasings. Lazy, so later phrasings
+        are only searched if the caller still needs more.
+        """
         # Apply football filter to the incoming query
         safe_q = self._make_football_query(query)
         # Clean: remove special chars, truncate
@@ -1143,8 +2166,6 @@ class MediaSourcer:
 ]
 
         for attempt_query in queries_to_try:
-            if len(results) >= count:
-                break
             try:
                 search_url = "https://commons.wikimedia.org/w/api.php"
                 params = {
@@ -1156,55 +2177,64 @@ class MediaSourcer:
                     "gsrlimit": 15,
                     "prop": "imageinfo",
                     "iiprop": "url|size|mime|extmetadata",
+                    **self._rendition_params(),
                 }
                 headers = {'User-Agent': 'FootyBitezBot/1.0'}
-                r = requests.get(search_url, params=params, headers=headers, timeout=10)
-                if r.status_code != 200 or not r.text.strip():
+                data = self._cached_search(
+                    "wikimedia", attempt_query,
+                    lambda: self._get_json(search_url, params=params, headers=headers, timeout=10),
+                    variant=json.dumps(self._rendition_params(), sort_keys=True))
+                if data is None:
                     continue
-                try:
-                    data = r.json()
-                except json.JSONDecodeError:
-                    continue
-
                 pages = data.get("query", {}).get("pages", {})
-                if not pages:
-                    continue
+            except Exception as e:
+                print(f"Wikimedia multi-fetch error (query='{attempt_query}'): {e}")
+                continue
 
-                for page_id in pages:
-                    if len(results) >= count:
-                        break
-                    page = pages[page_id]
-                    imageinfo = page.get("imageinfo", [])
-                    if not imageinfo:
-                        continue
+            for page_id in pages:
+                page = pages[page_id]
+                imageinfo = page.get("imageinfo", [])
+                if not imageinfo:
+                    continue
+                info = imageinfo[0]
 
-                    url = imageinfo[0].get("url", "")
-                    if url in self.used_urls:
-                        continue
-                    mime = imageinfo[0].get("mime", "")
+                original_url = info.get("url", "")
+                # Pre-scaled rendition (see _rendition_params); the original
+                # only when Commons didn't return one.
+                url = info.get("thumburl") or original_url
+                if url in self.used_urls:
+                    continue
+                mime = info.get("mime", "")
 
-                    # Skip SVGs, audio, video
-                    if not mime.startswith("image/") or "svg" in mime.lower():
-                        continue
+                # Skip SVGs, audio, video
+                if not mime.startswith("image/") or "svg" in mime.lower():
+                    continue
 
-                    meta = imageinfo[0].get("extmetadata", {})
-                    categories = meta.get("Categories", {}).get("value", "")
-                    license_name = meta.get("LicenseShortName", {}).get("value", "CC BY-SA")
-                    artist = meta.get("Artist", {}).get("value", "Unknown")
-                    artist = re.sub('<[^<]+?>', '', artist)
+                meta = info.get("extmetadata", {})
+                categories = meta.get("Categories", {}).get("value", "")
+                license_name = meta.get("LicenseShortName", {}).get("value", "CC BY-SA")
+                artist = meta.get("Artist", {}).get("value", "Unknown")
+                artist = re.sub('<[^<]+?>', '', artist)
 
-                    # ── Football-only filter ──────────────────────────────
-                    img_title = page.get("title", "")
-                    if self._is_bad_image(url=url, title=img_title, tags=categories):
-                        continue
-                    # ── Named-entity filter (see _required_name_token) — catches
-                    # e.g. "Diego Maradona" searches matching "Diego Forlán" /
-                    # "Diego Costa" pages on first-name overlap alone.
-                    if self._name_mismatch(query, title=img_title, tags=categories):
-                        continue
+                # ── Football-only filter ──────────────────────────────
+                img_title = page.get("title", "")
+                if self._is_bad_image(url=original_url, title=img_title, tags=categories):
+                    continue
+                # ── Named-entity filter (see _required_name_token) — catches
+                # e.g. "Diego Maradona" searches matching "Diego Forlán" /
+                # "Diego Costa" pages on first-name overlap alone.
+                if self._name_mismatch(query, title=img_title, tags=categories):
+                    continue
 
-                    fname = f"wiki_{hash(url)}.jpg"
-                    fpath = os.path.join(self.download_dir, fname)
+                thumb = info.get("thumburl")
+                yield {
+                    "provider": "wikimedia",
+                    "url": url,
+                    # Commons serves a standard 330px step of any thumb URL.
+                    "preview": re.sub(r"/\d+px-", "/330px-", thumb) if thumb else None,
+                    "width": info.get("thumbwidth") or info.get("width") or 0,
+                    "height": info.get("thumbheight") or info.get("height") or 0,
+                    "fpath": os.path.join(self.download_dir, f"wiki_{stable_hash(url)}.jpg"),
                     # strict=False: Wikimedia Commons has its own community
                     # moderation/deletion policy against NSFW content (unlike raw DDG
                     # web search, which is the actual high-risk source). Fail-closed
@@ -1213,65 +2243,115 @@ class MediaSourcer:
                     # auto-rejected too, cascading all the way down to blank solid-
                     # color fallback cards instead of a real (still text-filtered)
                     # image.
-                    self._download_file(url, fpath, context_query=query, strict=False)
+                    "strict": False,
+                    "context": query,
+                    "credit": f"Image from Wikimedia Commons: {artist} ({license_name})",
+                    "source": "Wikimedia Commons",
+                    "artist": artist,
+                    "min_bytes": 5000,
+                }
 
-                    if os.path.exists(fpath) and os.path.getsize(fpath) > 5000:
-                        self.used_urls.add(url)
-                        self._add_credit(f"Image from Wikimedia Commons: {artist} ({license_name})")
-                        self._write_image_meta(fpath, "Wikimedia Commons", artist)
-                        results.append(fpath)
+    def _stage_candidate(self, candidate: dict) -> str | None:
+        """
+        Downloads one search candidate — a dict from one of the *_candidates
+        generators holding its url, staging fpath, vision `strict`-ness,
+        context query and credit — and records its credit. Returns the staged
+        path, or None if it was filtered, rejected or failed to download.
+        """
+        url, fpath = candidate["url"], candidate["fpath"]
+        if url in self.used_urls:
+            return None
+        self._download_file(url, fpath, context_query=candidate["context"],
+                            strict=candidate["strict"], prefilter=True)
+        if not os.path.exists(fpath) or os.path.getsize(fpath) <= candidate.get("min_bytes", 0):
+            return None
+        self.used_urls.add(url)
+        self._add_credit(candidate["credit"], fpath)
+        self._write_image_meta(fpath, candidate["source"], candidate["artist"])
+        return fpath
 
-            except Exception as e:
-                print(f"Wikimedia multi-fetch error (query='{attempt_query}'): {e}")
-                continue
+    def _stage_candidates(self, candidates, count: int) -> list:
+        """Stages candidates in order until `count` of them made it."""
+        paths = []
+        for candidate in candidates:
+            if len(paths) >= count:
+                break
+            path = self._stage_candidate(candidate)
+            if path:
+                paths.append(path)
+        return paths
 
-        return results
+    def _stage_candidates_batched(self, candidates: list) -> list:
+        """Stages every candidate with one batched vision check; returns the ones that passed."""
+        tls = self._tls
+        outer = getattr(tls, "provider", None)
+        staged = []
+        with self._batched_vision_checks() as rejected:
+            for candidate in candidates:
+                # Attributes the deferred vision verdict to the right provider.
+                tls.provider = candidate["provider"] if outer is None else outer
+                staged.append(self._stage_candidate(candidate))
+        tls.provider = outer
+        return [p for p in staged if p and p not in rejected]
 
     def _fetch_unsplash_image(self, query, count=1):
+        return self._stage_candidates(self._unsplash_candidates(query, per_page=count * 4), count)
+
+    def _unsplash_candidates(self, query, per_page: int = 4):
+        """Yields filtered Unsplash search candidates (see _stage_candidate)."""
         if not self.unsplash_api_key:
-            return []
-        paths = []
+            return
         try:
             safe_query = self._make_football_query(query)
             url = "https://api.unsplash.com/search/photos"
             params = {
                 "query": safe_query,
-                "per_page": count * 4,  # Fetch more to filter bad ones
+                "per_page": per_page,  # Fetch more to filter bad ones
                 "client_id": self.unsplash_api_key,
                 "content_filter": "high",
             }
-            res = requests.get(url, params=params, timeout=10)
-            if res.status_code == 200:
-                data = res.json()
-                for photo in data.get('results', []):
-                    if len(paths) >= count:
-                        break
-                    src = photo['urls']['regular']
-                    if src in self.used_urls:
-                        continue
-                    # Check photo tags for bad-sport content
-                    photo_tags = " ".join(t.get("title", "") for t in photo.get("tags", []))
-                    alt = photo.get("alt_description") or ""
-                    if self._is_bad_image(url=src, title=alt, tags=photo_tags):
-                        continue
-                    if self._name_mismatch(query, title=alt, tags=photo_tags):
-                        continue
-                    user = photo['user']['name']
-                    fpath = os.path.join(self.download_dir, f"unsplash_{photo['id']}.jpg")
-                    self._download_file(src, fpath, context_query=query, strict=False)
-                    if os.path.exists(fpath):
-                        self.used_urls.add(src)
-                        paths.append(fpath)
-                        self._add_credit(f"Photo by {user} on Unsplash")
-                        self._write_image_meta(fpath, "Unsplash", user)
+            data = self._cached_search("unsplash", safe_query,
+                                       lambda: self._get_json(url, params=params, timeout=10),
+                                       variant=f"per_page={params['per_page']}")
+            photos = data.get('results', []) if data is not None else []
         except Exception as e:
             print(f"Unsplash error: {e}")
-        return paths
+            return
+        for photo in photos:
+            src = photo['urls']['regular']
+            if src in self.used_urls:
+                continue
+            # Check photo tags for bad-sport content
+            photo_tags = " ".join(t.get("title", "") for t in photo.get("tags", []))
+            alt = photo.get("alt_description") or ""
+            if self._is_bad_image(url=src, title=alt, tags=photo_tags):
+                continue
+            if self._name_mismatch(query, title=alt, tags=photo_tags):
+                continue
+            user = photo['user']['name']
+            # "regular" renditions are 1080px wide.
+            width, height = photo.get("width") or 0, photo.get("height") or 0
+            yield {
+                "provider": "unsplash",
+                "url": src,
+                "preview": photo['urls'].get('small'),
+                "width": min(width, 1080),
+                "height": round(height * min(1.0, 1080 / width)) if width else 0,
+                "fpath": os.path.join(self.download_dir, f"unsplash_{photo['id']}.jpg"),
+                "strict": False,
+                "context": query,
+                "credit": f"Photo by {user} on Unsplash",
+                "source": "Unsplash",
+                "artist": user,
+            }
 
     def _fetch_pixabay_image(self, query, count=1):
+        return self._stage_candidates(self._pixabay_candidates(query, per_page=count * 4), count)
+
+    def _pixabay_candidates(self, query, per_page: int = 4):
+        """Yields filtered Pixabay search candidates (see _stage_candidate)."""
         if not self.pixabay_api_key:
-            return []
-        paths = []
+            return
         try:
             safe_query = self._make_football_query(query)
             url = "https://pixabay.com/api/"
@@ -1281,34 +2361,42 @@ class MediaSourcer:
                 "image_type": "photo",
                 "category": "sports",  # Restrict to sports category
                 "safesearch": "true",
-                "per_page": count * 4,  # Fetch more to filter
+                "per_page": per_page,  # Fetch more to filter
             }
-            res = requests.get(url, params=params, timeout=10)
-            if res.status_code == 200:
-                data = res.json()
-                for hit in data.get('hits', []):
-                    if len(paths) >= count:
-                        break
-                    src = hit['largeImageURL']
-                    if src in self.used_urls:
-                        continue
-                    # Check pixabay tags field
-                    tags = hit.get("tags", "")
-                    if self._is_bad_image(url=src, title=tags, tags=tags):
-                        continue
-                    if self._name_mismatch(query, title=tags, tags=tags):
-                        continue
-                    user = hit['user']
-                    fpath = os.path.join(self.download_dir, f"pixabay_{hit['id']}.jpg")
-                    self._download_file(src, fpath, context_query=query, strict=False)
-                    if os.path.exists(fpath):
-                        self.used_urls.add(src)
-                        paths.append(fpath)
-                        self._add_credit(f"Image by {user} from Pixabay")
-                        self._write_image_meta(fpath, "Pixabay", user)
+            data = self._cached_search("pixabay", safe_query,
+                                       lambda: self._get_json(url, params=params, timeout=10),
+                                       variant=f"per_page={params['per_page']}")
+            hits = data.get('hits', []) if data is not None else []
         except Exception as e:
             print(f"Pixabay error: {e}")
-        return paths
+            return
+        for hit in hits:
+            src = hit['largeImageURL']
+            if src in self.used_urls:
+                continue
+            # Check pixabay tags field
+            tags = hit.get("tags", "")
+            if self._is_bad_image(url=src, title=tags, tags=tags):
+                continue
+            if self._name_mismatch(query, title=tags, tags=tags):
+                continue
+            user = hit['user']
+            # largeImageURL is scaled to fit 1280x1280.
+            width, height = hit.get("imageWidth") or 0, hit.get("imageHeight") or 0
+            scale = min(1.0, 1280 / max(width, height)) if width and height else 1.0
+            yield {
+                "provider": "pixabay",
+                "url": src,
+                "preview": hit.get("webformatURL"),
+                "width": round(width * scale),
+                "height": round(height * scale),
+                "fpath": os.path.join(self.download_dir, f"pixabay_{hit['id']}.jpg"),
+                "strict": False,
+                "context": query,
+                "credit": f"Image by {user} from Pixabay",
+                "source": "Pixabay",
+                "artist": user,
+            }
 
     def _fetch_openverse_image(self, query, count=1):
         """
@@ -1318,46 +2406,54 @@ class MediaSourcer:
         "suspended" or run out of quota; it's a free, always-available layer to try
         before falling back to unfiltered DDG web search.
         """
-        paths = []
+        return self._stage_candidates(self._openverse_candidates(query, page_size=count * 4), count)
+
+    def _openverse_candidates(self, query, page_size: int = 4):
+        """Yields filtered Openverse search candidates (see _stage_candidate)."""
         try:
             safe_query = self._make_football_query(query)
             url = "https://api.openverse.org/v1/images/"
             params = {
                 "q": safe_query,
                 "license_type": "all-cc",
-                "page_size": count * 4,  # fetch more to filter bad ones
+                "page_size": page_size,  # fetch more to filter bad ones
             }
             headers = {'User-Agent': 'FootyBitezBot/1.0 (contact: admin@footybitez.com)'}
-            res = requests.get(url, params=params, headers=headers, timeout=10)
-            if res.status_code == 200:
-                data = res.json()
-                for hit in data.get('results', []):
-                    if len(paths) >= count:
-                        break
-                    src = hit.get('url')
-                    if not src or src in self.used_urls:
-                        continue
-                    title = hit.get('title') or ""
-                    tags = " ".join(t.get('name', '') for t in (hit.get('tags') or []))
-                    if self._is_bad_image(url=src, title=title, tags=tags):
-                        continue
-                    if self._name_mismatch(query, title=title, tags=tags):
-                        continue
-                    creator = hit.get('creator') or "Unknown"
-                    license_name = (hit.get('license') or 'CC').upper()
-                    fpath = os.path.join(self.download_dir, f"openverse_{hash(src)}.jpg")
-                    # Openverse aggregates many source providers of mixed curation
-                    # quality — treat like Wikimedia/DDG (fail closed on the safety
-                    # check), not like Unsplash/Pixabay's own moderated feeds.
-                    self._download_file(src, fpath, context_query=query, strict=True)
-                    if os.path.exists(fpath):
-                        self.used_urls.add(src)
-                        paths.append(fpath)
-                        self._add_credit(f"Image by {creator} via Openverse ({license_name})")
-                        self._write_image_meta(fpath, "Openverse", creator)
+            data = self._cached_search("openverse", safe_query,
+                                       lambda: self._get_json(url, params=params, headers=headers, timeout=10),
+                                       variant=f"page_size={params['page_size']}")
+            hits = data.get('results', []) if data is not None else []
         except Exception as e:
             print(f"[Openverse] Error: {e}")
-        return paths
+            return
+        for hit in hits:
+            src = hit.get('url')
+            if not src or src in self.used_urls:
+                continue
+            title = hit.get('title') or ""
+            tags = " ".join(t.get('name', '') for t in (hit.get('tags') or []))
+            if self._is_bad_image(url=src, title=title, tags=tags):
+                continue
+            if self._name_mismatch(query, title=title, tags=tags):
+                continue
+            creator = hit.get('creator') or "Unknown"
+            license_name = (hit.get('license') or 'CC').upper()
+            yield {
+                "provider": "openverse",
+                "url": src,
+                "preview": hit.get('thumbnail'),
+                "width": hit.get('width') or 0,
+                "height": hit.get('height') or 0,
+                "fpath": os.path.join(self.download_dir, f"openverse_{stable_hash(src)}.jpg"),
+                # Openverse aggregates many source providers of mixed curation
+                # quality — treat like Wikimedia/DDG (fail closed on the safety
+                # check), not like Unsplash/Pixabay's own moderated feeds.
+                "strict": True,
+                "context": query,
+                "credit": f"Image by {creator} via Openverse ({license_name})",
+                "source": "Openverse",
+                "artist": creator,
+            }
 
     _VALID_IMAGE_EXTS = {"jpg", "jpeg", "png", "gif", "webp", "bmp"}
 
@@ -1374,6 +2470,14 @@ class MediaSourcer:
         ext = image_url.split('.')[-1].split('?')[0].lower()
         return ext if ext in self._VALID_IMAGE_EXTS else "jpg"
 
+    def _ddg_image_search(self, ddg_query: str) -> list:
+        """DDG image search results, through the search cache. Empty result lists
+        aren't cached — DDG returns those when it is quietly rate-limiting."""
+        def search():
+            with DDGS() as ddgs:
+                return list(ddgs.images(ddg_query, safesearch='on', max_results=25))
+        return self._cached_search("ddg", ddg_query, search, cache_empty=False) or []
+
     def _fetch_ddg_image(self, query, suffix):
         """Fetches an image using DuckDuckGo as final free fallback with football-only filter."""
         if DDGS is None:
@@ -1383,26 +2487,25 @@ class MediaSourcer:
             safe_query = self._make_football_query(query)
             # Append negative terms in the query string (DDG supports them)
             ddg_query = f"{safe_query} {self._FOOTBALL_NEG_SUFFIX}"
-            with DDGS() as ddgs:
-                results = list(ddgs.images(ddg_query, safesearch='on', max_results=25))
-                if results:
-                    for result in results:
-                        image_url = result.get('image', '')
-                        title = result.get('title', '')
-                        if not image_url or image_url in self.used_urls:
-                            continue
-                        # Filter: reject bad-sport URLs and titles
-                        if self._is_bad_image(url=image_url, title=title):
-                            continue
-                        if self._name_mismatch(query, title=title):
-                            continue
-                        ext = self._safe_image_ext(image_url)
-                        filename = f"ddg_{suffix}_{hash(query)}.{ext}"
-                        filepath = os.path.join(self.download_dir, filename)
-                        self._download_file(image_url, filepath, context_query=query, strict=True)
-                        if os.path.exists(filepath):
-                            self.used_urls.add(image_url)
-                            return filepath
+            results = self._ddg_image_search(ddg_query)
+            if results:
+                for result in results:
+                    image_url = result.get('image', '')
+                    title = result.get('title', '')
+                    if not image_url or image_url in self.used_urls:
+                        continue
+                    # Filter: reject bad-sport URLs and titles
+                    if self._is_bad_image(url=image_url, title=title):
+                        continue
+                    if self._name_mismatch(query, title=title):
+                        continue
+                    ext = self._safe_image_ext(image_url)
+                    filename = f"ddg_{suffix}_{stable_hash(query)}.{ext}"
+                    filepath = os.path.join(self.download_dir, filename)
+                    self._download_file(image_url, filepath, context_query=query, strict=True, prefilter=True)
+                    if os.path.exists(filepath):
+                        self.used_urls.add(image_url)
+                        return filepath
         except Exception as e:
             print(f"DDG Fallback error: {e}")
         return None
@@ -1416,28 +2519,29 @@ class MediaSourcer:
         try:
             safe_query = self._make_football_query(query)
             ddg_query = f"{safe_query} {self._FOOTBALL_NEG_SUFFIX}"
-            with DDGS() as ddgs:
-                results = list(ddgs.images(ddg_query, safesearch='on', max_results=25))
-                if results:
-                    for result in results:
-                        if len(paths) >= count:
-                            break
-                        image_url = result.get('image', '')
-                        title = result.get('title', '')
-                        if not image_url or image_url in self.used_urls:
-                            continue
-                        # Filter: reject bad-sport URLs and titles
-                        if self._is_bad_image(url=image_url, title=title):
-                            continue
-                        if self._name_mismatch(query, title=title):
-                            continue
-                        ext = self._safe_image_ext(image_url)
-                        filename = f"ddg_{suffix}_{len(paths)}_{hash(query)}.{ext}"
-                        filepath = os.path.join(self.download_dir, filename)
-                        self._download_file(image_url, filepath, context_query=query, strict=True)
-                        if os.path.exists(filepath):
-                            self.used_urls.add(image_url)
-                            paths.append(filepath)
+            results = self._ddg_image_search(ddg_query)
+            if results:
+                for result in results:
+                    if len(paths) >= count:
+                        break
+                    image_url = result.get('image', '')
+                    title = result.get('title', '')
+                    if not image_url or image_url in self.used_urls:
+                        continue
+                    # Filter: reject bad-sport URLs and titles
+                    if self._is_bad_image(url=image_url, title=title):
+                        continue
+                    if self._name_mismatch(query, title=title):
+                        continue
+                    ext = self._safe_image_ext(image_url)
+                    # Named by image URL, not position: a batched tier's second pass
+                    # starts from an empty list and must not reuse the first's names.
+                    filename = f"ddg_{suffix}_{stable_hash(image_url)}.{ext}"
+                    filepath = os.path.join(self.download_dir, filename)
+                    self._download_file(image_url, filepath, context_query=query, strict=True, prefilter=True)
+                    if os.path.exists(filepath):
+                        self.used_urls.add(image_url)
+                        paths.append(filepath)
         except Exception as e:
             print(f"DDG Multi Fallback error: {e}")
         return paths
@@ -1451,8 +2555,16 @@ class MediaSourcer:
         Regenerates (new random seed via cache-busting) up to `max_attempts` times if
         rejected, then gives up so the caller falls back to the next source tier.
 
+        A cached image that passed the same check for this prompt is served
+        first once the prompt has its full set of variants, or as a last resort
+        when every attempt fails (see ai_image_cache.py).
+
         Returns True on success, False on failure.
         """
+        ai_cache = get_ai_image_cache()
+        if ai_cache.serve("pollinations", prompt, "9:16", output_path, require_safe=True):
+            return True
+
         import urllib.parse
         encoded = urllib.parse.quote(prompt)
         headers = {'User-Agent': 'FootyBitezBot/1.0'}
@@ -1463,7 +2575,7 @@ class MediaSourcer:
                 # different image instead of the same (rejected) one.
                 seed = random.randint(1, 10_000_000)
                 url = f"https://image.pollinations.ai/prompt/{encoded}?width=1080&height=1920&nologo=true&seed={seed}"
-                r = requests.get(url, headers=headers, timeout=30)
+                r = http.get(url, headers=headers, timeout=30)
                 if r.status_code == 200 and 'image' in r.headers.get('Content-Type', ''):
                     os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
                     with open(output_path, 'wb') as f:
@@ -1480,6 +2592,7 @@ class MediaSourcer:
 
                     if passed:
                         print(f"[Pollinations] Generated image: {output_path} (attempt {attempt+1}/{max_attempts})")
+                        ai_cache.store("pollinations", prompt, "9:16", output_path, verdict="passed")
                         return True
 
                     print(f"[Pollinations] Generated image REJECTED by safety/relevance check (attempt {attempt+1}/{max_attempts}). Retrying...")
@@ -1490,7 +2603,7 @@ class MediaSourcer:
             except Exception as e:
                 print(f"[Pollinations] Error: {e}")
 
-        return False
+        return ai_cache.serve("pollinations", prompt, "9:16", output_path, require_safe=True, partial=True)
 
     def _create_solid_card(self, text: str) -> str:
         """
@@ -1543,7 +2656,7 @@ class MediaSourcer:
                     draw.text((tx + ox, ty + oy), label, font=font, fill=(0, 0, 0))
             draw.text((tx, ty), label, font=font, fill=(245, 166, 35))
 
-            fname = f"card_{hash(text)}.jpg"
+            fname = f"card_{stable_hash(text)}.jpg"
             fpath = os.path.join(self.download_dir, fname)
             os.makedirs(self.download_dir, exist_ok=True)
             img.save(fpath, "JPEG", quality=90)
@@ -0,0 +1,257 @@
+"""
+provider_health.py
+Cross-run health and latency stats for media providers, with a circuit breaker.
+
+get_media's tier order was hard-coded and MediaSourcer only remembered dead
+Gemini key/model combos for one process, so every cron run paid the full
+timeout again on a provider that had been failing all day — API-Football while
+the account was suspended, DDG while it was quietly rate-limiting. Each
+provider's record now survives between runs in one small JSON file under
+footybitez/data/cache/ (PROVIDER_HEALTH_FILE to override), which the workflows
+persist with actions/cache:
+  - request outcomes (ok / failed / quota error) and recent request latencies;
+  - tier runs and how many of them produced at least one image;
+  - how many of its downloads passed the vision check.
+
+Circuit breaker: PROVIDER_BREAKER_FAILURES consecutive failed requests
+(default 3) open a provider's breaker for PROVIDER_BREAKER_COOLDOWN_MINUTES
+(default 30); a quota/auth error opens it at once for
+PROVIDER_QUOTA_COOLDOWN_MINUTES (default 180). While open the provider is
+skipped. Once the cooldown passes, one trial request is let through and a
+single further failure re-opens it.
+
+Writes are debounced: recorded stats are saved at most every
+PROVIDER_HEALTH_SAVE_SECONDS (default 10), on flush() and at exit, instead of
+rewriting the whole file once per request. A breaker opening or closing is
+saved at once, since that is the state the next run most needs to see.
+
+Ordering: get_media keeps its priority order, but a tier with at least
+PROVIDER_MIN_SAMPLES runs (default 8) whose yield — tier hit rate times vision
+pass rate — is below PROVIDER_DEMOTE_BELOW (default 0.15) is moved behind the
+healthy tiers (see order_tiers).
+
+Usage:
+    from footybitez.media.provider_health import get_provider_health
+
+    health = get_provider_health()
+    if health.is_open("ddg"):
+        ...                                   # skip it
+    health.record_request("ddg", ok=False, latency=10.2)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+HEALTH_FILE = "footybitez/data/cache/provider_health.json"
+LATENCY_WINDOW = 50   # recent request latencies kept per provider
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _percentile(values: list, pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _new_record() -> dict:
+    return {
+        "requests": 0, "ok": 0, "failures": 0, "quota_errors": 0,
+        "consecutive_failures": 0, "open_until": 0,
+        "latencies": [],
+        "tier_runs": 0, "tier_hits": 0,
+        "vision_checked": 0, "vision_passed": 0,
+    }
+
+
+class ProviderHealth:
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("PROVIDER_HEALTH_FILE", HEALTH_FILE)
+        self.breaker_failures = int(os.getenv("PROVIDER_BREAKER_FAILURES", "3"))
+        self.cooldown = float(os.getenv("PROVIDER_BREAKER_COOLDOWN_MINUTES", "30")) * 60
+        self.quota_cooldown = float(os.getenv("PROVIDER_QUOTA_COOLDOWN_MINUTES", "180")) * 60
+        self.min_samples = int(os.getenv("PROVIDER_MIN_SAMPLES", "8"))
+        self.demote_below = float(os.getenv("PROVIDER_DEMOTE_BELOW", "0.15"))
+        self.save_interval = float(os.getenv("PROVIDER_HEALTH_SAVE_SECONDS", "10"))
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._skipped = {}  # provider -> calls skipped by an open breaker this run
+        self._dirty = False
+        self._last_save = time.monotonic()
+        atexit.register(self.flush)
+
+    def _load(self) -> dict:
+        """Load the store. Returns an empty one if the file is missing or corrupt."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    # "gemini:<key>:<model>" records from older runs are dropped —
+                    # Gemini key/model health lives in llm_gateway.py's registry.
+                    return {k: {**_new_record(), **v} for k, v in data.items()
+                            if isinstance(v, dict) and not k.startswith("gemini:")}
+            except Exception:
+                pass
+        return {}
+
+    def _save(self):
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"[ProviderHealth] Failed to save {self.path}: {e}")
+        self._last_save = time.monotonic()
+
+    def _changed(self, urgent: bool = False):
+        """Marks the store dirty and saves it if `urgent` or the save interval has passed."""
+        self._dirty = True
+        if urgent or time.monotonic() - self._last_save >= self.save_interval:
+            self._save()
+
+    def flush(self):
+        """Writes out any stats recorded since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _record(self, provider: str) -> dict:
+        return self._data.setdefault(provider, _new_record())
+
+    # ── recording ────────────────────────────────────────────────────────────
+
+    def record_request(self, provider: str, ok: bool, latency: float | None = None, quota: bool = False):
+        """One network request to `provider`. `quota` marks a quota/auth/suspension error."""
+        with self._lock:
+            rec = self._record(provider)
+            rec["requests"] += 1
+            was_open = rec["open_until"] > time.time()
+            if latency is not None:
+                rec["latencies"] = (rec["latencies"] + [round(latency, 3)])[-LATENCY_WINDOW:]
+            if ok:
+                rec["ok"] += 1
+                rec["consecutive_failures"] = 0
+                rec["open_until"] = 0
+            else:
+                rec["failures"] += 1
+                rec["consecutive_failures"] += 1
+                if quota:
+                    rec["quota_errors"] += 1
+                    rec["open_until"] = time.time() + self.quota_cooldown
+                    print(f"[ProviderHealth] {provider}: quota/auth error — skipping it for "
+                          f"{self.quota_cooldown / 60:.0f} min.")
+                elif rec["consecutive_failures"] >= self.breaker_failures:
+                    rec["open_until"] = time.time() + self.cooldown
+                    print(f"[ProviderHealth] {provider}: {rec['consecutive_failures']} failures in a row — "
+                          f"circuit open for {self.cooldown / 60:.0f} min.")
+            self._changed(urgent=(rec["open_until"] > time.time()) != was_open)
+
+    def record_tier(self, provider: str, found: int):
+        """One get_media tier run for `provider` that returned `found` images."""
+        with self._lock:
+            rec = self._record(provider)
+            rec["tier_runs"] += 1
+            if found:
+                rec["tier_hits"] += 1
+            self._changed()
+
+    def record_vision(self, provider: str, passed: bool):
+        """One of `provider`'s downloads went through the vision check."""
+        with self._lock:
+            rec = self._record(provider)
+            rec["vision_checked"] += 1
+            if passed:
+                rec["vision_passed"] += 1
+            self._changed()
+
+    # ── decisions ────────────────────────────────────────────────────────────
+
+    def is_open(self, provider: str) -> bool:
+        """True while `provider`'s circuit breaker is open and it should be skipped."""
+        with self._lock:
+            rec = self._data.get(provider)
+            if not rec or rec["open_until"] <= time.time():
+                return False
+            self._skipped[provider] = self._skipped.get(provider, 0) + 1
+            return True
+
+    def yield_rate(self, provider: str) -> float | None:
+        """Tier hit rate x vision pass rate, or None until there are enough samples."""
+        with self._lock:
+            rec = self._data.get(provider)
+            if not rec or rec["tier_runs"] < self.min_samples:
+                return None
+            rate = rec["tier_hits"] / rec["tier_runs"]
+            if rec["vision_checked"]:
+                rate *= rec["vision_passed"] / rec["vision_checked"]
+            return rate
+
+    def order_tiers(self, tiers: list, key=lambda tier: tier[0]) -> list:
+        """
+        Drops tiers whose breaker is open and moves poor-yield tiers behind the
+        healthy ones. Relative priority within each group is unchanged.
+        """
+        healthy, demoted = [], []
+        for tier in tiers:
+            provider = key(tier)
+            if self.is_open(provider):
+                print(f"[ProviderHealth] Skipping '{provider}' (circuit open).")
+                continue
+            rate = self.yield_rate(provider)
+            (demoted if rate is not None and rate < self.demote_below else healthy).append(tier)
+        return healthy + demoted
+
+    def summary(self, provider: str) -> dict:
+        with self._lock:
+            rec = dict(self._data.get(provider) or _new_record())
+        return {
+            "success_rate": rec["ok"] / rec["requests"] if rec["requests"] else None,
+            "p50": _percentile(rec["latencies"], 50),
+            "p95": _percentile(rec["latencies"], 95),
+            "vision_pass_rate": rec["vision_passed"] / rec["vision_checked"] if rec["vision_checked"] else None,
+            "quota_errors": rec["quota_errors"],
+            "open": rec["open_until"] > time.time(),
+        }
+
+    def log_stats(self):
+        """Prints one line per provider with request stats."""
+        with self._lock:
+            providers = sorted(p for p, r in self._data.items() if r["requests"] or r["tier_runs"])
+            skipped = dict(self._skipped)
+        for provider in providers:
+            s = self.summary(provider)
+            parts = []
+            if s["success_rate"] is not None:
+                parts.append(f"{100 * s['success_rate']:.0f}% ok")
+            if s["p50"] is not None:
+                parts.append(f"p50 {s['p50']:.1f}s / p95 {s['p95']:.1f}s")
+            if s["vision_pass_rate"] is not None:
+                parts.append(f"{100 * s['vision_pass_rate']:.0f}% vision pass")
+            if s["quota_errors"]:
+                parts.append(f"{s['quota_errors']} quota errors")
+            if s["open"]:
+                parts.append("CIRCUIT OPEN")
+            if skipped.get(provider):
+                parts.append(f"skipped {skipped[provider]}x this run")
+            print(f"[ProviderHealth] {provider}: " + ", ".join(parts or ["no requests yet"]))
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealth:
+    """Process-wide shared ProviderHealth."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = ProviderHealth()
+        return _instance
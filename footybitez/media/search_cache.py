@@ -0,0 +1,122 @@
+"""
+search_cache.py
+On-disk TTL cache for image-provider search responses.
+
+Every get_media call re-ran the same Wikimedia generator=search, Unsplash,
+Pixabay, Openverse, TheSportsDB and DDG searches from scratch — for evergreen
+queries like "stadium football soccer men" the answer barely changes between
+the dozens of cron runs a day. Parsed search responses are now stored as one
+JSON file per (provider, normalized query, variant) under
+footybitez/data/cache/search/<provider>/ (SEARCH_CACHE_DIR to override), which
+the GitHub workflows persist with actions/cache alongside the media cache.
+
+Only successful responses are stored. TTLs are per provider (hours, see
+DEFAULT_TTL_HOURS); override one with SEARCH_CACHE_TTL_<PROVIDER>_HOURS, e.g.
+SEARCH_CACHE_TTL_DDG_HOURS=6, or set it to 0 to disable caching for it.
+
+Usage:
+    from footybitez.media.search_cache import get_search_cache
+
+    cache = get_search_cache()
+    data = cache.get("unsplash", query, variant="per_page=12")
+    if data is None:
+        data = ...  # hit the API
+        cache.put("unsplash", query, data, variant="per_page=12")
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/search"
+DEFAULT_TTL_HOURS = {
+    "wikimedia": 24 * 7,     # Commons search results are close to static
+    "thesportsdb": 24 * 7,
+    "unsplash": 72,
+    "pixabay": 72,
+    "openverse": 72,
+    "pexels": 72,
+    "ddg": 24,               # web results drift fastest
+}
+FALLBACK_TTL_HOURS = 24
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def normalize_query(query: str) -> str:
+    """Lowercased with whitespace collapsed — word order still matters to search."""
+    return " ".join(str(query or "").lower().split())
+
+
+class SearchCache:
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir or os.getenv("SEARCH_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self._lock = threading.Lock()
+        self._stats = {}  # provider -> {"hits": n, "misses": n}
+
+    def ttl_seconds(self, provider: str) -> float:
+        default = DEFAULT_TTL_HOURS.get(provider, FALLBACK_TTL_HOURS)
+        return float(os.getenv(f"SEARCH_CACHE_TTL_{provider.upper()}_HOURS", default)) * 3600
+
+    def _path(self, provider: str, query: str, variant: str) -> str:
+        key = f"{normalize_query(query)}\n{variant}"
+        return os.path.join(self.cache_dir, provider, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _count(self, provider: str, field: str):
+        with self._lock:
+            self._stats.setdefault(provider, {"hits": 0, "misses": 0})[field] += 1
+
+    def get(self, provider: str, query: str, variant: str = ""):
+        """Cached response for this search, or None if absent, expired or corrupt."""
+        ttl = self.ttl_seconds(provider)
+        path = self._path(provider, query, variant)
+        if ttl > 0 and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if time.time() - entry.get("t", 0) <= ttl:
+                    self._count(provider, "hits")
+                    return entry["data"]
+            except Exception:
+                pass
+        self._count(provider, "misses")
+        return None
+
+    def put(self, provider: str, query: str, data, variant: str = ""):
+        if self.ttl_seconds(provider) <= 0:
+            return
+        path = self._path(provider, query, variant)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"t": time.time(), "query": normalize_query(query), "data": data}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[SearchCache] Failed to store {provider} results for '{query}': {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {p: dict(s) for p, s in self._stats.items()}
+
+    def log_stats(self):
+        """Prints one hit-rate line per provider searched this run."""
+        for provider, s in sorted(self.stats().items()):
+            total = s["hits"] + s["misses"]
+            if total:
+                print(f"[SearchCache] {provider}: {s['hits']}/{total} hits ({100 * s['hits'] / total:.0f}%)")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide shared SearchCache."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = SearchCache()
+        return _instance
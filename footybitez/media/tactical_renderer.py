@@ -0,0 +1,229 @@
+"""
+tactical_renderer.py
+Deterministic, offline tactical diagrams in plain numpy + Pillow.
+
+generate_tactical_diagram turned every formation / heat-map / passing-lane /
+pressure-map request into a Gemini image prompt: quota spent, several seconds
+per image, and a picture whose player count and positions were whatever the
+model felt like. These four diagram types are now drawn locally in the channel
+palette (#111111 background, #F5A623 amber, #C0392B red) in well under a second;
+the same inputs always give the same image.
+
+Inputs:
+  formation  a formation string such as "4-3-3" or "4-2-3-1" (outfield lines
+             from defence to attack; the goalkeeper is implicit). Parsed from
+             the scene's "formation" field or its prompt, default 4-3-3.
+  events     [x, y] event coordinates on a 100x100 pitch (x towards the
+             opponent's goal). A heat map is a gaussian KDE of these and needs
+             them: a KDE of the formation's own slots would only pass the
+             formation off as player activity, so without events it isn't drawn.
+
+The team always attacks left to right on a horizontal pitch.
+
+Usage:
+    from footybitez.media.tactical_renderer import render_tactical_diagram
+
+    ok = render_tactical_diagram("heat_map", out_path, formation="4-2-3-1", events=[[62, 40], ...])
+"""
+
+import logging
+import os
+import re
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+BACKGROUND = (17, 17, 17)      # #111111
+AMBER = (245, 166, 35)         # #F5A623
+RED = (192, 57, 43)            # #C0392B
+LINE = (255, 255, 255, 70)     # pitch markings
+DIAGRAM_TYPES = ("formation", "heat_map", "passing_lanes", "pressure_map")
+DEFAULT_FORMATION = "4-3-3"
+PITCH_MARGIN = 0.06            # share of the canvas left around the pitch
+HEAT_GRID = (160, 104)         # KDE grid (x, y) before upscaling
+# ─────────────────────────────────────────────────────────────────────────────
+
+_FORMATION_RE = re.compile(r"\b([1-6](?:-[1-6]){1,4})\b")
+
+
+def parse_formation(text: str) -> list | None:
+    """Outfield lines of the first formation in `text` that adds up to 10 players, e.g. [4, 3, 3]."""
+    for match in _FORMATION_RE.finditer(str(text or "")):
+        lines = [int(n) for n in match.group(1).split("-")]
+        if sum(lines) == 10:
+            return lines
+    return None
+
+
+def formation_positions(lines: list) -> list:
+    """(x, y) of the goalkeeper and each outfield player on a 100x100 pitch."""
+    positions = [(5.0, 50.0)]
+    depth = len(lines)
+    for i, count in enumerate(lines):
+        x = 22.0 + (i * 50.0 / (depth - 1) if depth > 1 else 25.0)
+        for j in range(count):
+            positions.append((x, 100.0 * (j + 1) / (count + 1)))
+    return positions
+
+
+def kde_grid(points: list, grid: tuple = HEAT_GRID, bandwidth: float = 8.0) -> np.ndarray:
+    """
+    Gaussian KDE of `points` (100x100 pitch coordinates) evaluated on a
+    (grid_y, grid_x) array, scaled to a peak of 1. `bandwidth` is in pitch units.
+    """
+    gx, gy = grid
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if not len(pts):
+        return np.zeros((gy, gx))
+    xs = (np.arange(gx) + 0.5) * 100.0 / gx
+    ys = (np.arange(gy) + 0.5) * 100.0 / gy
+    # Separable gaussians: (n, gy, 1) * (n, 1, gx) summed over the points.
+    wx = np.exp(-((xs[None, :] - pts[:, 0:1]) ** 2) / (2 * bandwidth ** 2))
+    wy = np.exp(-((ys[None, :] - pts[:, 1:2]) ** 2) / (2 * bandwidth ** 2))
+    density = np.einsum("ny,nx->yx", wy, wx)
+    peak = density.max()
+    return density / peak if peak > 0 else density
+
+
+def _colorize(density: np.ndarray, hot: tuple) -> np.ndarray:
+    """RGBA array ramping from transparent background through red to `hot`."""
+    stops = [0.0, 0.45, 1.0]
+    rgba = np.empty(density.shape + (4,), dtype=np.uint8)
+    for c in range(3):
+        rgba[..., c] = np.interp(density, stops, [BACKGROUND[c], RED[c], hot[c]])
+    rgba[..., 3] = np.interp(density, [0.0, 0.08, 0.5, 1.0], [0, 40, 190, 235])
+    return rgba
+
+
+class _Pitch:
+    """Maps 100x100 pitch coordinates onto the canvas."""
+
+    def __init__(self, size: tuple):
+        w, h = size
+        margin = int(min(w, h) * PITCH_MARGIN)
+        # Keep a real pitch's 105:68 proportions inside the margins.
+        avail_w, avail_h = w - 2 * margin, h - 2 * margin
+        pw = min(avail_w, avail_h * 105 / 68)
+        ph = pw * 68 / 105
+        self.left, self.top = (w - pw) / 2, (h - ph) / 2
+        self.width, self.height = pw, ph
+
+    def xy(self, x: float, y: float) -> tuple:
+        return (self.left + x / 100.0 * self.width, self.top + y / 100.0 * self.height)
+
+    def box(self) -> tuple:
+        return (int(self.left), int(self.top), int(self.left + self.width), int(self.top + self.height))
+
+    def draw_markings(self, draw: ImageDraw.ImageDraw):
+        width = max(2, int(self.width / 400))
+        draw.rectangle(self.box(), outline=LINE, width=width)
+        draw.line([self.xy(50, 0), self.xy(50, 100)], fill=LINE, width=width)
+        r = 9.15 / 105 * self.width
+        cx, cy = self.xy(50, 50)
+        draw.ellipse([cx - r, cy - r, cx + r, cy + r], outline=LINE, width=width)
+        # Penalty and goal areas (16.5m and 5.5m deep, 40.3m and 18.3m wide).
+        for depth, span in ((16.5, 40.3), (5.5, 18.3)):
+            dx, dy = depth / 105 * 100, span / 68 * 100 / 2
+            draw.rectangle([self.xy(0, 50 - dy), self.xy(dx, 50 + dy)], outline=LINE, width=width)
+            draw.rectangle([self.xy(100 - dx, 50 - dy), self.xy(100, 50 + dy)], outline=LINE, width=width)
+
+
+def _heat_layer(pitch: _Pitch, size: tuple, points: list, bandwidth: float, hot: tuple) -> Image.Image:
+    layer = Image.new("RGBA", size, (0, 0, 0, 0))
+    heat = Image.fromarray(_colorize(kde_grid(points, bandwidth=bandwidth), hot), "RGBA")
+    box = pitch.box()
+    layer.paste(heat.resize((box[2] - box[0], box[3] - box[1]), Image.BILINEAR), box[:2])
+    return layer
+
+
+def _glow_lines(size: tuple, segments: list, color: tuple, width: int) -> Image.Image:
+    """Lines with a soft blurred halo underneath."""
+    halo = Image.new("RGBA", size, (0, 0, 0, 0))
+    halo_draw = ImageDraw.Draw(halo)
+    for a, b in segments:
+        halo_draw.line([a, b], fill=color + (150,), width=width * 4)
+    halo = halo.filter(ImageFilter.GaussianBlur(width * 3))
+    sharp_draw = ImageDraw.Draw(halo)
+    for a, b in segments:
+        sharp_draw.line([a, b], fill=color + (255,), width=width)
+    return halo
+
+
+def _draw_players(draw: ImageDraw.ImageDraw, points: list, color: tuple, radius: float):
+    for x, y in points:
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius],
+                     fill=color + (255,), outline=BACKGROUND + (255,), width=max(2, int(radius / 4)))
+
+
+def _passing_segments(positions: list) -> list:
+    """Each player to the nearest two team-mates further up the pitch — the forward passing lanes."""
+    segments = set()
+    for i, (x, y) in enumerate(positions):
+        ahead = sorted((j for j, (x2, _) in enumerate(positions) if x2 > x + 1),
+                       key=lambda j: (positions[j][0] - x) ** 2 + (positions[j][1] - y) ** 2)
+        for j in ahead[:2]:
+            segments.add((i, j))
+    return sorted(segments)
+
+
+def render_tactical_diagram(diagram_type: str, output_path: str, formation=None, events=None,
+                            size: tuple = (1920, 1080)) -> bool:
+    """
+    Draws a `diagram_type` diagram (see DIAGRAM_TYPES) and saves it as JPEG.
+    `formation` is a string ("4-3-3") or outfield line list; `events` the
+    [x, y] points a heat map requires. Returns True on success, False otherwise.
+    """
+    if diagram_type not in DIAGRAM_TYPES:
+        return False
+    points = [(float(p[0]), float(p[1])) for p in (events or []) if len(p) >= 2]
+    if diagram_type == "heat_map" and not points:
+        logger.info("[TacticalRenderer] No event data for a heat map — not drawing one.")
+        return False
+    try:
+        lines = formation if isinstance(formation, list) else parse_formation(formation)
+        lines = lines or parse_formation(DEFAULT_FORMATION)
+        positions = formation_positions(lines)
+
+        img = Image.new("RGBA", size, BACKGROUND + (255,))
+        pitch = _Pitch(size)
+        radius = pitch.height / 34
+        canvas_positions = [pitch.xy(x, y) for x, y in positions]
+        # The press: midfield and forwards push up into the opponent's half.
+        pressers = [i for i, (x, _) in enumerate(positions) if i and x >= 45]
+        press = [(min(96.0, positions[i][0] + 22.0), positions[i][1]) for i in pressers]
+
+        if diagram_type == "heat_map":
+            img.alpha_composite(_heat_layer(pitch, size, points, bandwidth=7.0, hot=AMBER))
+        elif diagram_type == "pressure_map":
+            img.alpha_composite(_heat_layer(pitch, size, press, bandwidth=9.0, hot=RED))
+
+        markings = Image.new("RGBA", size, (0, 0, 0, 0))
+        pitch.draw_markings(ImageDraw.Draw(markings))
+        img.alpha_composite(markings)
+        draw = ImageDraw.Draw(img)
+
+        if diagram_type == "passing_lanes":
+            segments = [(canvas_positions[i], canvas_positions[j]) for i, j in _passing_segments(positions)]
+            img.alpha_composite(_glow_lines(size, segments, AMBER, max(3, int(radius / 5))))
+            draw = ImageDraw.Draw(img)
+        elif diagram_type == "pressure_map":
+            targets = [pitch.xy(x, y) for x, y in press]
+            segments = [(canvas_positions[i], t) for i, t in zip(pressers, targets)]
+            img.alpha_composite(_glow_lines(size, segments, RED, max(3, int(radius / 5))))
+            draw = ImageDraw.Draw(img)
+            for tx, ty in targets:
+                draw.ellipse([tx - radius / 3, ty - radius / 3, tx + radius / 3, ty + radius / 3], fill=RED + (255,))
+
+        _draw_players(draw, canvas_positions[1:], AMBER, radius)
+        _draw_players(draw, canvas_positions[:1], RED, radius)
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        img.convert("RGB").save(output_path, "JPEG", quality=92)
+        logger.info(f"[TacticalRenderer] {diagram_type} ({'-'.join(map(str, lines))}) saved: {output_path}")
+        return True
+    except Exception as e:
+        logger.warning(f"[TacticalRenderer] Failed to render {diagram_type}: {e}")
+        return False
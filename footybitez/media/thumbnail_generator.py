@@ -4,6 +4,9 @@ import logging
 import requests
 from PIL import Image, ImageDraw, ImageFont
 
+from footybitez.utils.llm_gateway import get_llm_gateway
+from footybitez.utils.llm_models import GEMINI_IMAGE_MODEL
+
 logger = logging.getLogger(__name__)
 
 class ThumbnailGenerator:
@@ -19,7 +22,7 @@ class ThumbnailGenerator:
         Tries GEMINI_API_KEY, GEMINI_API_KEY2, GEMINI_API_KEY3 in order.
 
         Uses new google-genai SDK (replaces deprecated google-generativeai).
-        Model: gemini-2.5-flash-image
+        Model: GEMINI_IMAGE_MODEL (default gemini-2.5-flash-image)
           - Free tier, supports response_modalities=["TEXT","IMAGE"]
           - The old SDK's GenerationConfig had no response_modalities — that was the crash.
         """
@@ -33,13 +36,11 @@ class ThumbnailGenerator:
             logger.warning("No GEMINI_API_KEY found. Skipping AI thumbnail.")
             return None
 
-        for i, key in enumerate(gemini_keys):
+        gateway = get_llm_gateway()
+        for i, key, model in gateway.combos("gemini", gemini_keys, [GEMINI_IMAGE_MODEL]):
             try:
-                from google import genai
                 from google.genai import types
 
-                client = genai.Client(api_key=key)
-
                 full_prompt = (
                     f"{ai_prompt}\n\n"
                     "Style: cinematic YouTube thumbnail, 16:9 aspect ratio, "
@@ -48,13 +49,13 @@ class ThumbnailGenerator:
                     "no watermarks, no text in image."
                 )
 
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash-image",
+                response = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                    model=model,
                     contents=full_prompt,
                     config=types.GenerateContentConfig(
                         response_modalities=["TEXT", "IMAGE"]
                     )
-                )
+                ))
 
                 for part in response.candidates[0].content.parts:
                     if part.inline_data and part.inline_data.mime_type.startswith("image/"):
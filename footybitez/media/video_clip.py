@@ -0,0 +1,127 @@
+"""
+video_clip.py
+Rendition choice, trimming and caching for Pexels B-roll clips.
+
+fetch_pexels_video used to download the first rendition at least 1280px wide —
+often the 4K / 60 fps file, 60 MB+ — and stage the whole clip, although an
+ai_video scene shows at most a few seconds of it (long_main caps video scenes
+at 4 s, and AIVideoScene loops anything shorter). Now:
+  - select_rendition picks the smallest MP4 rendition that still covers the
+    target frame (PEXELS_VIDEO_TARGET, default 1920x1080) at PEXELS_MIN_FPS
+    (default 24): lowest resolution first, then lowest frame rate, then size;
+  - trim_clip cuts the download to the scene's duration with an ffmpeg stream
+    copy (no re-encode) and drops the unused audio track;
+  - the trimmed clip is filed in a separate MediaCache keyed by Pexels video
+    ID, so the same stock clip is never downloaded twice across runs.
+
+The clip cache lives under footybitez/data/cache/pexels_videos/
+(PEXELS_VIDEO_CACHE_DIR to override), LRU-evicted past
+PEXELS_VIDEO_CACHE_MAX_MB (default 256).
+
+Usage:
+    from footybitez.media.video_clip import select_rendition, trim_clip
+
+    rendition = select_rendition(video["video_files"], target_size=(1920, 1080))
+    ...
+    trim_clip(download_path, output_path, seconds=5)
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+
+from footybitez.media.media_cache import MediaCache
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/pexels_videos"
+DEFAULT_MAX_MB = 256
+RESOLUTION_TOLERANCE = 0.9   # 1920x1012 "cinematic" renditions still count as 1080p
+FALLBACK_MIN_WIDTH = 1280    # used when no rendition reaches the target
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def target_size_from_env() -> tuple:
+    w, h = (int(v) for v in os.getenv("PEXELS_VIDEO_TARGET", "1920x1080").lower().split("x"))
+    return w, h
+
+
+def select_rendition(video_files: list, target_size: tuple | None = None, min_fps: float | None = None) -> dict | None:
+    """
+    The smallest MP4 rendition that covers `target_size` at `min_fps` or more.
+    If none does, the largest MP4 at least FALLBACK_MIN_WIDTH wide (the old
+    behaviour); None if there is no usable MP4 at all.
+    """
+    tw, th = target_size or target_size_from_env()
+    if min_fps is None:
+        min_fps = float(os.getenv("PEXELS_MIN_FPS", "24"))
+    mp4s = [f for f in video_files or []
+            if f.get("file_type") == "video/mp4" and f.get("link") and f.get("width") and f.get("height")]
+
+    def fps(f):
+        return f.get("fps") or 30.0
+
+    meeting = [f for f in mp4s
+               if f["width"] >= tw * RESOLUTION_TOLERANCE and f["height"] >= th * RESOLUTION_TOLERANCE
+               and fps(f) >= min_fps]
+    if meeting:
+        return min(meeting, key=lambda f: (f["width"] * f["height"], fps(f), f.get("size") or 0))
+    wide = [f for f in mp4s if f["width"] >= FALLBACK_MIN_WIDTH]
+    if wide:
+        return max(wide, key=lambda f: (f["width"] * f["height"], -fps(f)))
+    return None
+
+
+def trim_clip(src_path: str, dst_path: str, seconds: float) -> bool:
+    """
+    Writes the first `seconds` of `src_path` to `dst_path` with an ffmpeg
+    stream copy (video only, faststart). Returns False if ffmpeg is missing
+    or fails — the caller keeps the untrimmed file.
+    """
+    tmp = dst_path + ".trim.mp4"
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-i", src_path, "-t", f"{seconds:.2f}",
+             "-map", "0:v:0", "-c", "copy", "-an", "-movflags", "+faststart", tmp],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=60
+        )
+        if result.returncode != 0 or not os.path.exists(tmp) or os.path.getsize(tmp) == 0:
+            print(f"[VideoClip] ffmpeg trim failed: {result.stdout.strip()[:200]}")
+            return False
+        os.replace(tmp, dst_path)
+        return True
+    except FileNotFoundError:
+        print("[VideoClip] ffmpeg not found — keeping the full clip.")
+        return False
+    except Exception as e:
+        print(f"[VideoClip] Trim error: {e}")
+        return False
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def stage_clip(src_path: str, output_path: str):
+    """Copies a cached clip to `output_path`, with its .json credit sidecar."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    shutil.copy2(src_path, output_path)
+    if os.path.exists(src_path + ".json"):
+        shutil.copy2(src_path + ".json", output_path + ".json")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_video_cache() -> MediaCache:
+    """Process-wide MediaCache for trimmed Pexels clips, keyed "pexels:video:<id>"."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            max_mb = float(os.getenv("PEXELS_VIDEO_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+            _instance = MediaCache(cache_dir=os.getenv("PEXELS_VIDEO_CACHE_DIR", DEFAULT_CACHE_DIR),
+                                   max_bytes=int(max_mb * 1024 * 1024))
+        return _instance
@@ -0,0 +1,149 @@
+"""
+vision_verdicts.py
+Persistent cache of Gemini vision safety/relevance verdicts, keyed by the
+perceptual hash of the image pixels (see image_hash.py).
+
+_check_image_safety_and_relevance spends one multimodal Gemini call per image,
+and on the free tier the daily vision quota ran out halfway through World Cup
+matchdays — mostly re-checking photos that were already approved the day before,
+often re-encoded copies of them from a different host. Verdicts are now stored
+per image:
+  - is_nsfw / is_football_related depend only on the pixels, so they are reused
+    for ANY later context;
+  - matches_context is stored per normalized context query, so a Messi photo
+    approved for "Lionel Messi" is not blindly reused for "Kylian Mbappe".
+
+Lookups also match near-identical hashes (VISION_VERDICT_MAX_DISTANCE bits,
+default 4) so recompressed/resized copies hit. Entries expire after
+VISION_VERDICT_TTL_DAYS (default 60).
+
+Usage:
+    from footybitez.media.vision_verdicts import get_verdict_cache
+
+    cache = get_verdict_cache()
+    verdict = cache.lookup(phash_value, context_query)   # dict or None
+    ...
+    cache.record(phash_value, context_query, is_nsfw, is_football, matches_context)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from footybitez.media.image_hash import FLAT_HASH, hamming, to_hex, from_hex
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+VERDICTS_FILE = "footybitez/data/cache/vision_verdicts.json"
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Filler the pipelines add around the actual subject ("(football player)",
+# the football-safe query suffix) — dropped so it doesn't fragment the key.
+_CONTEXT_FILLER = {
+    "association", "football", "soccer", "men", "player", "club", "the", "a", "an", "of",
+}
+
+
+def normalize_context(context_query: str) -> str:
+    """Lowercased, de-duplicated, order-independent token set of a context query."""
+    tokens = re.findall(r"[a-z0-9]+", (context_query or "").lower())
+    return " ".join(sorted({t for t in tokens if t not in _CONTEXT_FILLER}))
+
+
+class VisionVerdictCache:
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("VISION_VERDICTS_FILE", VERDICTS_FILE)
+        self.ttl = float(os.getenv("VISION_VERDICT_TTL_DAYS", "60")) * 86400
+        self.max_distance = int(os.getenv("VISION_VERDICT_MAX_DISTANCE", "4"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._data = self._load()
+
+    def _load(self) -> dict:
+        """Load verdicts, dropping expired ones. Empty if the file is missing or corrupt."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                cutoff = time.time() - self.ttl
+                return {k: v for k, v in data.items() if v.get("t", 0) >= cutoff}
+            except Exception:
+                pass
+        return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"[VisionCache] Failed to save verdicts: {e}")
+
+    def _find(self, phash_value: int) -> dict | None:
+        exact = self._data.get(to_hex(phash_value))
+        if exact is not None:
+            return exact
+        best, best_dist = None, self.max_distance + 1
+        for key, entry in self._data.items():
+            dist = hamming(phash_value, from_hex(key))
+            if dist < best_dist:
+                best, best_dist = entry, dist
+        return best
+
+    def lookup(self, phash_value: int, context_query: str = "") -> dict | None:
+        """
+        Returns a cached verdict usable for this image + context, or None if the
+        API still has to be asked. A known NSFW / non-football image is returned
+        regardless of context (those never depend on it).
+        """
+        if phash_value == FLAT_HASH:
+            return None
+        ctx = normalize_context(context_query)
+        with self._lock:
+            entry = self._find(phash_value)
+            if entry is None:
+                self.misses += 1
+                return None
+            verdict = {
+                "is_nsfw": entry["nsfw"],
+                "is_football_related": entry["football"],
+                "matches_context": True,
+            }
+            if not entry["nsfw"] and entry["football"] and ctx:
+                if ctx not in entry.get("contexts", {}):
+                    self.misses += 1
+                    return None
+                verdict["matches_context"] = entry["contexts"][ctx]
+            self.hits += 1
+            return verdict
+
+    def record(self, phash_value: int, context_query: str, is_nsfw: bool,
+               is_football: bool, matches_context: bool = True):
+        if phash_value == FLAT_HASH:
+            return
+        ctx = normalize_context(context_query)
+        with self._lock:
+            key = to_hex(phash_value)
+            entry = self._data.get(key) or {"contexts": {}}
+            entry.update({"nsfw": bool(is_nsfw), "football": bool(is_football), "t": time.time()})
+            if ctx:
+                entry["contexts"][ctx] = bool(matches_context)
+            self._data[key] = entry
+            self._save()
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_verdict_cache() -> VisionVerdictCache:
+    """Process-wide shared VisionVerdictCache."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = VisionVerdictCache()
+        return _instance
@@ -4,7 +4,7 @@ import os
 import logging
 import time
 import random
-import requests
+from footybitez.utils import http_client as http
 import re
 import asyncio
 import json
@@ -151,7 +151,7 @@ class VoiceGenerator:
         for i, key in enumerate(self.gcp_tts_keys):
             try:
                 url = f"https://texttospeech.googleapis.com/v1beta1/text:synthesize?key={key}"
-                response = requests.post(url, json=payload, timeout=60)
+                response = http.post(url, json=payload, timeout=60)
                 if response.status_code != 200:
                     logger.warning(f"Google Cloud TTS error {response.status_code} on key #{i+1}: {response.text[:300]}")
                     continue
@@ -229,7 +229,7 @@ class VoiceGenerator:
                 if voice_id:
                      payload["utterances"][0]["description"] = f"Voice ID: {voice_id}"
                 
-                response = requests.post(url, json=payload, headers=headers, timeout=60)
+                response = http.post(url, json=payload, headers=headers, timeout=60)
                 if response.status_code == 200:
                     with open(output_path, "wb") as f:
                         f.write(response.content)
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# Ensure root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from footybitez.data.worldcup_data import WorldCupData
+from footybitez.media.media_sourcer import MediaSourcer
+from footybitez.media.entity_index import get_entity_index
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("entity_warmup")
+
+WARMUP_DIR = "footybitez/media/downloads/entity_warmup"
+
+
+def team_aliases(team: dict) -> list:
+    """Names a national team is looked up by; the first is the Wikipedia article title."""
+    name = team.get("name", "")
+    aliases = [f"{name} national football team", name, f"{name} national team"]
+    short = team.get("shortName")
+    if short and short != name:
+        aliases += [short, f"{short} national football team"]
+    return aliases
+
+
+def warm_entity(sourcer: MediaSourcer, aliases: list) -> bool:
+    """
+    Resolves, vision-verifies and indexes one image for the entity named
+    aliases[0]. The sourcer must have require_vision_verdict set, so an image
+    whose check couldn't run is rejected rather than indexed.
+    """
+    path = sourcer.get_profile_image(aliases[0], use_index=False)
+    if not path:
+        return False
+    meta = {}
+    try:
+        with open(path + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        pass
+    return get_entity_index().add(aliases, path, source=meta.get("source", ""), artist=meta.get("artist", "")) is not None
+
+
+def run_warmup(limit=None, teams_only=False, refresh=False):
+    logger.info("Starting World Cup entity image warm-up...")
+
+    fd_key = os.getenv("FOOTBALL_DATA_API_KEY", "")
+    if not fd_key:
+        logger.error("FOOTBALL_DATA_API_KEY not set. Stopping.")
+        sys.exit(1)
+
+    sourcer = MediaSourcer(download_dir=WARMUP_DIR)
+    # Pre-moderated sources normally pass without a vision check once Gemini is
+    # out of keys or quota — nothing unverified may go into the index.
+    sourcer.require_vision_verdict = True
+    if not sourcer.gemini_keys:
+        logger.error("No GEMINI_API_KEY set — images can't be vision-verified. Stopping.")
+        sys.exit(1)
+
+    teams = WorldCupData(fd_key).get_teams()
+    logger.info(f"Found {len(teams)} World Cup teams.")
+
+    entities = []
+    for team in teams:
+        if team.get("name"):
+            entities.append(team_aliases(team))
+    if not teams_only:
+        for team in teams:
+            for player in team.get("squad", []) or []:
+                if player.get("name"):
+                    entities.append([player["name"]])
+
+    index = get_entity_index()
+    warmed = failed = 0
+    for aliases in entities:
+        if limit is not None and warmed + failed >= limit:
+            logger.info(f"Reached warm-up limit of {limit} lookups. Stopping.")
+            break
+        if not refresh and index.lookup(aliases[0]):
+            continue
+        if not sourcer.vision_available():
+            logger.warning("Gemini vision quota exhausted on every key/model — stopping the warm-up; "
+                           "the rest is picked up on the next run.")
+            break
+        try:
+            ok = warm_entity(sourcer, aliases)
+        except Exception as e:
+            logger.error(f"Warm-up failed for '{aliases[0]}': {e}")
+            ok = False
+        if ok:
+            warmed += 1
+            logger.info(f"Indexed image for '{aliases[0]}'")
+        else:
+            failed += 1
+            logger.warning(f"No verified image found for '{aliases[0]}'")
+
+    sourcer.cleanup()
+    stats = index.stats()
+    logger.info(f"Entity warm-up finished: {warmed} indexed, {failed} unresolved this run; "
+                f"{stats['entities']} entities / {stats['aliases']} aliases in the index.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, help="Maximum entities to look up in this run")
+    parser.add_argument("--teams-only", action="store_true", help="Index national teams only, not squads")
+    parser.add_argument("--refresh", action="store_true", help="Re-resolve entities that are already indexed")
+    args = parser.parse_args()
+
+    run_warmup(limit=args.limit, teams_only=args.teams_only, refresh=args.refresh)
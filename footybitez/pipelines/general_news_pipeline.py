@@ -18,6 +18,9 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL
+from footybitez.utils.llm_cache import get_llm_cache
+from footybitez.utils.llm_gateway import get_llm_gateway
+from footybitez.utils.keyword_matcher import TOPIC_FILTER
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -130,13 +133,11 @@ class GeneralNewsPipeline:
                         # itself above, but a feed (this one or a future addition)
                         # drifting or occasionally cross-posting off-topic content
                         # shouldn't be able to produce an entire video about the
-                        # wrong sport. Reuses ScriptGenerator.BAD_TOPIC_KEYWORDS
-                        # rather than MediaSourcer's image-metadata list — that one
-                        # includes "handball", which is a routine football term (VAR
-                        # decisions) here, not just the separate sport; the
-                        # narration-text list already excludes it for that reason.
-                        combined_text = f"{t_text} {d_text}".lower()
-                        if any(bad in combined_text for bad in self.script_gen.BAD_TOPIC_KEYWORDS):
+                        # wrong sport. Uses the narration/topic matcher rather than
+                        # the image-metadata one — that one bans "handball", which is
+                        # a routine football term (VAR decisions) here, not just the
+                        # separate sport (see utils/keyword_matcher.py).
+                        if TOPIC_FILTER.matches(f"{t_text} {d_text}"):
                             continue
 
                         articles.append({
@@ -209,21 +210,35 @@ class GeneralNewsPipeline:
         }}
         """
 
+        candidates = len(unprocessed[:15])
+
+        def valid_selection(data) -> bool:
+            """An in-range selected_index and a known category — the only answers worth caching."""
+            idx = data.get("selected_index") if isinstance(data, dict) else None
+            return (isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx < candidates
+                    and data.get("category") in category_names)
+
         # Query LLM
         selected_data = None
+        gateway = get_llm_gateway()
+        cache = get_llm_cache()
         if self.script_gen.groq_keys:
+            selected_data = cache.get("headline", GROQ_SCRIPT_MODEL, prompt, temperature=0.3)
+            if selected_data is not None and not valid_selection(selected_data):
+                selected_data = None
+        if selected_data is not None:
+            logger.info("Using cached headline selection.")
+        for i, key, model in ([] if selected_data else
+                              gateway.combos("groq", self.script_gen.groq_keys, [GROQ_SCRIPT_MODEL])):
             try:
-                from groq import Groq
-                client = Groq(api_key=self.script_gen.groq_keys[0])
-                completion = client.chat.completions.create(
-                    model=GROQ_SCRIPT_MODEL,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                    response_format={"type": "json_object"}
-                )
-                selected_data = json.loads(completion.choices[0].message.content)
+                selected_data = gateway.complete_json("groq", key, model, prompt, temperature=0.3)
+                if valid_selection(selected_data):
+                    cache.put("headline", model, prompt, selected_data, temperature=0.3)
+                    break
+                logger.warning(f"Groq headline selection (key #{i+1}) returned no valid selection: {selected_data}")
+                selected_data = None
             except Exception as e:
-                logger.error(f"Groq headline selection failed: {e}")
+                logger.error(f"Groq headline selection failed (key #{i+1}): {e}")
 
         if not selected_data and self.script_gen.gemini_keys:
             # Fallback to Gemini. NOTE: uses _try_gemini_raw_json, NOT _try_gemini —
@@ -233,7 +248,8 @@ class GeneralNewsPipeline:
             # silently failed on every single call (even successful ones), always
             # falling through to "just pick the first article" below — the AI
             # selection had never actually been working via this path.
-            selected_data = self.script_gen._try_gemini_raw_json(prompt)
+            selected_data = self.script_gen._try_gemini_raw_json(prompt, call_type="headline",
+                                                                 validate=valid_selection)
 
         if not selected_data:
             # Fallback to first article if LLM fails
@@ -247,7 +263,7 @@ class GeneralNewsPipeline:
         if category not in category_names:
             category = DEFAULT_CATEGORY
 
-        if idx is not None and 0 <= idx < len(unprocessed[:15]):
+        if idx is not None and 0 <= idx < candidates:
             chosen = unprocessed[idx]
             chosen["category"] = category
             logger.info(f"AI selected viral headline: '{chosen['title']}' (category: {category}). Reasoning: {selected_data.get('reasoning')}")
@@ -0,0 +1,139 @@
+import os
+import sys
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Ensure root path is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from footybitez.content.grounding_index import get_grounding_index
+from footybitez.content.wiki_grounding import get_wiki_grounding
+from footybitez.pipelines.entity_warmup import team_aliases
+from footybitez.utils.keyword_matcher import TOPIC_FILTER
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("grounding_index_build")
+
+# Article titles indexed on every build, whatever the World Cup data says.
+SEED_CLUBS = [
+    "Real Madrid CF", "FC Barcelona", "Manchester United F.C.", "Manchester City F.C.",
+    "Liverpool F.C.", "Arsenal F.C.", "Chelsea F.C.", "Tottenham Hotspur F.C.",
+    "FC Bayern Munich", "Borussia Dortmund", "Paris Saint-Germain FC", "Juventus FC",
+    "AC Milan", "Inter Milan", "SSC Napoli", "Atlético Madrid", "AFC Ajax", "SL Benfica",
+    "FC Porto", "Celtic F.C.", "Boca Juniors", "Club Atlético River Plate", "Al Nassr FC",
+    "Inter Miami CF",
+]
+SEED_TOURNAMENTS = [
+    "FIFA World Cup", "UEFA Champions League", "UEFA European Championship", "Copa América",
+    "Premier League", "La Liga", "Serie A", "Bundesliga", "Ligue 1", "FA Cup",
+    "UEFA Europa League", "FIFA Club World Cup", "Ballon d'Or", "Africa Cup of Nations",
+    "2022 FIFA World Cup", "2026 FIFA World Cup", "2030 FIFA World Cup",
+]
+SEED_CONCEPTS = [
+    "Offside (association football)", "Penalty kick (association football)",
+    "Penalty shoot-out (association football)", "Tiki-taka", "Gegenpressing", "Total Football",
+    "Catenaccio", "False 9", "Formation (association football)", "Video assistant referee",
+    "Hat-trick", "Clean sheet", "Transfer (association football)", "Away goals rule",
+    "Parking the bus", "Counter-attack", "Pressing (association football)", "Sweeper keeper",
+    "Fouls and misconduct (association football)", "Assist (football)",
+]
+SEED_PLAYERS = [
+    "Lionel Messi", "Cristiano Ronaldo", "Pelé", "Diego Maradona", "Johan Cruyff", "Zinedine Zidane",
+    "Ronaldo (Brazilian footballer)", "Kylian Mbappé", "Erling Haaland", "Neymar", "Harry Kane",
+    "Mohamed Salah", "Kevin De Bruyne", "Luka Modrić", "Robert Lewandowski", "Thierry Henry",
+    "Franz Beckenbauer", "Miroslav Klose", "Jude Bellingham", "Vinícius Júnior",
+]
+
+
+def seed_entities() -> list:
+    """(aliases, kind, is_title) for the seed lists — seeds are exact article titles."""
+    entities = []
+    for kind, titles in (("club", SEED_CLUBS), ("tournament", SEED_TOURNAMENTS),
+                         ("concept", SEED_CONCEPTS), ("player", SEED_PLAYERS)):
+        for title in titles:
+            # "Offside (association football)" is also named "Offside" (concepts are
+            # only found by text search, never claim an entity topic) — but
+            # "Ronaldo (Brazilian footballer)" must not claim every "Ronaldo" topic.
+            short = title.split(" (")[0]
+            entities.append(([title, short] if short != title and kind != "player" else [title], kind, True))
+    return entities
+
+
+def worldcup_entities(teams_only: bool = False) -> list:
+    """(aliases, kind, is_title) for World Cup teams and, unless teams_only, their squads."""
+    fd_key = os.getenv("FOOTBALL_DATA_API_KEY", "")
+    if not fd_key:
+        logger.warning("FOOTBALL_DATA_API_KEY not set — indexing the seed lists only.")
+        return []
+    from footybitez.data.worldcup_data import WorldCupData
+
+    teams = WorldCupData(fd_key).get_teams()
+    logger.info(f"Found {len(teams)} World Cup teams.")
+    entities = [(team_aliases(team), "team", True) for team in teams if team.get("name")]
+    if not teams_only:
+        for team in teams:
+            for player in team.get("squad", []) or []:
+                if player.get("name"):
+                    # Squad names aren't article titles ("Rodri"), so they are searched.
+                    entities.append(([player["name"]], "player", False))
+    return entities
+
+
+def resolve(entity) -> dict | None:
+    """Grounding page for one entity, through WikiGrounding's cache and men's-football guards."""
+    aliases, _, is_title = entity
+    grounding = get_wiki_grounding()
+    if not is_title:
+        return grounding.best_page(aliases[0])
+    try:
+        page = grounding.page(aliases[0])
+    except Exception as e:
+        logger.error(f"Failed to fetch '{aliases[0]}': {e}")
+        return None
+    bad = page and TOPIC_FILTER.find(f"{page['title']} {page['summary']}")
+    if bad:
+        logger.warning(f"Skipping '{page['title']}' — matches banned term '{bad}'.")
+        return None
+    return page
+
+
+def run_build(limit=None, teams_only=False, seeds_only=False, refresh=False):
+    logger.info("Building the offline grounding index...")
+    index = get_grounding_index()
+
+    entities = seed_entities()
+    if not seeds_only:
+        entities += worldcup_entities(teams_only=teams_only)
+    if not refresh:
+        entities = [e for e in entities if not index.has(e[0][0])]
+    if limit is not None:
+        entities = entities[:limit]
+    logger.info(f"{len(entities)} entities to fetch.")
+
+    indexed = failed = 0
+    with ThreadPoolExecutor(max_workers=get_wiki_grounding().workers) as pool:
+        for (aliases, kind, _), page in zip(entities, pool.map(resolve, entities)):
+            if not page:
+                failed += 1
+                logger.warning(f"No usable Wikipedia page for '{aliases[0]}'")
+                continue
+            index.add(page, aliases=aliases, kind=kind)
+            indexed += 1
+
+    stats = index.stats()
+    logger.info(f"Grounding index build finished: {indexed} indexed, {failed} unresolved this run; "
+                f"{stats['pages']} pages / {stats['names']} names in {index.db_path}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, help="Maximum entities to fetch in this run")
+    parser.add_argument("--teams-only", action="store_true", help="Index national teams only, not squads")
+    parser.add_argument("--seeds-only", action="store_true", help="Index the built-in seed lists only")
+    parser.add_argument("--refresh", action="store_true", help="Re-fetch entities that are already indexed")
+    args = parser.parse_args()
+
+    run_build(limit=args.limit, teams_only=args.teams_only, seeds_only=args.seeds_only, refresh=args.refresh)
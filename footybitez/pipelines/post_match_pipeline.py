@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.utils.llm_cache import get_llm_cache
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -64,7 +66,7 @@ def is_knockout_match(target_match):
     return bool(stage and stage != "GROUP_STAGE")
 
 def fetch_api_football_data(home_name, away_name, date_str, api_key):
-    import requests
+    from footybitez.utils import http_client as http
     
     match_date = date_str.split("T")[0]
     headers = {"x-apisports-key": api_key}
@@ -75,7 +77,7 @@ def fetch_api_football_data(home_name, away_name, date_str, api_key):
     }
     
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=15)
+        resp = http.get(url, headers=headers, params=params, timeout=15)
         resp.raise_for_status()
         fixtures = resp.json().get("response", [])
     except Exception as e:
@@ -147,7 +149,7 @@ def fetch_api_football_data(home_name, away_name, date_str, api_key):
     # Fetch events
     events = []
     try:
-        events_resp = requests.get(f"https://v3.football.api-sports.io/fixtures/events", 
+        events_resp = http.get(f"https://v3.football.api-sports.io/fixtures/events", 
                                    headers=headers, params={"fixture": fixture_id}, timeout=15)
         events_resp.raise_for_status()
         events = events_resp.json().get("response", [])
@@ -182,7 +184,7 @@ def fetch_api_football_data(home_name, away_name, date_str, api_key):
     # Fetch statistics
     stats = {}
     try:
-        stats_resp = requests.get(f"https://v3.football.api-sports.io/fixtures/statistics", 
+        stats_resp = http.get(f"https://v3.football.api-sports.io/fixtures/statistics", 
                                   headers=headers, params={"fixture": fixture_id}, timeout=15)
         stats_resp.raise_for_status()
         stats_data = stats_resp.json().get("response", [])
@@ -299,8 +301,9 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
         return STATIC_MATCH_FALLBACKS[match_key]
 
     import json
-    from google import genai
     from google.genai import types
+
+    gateway = get_llm_gateway()
     
     # 1. Try to fetch real scorers & stats from API-Football first
     api_football_key = os.getenv("API_FOOTBALL_KEY")
@@ -358,33 +361,35 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
             "next_b": "Next opponent and date for away team"
         }}
         """
-        for key in keys:
-            for model in GEMINI_TEXT_MODELS:
-                try:
-                    logger.info(f"[Gemini] Generating post-match script details via model={model}...")
-                    client = genai.Client(api_key=key)
-                    r = client.models.generate_content(
-                        model=model,
-                        contents=prompt,
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json"
-                        )
-                    )
-                    data = json.loads(r.text)
-                    required = ["motm", "standout_moment", "next_a", "next_b"]
-                    if not is_knockout:
-                        required.append("standings")
-                    if all(k in data for k in required):
-                        logger.info("[Gemini] Narrative details generation succeeded.")
-                        # Inject real scorers and stats
-                        data["scorers"] = real_data["scorers"]
-                        data["stats"] = real_data["stats"]
-                        return data
-                except Exception as e:
-                    logger.warning(f"Gemini narrative generation failed on {model}: {e}")
-                    time.sleep(2)
-                    continue
-                    
+        # The prompt carries the real stats and scorers, so a cached narrative
+        # is only reused for the same data. Keyed under the whole Gemini/Groq chain.
+        cache = get_llm_cache()
+        narrative_prompt = prompt
+        narrative_model = "+".join(GEMINI_TEXT_MODELS + [GROQ_SCRIPT_MODEL])
+        cached = cache.get("post_match", narrative_model, narrative_prompt)
+        required = ["motm", "standout_moment", "next_a", "next_b"] + ([] if is_knockout else ["standings"])
+        if cached and all(k in cached for k in required):
+            logger.info("[LLMCache] Using cached post-match narrative.")
+            return cached
+        for _, key, model in gateway.combos("gemini", keys, GEMINI_TEXT_MODELS):
+            try:
+                logger.info(f"[Gemini] Generating post-match script details via model={model}...")
+                data = gateway.complete_json("gemini", key, model, prompt, temperature=None)
+                required = ["motm", "standout_moment", "next_a", "next_b"]
+                if not is_knockout:
+                    required.append("standings")
+                if all(k in data for k in required):
+                    logger.info("[Gemini] Narrative details generation succeeded.")
+                    # Inject real scorers and stats
+                    data["scorers"] = real_data["scorers"]
+                    data["stats"] = real_data["stats"]
+                    cache.put("post_match", narrative_model, narrative_prompt, data)
+                    return data
+            except Exception as e:
+                logger.warning(f"Gemini narrative generation failed on {model}: {e}")
+                time.sleep(2)
+                continue
+                
         # 2. Try Groq (fallback)
         groq_keys = []
         for suffix in ["", "2", "3"]:
@@ -393,20 +398,11 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
                 groq_keys.append(val)
 
         if groq_keys:
-            for j, gkey in enumerate(groq_keys):
+            for j, gkey, model in gateway.combos("groq", groq_keys, [GROQ_SCRIPT_MODEL]):
                 try:
-                    logger.info(f"Attempting Groq key #{j+1} (Llama-3.3-70b) fallback for post-match narrative generation...")
-                    from groq import Groq
-                    client = Groq(api_key=gkey)
-                    completion = client.chat.completions.create(
-                        model=GROQ_SCRIPT_MODEL,
-                        messages=[{"role": "user", "content": prompt + "\n\nRespond ONLY with valid JSON."}],
-                        temperature=0.7,
-                        max_tokens=1024,
-                        response_format={"type": "json_object"}
-                    )
-                    text = completion.choices[0].message.content
-                    data = json.loads(text)
+                    logger.info(f"Attempting Groq key #{j+1} ({model}) fallback for post-match narrative generation...")
+                    data = gateway.complete_json("groq", gkey, model, prompt + "\n\nRespond ONLY with valid JSON.",
+                                                 temperature=0.7, max_tokens=1024)
                     required = ["motm", "standout_moment", "next_a", "next_b"]
                     if not is_knockout:
                         required.append("standings")
@@ -414,6 +410,7 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
                         logger.info(f"Groq key #{j+1} post-match narrative fallback generation succeeded.")
                         data["scorers"] = real_data["scorers"]
                         data["stats"] = real_data["stats"]
+                        cache.put("post_match", narrative_model, narrative_prompt, data)
                         return data
                 except Exception as e:
                     logger.error(f"Groq key #{j+1} fallback generation failed: {e}")
@@ -485,39 +482,50 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
         "next_b": "Next opponent and date for away team"
     }}
     """
-    
-    for key in keys:
-        for model in GEMINI_TEXT_MODELS:
-            try:
-                logger.info(f"[GeminiSearch] Fetching post-match details via model={model}...")
-                client = genai.Client(api_key=key)
-                r1 = client.models.generate_content(
-                    model=model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        tools=[types.Tool(google_search=types.GoogleSearch())]
-                    )
+
+    # Grounded Gemini and the Groq / OpenRouter / Mistral fallbacks all answer
+    # this request, so a validated answer is cached under the request prompt and
+    # the whole chain.
+    cache = get_llm_cache()
+    details_prompt = prompt
+    details_model = "+".join(GEMINI_TEXT_MODELS + [GROQ_SCRIPT_MODEL, "openrouter", "mistral-large-latest"])
+    cached = cache.get("post_match", details_model, details_prompt)
+    required = ["scorers", "stats", "motm", "standout_moment", "next_a", "next_b"] + ([] if is_knockout else ["standings"])
+    if cached and all(k in cached for k in required):
+        logger.info("[LLMCache] Using cached post-match details.")
+        return cached
+    
+    for _, key, model in gateway.combos("gemini", keys, GEMINI_TEXT_MODELS):
+        try:
+            logger.info(f"[GeminiSearch] Fetching post-match details via model={model}...")
+            r1 = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    tools=[types.Tool(google_search=types.GoogleSearch())]
                 )
-                time.sleep(2.5)
-                r2 = client.models.generate_content(
-                    model=model,
-                    contents=f"Convert this text content into the requested JSON object format:\n\n{r1.text}",
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json"
-                    )
+            ))
+            time.sleep(2.5)
+            r2 = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                model=model,
+                contents=f"Convert this text content into the requested JSON object format:\n\n{r1.text}",
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
                 )
-                data = json.loads(r2.text)
-                required = ["scorers", "stats", "motm", "standout_moment", "next_a", "next_b"]
-                if not is_knockout:
-                    required.append("standings")
-                if all(k in data for k in required):
-                    logger.info("[GeminiSearch] Post-match grounding succeeded.")
-                    return data
-            except Exception as e:
-                logger.warning(f"Gemini post-match fetch failed on {model}: {e}")
-                time.sleep(2)
-                continue
-                
+            ))
+            data = json.loads(r2.text)
+            required = ["scorers", "stats", "motm", "standout_moment", "next_a", "next_b"]
+            if not is_knockout:
+                required.append("standings")
+            if all(k in data for k in required):
+                logger.info("[GeminiSearch] Post-match grounding succeeded.")
+                cache.put("post_match", details_model, details_prompt, data)
+                return data
+        except Exception as e:
+            logger.warning(f"Gemini post-match fetch failed on {model}: {e}")
+            time.sleep(2)
+            continue
+            
     # ── Groq + DuckDuckGo Search Fallback ──────────────────────────────────
     groq_keys = []
     for suffix in ["", "2", "3"]:
@@ -617,25 +625,17 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
             }}
             """
 
-            for j, gkey in enumerate(groq_keys):
+            for j, gkey, model in gateway.combos("groq", groq_keys, [GROQ_SCRIPT_MODEL]):
                 try:
                     logger.info(f"[GroqSearch] Trying Groq key #{j+1}...")
-                    from groq import Groq
-                    client = Groq(api_key=gkey)
-                    completion = client.chat.completions.create(
-                        model=GROQ_SCRIPT_MODEL,
-                        messages=[{"role": "user", "content": prompt + "\n\nRespond ONLY with valid JSON."}],
-                        temperature=0.7,
-                        max_tokens=1024,
-                        response_format={"type": "json_object"}
-                    )
-                    text = completion.choices[0].message.content
-                    data = json.loads(text)
+                    data = gateway.complete_json("groq", gkey, model, prompt + "\n\nRespond ONLY with valid JSON.",
+                                                 temperature=0.7, max_tokens=1024)
                     required = ["scorers", "stats", "motm", "standout_moment", "next_a", "next_b"]
                     if not is_knockout:
                         required.append("standings")
                     if all(k in data for k in required):
                         logger.info(f"[GroqSearch] Post-match grounding fallback succeeded with key #{j+1}.")
+                        cache.put("post_match", details_model, details_prompt, data)
                         return data
                 except Exception as ke:
                     logger.error(f"[GroqSearch] Groq key #{j+1} failed: {ke}")
@@ -656,7 +656,7 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
             for model in openrouter_models:
                 try:
                     logger.info(f"[OpenRouter] Trying model {model}...")
-                    response = requests.post(
+                    response = http.post(
                         "https://openrouter.ai/api/v1/chat/completions",
                         headers={
                             "Authorization": f"Bearer {openrouter_key}",
@@ -677,6 +677,7 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
                             required.append("standings")
                         if all(k in data for k in required):
                             logger.info(f"[OpenRouter] Success with {model}")
+                            cache.put("post_match", details_model, details_prompt, data)
                             return data
                     else:
                         logger.warning(f"[OpenRouter] {model} failed: {response.status_code} - {response.text[:200]}")
@@ -691,7 +692,7 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
     if mistral_key:
         try:
             logger.info("[Mistral] Attempting Mistral fallback for post-match details...")
-            response = requests.post(
+            response = http.post(
                 "https://api.mistral.ai/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {mistral_key}",
@@ -712,6 +713,7 @@ def get_gemini_post_match_details(home, away, date_str, venue, hs, as_, is_knock
                     required.append("standings")
                 if all(k in data for k in required):
                     logger.info("[Mistral] Fallback succeeded")
+                    cache.put("post_match", details_model, details_prompt, data)
                     return data
         except Exception as e:
             logger.error(f"[Mistral] Fallback failed: {e}")
@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from footybitez.utils.llm_models import GROQ_SCRIPT_MODEL, GEMINI_TEXT_MODELS
+from footybitez.utils.llm_cache import get_llm_cache
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -62,9 +64,9 @@ def get_match_stage_name(target_match):
 
 def get_gemini_pre_match_details(home, away, kickoff_str, venue, stage_name="GROUP STAGE"):
     import json
-    from google import genai
     from google.genai import types
     
+    gateway = get_llm_gateway()
     keys = []
     for suffix in ["", "2", "3"]:
         val = os.getenv(f"GEMINI_API_KEY{suffix}")
@@ -98,37 +100,47 @@ def get_gemini_pre_match_details(home, away, kickoff_str, venue, stage_name="GRO
         "storyline": "Short text detailing the main storyline"
     }}
     """
+
+    # Grounded Gemini and the Groq + DuckDuckGo fallback both answer this request,
+    # so a validated answer is cached under the request prompt and the whole chain.
+    cache = get_llm_cache()
+    details_prompt = prompt
+    details_model = "+".join(GEMINI_TEXT_MODELS + [GROQ_SCRIPT_MODEL])
+    cached = cache.get("pre_match", details_model, details_prompt)
+    required = ["h2h", "form_a", "form_b", "prob_a", "prob_draw", "prob_b", "player_a", "player_a_stats", "player_b", "player_b_stats", "storyline"]
+    if cached and all(k in cached for k in required):
+        logger.info("[LLMCache] Using cached pre-match details.")
+        return cached
     
-    for key in keys:
-        for model in GEMINI_TEXT_MODELS:
-            try:
-                logger.info(f"[GeminiSearch] Fetching pre-match details via model={model}...")
-                client = genai.Client(api_key=key)
-                r1 = client.models.generate_content(
-                    model=model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        tools=[types.Tool(google_search=types.GoogleSearch())]
-                    )
+    for _, key, model in gateway.combos("gemini", keys, GEMINI_TEXT_MODELS):
+        try:
+            logger.info(f"[GeminiSearch] Fetching pre-match details via model={model}...")
+            r1 = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    tools=[types.Tool(google_search=types.GoogleSearch())]
                 )
-                time.sleep(2.5)
-                r2 = client.models.generate_content(
-                    model=model,
-                    contents=f"Convert this text content into the requested JSON object format:\n\n{r1.text}",
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json"
-                    )
+            ))
+            time.sleep(2.5)
+            r2 = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                model=model,
+                contents=f"Convert this text content into the requested JSON object format:\n\n{r1.text}",
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json"
                 )
-                data = json.loads(r2.text)
-                required = ["h2h", "form_a", "form_b", "prob_a", "prob_draw", "prob_b", "player_a", "player_a_stats", "player_b", "player_b_stats", "storyline"]
-                if all(k in data for k in required):
-                    logger.info("[GeminiSearch] Pre-match grounding succeeded.")
-                    return data
-            except Exception as e:
-                logger.warning(f"Gemini pre-match fetch failed on {model}: {e}")
-                time.sleep(2)
-                continue
-                
+            ))
+            data = json.loads(r2.text)
+            required = ["h2h", "form_a", "form_b", "prob_a", "prob_draw", "prob_b", "player_a", "player_a_stats", "player_b", "player_b_stats", "storyline"]
+            if all(k in data for k in required):
+                logger.info("[GeminiSearch] Pre-match grounding succeeded.")
+                cache.put("pre_match", details_model, details_prompt, data)
+                return data
+        except Exception as e:
+            logger.warning(f"Gemini pre-match fetch failed on {model}: {e}")
+            time.sleep(2)
+            continue
+            
     # ── Groq + DuckDuckGo Search Fallback ──────────────────────────────────
     groq_keys = []
     for suffix in ["", "2", "3"]:
@@ -203,23 +215,15 @@ def get_gemini_pre_match_details(home, away, kickoff_str, venue, stage_name="GRO
             }}
             """
 
-            for j, gkey in enumerate(groq_keys):
+            for j, gkey, model in gateway.combos("groq", groq_keys, [GROQ_SCRIPT_MODEL]):
                 try:
                     logger.info(f"[GroqSearch] Trying Groq key #{j+1}...")
-                    from groq import Groq
-                    client = Groq(api_key=gkey)
-                    completion = client.chat.completions.create(
-                        model=GROQ_SCRIPT_MODEL,
-                        messages=[{"role": "user", "content": prompt + "\n\nRespond ONLY with valid JSON."}],
-                        temperature=0.7,
-                        max_tokens=1024,
-                        response_format={"type": "json_object"}
-                    )
-                    text = completion.choices[0].message.content
-                    data = json.loads(text)
+                    data = gateway.complete_json("groq", gkey, model, prompt + "\n\nRespond ONLY with valid JSON.",
+                                                 temperature=0.7, max_tokens=1024)
                     required = ["h2h", "form_a", "form_b", "prob_a", "prob_draw", "prob_b", "player_a", "player_a_stats", "player_b", "player_b_stats", "storyline"]
                     if all(k in data for k in required):
                         logger.info(f"[GroqSearch] Pre-match grounding fallback succeeded with key #{j+1}.")
+                        cache.put("pre_match", details_model, details_prompt, data)
                         return data
                 except Exception as ke:
                     logger.error(f"[GroqSearch] Groq key #{j+1} failed: {ke}")
@@ -26,6 +26,7 @@ import numpy as np
 from datetime import date
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -432,23 +433,22 @@ class WorldCupPipeline:
                 gemini_keys.append(val)
 
         if gemini_keys:
-            for key in gemini_keys:
+            gateway = get_llm_gateway()
+            for _, key, model in gateway.combos("gemini", gemini_keys, GEMINI_TEXT_MODELS[:1]):
                 try:
-                    from google import genai
                     from google.genai import types
-                    client = genai.Client(api_key=key)
                     search_prompt = (
                         f"Search for the head-to-head history (total matches played, wins for each team, draws), "
                         f"recent form of both teams, and winning probabilities or match predictions for the upcoming "
                         f"World Cup 2026 match: {home} vs {away}."
                     )
-                    r = client.models.generate_content(
-                        model=GEMINI_TEXT_MODELS[0],
+                    r = gateway.call("gemini", key, model, lambda client: client.models.generate_content(
+                        model=model,
                         contents=search_prompt,
                         config=types.GenerateContentConfig(
                             tools=[types.Tool(google_search=types.GoogleSearch())]
                         )
-                    )
+                    ))
                     h2h_context = r.text
                     logger.info(f"Retrieved head-to-head and probability context: {len(h2h_context)} chars.")
                     break
@@ -492,13 +492,9 @@ class WorldCupPipeline:
             except Exception:
                 pass
 
-        segment_media = []
-        for seg in script.get("segments", []):
-            kw = seg.get("visual_keyword", topic) if isinstance(seg, dict) else topic
-            # Append match-specific context so search returns match images, not generic photos
-            if match_context:
-                kw = f"{kw} {match_context}"
-            segment_media.append(self.media_sourcer.get_media(kw, count=2))
+        # Match-specific context is appended to every segment query so search
+        # returns match images, not generic photos.
+        segment_media = self.media_sourcer.plan_media(script, count=2, default_keyword=topic, suffix=match_context)
 
         visual_assets = {
             "title_card": title_card,
@@ -1,7 +1,7 @@
 import os
 import time
 import logging
-import requests
+from footybitez.utils import http_client as http
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class MetaPublisher:
             "limit": 100
         }
         try:
-            res = requests.get(url, params=params, timeout=15)
+            res = http.get(url, params=params, timeout=15)
             if res.status_code == 200:
                 data = res.json().get("data", [])
                 logger.info(f"Retrieved {len(data)} authorized Facebook Pages from Meta account.")
@@ -121,7 +121,7 @@ class MetaPublisher:
                     files = {
                         "source": video_file
                     }
-                    response = requests.post(url, data=payload, files=files, timeout=120)
+                    response = http.post(url, data=payload, files=files, timeout=120)
                     response_data = response.json()
                     
                     if response.status_code == 200 and "id" in response_data:
@@ -160,7 +160,7 @@ class MetaPublisher:
         }
         
         try:
-            container_res = requests.post(container_url, data=container_payload)
+            container_res = http.post(container_url, data=container_payload)
             container_data = container_res.json()
             
             if container_res.status_code != 200 or "id" not in container_data:
@@ -181,7 +181,7 @@ class MetaPublisher:
             max_attempts = 18 # 3 minutes total timeout
             for attempt in range(max_attempts):
                 time.sleep(10)
-                status_res = requests.get(status_url, params=params)
+                status_res = http.get(status_url, params=params)
                 status_data = status_res.json()
                 
                 if status_res.status_code == 200:
@@ -208,7 +208,7 @@ class MetaPublisher:
                 "access_token": self.access_token
             }
             
-            publish_res = requests.post(publish_url, data=publish_payload)
+            publish_res = http.post(publish_url, data=publish_payload)
             publish_data = publish_res.json()
             
             if publish_res.status_code == 200 and "id" in publish_data:
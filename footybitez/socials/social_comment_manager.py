@@ -1,10 +1,10 @@
 import os
 import json
 import logging
-import requests
-import google.genai as genai
+from footybitez.utils import http_client as http
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -17,16 +17,9 @@ class SocialCommentManager:
         self.api_version = "v19.0"
         self.base_url = "https://graph.facebook.com"
         
-        # Configure Gemini
+        # Gemini for reply generation (client pooled by the LLM gateway)
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        self.model = None
-        if self.gemini_api_key:
-            try:
-                # Use the recommended google.genai package
-                self.client = genai.Client(api_key=self.gemini_api_key)
-                self.model_name = GEMINI_TEXT_MODELS[0]
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini client: {e}")
+        self.model_name = GEMINI_TEXT_MODELS[0]
 
     def _get_authorized_pages(self) -> list:
         if not self.access_token:
@@ -37,7 +30,7 @@ class SocialCommentManager:
             "limit": 100
         }
         try:
-            res = requests.get(url, params=params, timeout=15)
+            res = http.get(url, params=params, timeout=15)
             if res.status_code == 200:
                 return res.json().get("data", [])
             else:
@@ -70,15 +63,14 @@ class SocialCommentManager:
         
         REPLY:
         """
-        try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-            return response.text.strip() if response.text else None
-        except Exception as e:
-            logger.error(f"Gemini social reply generation failed: {e}")
-            return None
+        gateway = get_llm_gateway()
+        for _, key, model in gateway.combos("gemini", [self.gemini_api_key], [self.model_name]):
+            try:
+                text = gateway.complete("gemini", key, model, prompt, temperature=None, json_mode=False)
+                return text.strip() if text else None
+            except Exception as e:
+                logger.error(f"Gemini social reply generation failed: {e}")
+        return None
 
     def auto_reply_facebook(self, max_posts=10):
         """
@@ -128,7 +120,7 @@ class SocialCommentManager:
                 "limit": max_posts
             }
             try:
-                posts_res = requests.get(posts_url, params=params, timeout=15)
+                posts_res = http.get(posts_url, params=params, timeout=15)
                 if posts_res.status_code != 200:
                     logger.error(f"Failed to get posts for Facebook Page '{page_name}': {posts_res.text}")
                     continue
@@ -143,7 +135,7 @@ class SocialCommentManager:
                         "fields": "id,message,from",
                         "limit": 50
                     }
-                    comments_res = requests.get(comments_url, params=comments_params, timeout=15)
+                    comments_res = http.get(comments_url, params=comments_params, timeout=15)
                     if comments_res.status_code != 200:
                         continue
                     
@@ -165,7 +157,7 @@ class SocialCommentManager:
                             "fields": "from",
                             "limit": 50
                         }
-                        replies_res = requests.get(replies_url, params=replies_params, timeout=15)
+                        replies_res = http.get(replies_url, params=replies_params, timeout=15)
                         already_replied = False
                         if replies_res.status_code == 200:
                             replies = replies_res.json().get("data", [])
@@ -186,7 +178,7 @@ class SocialCommentManager:
                                 "message": reply_msg,
                                 "access_token": page_token
                             }
-                            post_res = requests.post(reply_url, data=reply_payload, timeout=15)
+                            post_res = http.post(reply_url, data=reply_payload, timeout=15)
                             if post_res.status_code == 200:
                                 logger.info(f"SUCCESS: Replied to comment ID {comment_id} on Facebook Page '{page_name}'")
                             else:
@@ -211,7 +203,7 @@ class SocialCommentManager:
                 "fields": "username",
                 "access_token": self.access_token
             }
-            me_res = requests.get(me_url, params=me_params, timeout=15)
+            me_res = http.get(me_url, params=me_params, timeout=15)
             my_username = ""
             if me_res.status_code == 200:
                 my_username = me_res.json().get("username", "")
@@ -222,7 +214,7 @@ class SocialCommentManager:
                 "access_token": self.access_token,
                 "limit": max_media
             }
-            media_res = requests.get(media_url, params=params, timeout=15)
+            media_res = http.get(media_url, params=params, timeout=15)
             if media_res.status_code != 200:
                 logger.error(f"Failed to fetch Instagram media: {media_res.text}")
                 return
@@ -238,7 +230,7 @@ class SocialCommentManager:
                     "fields": "id,text,username",
                     "limit": 50
                 }
-                comments_res = requests.get(comments_url, params=comments_params, timeout=15)
+                comments_res = http.get(comments_url, params=comments_params, timeout=15)
                 if comments_res.status_code != 200:
                     continue
 
@@ -258,7 +250,7 @@ class SocialCommentManager:
                         "fields": "id,username",
                         "limit": 50
                     }
-                    replies_res = requests.get(replies_url, params=replies_params, timeout=15)
+                    replies_res = http.get(replies_url, params=replies_params, timeout=15)
                     already_replied = False
                     if replies_res.status_code == 200:
                         replies = replies_res.json().get("data", [])
@@ -279,7 +271,7 @@ class SocialCommentManager:
                             "message": reply_msg,
                             "access_token": self.access_token
                         }
-                        post_res = requests.post(reply_url, data=reply_payload, timeout=15)
+                        post_res = http.post(reply_url, data=reply_payload, timeout=15)
                         if post_res.status_code == 200:
                             logger.info(f"SUCCESS: Replied to Instagram comment ID {comment_id}")
                         else:
@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-import requests
+from footybitez.utils import http_client as http
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,7 @@ class TikTokPublisher:
         }
 
         try:
-            res = requests.post(url, headers=headers, data=payload)
+            res = http.post(url, headers=headers, data=payload)
             data = res.json()
             if res.status_code == 200 and "access_token" in data:
                 # Log the refreshed refresh token if TikTok rotated it
@@ -106,7 +106,7 @@ class TikTokPublisher:
         }
 
         try:
-            init_res = requests.post(init_url, headers=headers, json=payload)
+            init_res = http.post(init_url, headers=headers, json=payload)
             init_data = init_res.json()
             
             if init_res.status_code != 200 or "data" not in init_data:
@@ -124,7 +124,7 @@ class TikTokPublisher:
             }
             
             with open(file_path, "rb") as video_file:
-                upload_res = requests.put(upload_url, headers=upload_headers, data=video_file)
+                upload_res = http.put(upload_url, headers=upload_headers, data=video_file, timeout=300)
                 
                 # TikTok returns 200 or 201 for successful chunk uploads
                 if upload_res.status_code in [200, 201]:
@@ -0,0 +1,155 @@
+"""
+Shared, pooled HTTP client for every outbound fetcher.
+
+Every fetcher used to call bare requests.get/requests.post, so each call
+opened a fresh TCP+TLS connection (Wikimedia/Wikipedia alone see 10+
+sequential requests per short), with ad-hoc timeouts and no retry policy at
+all. Everything now goes through one requests.Session with:
+  - per-host keep-alive connection pools (HTTP_POOL_SIZE, default 16);
+  - a default timeout (HTTP_TIMEOUT, default 15s) when the caller sets none;
+  - retry with exponential backoff (HTTP_RETRIES, default 2; HTTP_BACKOFF,
+    default 0.5s) on connection errors and 429/5xx for idempotent methods,
+    honouring Retry-After — unless the server asks for longer than
+    HTTP_RETRY_AFTER_CAP (default 30s), in which case the response is handed
+    straight back (a daily-quota 429 never recovers within a run);
+  - per-host latency/error metrics, logged once at process exit.
+
+Usage:
+    from footybitez.utils import http_client as http
+
+    r = http.get(url, params=params, timeout=10)
+    r = http.post(url, data=payload)
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Re-exported so call sites don't need a separate `import requests` just to
+# catch these.
+HTTPError = requests.HTTPError
+RequestException = requests.RequestException
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_RETRY_AFTER_CAP = float(os.getenv("HTTP_RETRY_AFTER_CAP", "30"))
+
+
+class _CappedRetryAfter(Retry):
+    """Retry that gives up at once when Retry-After asks for more than the cap."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > HTTP_RETRY_AFTER_CAP:
+                raise MaxRetryError(_pool, url, ResponseError(
+                    f"Retry-After {retry_after:.0f}s exceeds {HTTP_RETRY_AFTER_CAP:.0f}s cap"))
+        return super().increment(method=method, url=url, response=response, error=error,
+                                 _pool=_pool, _stacktrace=_stacktrace)
+
+
+def _build_session() -> requests.Session:
+    retry = _CappedRetryAfter(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=HTTP_RETRIES,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        # Callers inspect status codes themselves (e.g. `if r.status_code != 200`),
+        # so hand back the final response instead of raising.
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _build_session()
+_metrics = {}
+_metrics_lock = threading.Lock()
+_MAX_SAMPLES = 500
+
+
+def _record(host: str, elapsed: float, ok: bool):
+    with _metrics_lock:
+        m = _metrics.setdefault(host, {"requests": 0, "errors": 0, "latencies": []})
+        m["requests"] += 1
+        if not ok:
+            m["errors"] += 1
+        m["latencies"].append(elapsed)
+        if len(m["latencies"]) > _MAX_SAMPLES:
+            del m["latencies"][0]
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request through the shared pooled session, with metrics."""
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = DEFAULT_TIMEOUT
+    host = urlsplit(url).hostname or "?"
+    started = time.perf_counter()
+    try:
+        response = _session.request(method, url, **kwargs)
+    except Exception:
+        _record(host, time.perf_counter() - started, ok=False)
+        raise
+    _record(host, time.perf_counter() - started, ok=response.status_code < 400)
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def get_metrics() -> dict:
+    """Per-host request counts, error counts and p50/p95 latency in ms."""
+    with _metrics_lock:
+        return {
+            host: {
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "p50_ms": round(_percentile(m["latencies"], 50) * 1000),
+                "p95_ms": round(_percentile(m["latencies"], 95) * 1000),
+            }
+            for host, m in _metrics.items() if m["latencies"]
+        }
+
+
+def log_metrics():
+    """Logs one line per host, busiest first."""
+    metrics = get_metrics()
+    for host, m in sorted(metrics.items(), key=lambda kv: -kv[1]["requests"]):
+        logger.info(
+            f"[HTTP] {host}: {m['requests']} requests, {m['errors']} errors, "
+            f"p50 {m['p50_ms']}ms, p95 {m['p95_ms']}ms"
+        )
+
+
+atexit.register(log_metrics)
@@ -0,0 +1,162 @@
+"""
+Compiled keyword / safety matchers shared by every content filter.
+
+The men's-football-only and adult-content filters were `any(bad in text for
+bad in LIST)` loops in half a dozen places (ScriptGenerator's grounding,
+sanitizer and validator, MediaSourcer._is_bad_image / _make_football_query,
+GeneralNewsPipeline's RSS crawl), each with its own copy of the list and its
+own idea of word boundaries. Bare substring tests also misfired on ordinary
+words: "conflict" contains "nfl", "dilemma" contains "mma", and "Boxing Day"
+fixtures tripped "boxing".
+
+Each list is now one KeywordMatcher: a single precompiled alternation regex
+that scans the text once and reports which term matched.
+  - Terms match whole words (a trailing plural "s" is allowed), spaces in a
+    term also match "_" and "-" so URL slugs and filenames hit the same way;
+    word_boundary=False gives plain substring matching for URL fragments.
+  - `exceptions` are phrases that are allowed even though they contain a
+    term ("boxing day" vs "boxing", "sussex" vs "sex"). They are part of the
+    same regex, so an exception shadows the term inside it in the one pass.
+  - Per-list differences are explicit: the narration/topic list leaves out
+    "handball" (a routine foul/VAR term) and only bans "racing" in phrases
+    ("horse racing"), because clubs are named Racing Santander, Racing Club,
+    Racing Genk; the image-metadata list also bans "handball", futsal and
+    beach variants, which are fine to steer an image search away from.
+  - Image URLs, filenames and tags run words together and append years
+    ("FIFAWomensWorldCup2023", "womenssoccer", "rugby7s"), so
+    IMAGE_METADATA_FILTER checks a candidate image's URL, title and tags as
+    plain substrings like the original filter did; its exceptions cover the
+    words, names and CDN hosts that contain a term ("Emmanuel" vs "mma",
+    "staticflickr" vs "cfl"). IMAGE_FILTER's word boundaries are for cleaning
+    search queries.
+
+Usage:
+    from footybitez.utils.keyword_matcher import TOPIC_FILTER
+
+    term = TOPIC_FILTER.find(text)     # "rugby", or None
+    if TOPIC_FILTER.matches(text):
+        ...
+    query = IMAGE_FILTER.remove(query)  # drop banned terms from a search query
+"""
+import re
+
+_SEPARATORS = r"[\s_\-]+"
+
+
+def _term_pattern(term: str) -> str:
+    words = [w for w in re.split(_SEPARATORS, term.strip().lower()) if w]
+    return _SEPARATORS.join(re.escape(w) for w in words)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(w for w in re.split(_SEPARATORS, text.lower()) if w)
+
+
+class KeywordMatcher:
+    def __init__(self, terms, exceptions=(), word_boundary: bool = True):
+        self.terms = list(dict.fromkeys(_normalize(t) for t in terms if t.strip()))
+        self.exceptions = list(dict.fromkeys(_normalize(e) for e in exceptions if e.strip()))
+        self.word_boundary = word_boundary
+
+        def alternation(items):
+            # Longest first, so "rugby league" wins over "rugby" at the same spot.
+            return "|".join(_term_pattern(i) for i in sorted(items, key=len, reverse=True))
+
+        if word_boundary:
+            # Letters/digits on either side mean we're inside a longer word.
+            prefix, suffix = r"(?<![^\W_])", r"s?(?![^\W_])"
+        else:
+            prefix, suffix = "", ""
+        parts = []
+        if self.exceptions:
+            parts.append(f"(?P<exception>{prefix}(?:{alternation(self.exceptions)}){suffix})")
+        parts.append(f"(?P<term>{prefix}(?:{alternation(self.terms)}){suffix})")
+        self._regex = re.compile("|".join(parts), re.IGNORECASE)
+        self._lookup = {t: t for t in self.terms}
+
+    def _canonical(self, matched: str) -> str:
+        text = _normalize(matched)
+        if text not in self._lookup and text.endswith("s"):
+            text = text[:-1]
+        return self._lookup.get(text, text)
+
+    def find(self, text: str) -> str | None:
+        """The first banned term in `text` that isn't covered by an exception, or None."""
+        if not text:
+            return None
+        for match in self._regex.finditer(text):
+            if match.lastgroup == "term":
+                return self._canonical(match.group())
+        return None
+
+    def matches(self, text: str) -> bool:
+        return self.find(text) is not None
+
+    def remove(self, text: str) -> str:
+        """`text` with every banned term (outside exceptions) cut out and spacing tidied."""
+        if not text:
+            return text
+        cleaned = self._regex.sub(lambda m: m.group() if m.lastgroup == "exception" else " ", text)
+        return " ".join(cleaned.split())
+
+
+# ─── Term lists ──────────────────────────────────────────────────────────────
+WRONG_SPORT_TERMS = [
+    "nfl", "gridiron", "american football", "superbowl", "super bowl", "touchdown",
+    "rugby", "rugby union", "rugby league",
+    "cricket", "hockey", "nhl", "baseball", "basketball", "nba",
+    "tennis", "golf", "boxing", "mma", "volleyball",
+    "formula 1", "formula one", "motogp", "grand prix",
+    "horse racing", "racecourse", "jockey", "snooker", "darts",
+]
+WRONG_GENDER_TERMS = [
+    "women", "woman", "female", "ladies", "girl",
+    "nwsl", "wsl", "nwt", "women's national", "womens", "women football", "women soccer",
+]
+# Image metadata only — "handball" is a routine football term in narration.
+IMAGE_ONLY_TERMS = [
+    "handball", "quarterback", "helmet", "nfl draft", "cfl", "afl",
+    "beach socca", "beach soccer", "beach football", "sand soccer",
+    "futsal", "futbol sala", "indoor football", "indoor soccer",
+    "seven-a-side", "five-a-side",
+]
+# Football phrases that contain a banned term.
+FOOTBALL_EXCEPTIONS = ["boxing day"]
+# URL, title and tag fragments that contain an image term as a substring.
+IMAGE_METADATA_EXCEPTIONS = FOOTBALL_EXCEPTIONS + [
+    "boxingday", "conflict", "influen", "confluen", "unflap",   # boxing, nfl
+    "amma", "emma", "imma", "omma", "umma",   # mma: Hammarby, Muhammad, dilemma, Emmanuel, command, summary
+    "unbala",                                 # nba (unbalanced)
+    "staticflickr",                           # cfl (Openverse's Flickr CDN)
+    "newsl",                                  # wsl (newsletter, newslink)
+]
+
+TOPIC_TERMS = WRONG_SPORT_TERMS + WRONG_GENDER_TERMS
+IMAGE_TERMS = WRONG_SPORT_TERMS + IMAGE_ONLY_TERMS + WRONG_GENDER_TERMS
+
+# Adult-content fragments checked in image URLs as plain substrings (CDN host
+# names and slugs run words together).
+ADULT_URL_TERMS = [
+    "porn", "xxx", "nsfw", "erotic", "nude", "nudit", "onlyfans",
+    "xvideo", "xhamster", "redtube", "youporn", "hentai", "milf", "blowjob",
+    "vagina", "penis", "pussy", "boobs", "naughty", "playboy",
+    "sensual", "softcore", "orgasm", "ejaculat", "semen",
+    "fuck", "boob", "naked", "busty", "camgirl", "chaturbate",
+    "xhcdn", "pornhub", "xvideos", "xnxx", "phncdn", "xv-cdn", "sex",
+]
+ADULT_URL_EXCEPTIONS = ["sussex", "essex", "middlesex", "sexton", "sexsmith"]
+# Whole words in titles/tags. Leaves out "adult" (adult/senior team),
+# "hardcore" (hardcore fans), "escort" (player/child escorts) and "dick"
+# (Dick Advocaat).
+ADULT_TEXT_TERMS = [
+    "porn", "pornography", "sex", "nude", "nudity", "erotic", "erotica", "nsfw", "hentai",
+    "naked", "nakedness", "sexy", "sensual", "busty", "milf", "xxx", "softcore", "blowjob",
+    "fuck", "vagina", "penis", "boob", "boobs", "pussy", "pornstar", "playboy",
+]
+# ─────────────────────────────────────────────────────────────────────────────
+
+TOPIC_FILTER = KeywordMatcher(TOPIC_TERMS, exceptions=FOOTBALL_EXCEPTIONS)
+IMAGE_FILTER = KeywordMatcher(IMAGE_TERMS, exceptions=FOOTBALL_EXCEPTIONS)
+IMAGE_METADATA_FILTER = KeywordMatcher(IMAGE_TERMS, exceptions=IMAGE_METADATA_EXCEPTIONS, word_boundary=False)
+ADULT_URL_FILTER = KeywordMatcher(ADULT_URL_TERMS, exceptions=ADULT_URL_EXCEPTIONS, word_boundary=False)
+ADULT_TEXT_FILTER = KeywordMatcher(ADULT_TEXT_TERMS)
@@ -0,0 +1,135 @@
+"""
+llm_cache.py
+On-disk TTL cache for validated LLM responses.
+
+Re-running a failed pipeline, a backfill or a --force World Cup run sent
+exactly the same prompts again — scripts, headline selections, pre/post-match
+details — and spent free-tier requests-per-day on answers we already had.
+Validated responses are now stored as one JSON file per (call type, model,
+temperature, normalized prompt) under footybitez/data/cache/llm/<call_type>/
+(LLM_CACHE_DIR to override), which the workflows persist with actions/cache.
+
+Only responses that passed the caller's validation are stored, and callers
+re-validate on a hit, so a tightened validator never serves an old answer it
+would now reject. Prompts are normalized by collapsing whitespace (the
+prompts are indented triple-quoted f-strings); anything else that changes —
+the topic, the grounding context, the stats — changes the key.
+
+TTLs are per call type (hours, see DEFAULT_TTL_HOURS); override one with
+LLM_CACHE_TTL_<CALL_TYPE>_HOURS, e.g. LLM_CACHE_TTL_PRE_MATCH_HOURS=2, or set it
+to 0 to disable caching for it. LLM_CACHE_BYPASS=true skips every lookup (fresh
+answers are still stored, so a bypassed run refreshes the cache).
+
+Usage:
+    from footybitez.utils.llm_cache import get_llm_cache
+
+    cache = get_llm_cache()
+    data = cache.get("script", model, prompt, temperature=0.7)
+    if data is None:
+        data = ...  # call the model and validate
+        cache.put("script", model, prompt, data, temperature=0.7)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = "footybitez/data/cache/llm"
+DEFAULT_TTL_HOURS = {
+    "script": 72,            # Shorts scripts for a topic + grounding context
+    "breaking_news": 24,
+    "headline": 12,          # general-news headline selection
+    "raw_json": 24,
+    "pre_match": 6,          # predictions and team news move towards kick-off
+    "post_match": 72,        # a finished match's facts don't change
+}
+FALLBACK_TTL_HOURS = 24
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Whitespace collapsed; case and wording are significant."""
+    return " ".join(str(prompt or "").split())
+
+
+def bypass_enabled() -> bool:
+    return os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+
+class LLMResponseCache:
+    def __init__(self, cache_dir: str | None = None, bypass: bool | None = None):
+        self.cache_dir = cache_dir or os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.bypass = bypass_enabled() if bypass is None else bypass
+        self._lock = threading.Lock()
+        self._stats = {}  # call_type -> {"hits": n, "misses": n}
+
+    def ttl_seconds(self, call_type: str) -> float:
+        default = DEFAULT_TTL_HOURS.get(call_type, FALLBACK_TTL_HOURS)
+        return float(os.getenv(f"LLM_CACHE_TTL_{call_type.upper()}_HOURS", default)) * 3600
+
+    def _path(self, call_type: str, model: str, prompt: str, temperature) -> str:
+        temp = "default" if temperature is None else f"{float(temperature):g}"
+        key = f"{model}\n{temp}\n{normalize_prompt(prompt)}"
+        return os.path.join(self.cache_dir, call_type, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _count(self, call_type: str, field: str):
+        with self._lock:
+            self._stats.setdefault(call_type, {"hits": 0, "misses": 0})[field] += 1
+
+    def get(self, call_type: str, model: str, prompt: str, temperature=None):
+        """Cached response for this request, or None if absent, expired, corrupt or bypassed."""
+        ttl = self.ttl_seconds(call_type)
+        path = self._path(call_type, model, prompt, temperature)
+        if ttl > 0 and not self.bypass and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if time.time() - entry.get("t", 0) <= ttl:
+                    self._count(call_type, "hits")
+                    return entry["data"]
+            except Exception:
+                pass
+        self._count(call_type, "misses")
+        return None
+
+    def put(self, call_type: str, model: str, prompt: str, data, temperature=None):
+        """Stores a response the caller has already validated."""
+        if self.ttl_seconds(call_type) <= 0 or data is None:
+            return
+        path = self._path(call_type, model, prompt, temperature)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"t": time.time(), "model": model, "data": data}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[LLMCache] Failed to store {call_type} response from {model}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {c: dict(s) for c, s in self._stats.items()}
+
+    def log_stats(self):
+        """Prints one hit-rate line per call type looked up this run."""
+        for call_type, s in sorted(self.stats().items()):
+            total = s["hits"] + s["misses"]
+            if total:
+                print(f"[LLMCache] {call_type}: {s['hits']}/{total} hits ({100 * s['hits'] / total:.0f}%)"
+                      + (" — bypassed" if self.bypass else ""))
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide shared LLMResponseCache."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = LLMResponseCache()
+        return _instance
@@ -0,0 +1,386 @@
+"""
+One gateway for every Gemini / Groq / Claude call, with a cross-run registry
+of dead key/model combinations.
+
+The key x model fallback loop was re-implemented in ScriptGenerator,
+DocumentaryGenerator, MediaSourcer's vision check and AI image generator,
+football_visual_generator, both comment managers and the pre/post-match detail
+fetchers. Each copy built a fresh client per attempt and rediscovered the same
+429 / 404 / "limit: 0" from scratch — every call, every pipeline, every cron
+run — although a daily quota stays exhausted until it resets and a retired
+model never comes back.
+
+Now:
+  - clients are pooled per provider + API key for the whole process;
+  - a failed call is classified from its error text (the PerDay vs PerMinute
+    parsing handle_429_sleep used to do on its own) and, when the failure has
+    a known window, the combination is recorded with the time it recovers:
+      per_day          daily quota — next midnight Pacific time for Gemini,
+                       when Google resets requests-per-day; Groq's own "try
+                       again in" for its rolling daily token/request limits;
+      per_minute       the retry delay the API reported ("Please retry in
+                       27s", retryDelay, Groq's "try again in 7m12.5s");
+      zero_allocation  "limit: 0", the key's tier has no quota for this model —
+                       LLM_ZERO_ALLOCATION_HOURS (default 24);
+      retired          the model is not found (404 / NOT_FOUND naming the
+                       model), decommissioned or no longer available —
+                       LLM_RETIRED_MODEL_DAYS (default 7);
+      auth             invalid, revoked or suspended key (the whole key) or
+                       PERMISSION_DENIED on one model — LLM_AUTH_COOLDOWN_HOURS
+                       (default 6).
+    A 429 with no recognisable window is not recorded; the caller just moves
+    on to its next option, as before.
+  - every call site asks the gateway which combinations are still alive, so a
+    dead one is skipped instantly in every pipeline until it recovers.
+
+The registry is one JSON file under footybitez/data/cache/ (LLM_HEALTH_FILE to
+override), which the workflows persist with actions/cache. API keys are only
+ever stored hashed.
+
+Usage:
+    from footybitez.utils.llm_gateway import get_llm_gateway
+
+    gateway = get_llm_gateway()
+    for i, key, model in gateway.combos("gemini", gemini_keys, GEMINI_TEXT_MODELS):
+        try:
+            data = gateway.complete_json("gemini", key, model, prompt, temperature=0.3)
+        except Exception as e:
+            ...                                   # already recorded; try the next one
+    # Arbitrary requests on the pooled client:
+    response = gateway.call("gemini", key, model, lambda client: client.models.generate_content(...))
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+HEALTH_FILE = "footybitez/data/cache/llm_health.json"
+PROVIDERS = ("gemini", "groq", "anthropic")
+ANY_MODEL = "*"              # registry entries that cover every model of a key
+MAX_PER_MINUTE_WAIT = 3600   # cap on a parsed retry delay
+DEFAULT_PER_MINUTE_WAIT = 60
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Matched against the lowercased error text; HTTP codes only as whole numbers
+# ("Used 99401" isn't a 401). A bare "not found" or 404 (a missing file, a
+# proxy's error page) doesn't retire a model: only phrasing about the model
+# itself, or a 404 with a NOT_FOUND / not_found_error status, does.
+_RETIRED = re.compile(r"models/\S+ (?:is )?not found|model_not_found|\bmodel\W+\S+ (?:is )?(?:not found|does not exist)"
+                      r"|\b404\b.*\bnot_found|\bnot_found.*\b404\b"
+                      r"|no longer available|decommissioned|has been deprecated", re.S)
+_AUTH = re.compile(r"\b401\b|api key not valid|api_key_invalid|invalid_api_key|invalid api key"
+                   r"|permission_denied|organization_restricted|suspended|revoked")
+# PERMISSION_DENIED can be about one model (region / tier), so it doesn't kill the whole key.
+_MODEL_ONLY_AUTH = re.compile(r"permission_denied")
+_QUOTA = re.compile(r"\b429\b|resource_?exhausted|quota|rate[ _]limit|too many requests")
+
+
+class ComboUnavailable(Exception):
+    """Raised by LLMGateway.call for a key/model combination the registry marks dead."""
+
+
+def _squash(text: str) -> str:
+    return text.lower().replace("_", "").replace("-", "").replace(" ", "")
+
+
+def retry_delay(err_msg: str) -> float:
+    """
+    The retry delay an error message suggests, in seconds (0.0 if none):
+    Gemini's "Please retry in 27.61s" / retryDelay: '27s', or Groq's
+    "Please try again in 7m12.5s".
+    """
+    match = re.search(r"(?:retry|try again) in ((?:[0-9.]+h)?(?:[0-9.]+m(?!s))?(?:[0-9.]+s)?)",
+                      err_msg, re.IGNORECASE)
+    if match and match.group(1):
+        total = 0.0
+        for value, unit in re.findall(r"([0-9.]+)([hms])", match.group(1).lower()):
+            try:
+                total += float(value) * {"h": 3600, "m": 60, "s": 1}[unit]
+            except ValueError:
+                pass
+        if total:
+            return total
+    match = re.search(r"retryDelay[\"']?\s*:\s*[\"']?([0-9.]+)\s*s", err_msg, re.IGNORECASE)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            pass
+    return 0.0
+
+
+def quota_window(err_msg: str) -> str | None:
+    """
+    "zero_allocation", "per_day" or "per_minute" for a quota error whose window
+    can be told from its text, otherwise None.
+    """
+    lower = err_msg.lower()
+    squashed = _squash(err_msg)
+    if re.search(r"limit:\s*0\b", lower):
+        return "zero_allocation"
+    if "perday" in squashed or "(rpd)" in lower or "(tpd)" in lower:
+        return "per_day"
+    if "perminute" in squashed or "(rpm)" in lower or "(tpm)" in lower:
+        return "per_minute"
+    return None
+
+
+def seconds_until_daily_reset(now: float | None = None) -> float:
+    """Seconds until the next midnight Pacific time (UTC if tz data is unavailable)."""
+    now = time.time() if now is None else now
+    try:
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo("America/Los_Angeles")
+    except Exception:
+        tz = datetime.timezone.utc
+    current = datetime.datetime.fromtimestamp(now, tz)
+    midnight = datetime.datetime.combine(current.date() + datetime.timedelta(days=1), datetime.time(), tz)
+    return max(60.0, midnight.timestamp() - now)
+
+
+def classify_error(err_msg: str, provider: str = "gemini", now: float | None = None) -> tuple:
+    """
+    (reason, seconds until the combination recovers, whole_key) for a failure
+    with a known window, or (None, 0.0, False) for a transient / unclear one.
+    """
+    lower = str(err_msg).lower()
+    if _AUTH.search(lower):
+        whole_key = not _MODEL_ONLY_AUTH.search(lower)
+        return "auth", float(os.getenv("LLM_AUTH_COOLDOWN_HOURS", "6")) * 3600, whole_key
+    if _QUOTA.search(lower):
+        window = quota_window(err_msg)
+        if window == "zero_allocation":
+            return window, float(os.getenv("LLM_ZERO_ALLOCATION_HOURS", "24")) * 3600, False
+        delay = retry_delay(err_msg)
+        if window == "per_day":
+            # Gemini still reports a 30-60s retryDelay on a daily quota, which is
+            # meaningless — it resets at midnight PT. Groq's daily limits roll, and
+            # its "try again in" is exact.
+            if provider == "gemini" or not delay:
+                return window, seconds_until_daily_reset(now), False
+            return window, min(delay, 86400.0), False
+        if window == "per_minute" or delay:
+            return "per_minute", min(delay or DEFAULT_PER_MINUTE_WAIT, MAX_PER_MINUTE_WAIT), False
+        return None, 0.0, False
+    if _RETIRED.search(lower):
+        return "retired", float(os.getenv("LLM_RETIRED_MODEL_DAYS", "7")) * 86400, False
+    return None, 0.0, False
+
+
+def strip_code_fences(text: str) -> str:
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1]
+    if text.endswith("```"):
+        text = text.rsplit("```", 1)[0]
+    return text.strip()
+
+
+def key_id(key: str) -> str:
+    return hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:8]
+
+
+class KeyHealthRegistry:
+    """Persisted {provider:key_hash:model -> {reason, until, error}} of dead combinations."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("LLM_HEALTH_FILE", HEALTH_FILE)
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._skipped = {}   # combo -> calls skipped this run
+
+    def _load(self) -> dict:
+        """Load the registry. Returns an empty one if the file is missing or corrupt."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {k: v for k, v in data.items() if isinstance(v, dict)}
+            except Exception:
+                pass
+        return {}
+
+    def _save(self):
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"[LLMGateway] Failed to save {self.path}: {e}")
+
+    @staticmethod
+    def combo(provider: str, key: str, model: str) -> str:
+        return f"{provider}:{key_id(key)}:{model}"
+
+    def dead_reason(self, provider: str, key: str, model: str) -> str | None:
+        """Why this combination (or its whole key) is dead right now, or None if it's usable."""
+        now = time.time()
+        with self._lock:
+            for name in (self.combo(provider, key, ANY_MODEL), self.combo(provider, key, model)):
+                entry = self._data.get(name)
+                if entry and entry.get("until", 0) > now:
+                    self._skipped[name] = self._skipped.get(name, 0) + 1
+                    return entry.get("reason")
+        return None
+
+    def mark_dead(self, provider: str, key: str, model: str, reason: str, seconds: float, error: str = ""):
+        with self._lock:
+            self._data[self.combo(provider, key, model)] = {
+                "reason": reason, "until": time.time() + seconds, "error": str(error)[:200],
+            }
+            # Drop entries that have long recovered so the file doesn't grow forever.
+            cutoff = time.time() - 86400
+            self._data = {k: v for k, v in self._data.items() if v.get("until", 0) > cutoff}
+            self._save()
+
+    def record_error(self, provider: str, key: str, model: str, err_msg: str) -> str | None:
+        """Classifies a failure and records it if its window is known. Returns the reason."""
+        reason, seconds, whole_key = classify_error(err_msg, provider)
+        if reason:
+            self.mark_dead(provider, key, ANY_MODEL if whole_key else model, reason, seconds, err_msg)
+            print(f"[LLMGateway] {provider} key {key_id(key)} / {ANY_MODEL if whole_key else model}: "
+                  f"{reason} — skipping it for {seconds / 3600:.1f}h.")
+        return reason
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            dead = {k: v["reason"] for k, v in self._data.items() if v.get("until", 0) > now}
+            return {"dead": dead, "skipped": dict(self._skipped)}
+
+    def log_stats(self):
+        s = self.stats()
+        for name, reason in sorted(s["dead"].items()):
+            print(f"[LLMGateway] {name}: {reason}, skipped {s['skipped'].get(name, 0)}x this run")
+
+
+class LLMGateway:
+    def __init__(self, registry: KeyHealthRegistry | None = None):
+        self.registry = registry or KeyHealthRegistry()
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    # ── clients ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _client_class(provider: str):
+        if provider == "gemini":
+            from google import genai
+            return genai.Client
+        if provider == "groq":
+            from groq import Groq
+            return Groq
+        if provider == "anthropic":
+            import anthropic
+            return anthropic.Anthropic
+        raise ValueError(f"Unknown LLM provider '{provider}'")
+
+    def sdk_available(self, provider: str) -> bool:
+        try:
+            self._client_class(provider)
+            return True
+        except ImportError:
+            return False
+
+    def client(self, provider: str, key: str):
+        """The pooled client for this provider + key, created on first use."""
+        cls = self._client_class(provider)
+        # Keyed on the class too, so a re-imported (or test-patched) SDK gets fresh clients.
+        pool_key = (provider, key, id(cls))
+        with self._lock:
+            if pool_key not in self._clients:
+                self._clients[pool_key] = cls(api_key=key)
+            return self._clients[pool_key]
+
+    # ── registry ─────────────────────────────────────────────────────────────
+
+    def available(self, provider: str, key: str, model: str = ANY_MODEL) -> bool:
+        return self.registry.dead_reason(provider, key, model) is None
+
+    def combos(self, provider: str, keys: list, models: list) -> list:
+        """(key_index, key, model) for every combination not currently marked dead, keys outermost."""
+        alive = []
+        for i, key in enumerate(keys):
+            for model in models:
+                reason = self.registry.dead_reason(provider, key, model)
+                if reason:
+                    print(f"[LLMGateway] Skipping {provider} key #{i+1} / {model} ({reason}).")
+                    continue
+                alive.append((i, key, model))
+        return alive
+
+    def record_error(self, provider: str, key: str, model: str, error) -> str | None:
+        return self.registry.record_error(provider, key, model, str(error))
+
+    # ── requests ─────────────────────────────────────────────────────────────
+
+    def call(self, provider: str, key: str, model: str, request):
+        """
+        Runs `request(client)` on the pooled client. Failures are classified
+        and recorded before being re-raised; a combination already marked dead
+        raises ComboUnavailable without a request.
+        """
+        reason = self.registry.dead_reason(provider, key, model)
+        if reason:
+            raise ComboUnavailable(f"{provider} key {key_id(key)} / {model}: {reason}")
+        try:
+            return request(self.client(provider, key))
+        except Exception as e:
+            self.registry.record_error(provider, key, model, str(e))
+            raise
+
+    def complete(self, provider: str, key: str, model: str, prompt: str, system: str | None = None,
+                 temperature: float | None = 0.7, max_tokens: int = 1024, json_mode: bool = True) -> str:
+        """One text completion; returns the response text. temperature=None keeps the provider default."""
+        if provider == "gemini":
+            from google.genai import types
+            config = {} if temperature is None else {"temperature": temperature}
+            if json_mode:
+                config["response_mime_type"] = "application/json"
+                config["thinking_config"] = types.ThinkingConfig(thinking_budget=0)
+            contents = f"{system}\n\n{prompt}" if system else prompt
+            response = self.call(provider, key, model, lambda c: c.models.generate_content(
+                model=model, contents=contents, config=types.GenerateContentConfig(**config)))
+            return response.text or ""
+        if provider == "groq":
+            messages = ([{"role": "system", "content": system}] if system else []) + \
+                       [{"role": "user", "content": prompt}]
+            kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+            if temperature is not None:
+                kwargs["temperature"] = temperature
+            completion = self.call(provider, key, model, lambda c: c.chat.completions.create(
+                model=model, messages=messages, max_tokens=max_tokens, **kwargs))
+            return completion.choices[0].message.content or ""
+        if provider == "anthropic":
+            kwargs = {"system": system} if system else {}
+            if temperature is not None:
+                kwargs["temperature"] = temperature
+            message = self.call(provider, key, model, lambda c: c.messages.create(
+                model=model, max_tokens=max_tokens, messages=[{"role": "user", "content": prompt}], **kwargs))
+            return message.content[0].text
+        raise ValueError(f"Unknown LLM provider '{provider}'")
+
+    def complete_json(self, provider: str, key: str, model: str, prompt: str, **kwargs):
+        """complete() with the reply parsed as JSON (markdown fences stripped)."""
+        return json.loads(strip_code_fences(self.complete(provider, key, model, prompt, **kwargs)))
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide shared LLMGateway."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = LLMGateway()
+        return _instance
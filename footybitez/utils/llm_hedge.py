@@ -0,0 +1,212 @@
+"""
+llm_hedge.py
+Hedged requests across LLM providers, with cross-run latency / win-rate stats.
+
+ScriptGenerator tried Claude, then every Groq key, then every Gemini key/model
+strictly one after another, so a single slow or hanging provider could eat the
+breaking-news workflow's whole 4-minute timeout before the next one was even
+asked. In hedged mode (LLM_HEDGE=true) hedged_call starts the first provider,
+and if it hasn't produced an accepted answer within LLM_HEDGE_DELAY seconds
+(default 20; 0 fires every provider at once) it starts the next one alongside
+it — and immediately, if a provider fails outright. The first response the
+caller's `accept` check passes wins; the others are cancelled: each attempt
+receives a threading.Event it checks between keys/models, and a request that is
+already in flight is abandoned on its daemon thread.
+
+Every completed attempt's latency, and every race it was started in and won,
+is recorded per provider in one small JSON file under footybitez/data/cache/
+(LLM_HEDGE_STATS_FILE to override), which the workflows persist with
+actions/cache. log_stats prints win rate and p50/p95 latency for tuning
+LLM_HEDGE_DELAY: a delay a little above the preferred provider's p50 keeps it
+winning most races without waiting out its slow tail.
+
+Usage:
+    from footybitez.utils.llm_hedge import hedge_delay, hedged_call
+
+    name, result = hedged_call(
+        [("groq", lambda cancel: self._try_groq(prompt, cancel=cancel)),
+         ("gemini", lambda cancel: self._try_gemini(prompt, cancel=cancel))],
+        delay=hedge_delay(), accept=self._validate_script_data,
+    )
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ─── Configuration ───────────────────────────────────────────────────────────
+STATS_FILE = "footybitez/data/cache/llm_hedge_stats.json"
+LATENCY_WINDOW = 50   # recent latencies kept per provider
+DEFAULT_DELAY = 20.0
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def hedge_enabled() -> bool:
+    return os.getenv("LLM_HEDGE", "false").lower() == "true"
+
+
+def hedge_delay() -> float:
+    return max(0.0, float(os.getenv("LLM_HEDGE_DELAY", str(DEFAULT_DELAY))))
+
+
+def _percentile(values: list, pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class HedgeStats:
+    """Persisted {provider -> {races, wins, latencies}} for hedged calls."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("LLM_HEDGE_STATS_FILE", STATS_FILE)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> dict:
+        """Load the stats. Returns empty stats if the file is missing or corrupt."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {k: v for k, v in data.items() if isinstance(v, dict)}
+            except Exception:
+                pass
+        return {}
+
+    def save(self):
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock:
+                payload = json.dumps(self._data)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.warning(f"[LLMHedge] Failed to save {self.path}: {e}")
+
+    def _record(self, provider: str) -> dict:
+        return self._data.setdefault(provider, {"races": 0, "wins": 0, "latencies": []})
+
+    def record_start(self, provider: str):
+        with self._lock:
+            self._record(provider)["races"] += 1
+
+    def record_latency(self, provider: str, latency: float):
+        with self._lock:
+            rec = self._record(provider)
+            rec["latencies"] = (rec["latencies"] + [round(latency, 2)])[-LATENCY_WINDOW:]
+
+    def record_win(self, provider: str):
+        with self._lock:
+            self._record(provider)["wins"] += 1
+
+    def summary(self, provider: str) -> dict:
+        with self._lock:
+            rec = self._data.get(provider, {"races": 0, "wins": 0, "latencies": []})
+            return {
+                "races": rec["races"],
+                "win_rate": rec["wins"] / rec["races"] if rec["races"] else None,
+                "p50": _percentile(rec["latencies"], 50),
+                "p95": _percentile(rec["latencies"], 95),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            providers = list(self._data)
+        return {p: self.summary(p) for p in providers}
+
+    def log_stats(self):
+        for provider, s in sorted(self.stats().items()):
+            win_rate = f"{s['win_rate']:.0%}" if s["win_rate"] is not None else "n/a"
+            p50 = f"{s['p50']:.1f}s" if s["p50"] is not None else "n/a"
+            p95 = f"{s['p95']:.1f}s" if s["p95"] is not None else "n/a"
+            logger.info(f"[LLMHedge] {provider}: won {win_rate} of {s['races']} races, "
+                        f"latency p50 {p50} / p95 {p95}")
+
+
+def hedged_call(attempts: list, delay: float | None = None, accept=bool,
+                stats: HedgeStats | None = None) -> tuple:
+    """
+    Runs `attempts` — [(provider name, fn(cancel_event) -> result or None)], in
+    preference order — as a hedged race (see module docstring). Returns
+    (provider, result) for the first result `accept` passes, or (None, None)
+    once every attempt has finished without one.
+    """
+    if not attempts:
+        return None, None
+    delay = hedge_delay() if delay is None else delay
+    stats = stats or get_hedge_stats()
+    cancel = threading.Event()
+    results = queue.Queue()
+
+    def run(name, fn):
+        start = time.monotonic()
+        try:
+            value = fn(cancel)
+        except Exception as e:
+            logger.warning(f"[LLMHedge] {name} raised: {e}")
+            value = None
+        latency = time.monotonic() - start
+        # An attempt that gave up because it was cancelled didn't measure anything;
+        # a loser whose request completed anyway did (that's the slow tail).
+        if value is not None or not cancel.is_set():
+            stats.record_latency(name, latency)
+        results.put((name, value, latency))
+
+    launched = 0
+
+    def launch():
+        nonlocal launched
+        name, fn = attempts[launched]
+        launched += 1
+        stats.record_start(name)
+        threading.Thread(target=run, args=(name, fn), daemon=True, name=f"llm-hedge-{name}").start()
+
+    launch()
+    pending = 1
+    winner = (None, None)
+    while pending:
+        more = launched < len(attempts)
+        try:
+            name, value, latency = results.get(timeout=delay if more else None)
+        except queue.Empty:
+            logger.info(f"[LLMHedge] No answer after {delay:.0f}s — also starting {attempts[launched][0]}.")
+            launch()
+            pending += 1
+            continue
+        pending -= 1
+        if value is not None and accept(value):
+            logger.info(f"[LLMHedge] {name} won in {latency:.1f}s.")
+            stats.record_win(name)
+            winner = (name, value)
+            break
+        logger.info(f"[LLMHedge] {name} gave no usable answer after {latency:.1f}s.")
+        if more:
+            launch()
+            pending += 1
+
+    cancel.set()
+    stats.save()
+    stats.log_stats()
+    return winner
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_hedge_stats() -> HedgeStats:
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = HedgeStats()
+        return _instance
@@ -30,6 +30,9 @@ def _model_list(env_var: str, default_csv: str) -> list:
 # recommended replacement for it.
 GROQ_SCRIPT_MODEL = os.getenv("GROQ_SCRIPT_MODEL", "openai/gpt-oss-120b")
 
+# Claude script model, tried first by ScriptGenerator when ANTHROPIC_API_KEY is set.
+CLAUDE_SCRIPT_MODEL = os.getenv("CLAUDE_SCRIPT_MODEL", "claude-3-5-sonnet-20241022")
+
 # Gemini text-generation fallback chain (script generation, headline
 # selection, etc.) — tried in order, first success wins. gemini-2.5-flash is
 # the one confirmed still working in production logs as of 2026-08; 3.6-flash
@@ -39,3 +42,7 @@ GEMINI_TEXT_MODELS = _model_list("GEMINI_TEXT_MODELS", "gemini-2.5-flash,gemini-
 
 # Gemini vision-safety/relevance-check model(s) — see media_sourcer.py.
 GEMINI_VISION_MODELS = _model_list("GEMINI_VISION_MODELS", "gemini-2.5-flash")
+
+# Gemini image generation (football_visual_generator, MediaSourcer's Shorts
+# images) — the free-tier model that returns inline image parts.
+GEMINI_IMAGE_MODEL = os.getenv("GEMINI_IMAGE_MODEL", "gemini-2.5-flash-image")
@@ -5,6 +5,8 @@ from moviepy.editor import AudioFileClip
 import shutil
 import subprocess
 
+from footybitez.media.image_normalizer import SHORTS_SIZE, SHORTS_HEADROOM, is_image, normalize_many
+
 logger = logging.getLogger(__name__)
 
 class RemotionVideoCreator:
@@ -20,10 +22,39 @@ class RemotionVideoCreator:
         from footybitez.media.sfx_manager import SFXManager
         self.voice_gen = VoiceGenerator(key_pool="shorts")
         self.sfx_man = SFXManager()
+        # source path -> filename in public/ for images normalized up front
+        self._staged = {}
+
+    def _stage_images(self, paths):
+        """
+        Normalizes every image the composition will show (EXIF rotation, sRGB,
+        sized to the 1080x1920 frame plus Ken Burns headroom) into public/ in
+        one parallel, cached batch, so _copy_to_public only looks them up.
+        """
+        jobs = []
+        for p in paths:
+            if p and is_image(p) and os.path.exists(p) and p not in self._staged:
+                jobs.append((p, os.path.join(self.remotion_public, os.path.basename(p))))
+        if not jobs:
+            return
+        try:
+            written = normalize_many(jobs, size=SHORTS_SIZE, headroom=SHORTS_HEADROOM)
+        except Exception as e:
+            logger.warning(f"Image normalization failed, staging originals: {e}")
+            return
+        for src, dest in written.items():
+            self._staged[src] = os.path.basename(dest)
+        logger.info(f"Normalized {len(written)} images into {self.remotion_public}")
 
     def _copy_to_public(self, filepath, fallback=""):
         if not filepath or not os.path.exists(filepath):
             return fallback
+        if filepath in self._staged:
+            return self._staged[filepath]
+        if is_image(filepath):
+            self._stage_images([filepath])
+            if filepath in self._staged:
+                return self._staged[filepath]
         filename = os.path.basename(filepath)
         dest = os.path.join(self.remotion_public, filename)
         shutil.copy2(filepath, dest)
@@ -120,6 +151,13 @@ class RemotionVideoCreator:
         chunks.append({"type": "outro", "text": script_data.get("outro", ""), "is_title": False})
 
         # 2. Setup Remotion Data Structure
+        self._staged = {}
+        image_paths = [visual_assets.get("title_card"), visual_assets.get("profile_image"),
+                       visual_assets.get("outro_image")]
+        for pool in visual_assets.get("segment_media", []) or []:
+            image_paths.extend(pool if isinstance(pool, list) else [pool])
+        self._stage_images(image_paths)
+
         remotion_props = {
             "title_card": self._copy_to_public(visual_assets.get("title_card")),
             "profile_image": self._copy_to_public(visual_assets.get("profile_image")),
@@ -6,10 +6,9 @@ from google.auth.transport.requests import Request
 import googleapiclient.discovery
 import googleapiclient.errors
 import google_auth_oauthlib.flow
-from google import genai
-from google.genai import types
 from dotenv import load_dotenv
 from footybitez.utils.llm_models import GEMINI_TEXT_MODELS
+from footybitez.utils.llm_gateway import get_llm_gateway
 
 # Load environment variables
 load_dotenv()
@@ -23,10 +22,8 @@ class CommentManager:
         ]
         self.youtube = self._authenticate(client_secrets_file, token_file)
         
-        # Configure Gemini for reply generation
+        # Gemini for reply generation (client pooled by the LLM gateway)
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if self.gemini_api_key:
-            self.client = genai.Client(api_key=self.gemini_api_key)
 
     def _authenticate(self, client_secrets_file, token_file):
         """Authenticates and returns the YouTube service."""
@@ -161,15 +158,16 @@ class CommentManager:
         
         REPLY:
         """
-        try:
-            response = self.client.models.generate_content(
-                model=GEMINI_TEXT_MODELS[0],
-                contents=prompt
-            )
-            return response.text.strip()
-        except Exception as e:
-            logger.error(f"Gemini reply generation failed: {e}")
+        if not self.gemini_api_key:
             return None
+        gateway = get_llm_gateway()
+        for _, key, model in gateway.combos("gemini", [self.gemini_api_key], GEMINI_TEXT_MODELS[:1]):
+            try:
+                text = gateway.complete("gemini", key, model, prompt, temperature=None, json_mode=False)
+                return text.strip()
+            except Exception as e:
+                logger.error(f"Gemini reply generation failed: {e}")
+        return None
 
     def _post_reply(self, parent_id, text):
         """Posts a reply to a comment thread."""
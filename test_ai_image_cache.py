@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.ai_image_cache import AiImageCache
+
+
+class TestAiImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.cache = AiImageCache(cache_dir=self.cache_dir, max_bytes=10 * 1024 * 1024, max_variants=2)
+
+    def _image(self, name, size=6000, fill=b"\0"):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(b"\xff\xd8\xff" + fill * size)
+        return path
+
+    def test_prompt_is_normalized_and_generator_and_aspect_are_part_of_the_key(self):
+        self.cache.store("pollinations", "Stadium  Atmosphere", "9:16", self._image("a.jpg"), verdict="passed")
+        self.assertIsNotNone(self.cache.lookup("pollinations", " stadium atmosphere ", "9:16"))
+        self.assertIsNone(self.cache.lookup("pollinations", "stadium atmosphere", "16:9"))
+        self.assertIsNone(self.cache.lookup("gemini_image", "stadium atmosphere", "9:16"))
+
+    def test_require_safe_skips_unchecked_variants(self):
+        self.cache.store("gemini_image", "crowd", "16:9", self._image("a.jpg"))
+        self.assertIsNone(self.cache.lookup("gemini_image", "crowd", "16:9", require_safe=True))
+        self.assertEqual(self.cache.lookup("gemini_image", "crowd", "16:9")["verdict"], "unchecked")
+
+    def test_serve_rotates_variants_and_respects_the_option(self):
+        self.cache.store("pollinations", "crowd", "9:16", self._image("a.jpg", fill=b"a"), verdict="passed")
+        self.cache.store("pollinations", "crowd", "9:16", self._image("b.jpg", fill=b"b"), verdict="passed")
+        out = os.path.join(self.tmp, "out", "img.jpg")
+        served = set()
+        for _ in range(2):
+            self.assertTrue(self.cache.serve("pollinations", "crowd", "9:16", out, require_safe=True))
+            with open(out, "rb") as f:
+                served.add(f.read()[3:4])
+        self.assertEqual(served, {b"a", b"b"})
+
+        off = AiImageCache(cache_dir=self.cache_dir, serve_cached=False)
+        self.assertFalse(off.serve("pollinations", "crowd", "9:16", out))
+
+    def test_serving_waits_for_a_full_variant_set_unless_partial(self):
+        self.cache.store("pollinations", "crowd", "9:16", self._image("a.jpg"), verdict="passed")
+        out = os.path.join(self.tmp, "out", "img.jpg")
+        self.assertFalse(self.cache.serve("pollinations", "crowd", "9:16", out, require_safe=True))
+        self.assertTrue(self.cache.serve("pollinations", "crowd", "9:16", out, require_safe=True, partial=True))
+
+    def test_variant_cap_and_size_budget_evict(self):
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            self.cache.store("pollinations", "crowd", "9:16", self._image(name), verdict="passed")
+        self.assertEqual(self.cache.stats()["variants"], 2)
+
+        small = AiImageCache(cache_dir=os.path.join(self.tmp, "small"), max_bytes=10000)
+        small.store("pollinations", "one", "9:16", self._image("d.jpg"), verdict="passed")
+        small.store("pollinations", "two", "9:16", self._image("e.jpg"), verdict="passed")
+        self.assertIsNone(small.lookup("pollinations", "one", "9:16"))
+        self.assertIsNotNone(small.lookup("pollinations", "two", "9:16"))
+
+    def test_index_persists(self):
+        self.cache.store("gemini_shorts", "crowd", "9:16", self._image("a.jpg"), verdict="passed")
+        reloaded = AiImageCache(cache_dir=self.cache_dir)
+        self.assertEqual(reloaded.lookup("gemini_shorts", "crowd", "9:16", require_safe=True)["verdict"], "passed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.candidate_ranker import crop_loss, rank_candidates, resolution_score
+
+SHORTS = (1080, 1920)
+
+
+class TestCandidateRanker(unittest.TestCase):
+
+    def test_crop_loss_for_a_vertical_frame(self):
+        self.assertAlmostEqual(crop_loss(1080, 1920, SHORTS), 0.0)
+        self.assertAlmostEqual(crop_loss(1920, 1080, SHORTS), 1 - (1080 / 1920) / (1920 / 1080))
+
+    def test_resolution_score_penalizes_upscaling(self):
+        self.assertEqual(resolution_score(2160, 3840, SHORTS), 1.0)
+        self.assertAlmostEqual(resolution_score(540, 960, SHORTS), 0.5)
+
+    def test_sharp_portrait_beats_blurry_landscape_scan(self):
+        scan = {"url": "scan", "width": 1920, "height": 1080, "sharpness": 5.0}
+        portrait = {"url": "portrait", "width": 1080, "height": 1620, "sharpness": 300.0}
+        ranked = rank_candidates([scan, portrait], SHORTS)
+        self.assertEqual([c["url"] for c in ranked], ["portrait", "scan"])
+        self.assertGreater(ranked[0]["scores"]["total"], ranked[1]["scores"]["total"])
+
+    def test_near_duplicates_of_used_or_picked_images_are_dropped(self):
+        a = {"url": "a", "width": 1080, "height": 1920, "sharpness": 200.0, "preview_hash": 0xFFFF}
+        a_copy = {"url": "a2", "width": 800, "height": 1200, "sharpness": 200.0, "preview_hash": 0xFFFE}
+        used = {"url": "b", "width": 1080, "height": 1920, "sharpness": 200.0, "preview_hash": 1 << 40}
+        ranked = rank_candidates([a, a_copy, used], SHORTS, used_hashes=[(1 << 40) | (1 << 41)])
+        self.assertEqual([c["url"] for c in ranked], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
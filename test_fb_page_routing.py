@@ -16,7 +16,7 @@ class TestFBPageRouting(unittest.TestCase):
         "FOOTYBITEZ_INSTAGRAM_BUSINESS_ACCOUNT_ID": "67890_insta_id",
         "DRY_RUN": "false"
     })
-    @patch("footybitez.socials.meta_publisher.requests.post")
+    @patch("footybitez.socials.meta_publisher.http.post")
     @patch.object(MetaPublisher, "_get_authorized_pages")
     def test_routing_with_matching_page_id(self, mock_get_pages, mock_post):
         # Scenario 1: Both "On Trending Today" and "footybitez" are authorized dynamically
@@ -25,7 +25,7 @@ class TestFBPageRouting(unittest.TestCase):
             {"id": "12345_footybitez_page", "access_token": "token_footybitez", "name": "FootyBitez"}
         ]
 
-        # Mock the requests.post response for video upload
+        # Mock the http.post response for video upload
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.json.return_value = {"id": "mock_video_post_id"}
@@ -53,7 +53,7 @@ class TestFBPageRouting(unittest.TestCase):
         "FOOTYBITEZ_INSTAGRAM_BUSINESS_ACCOUNT_ID": "67890_insta_id",
         "DRY_RUN": "false"
     })
-    @patch("footybitez.socials.meta_publisher.requests.post")
+    @patch("footybitez.socials.meta_publisher.http.post")
     @patch.object(MetaPublisher, "_get_authorized_pages")
     def test_routing_fallback_with_unmatching_page_id(self, mock_get_pages, mock_post):
         # Scenario 2: Only "On Trending Today" is authorized dynamically
@@ -61,7 +61,7 @@ class TestFBPageRouting(unittest.TestCase):
             {"id": "98765_trending_today", "access_token": "token_trending", "name": "On Trending Today"}
         ]
 
-        # Mock the requests.post response for video upload
+        # Mock the http.post response for video upload
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.json.return_value = {"id": "mock_fallback_video_post_id"}
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.content.grounding_index import GroundingIndex
+from footybitez.content.script_generator import ScriptGenerator
+from footybitez.content.wiki_grounding import WikiGrounding
+
+MESSI = {"title": "Lionel Messi", "summary": "Lionel Messi is an Argentine professional footballer.",
+         "sections": {"Honours": "FIFA World Cup: 2022"}}
+WORLD_CUP = {"title": "FIFA World Cup", "summary": "The FIFA World Cup is an international football competition.",
+             "sections": {}}
+MBAPPE = {"title": "Kylian Mbappé", "summary": "Kylian Mbappé is a French professional footballer.",
+          "sections": {}}
+HAT_TRICK = {"title": "Hat-trick", "summary": "A hat-trick is the achievement of three goals in one game.",
+             "sections": {}}
+TIKI_TAKA = {"title": "Tiki-taka", "summary": "Tiki-taka is a style of play characterised by short passing "
+                                              "and movement, working the ball through various channels.",
+             "sections": {}}
+
+
+class TestGroundingIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "index.db")
+        self.index = GroundingIndex(db_path=self.db_path)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_missing_database_is_an_empty_index(self):
+        self.assertIsNone(self.index.lookup("lionel messi"))
+        self.assertEqual(self.index.search_text("tiki-taka"), [])
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_lookup_picks_the_most_specific_name_in_the_topic(self):
+        self.index.add(MESSI, aliases=["Messi"], kind="player")
+        self.index.add(WORLD_CUP, aliases=["World Cup"], kind="tournament")
+        self.assertEqual(self.index.lookup("lionel messi's world cup record")["title"], "Lionel Messi")
+        self.assertEqual(self.index.lookup("Messi")["sections"], {"Honours": "FIFA World Cup: 2022"})
+        self.assertIsNone(self.index.lookup("lionel richie"))
+        self.assertTrue(self.index.has("messi"))
+        self.assertFalse(self.index.has("Lionel"))
+
+    def test_names_match_without_accents(self):
+        self.index.add(MBAPPE, kind="player")
+        self.assertEqual(self.index.lookup("kylian mbappe")["title"], "Kylian Mbappé")
+        self.assertEqual(self.index.lookup("Kylian Mbappé's best goals")["title"], "Kylian Mbappé")
+
+    def test_concept_aliases_do_not_claim_entity_topics(self):
+        self.index.add(MBAPPE, aliases=["Mbappé"], kind="player")
+        self.index.add(HAT_TRICK, kind="concept")
+        self.assertEqual(self.index.lookup("Mbappé hat-trick vs Argentina")["title"], "Kylian Mbappé")
+        self.assertIsNone(self.index.lookup("Hat-trick"))
+        self.assertEqual([p["title"] for p in self.index.search_text("Hat-trick")], ["Hat-trick"])
+        self.assertTrue(self.index.covers("Mbappé hat-trick"))
+        self.assertEqual(self.index.stats()["hits"] + self.index.stats()["misses"], 3)   # covers() isn't counted
+
+    def test_re_adding_a_page_refreshes_it(self):
+        self.index.add(MESSI, kind="player")
+        self.index.add(dict(MESSI, summary="Updated summary."), aliases=["Leo Messi"], kind="player")
+        self.assertEqual(self.index.lookup("leo messi")["summary"], "Updated summary.")
+        self.assertEqual(self.index.stats()["pages"], 1)
+
+    def test_text_search_needs_keyword_coverage(self):
+        self.index.add(TIKI_TAKA, kind="concept")
+        self.index.add(MESSI, kind="player")
+        self.assertEqual([p["title"] for p in self.index.search_text("How tiki-taka really works")], ["Tiki-taka"])
+        self.assertEqual(self.index.search_text("tiki-taka versus catenaccio defending"), [])
+
+    def test_stale_pages_are_misses(self):
+        self.index.add(MESSI, kind="player")
+        with mock.patch("footybitez.content.grounding_index.time.time", return_value=1e12):
+            self.assertIsNone(self.index.lookup("lionel messi"))
+            self.assertFalse(self.index.has("Lionel Messi"))
+
+
+class TestOfflineFirstGrounding(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.index = GroundingIndex(db_path=os.path.join(tmp, "index.db"))
+        self.index.add(MESSI, kind="player")
+        self.index.add(TIKI_TAKA, kind="concept")
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_indexed_entities_need_no_request(self):
+        grounding = WikiGrounding(cache_dir=tempfile.mkdtemp(), index=self.index)
+        with mock.patch("footybitez.content.wiki_grounding.http.get", side_effect=OSError("offline")) as get:
+            context = grounding.fetch_context(["lionel messi"])
+            self.assertIsNone(grounding.fetch_context(["kylian mbappe"]))
+        self.assertIn("ENTITY: Lionel Messi\nSUMMARY: Lionel Messi is an Argentine", context)
+        self.assertIn("--- HONOURS ---\nFIFA World Cup: 2022", context)
+        self.assertEqual(get.call_count, 1)   # only the miss searched the network
+
+    def test_conceptual_topics_skip_the_web_search(self):
+        with mock.patch("footybitez.content.script_generator.get_grounding_index", return_value=self.index), \
+                mock.patch.dict(sys.modules, {"ddgs": None, "duckduckgo_search": None}):
+            generator = ScriptGenerator()
+            context = generator._fetch_web_text_context("How tiki-taka really works")
+            self.assertIsNone(generator._fetch_web_text_context("Why penalties are psychological"))
+        self.assertTrue(context.startswith("WEB SOURCE: Tiki-taka (Wikipedia)\nSNIPPET: Tiki-taka is a style"))
+
+    def test_indexed_concepts_are_grounded_before_any_request(self):
+        grounding = WikiGrounding(cache_dir=tempfile.mkdtemp(), index=self.index)
+        with mock.patch("footybitez.content.script_generator.get_grounding_index", return_value=self.index), \
+                mock.patch("footybitez.content.script_generator.get_wiki_grounding", return_value=grounding), \
+                mock.patch("footybitez.content.wiki_grounding.http.get", side_effect=OSError("offline")) as get, \
+                mock.patch.dict(sys.modules, {"ddgs": None, "duckduckgo_search": None}):
+            context = ScriptGenerator()._fetch_context("How tiki-taka really works")
+        self.assertTrue(context.startswith("WEB SOURCE: Tiki-taka (Wikipedia)"))
+        self.assertEqual(get.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
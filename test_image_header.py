@@ -0,0 +1,42 @@
+import io
+import os
+import sys
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from PIL import Image
+
+from footybitez.media.image_header import sniff_image_header
+
+
+def _encode(fmt, size=(640, 360), **kwargs):
+    buf = io.BytesIO()
+    Image.new("RGB", size, (30, 140, 40)).save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+class TestImageHeader(unittest.TestCase):
+
+    def test_reads_dimensions_from_first_bytes(self):
+        for fmt, name in (("JPEG", "jpeg"), ("PNG", "png"), ("GIF", "gif"), ("WEBP", "webp")):
+            with self.subTest(fmt=fmt):
+                self.assertEqual(sniff_image_header(_encode(fmt)[:512]), (name, 640, 360))
+
+    def test_lossless_webp(self):
+        self.assertEqual(sniff_image_header(_encode("WEBP", lossless=True)[:64]), ("webp", 640, 360))
+
+    def test_jpeg_with_exif_needs_more_bytes(self):
+        exif = Image.Exif()
+        exif[0x010E] = "x" * 4000  # ImageDescription, pushes the SOF marker past 4 KB
+        data = _encode("JPEG", exif=exif)
+        self.assertEqual(sniff_image_header(data[:1024]), ("jpeg", None, None))
+        self.assertEqual(sniff_image_header(data[:8192]), ("jpeg", 640, 360))
+
+    def test_non_image_is_rejected(self):
+        self.assertEqual(sniff_image_header(b'<svg xmlns="http://www.w3.org/2000/svg">'), (None, None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
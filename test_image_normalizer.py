@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image, ImageCms
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.image_normalizer import normalize_image, normalize_many, render_size
+from footybitez.media.media_cache import MediaCache
+
+
+class TestNormalizeImage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def _path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_exif_orientation_is_applied(self):
+        # Stored landscape with "rotate 90° CW" — upright it's a portrait photo.
+        img = Image.new("RGB", (400, 300), (200, 30, 30))
+        exif = img.getexif()
+        exif[0x0112] = 6
+        img.save(self._path("phone.jpg"), exif=exif)
+        normalize_image(self._path("phone.jpg"), self._path("out.jpg"), size=(300, 400), headroom=1.0)
+        with Image.open(self._path("out.jpg")) as out:
+            self.assertEqual(out.size, (300, 400))
+            self.assertEqual(out.getexif().get(0x0112, 1), 1)
+
+    def test_large_image_is_cropped_to_frame_plus_headroom(self):
+        Image.new("RGB", (4000, 3000), (10, 120, 40)).save(self._path("big.png"))
+        normalize_image(self._path("big.png"), self._path("out.jpg"), size=(1080, 1920), headroom=1.3)
+        with Image.open(self._path("out.jpg")) as out:
+            self.assertEqual(out.format, "JPEG")
+            self.assertEqual(out.size, render_size((1080, 1920), 1.3))
+
+    def test_small_image_is_not_upscaled(self):
+        Image.new("RGB", (640, 480), (10, 120, 40)).save(self._path("small.png"))
+        normalize_image(self._path("small.png"), self._path("out.jpg"), size=(1920, 1080), headroom=1.15)
+        with Image.open(self._path("out.jpg")) as out:
+            self.assertEqual(out.size, (640, 360))
+
+    def test_icc_profile_and_alpha_are_flattened_to_srgb(self):
+        icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+        Image.new("RGBA", (200, 200), (255, 255, 255, 0)).save(self._path("logo.png"), icc_profile=icc)
+        normalize_image(self._path("logo.png"), self._path("out.jpg"), size=(200, 200), headroom=1.0)
+        with Image.open(self._path("out.jpg")) as out:
+            self.assertEqual(out.mode, "RGB")
+            self.assertIsNone(out.info.get("icc_profile"))
+            self.assertLess(sum(out.getpixel((100, 100))), 30)
+
+    def test_undecodable_file_is_copied_unchanged(self):
+        with open(self._path("broken.jpg"), "wb") as f:
+            f.write(b"not an image")
+        self.assertFalse(normalize_image(self._path("broken.jpg"), self._path("out.jpg")))
+        with open(self._path("out.jpg"), "rb") as f:
+            self.assertEqual(f.read(), b"not an image")
+
+
+class TestNormalizeMany(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = MediaCache(cache_dir=os.path.join(self.tmp, "cache"), max_bytes=50 * 1024 * 1024)
+
+    def test_outputs_are_cached_by_source_hash(self):
+        src = os.path.join(self.tmp, "wiki_1.png")
+        Image.new("RGB", (3000, 2000), (10, 120, 40)).save(src)
+        written = normalize_many([(src, os.path.join(self.tmp, "public", "wiki_1.png"))],
+                                 size=(1080, 1920), cache=self.cache, workers=1)
+        self.assertEqual(written[src], os.path.join(self.tmp, "public", "wiki_1.jpg"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        again = normalize_many([(src, os.path.join(self.tmp, "public2", "wiki_1.png"))],
+                               size=(1080, 1920), cache=self.cache, workers=1)
+        self.assertTrue(os.path.exists(again[src]))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_non_images_are_copied(self):
+        src = os.path.join(self.tmp, "hook.mp3")
+        with open(src, "wb") as f:
+            f.write(b"ID3")
+        written = normalize_many([(src, os.path.join(self.tmp, "public", "hook.mp3"))], cache=self.cache)
+        self.assertTrue(written[src].endswith("hook.mp3"))
+
+    def test_process_pool_batch(self):
+        jobs = []
+        for i in range(3):
+            src = os.path.join(self.tmp, f"img_{i}.png")
+            Image.new("RGB", (2400, 2400), (i * 40, 80, 40)).save(src)
+            jobs.append((src, os.path.join(self.tmp, "public", f"img_{i}.png")))
+        written = normalize_many(jobs, size=(1080, 1920), headroom=1.0, cache=self.cache, workers=2)
+        for src, _ in jobs:
+            with Image.open(written[src]) as out:
+                self.assertEqual(out.size, (1080, 1920))
+
+
+if __name__ == "__main__":
+    unittest.main()
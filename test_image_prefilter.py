@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from footybitez.media.image_prefilter import ImagePrefilter
+
+
+def _pitch_photo(path, size=(800, 600), blur=0.7):
+    rng = np.random.default_rng(0)
+    pixels = np.zeros((size[1], size[0], 3))
+    pixels[...] = (40, 120, 40)
+    pixels[: size[1] // 3] = (90, 90, 110)  # stands
+    pixels = (pixels + rng.normal(0, 18, pixels.shape)).clip(0, 255).astype(np.uint8)
+    Image.fromarray(pixels).filter(ImageFilter.GaussianBlur(blur)).save(path, quality=85)
+
+
+class TestImagePrefilter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.prefilter = ImagePrefilter()
+
+    def _path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_textured_pitch_photo_passes(self):
+        _pitch_photo(self._path("pitch.jpg"))
+        verdict = self.prefilter.check(self._path("pitch.jpg"))
+        self.assertTrue(verdict["ok"])
+        self.assertFalse(verdict["deprioritize"])
+
+    def test_flat_logo_is_rejected(self):
+        img = Image.new("RGB", (600, 600), "white")
+        ImageDraw.Draw(img).ellipse((100, 100, 500, 500), fill=(200, 0, 0))
+        img.save(self._path("logo.png"))
+        self.assertEqual(self.prefilter.check(self._path("logo.png"))["stage"], "flat")
+
+    def test_text_slide_is_rejected(self):
+        img = Image.new("RGB", (800, 600), (20, 20, 60))
+        draw = ImageDraw.Draw(img)
+        for y in range(20, 580, 18):
+            draw.text((10, y), "TOP SCORERS 2026 GOALS ASSISTS XG " * 4, fill="white")
+        img.save(self._path("text.png"))
+        self.assertEqual(self.prefilter.check(self._path("text.png"))["stage"], "text")
+
+    def test_banner_and_blur_are_rejected(self):
+        _pitch_photo(self._path("banner.jpg"), size=(1600, 300))
+        _pitch_photo(self._path("blurry.jpg"), blur=3)
+        self.assertEqual(self.prefilter.check(self._path("banner.jpg"))["stage"], "aspect")
+        self.assertEqual(self.prefilter.check(self._path("blurry.jpg"))["stage"], "blur")
+        self.assertEqual(self.prefilter.stats()["aspect"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
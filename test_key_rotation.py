@@ -18,7 +18,8 @@ class TestKeyRotation(unittest.TestCase):
         "GROQ_API_KEY3": "groq_key_3",
         "GEMINI_API_KEY": "",
         "GEMINI_API_KEY2": "",
-        "GEMINI_API_KEY3": ""
+        "GEMINI_API_KEY3": "",
+        "LLM_CACHE_TTL_SCRIPT_HOURS": "0"
     })
     @patch("groq.Groq")
     def test_groq_key_rotation_in_script_generator(self, mock_groq_class):
@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.utils.keyword_matcher import (
+    ADULT_URL_FILTER, IMAGE_FILTER, IMAGE_METADATA_FILTER, TOPIC_FILTER, KeywordMatcher,
+)
+
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_reports_the_matched_term_on_word_boundaries(self):
+        self.assertEqual(TOPIC_FILTER.find("The Rugby League final drew 80,000"), "rugby league")
+        self.assertEqual(TOPIC_FILTER.find("Girls' academy opens"), "girl")
+        self.assertIsNone(TOPIC_FILTER.find("The conflict left the manager in a dilemma"))
+
+    def test_separators_in_urls_and_slugs(self):
+        self.assertEqual(IMAGE_FILTER.find("https://x.org/England_Women_team.jpg"), "women")
+        self.assertEqual(IMAGE_FILTER.find("five-a-side cage"), "five a side")
+
+    def test_per_list_exceptions(self):
+        self.assertIsNone(TOPIC_FILTER.find("VAR gave a handball in the Boxing Day game"))
+        self.assertIsNone(TOPIC_FILTER.find("Racing Santander win promotion"))
+        self.assertEqual(IMAGE_FILTER.find("handball goalkeeper"), "handball")
+        self.assertEqual(TOPIC_FILTER.find("a boxing rematch"), "boxing")
+
+    def test_substring_mode_with_shadowing_exceptions(self):
+        self.assertIsNone(ADULT_URL_FILTER.find("https://x.org/Sussex_county_ground.jpg"))
+        self.assertEqual(ADULT_URL_FILTER.find("https://x.org/sussex/sexy.jpg"), "sex")
+        self.assertEqual(ADULT_URL_FILTER.find("https://thumb.xhcdn.com/a.webp"), "xhcdn")
+
+    def test_image_urls_match_run_together_and_digit_suffixed_slugs(self):
+        for url, term in [("https://x.org/FIFAWomensWorldCup2023_final.jpg", "womens"),
+                          ("https://x.org/USWNT_vs_Sweden_womensfootball.jpg", "womens"),
+                          ("https://x.org/NFLDraft2024.jpg", "nfl"),
+                          ("https://x.org/Rugby2019.jpg", "rugby")]:
+            self.assertEqual(IMAGE_METADATA_FILTER.find(url), term, url)
+        self.assertIsNone(IMAGE_METADATA_FILTER.find("https://live.staticflickr.com/Emmanuel_Adebayor_BoxingDay.jpg"))
+        self.assertIsNone(IMAGE_FILTER.find("Rugby2019"))   # query cleaning keeps word boundaries
+
+    def test_image_tags_match_run_together_words(self):
+        for tags, term in [("womenssoccer", "womens"), ("FIFAWomensWorldCup2019", "womens"),
+                           ("ladiesfootball", "ladies"), ("girlsfootball", "girl"), ("rugby7s", "rugby")]:
+            self.assertEqual(IMAGE_METADATA_FILTER.find(tags), term, tags)
+        self.assertIsNone(IMAGE_METADATA_FILTER.find("Hammarby IF derby, Mohammed Kudus, Muhammad tribute, "
+                                                     "Gemma stadium command centre, unbalanced midfield"))
+
+    def test_remove_keeps_exceptions(self):
+        matcher = KeywordMatcher(["boxing", "women"], exceptions=["boxing day"])
+        self.assertEqual(matcher.remove("Boxing Day women boxing derby"), "Boxing Day derby")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.content.script_generator import ScriptGenerator
+from footybitez.utils.llm_cache import LLMResponseCache
+from footybitez.utils.llm_models import GEMINI_TEXT_MODELS
+
+VALID_SCRIPT = {
+    "hook": "Test hook",
+    "primary_entity": "Test Entity",
+    "segments": [{"text": f"Segment {i} text", "visual_keyword": "soccer match action"} for i in range(4)],
+    "outro": "Test outro",
+}
+
+
+class TestLLMResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LLMResponseCache(cache_dir=tempfile.mkdtemp(), bypass=False)
+
+    def test_hit_ignores_prompt_whitespace(self):
+        self.cache.put("script", "m1", "Write a script\n        about Messi", {"hook": "x"}, temperature=0.7)
+        self.assertEqual(self.cache.get("script", "m1", "Write a script about Messi", temperature=0.7), {"hook": "x"})
+        self.assertEqual(self.cache.stats()["script"], {"hits": 1, "misses": 0})
+
+    def test_model_and_temperature_are_part_of_the_key(self):
+        self.cache.put("script", "m1", "prompt", {"hook": "x"}, temperature=0.7)
+        self.assertIsNone(self.cache.get("script", "m2", "prompt", temperature=0.7))
+        self.assertIsNone(self.cache.get("script", "m1", "prompt", temperature=0.3))
+
+    def test_entries_expire_per_call_type(self):
+        self.cache.put("pre_match", "m1", "prompt", {"h2h": "x"})
+        with mock.patch("footybitez.utils.llm_cache.time.time", return_value=1e12):
+            self.assertIsNone(self.cache.get("pre_match", "m1", "prompt"))
+
+    def test_bypass_skips_reads_but_still_stores(self):
+        bypassed = LLMResponseCache(cache_dir=self.cache.cache_dir, bypass=True)
+        bypassed.put("headline", "m1", "prompt", {"selected_index": 2})
+        self.assertIsNone(bypassed.get("headline", "m1", "prompt"))
+        self.assertEqual(self.cache.get("headline", "m1", "prompt"), {"selected_index": 2})
+
+
+class TestScriptGeneratorCache(unittest.TestCase):
+
+    @mock.patch.dict(os.environ, {"GROQ_API_KEY": "groq_key_1", "GROQ_API_KEY2": "", "GROQ_API_KEY3": "",
+                                  "GEMINI_API_KEY": "", "GEMINI_API_KEY2": "", "GEMINI_API_KEY3": ""})
+    def test_validated_groq_script_is_served_from_cache(self):
+        cache = LLMResponseCache(cache_dir=tempfile.mkdtemp(), bypass=False)
+        with mock.patch("footybitez.content.script_generator.get_llm_cache", return_value=cache), \
+                mock.patch("groq.Groq") as mock_groq:
+            completion = mock.MagicMock()
+            completion.choices[0].message.content = json.dumps(VALID_SCRIPT)
+            mock_groq.return_value.chat.completions.create.return_value = completion
+
+            generator = ScriptGenerator()
+            first = generator._try_groq("Write a script about Messi")
+            second = generator._try_groq("Write a script   about Messi")
+
+        self.assertEqual(first["hook"], "Test hook")
+        self.assertEqual(second, first)
+        self.assertEqual(mock_groq.return_value.chat.completions.create.call_count, 1)
+
+    @mock.patch.dict(os.environ, {"GROQ_API_KEY": "groq_key_1", "GROQ_API_KEY2": "", "GROQ_API_KEY3": ""})
+    def test_invalid_responses_are_not_cached(self):
+        cache = LLMResponseCache(cache_dir=tempfile.mkdtemp(), bypass=False)
+        with mock.patch("footybitez.content.script_generator.get_llm_cache", return_value=cache), \
+                mock.patch("groq.Groq") as mock_groq:
+            completion = mock.MagicMock()
+            completion.choices[0].message.content = json.dumps({"hook": "no segments"})
+            mock_groq.return_value.chat.completions.create.return_value = completion
+
+            self.assertIsNone(ScriptGenerator()._try_groq("Write a script about Ronaldo"))
+        self.assertFalse(any(files for _, _, files in os.walk(cache.cache_dir)))
+
+    @mock.patch.dict(os.environ, {"GROQ_API_KEY": "groq_key_1", "GROQ_API_KEY2": "", "GROQ_API_KEY3": ""})
+    def test_scripts_the_caller_would_reject_are_returned_but_not_cached(self):
+        cache = LLMResponseCache(cache_dir=tempfile.mkdtemp(), bypass=False)
+        long_enough = lambda script: ScriptGenerator._script_word_count(script) >= 120
+        with mock.patch("footybitez.content.script_generator.get_llm_cache", return_value=cache), \
+                mock.patch("groq.Groq") as mock_groq:
+            completion = mock.MagicMock()
+            completion.choices[0].message.content = json.dumps(VALID_SCRIPT)
+            mock_groq.return_value.chat.completions.create.return_value = completion
+
+            generator = ScriptGenerator()
+            first = generator._try_groq("Breaking: 2-0", call_type="breaking_news", cacheable=long_enough)
+            second = generator._try_groq("Breaking: 2-0", call_type="breaking_news", cacheable=long_enough)
+
+        self.assertEqual(first["hook"], "Test hook")   # still handed to the retry loop
+        self.assertEqual(second, first)
+        self.assertEqual(mock_groq.return_value.chat.completions.create.call_count, 2)
+        self.assertFalse(any(files for _, _, files in os.walk(cache.cache_dir)))
+
+    def test_raw_json_is_cached_only_when_the_callers_validator_passes(self):
+        cache = LLMResponseCache(cache_dir=tempfile.mkdtemp(), bypass=False)
+        model = GEMINI_TEXT_MODELS[0]
+        cache.put("headline", model, "Pick a headline", {"selected_index": 99}, temperature=0.3)
+        gateway = mock.MagicMock()
+        gateway.combos.return_value = [(0, "gemini_key_1", model), (1, "gemini_key_2", model)]
+        gateway.complete_json.side_effect = [{"selected_index": 7}, {"selected_index": 1}]
+        in_range = lambda data: data.get("selected_index") in range(3)
+        with mock.patch("footybitez.content.script_generator.get_llm_cache", return_value=cache), \
+                mock.patch("footybitez.content.script_generator.get_llm_gateway", return_value=gateway):
+            data = ScriptGenerator()._try_gemini_raw_json("Pick a headline", call_type="headline", validate=in_range)
+        self.assertEqual(data, {"selected_index": 1})   # the stale reject and the first reply were skipped
+        self.assertEqual(cache.get("headline", model, "Pick a headline", 0.3), {"selected_index": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
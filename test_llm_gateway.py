@@ -0,0 +1,140 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.utils.llm_gateway import (
+    ComboUnavailable, KeyHealthRegistry, LLMGateway, classify_error, retry_delay,
+)
+
+
+class TestClassifyError(unittest.TestCase):
+
+    def test_retry_delay_formats(self):
+        self.assertEqual(retry_delay("429 RESOURCE_EXHAUSTED. Please retry in 27.5s."), 27.5)
+        self.assertEqual(retry_delay("{'retryDelay': '41s'}"), 41.0)
+        self.assertEqual(retry_delay("Rate limit reached. Please try again in 7m12.5s."), 432.5)
+        self.assertEqual(retry_delay("Internal error"), 0.0)
+
+    def test_gemini_daily_quota_waits_for_the_reset_not_the_retry_delay(self):
+        err = ("429 RESOURCE_EXHAUSTED. Quota exceeded for metric: "
+               "generate_content_free_tier_requests, GenerateRequestsPerDayPerProjectPerModel-FreeTier. "
+               "Please retry in 30s.")
+        reason, seconds, whole_key = classify_error(err, "gemini")
+        self.assertEqual(reason, "per_day")
+        self.assertGreater(seconds, 60)
+        self.assertFalse(whole_key)
+
+    def test_groq_daily_limit_uses_its_own_delay(self):
+        err = "Error code: 429 - Rate limit reached on tokens per day (TPD). Please try again in 7m12.5s."
+        self.assertEqual(classify_error(err, "groq")[:2], ("per_day", 432.5))
+
+    def test_per_minute_and_zero_allocation(self):
+        self.assertEqual(classify_error("429 PerMinute quota. Please retry in 12s.")[:2], ("per_minute", 12.0))
+        self.assertEqual(classify_error("429 quota exceeded, limit: 0")[0], "zero_allocation")
+
+    def test_auth_and_retired_models(self):
+        self.assertEqual(classify_error("400 API key not valid. Please pass a valid API key."),
+                         ("auth", 6 * 3600.0, True))
+        self.assertFalse(classify_error("403 PERMISSION_DENIED for this model")[2])
+        self.assertEqual(classify_error("404 models/gemini-1.0-pro is not found")[0], "retired")
+        self.assertEqual(classify_error("404 NOT_FOUND. {'status': 'NOT_FOUND'}")[0], "retired")
+        self.assertEqual(classify_error("The model `llama3-70b-8192` does not exist")[0], "retired")
+        self.assertEqual(classify_error("Error code: 404 - {'type': 'not_found_error'}")[0], "retired")
+
+    def test_unrelated_not_found_errors_do_not_retire_the_model(self):
+        self.assertIsNone(classify_error("File not found: /tmp/frame.png")[0])
+        self.assertIsNone(classify_error("resource not found")[0])
+        self.assertIsNone(classify_error("404 page not found")[0])
+
+    def test_unclear_and_transient_errors_are_not_recorded(self):
+        self.assertIsNone(classify_error("Rate limit reached on Key 1")[0])
+        self.assertIsNone(classify_error("503 UNAVAILABLE: model overloaded")[0])
+        self.assertIsNone(classify_error("Used 99401 tokens")[0])
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self, api_key=None):
+        FakeClient.created += 1
+        self.api_key = api_key
+
+
+class TestGateway(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "llm_health.json")
+        self.gateway = LLMGateway(KeyHealthRegistry(path=self.path))
+        FakeClient.created = 0
+        patcher = mock.patch.object(LLMGateway, "_client_class", staticmethod(lambda provider: FakeClient))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clients_are_pooled_per_key(self):
+        for _ in range(3):
+            self.gateway.call("gemini", "key-a", "m1", lambda c: c.api_key)
+        self.gateway.call("gemini", "key-b", "m1", lambda c: c.api_key)
+        self.assertEqual(FakeClient.created, 2)
+
+    def test_dead_combo_is_skipped_across_runs(self):
+        def fail(client):
+            raise RuntimeError("404 models/m1 is not found")
+
+        with self.assertRaises(RuntimeError):
+            self.gateway.call("gemini", "key-a", "m1", fail)
+
+        reloaded = LLMGateway(KeyHealthRegistry(path=self.path))
+        self.assertEqual(reloaded.combos("gemini", ["key-a", "key-b"], ["m1", "m2"]),
+                         [(0, "key-a", "m2"), (1, "key-b", "m1"), (1, "key-b", "m2")])
+        with self.assertRaises(ComboUnavailable):
+            reloaded.call("gemini", "key-a", "m1", lambda c: "unreachable")
+        with open(self.path, encoding="utf-8") as f:
+            self.assertNotIn("key-a", f.read())
+
+    def test_invalid_key_kills_every_model(self):
+        self.gateway.record_error("groq", "key-a", "m1", "Error code: 401 - invalid_api_key")
+        self.assertEqual(self.gateway.combos("groq", ["key-a"], ["m1", "m2"]), [])
+
+    def test_recovered_combo_is_usable_again(self):
+        self.gateway.record_error("gemini", "key-a", "m1", "429 PerMinute. Please retry in 20s.")
+        self.assertFalse(self.gateway.available("gemini", "key-a", "m1"))
+        with mock.patch("footybitez.utils.llm_gateway.time.time", return_value=4e9):
+            self.assertTrue(self.gateway.available("gemini", "key-a", "m1"))
+
+
+class FakeVisionClient:
+    def __init__(self, api_key=None):
+        self.models = self
+        self.api_key = api_key
+
+    def generate_content(self, model, contents, config):
+        if self.api_key == "key-a":
+            raise RuntimeError("429 RESOURCE_EXHAUSTED. PerMinute quota exceeded. Please retry in 20s.")
+        return mock.MagicMock(text='{"safe": true}')
+
+
+class TestVisionThroughGateway(unittest.TestCase):
+
+    def test_per_minute_429_moves_on_without_killing_the_combo_for_the_run(self):
+        from footybitez.media.media_sourcer import MediaSourcer
+
+        gateway = LLMGateway(KeyHealthRegistry(path=os.path.join(tempfile.mkdtemp(), "llm_health.json")))
+        sourcer = MediaSourcer.__new__(MediaSourcer)
+        sourcer.gemini_keys = ["key-a", "key-b"]
+        with mock.patch.object(LLMGateway, "_client_class", staticmethod(lambda provider: FakeVisionClient)), \
+                mock.patch("footybitez.media.media_sourcer.get_llm_gateway", return_value=gateway), \
+                mock.patch("footybitez.media.media_sourcer.GEMINI_VISION_MODELS", ["m1"]):
+            self.assertEqual(sourcer._vision_request(["image"], "test"), ("ok", {"safe": True}))
+
+        self.assertEqual(gateway.registry.stats()["dead"], {KeyHealthRegistry.combo("gemini", "key-a", "m1"): "per_minute"})
+        with mock.patch("footybitez.utils.llm_gateway.time.time", return_value=4e9):
+            self.assertTrue(gateway.available("gemini", "key-a", "m1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
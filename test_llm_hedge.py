@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.utils.llm_hedge import HedgeStats, hedged_call
+
+
+class TestHedgedCall(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "hedge.json")
+        self.stats = HedgeStats(path=self.path)
+
+    def test_slow_provider_is_hedged_after_the_delay(self):
+        release = threading.Event()
+
+        def slow(cancel):
+            release.wait(5)
+            return {"script": "slow"}
+
+        start = time.monotonic()
+        name, result = hedged_call([("claude", slow), ("groq", lambda cancel: {"script": "fast"})],
+                                   delay=0.05, stats=self.stats)
+        release.set()
+        self.assertEqual((name, result), ("groq", {"script": "fast"}))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(self.stats.summary("groq")["win_rate"], 1.0)
+        self.assertEqual(self.stats.summary("claude")["win_rate"], 0.0)
+
+    def test_failure_starts_the_next_provider_without_waiting(self):
+        calls = []
+
+        def failing(cancel):
+            calls.append("groq")
+            raise RuntimeError("500")
+
+        start = time.monotonic()
+        name, _ = hedged_call([("groq", failing), ("gemini", lambda cancel: {"ok": True})],
+                              delay=10, stats=self.stats)
+        self.assertEqual(name, "gemini")
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_rejected_responses_and_exhaustion(self):
+        name, result = hedged_call([("groq", lambda cancel: {"bad": True}), ("gemini", lambda cancel: None)],
+                                   delay=0, accept=lambda data: "hook" in data, stats=self.stats)
+        self.assertEqual((name, result), (None, None))
+
+    def test_losers_are_cancelled_and_stats_persist(self):
+        seen = {}
+
+        def loser(cancel):
+            seen["cancel"] = cancel
+            cancel.wait(5)
+            return None
+
+        hedged_call([("claude", loser), ("gemini", lambda cancel: {"ok": True})], delay=0, stats=self.stats)
+        self.assertTrue(seen["cancel"].is_set())
+        reloaded = HedgeStats(path=self.path)
+        self.assertEqual(reloaded.summary("gemini")["races"], 1)
+        self.assertIsNotNone(reloaded.summary("gemini")["p50"])
+
+
+if __name__ == "__main__":
+    unittest.main()
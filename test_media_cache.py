@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.media_cache import MediaCache
+
+
+class TestAccessTimeBatching(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = MediaCache(cache_dir=os.path.join(self.tmp, "cache"), max_bytes=10 * 1024 * 1024)
+        src = os.path.join(self.tmp, "a.jpg")
+        with open(src, "wb") as f:
+            f.write(b"\xff\xd8" + b"\0" * 100)
+        self.cached = self.cache.store("https://example.org/a.jpg", src)
+
+    def _saved_last_used(self):
+        with open(self.cache.index_path, encoding="utf-8") as f:
+            return json.load(f)["blobs"][os.path.basename(self.cached)]["last_used"]
+
+    def test_hits_do_not_rewrite_the_index_until_flushed(self):
+        before = self._saved_last_used()
+        with mock.patch.object(self.cache, "_save", wraps=self.cache._save) as save:
+            for _ in range(5):
+                self.assertEqual(self.cache.lookup("https://example.org/a.jpg"), self.cached)
+            save.assert_not_called()
+            self.cache.flush()
+            self.cache.flush()
+            self.assertEqual(save.call_count, 1)
+        self.assertGreaterEqual(self._saved_last_used(), before)
+        self.assertEqual(self._saved_last_used(), self.cache._index["blobs"][os.path.basename(self.cached)]["last_used"])
+
+    def test_next_store_persists_pending_access_times(self):
+        self.cache.lookup("https://example.org/a.jpg")
+        bumped = self.cache._index["blobs"][os.path.basename(self.cached)]["last_used"]
+        src = os.path.join(self.tmp, "b.jpg")
+        with open(src, "wb") as f:
+            f.write(b"\xff\xd8" + b"\1" * 100)
+        self.cache.store("https://example.org/b.jpg", src)
+        self.assertEqual(self._saved_last_used(), bumped)
+        self.assertFalse(self.cache._dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
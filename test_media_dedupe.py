@@ -0,0 +1,162 @@
+import os
+import sys
+import tempfile
+import threading
+import contextlib
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from PIL import Image, ImageDraw
+
+from footybitez.media.media_sourcer import MediaSourcer
+
+
+def _draw(path, size, ball_at):
+    img = Image.new("RGB", size, (30, 140, 40))
+    draw = ImageDraw.Draw(img)
+    x, y = ball_at
+    draw.ellipse((x, y, x + size[0] // 4, y + size[0] // 4), fill=(250, 250, 250))
+    draw.rectangle((size[0] // 2, 10, size[0] - 20, size[1] // 2), fill=(10, 10, 10))
+    img.save(path, quality=70)
+
+
+class TestJobDedupe(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.sourcer = MediaSourcer.__new__(MediaSourcer)
+        self.sourcer._job_hashes = {}
+        self.sourcer._job_hashes_lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_rescaled_copy_from_another_source_is_rejected(self):
+        _draw(self._path("wiki_a.jpg"), (800, 600), (100, 300))
+        _draw(self._path("openverse_b.jpg"), (400, 300), (50, 150))
+        self.assertTrue(self.sourcer._claim_distinct(self._path("wiki_a.jpg")))
+        self.assertFalse(self.sourcer._claim_distinct(self._path("openverse_b.jpg")))
+        self.assertEqual(self.sourcer.find_duplicate(self._path("openverse_b.jpg")), self._path("wiki_a.jpg"))
+
+    def test_different_picture_is_kept(self):
+        _draw(self._path("a.jpg"), (800, 600), (100, 300))
+        img = Image.new("RGB", (800, 600), (200, 30, 30))
+        ImageDraw.Draw(img).polygon([(0, 600), (400, 0), (800, 600)], fill=(20, 20, 200))
+        img.save(self._path("b.jpg"))
+        self.assertTrue(self.sourcer._claim_distinct(self._path("a.jpg")))
+        self.assertTrue(self.sourcer._claim_distinct(self._path("b.jpg")))
+
+    def test_rejected_image_frees_its_slot(self):
+        _draw(self._path("a.jpg"), (800, 600), (100, 300))
+        _draw(self._path("b.jpg"), (640, 480), (80, 240))
+        self.assertTrue(self.sourcer._claim_distinct(self._path("a.jpg")))
+        self.sourcer._finalize_download(self._path("a.jpg"), "https://example.org/a.jpg", passed=False)
+        self.assertTrue(self.sourcer._claim_distinct(self._path("b.jpg")))
+
+
+
+class TestConcurrentTierRollback(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        sourcer = MediaSourcer.__new__(MediaSourcer)
+        sourcer._job_hashes = {}
+        sourcer._job_hashes_lock = threading.Lock()
+        sourcer._tls = threading.local()
+        sourcer._staged_urls = {}
+        sourcer._deprioritized = set()
+        sourcer.used_urls = set()
+        sourcer.credits_file = os.path.join(self.tmp, "image_credits.txt")
+        self.sourcer = sourcer
+
+    def _stage(self, name, ball_at):
+        path = os.path.join(self.tmp, name)
+        self.sourcer._note_created(path)   # as _download_file does for a fresh download
+        _draw(path, (800, 600), ball_at)
+        url = f"https://example.org/{name}"
+        self.assertTrue(self.sourcer._claim_distinct(path))
+        self.sourcer._staged_urls[path] = url
+        self.sourcer.used_urls.add(url)
+        self.sourcer._add_credit(f"Credit for {name}", path)
+        return path
+
+    def test_unpicked_lower_tier_images_are_unstaged(self):
+        lower_done = threading.Event()
+
+        def higher(n):
+            lower_done.wait(5)
+            return [self._stage("higher.jpg", (100, 300))]
+
+        def lower(n):
+            try:
+                return [self._stage("lower.jpg", (500, 100))]
+            finally:
+                lower_done.set()
+
+        picked = self.sourcer._run_media_tiers_concurrently([("", higher, False), ("", lower, False)],
+                                                            count=1, visual_keyword="test")
+        lower_path = os.path.join(self.tmp, "lower.jpg")
+        self.assertEqual(picked, [os.path.join(self.tmp, "higher.jpg")])
+        self.assertFalse(os.path.exists(lower_path))
+        self.assertNotIn(lower_path, self.sourcer._job_hashes)
+        self.assertEqual(self.sourcer.used_urls, {"https://example.org/higher.jpg"})
+        with open(self.sourcer.credits_file, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Credit for higher.jpg\n")
+
+    def test_files_already_on_disk_survive_a_losing_tier(self):
+        profile = os.path.join(self.tmp, "tsdb_player.jpg")
+        _draw(profile, (800, 600), (300, 200))
+        lower_done = threading.Event()
+
+        def higher(n):
+            lower_done.wait(5)
+            return [self._stage("higher.jpg", (100, 300))]
+
+        def lower(n):
+            lower_done.set()
+            return [profile]   # _download_file short-circuited on the existing file
+
+        picked = self.sourcer._run_media_tiers_concurrently([("", higher, False), ("", lower, False)],
+                                                            count=1, visual_keyword="test")
+        self.assertEqual(picked, [os.path.join(self.tmp, "higher.jpg")])
+        self.assertTrue(os.path.exists(profile))
+
+    def test_a_tier_never_returns_the_same_file_twice(self):
+        path = self._stage("higher.jpg", (100, 300))
+        self.assertEqual(self.sourcer._run_media_tier(lambda n: [path, path], batched=False, count=3), [path])
+
+    def test_unneeded_wikipedia_candidates_release_their_claims(self):
+        sourcer = self.sourcer
+        sourcer.download_dir = self.tmp
+        urls = ["https://upload.example.org/a.jpg", "https://upload.example.org/b.jpg"]
+        staged = {}
+
+        def download(url, fpath, **kwargs):
+            _draw(fpath, (800, 600), (100, 300) if url == urls[0] else (500, 100))
+            self.assertTrue(sourcer._claim_distinct(fpath))
+            sourcer._staged_urls[fpath] = url
+            sourcer.used_urls.add(url)
+            staged[url] = fpath
+
+        sourcer._rendition_params = lambda: {}
+        sourcer._rank_wiki_api_images = lambda pages, entity: urls
+        sourcer._batched_vision_checks = contextlib.nullcontext
+        sourcer._download_file = download
+        sourcer._add_credit = sourcer._write_image_meta = lambda *a: None
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"query": {"pages": {}}}
+        with mock.patch.dict(os.environ, {"WIKI_API_IMAGE_CANDIDATES": "2"}), \
+                mock.patch("footybitez.media.media_sourcer.http.get", return_value=response):
+            chosen = sourcer._get_wikipedia_images_from_api("Test Player")
+
+        self.assertEqual(chosen, staged[urls[0]])
+        self.assertFalse(os.path.exists(staged[urls[1]]))
+        self.assertEqual(set(sourcer._job_hashes), {chosen})
+        self.assertEqual(sourcer.used_urls, {urls[0]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.media_sourcer import MediaSourcer
+
+
+class TestPlanMedia(unittest.TestCase):
+
+    def setUp(self):
+        self.sourcer = MediaSourcer.__new__(MediaSourcer)
+        self.calls = []
+
+        def fake_get_media(query, count=3, **kwargs):
+            self.calls.append((query, count))
+            return [f"{query}_{i}.jpg" for i in range(count)]
+
+        self.sourcer.get_media = fake_get_media
+
+    def test_shared_keywords_are_searched_once_with_distinct_images(self):
+        script = {"segments": [
+            {"visual_keyword": "Lionel Messi"},
+            {"visual_keyword": "lionel messi football"},
+            {"visual_keyword": "Camp Nou stadium"},
+        ]}
+        plan = self.sourcer.plan_media(script, count=2)
+        self.assertEqual(sorted(self.calls), [("Camp Nou stadium", 2), ("Lionel Messi", 4)])
+        self.assertEqual(len(plan), 3)
+        self.assertEqual(len(plan[0]), 2)
+        self.assertFalse(set(plan[0]) & set(plan[1]))
+
+    def test_default_keyword_and_suffix(self):
+        script = {"segments": ["legacy string segment", {"visual_keyword": "Pedri"}]}
+        self.sourcer.plan_media(script, count=1, default_keyword="Spain", suffix="Spain Germany World Cup 2026")
+        self.assertEqual(sorted(q for q, _ in self.calls),
+                         ["Pedri Spain Germany World Cup 2026", "Spain Spain Germany World Cup 2026"])
+
+    def test_short_group_reuses_images_instead_of_leaving_a_segment_empty(self):
+        self.sourcer.get_media = lambda query, count=3, **kwargs: ["only.jpg"]
+        plan = self.sourcer.plan_media({"segments": [{"visual_keyword": "Pele"}] * 2}, count=3)
+        self.assertEqual(plan, [["only.jpg"], ["only.jpg"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.media_sourcer import MediaSourcer
+from footybitez.media.provider_health import ProviderHealth
+
+
+class TestProviderHealth(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "health.json")
+        self.health = ProviderHealth(path=self.path)
+
+    def test_consecutive_failures_open_the_breaker(self):
+        for _ in range(self.health.breaker_failures):
+            self.assertFalse(self.health.is_open("ddg"))
+            self.health.record_request("ddg", ok=False, latency=10.0)
+        self.assertTrue(self.health.is_open("ddg"))
+
+    def test_quota_error_opens_immediately_and_persists(self):
+        self.health.record_request("api_football", ok=False, latency=0.3, quota=True)
+        self.assertTrue(ProviderHealth(path=self.path).is_open("api_football"))
+
+    def test_breaker_closes_after_cooldown_and_success_resets(self):
+        self.health.record_request("ddg", ok=False, quota=True)
+        with mock.patch("footybitez.media.provider_health.time.time", return_value=4e9):
+            self.assertFalse(self.health.is_open("ddg"))
+        self.health.record_request("ddg", ok=True, latency=1.0)
+        self.assertFalse(self.health.is_open("ddg"))
+
+    def test_order_tiers_skips_open_and_demotes_poor_yield(self):
+        self.health.record_request("wikimedia", ok=False, quota=True)
+        for _ in range(self.health.min_samples):
+            self.health.record_tier("pixabay", 0)
+            self.health.record_tier("unsplash", 2)
+        tiers = [("wikimedia",), ("pixabay",), ("unsplash",), ("ddg",)]
+        self.assertEqual(self.health.order_tiers(tiers), [("unsplash",), ("ddg",), ("pixabay",)])
+
+    def test_stats_are_saved_debounced_until_flushed(self):
+        self.health.record_request("ddg", ok=False, quota=True)   # breaker opens: saved at once
+        with mock.patch.object(self.health, "_save", wraps=self.health._save) as save:
+            for _ in range(20):
+                self.health.record_request("unsplash", ok=True, latency=1.0)
+                self.health.record_tier("unsplash", 1)
+            save.assert_not_called()
+            self.health.flush()
+            self.health.flush()
+            self.assertEqual(save.call_count, 1)
+        self.assertEqual(ProviderHealth(path=self.path).summary("unsplash")["success_rate"], 1.0)
+
+    def test_summary_percentiles(self):
+        for latency in range(1, 21):
+            self.health.record_request("unsplash", ok=True, latency=float(latency))
+        s = self.health.summary("unsplash")
+        self.assertEqual(s["success_rate"], 1.0)
+        self.assertEqual(s["p50"], 11.0)
+        self.assertEqual(s["p95"], 19.0)
+
+
+class TestQuotaResponses(unittest.TestCase):
+
+    def _response(self, status, text=""):
+        r = mock.MagicMock()
+        r.status_code, r.text = status, text
+        return r
+
+    def test_only_rate_limits_count_as_quota(self):
+        self.assertTrue(MediaSourcer._is_quota_response(self._response(429)))
+        self.assertTrue(MediaSourcer._is_quota_response(self._response(403, "Rate Limit Exceeded")))
+        # A hotlink / User-Agent refusal on one file is an ordinary failure.
+        self.assertFalse(MediaSourcer._is_quota_response(self._response(403, "<html>Forbidden</html>")))
+        self.assertFalse(MediaSourcer._is_quota_response(self._response(401, "Unauthorized")))
+        self.assertFalse(MediaSourcer._is_quota_response(self._response(404)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.search_cache import SearchCache
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SearchCache(cache_dir=tempfile.mkdtemp())
+
+    def test_hit_after_put_with_normalized_query(self):
+        self.cache.put("wikimedia", "Stadium  Football Soccer Men", {"query": {"pages": {}}})
+        self.assertEqual(self.cache.get("wikimedia", "stadium football soccer men"), {"query": {"pages": {}}})
+        self.assertEqual(self.cache.stats()["wikimedia"], {"hits": 1, "misses": 0})
+
+    def test_variant_is_part_of_the_key(self):
+        self.cache.put("unsplash", "messi", {"results": []}, variant="per_page=12")
+        self.assertIsNone(self.cache.get("unsplash", "messi", variant="per_page=20"))
+
+    def test_entries_expire_per_provider(self):
+        self.cache.put("ddg", "messi", [{"image": "x"}])
+        with mock.patch("footybitez.media.search_cache.time.time", return_value=1e12):
+            self.assertIsNone(self.cache.get("ddg", "messi"))
+
+    def test_zero_ttl_disables_a_provider(self):
+        with mock.patch.dict(os.environ, {"SEARCH_CACHE_TTL_PIXABAY_HOURS": "0"}):
+            self.cache.put("pixabay", "messi", {"hits": []})
+            self.assertIsNone(self.cache.get("pixabay", "messi"))
+
+
+if __name__ == "__main__":
+    unittest.main()
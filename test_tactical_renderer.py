@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.tactical_renderer import (
+    DIAGRAM_TYPES, formation_positions, kde_grid, parse_formation, render_tactical_diagram,
+)
+
+
+class TestTacticalRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def test_parse_formation_needs_ten_outfield_players(self):
+        self.assertEqual(parse_formation("Klopp's 4-2-3-1 gegenpressing"), [4, 2, 3, 1])
+        self.assertIsNone(parse_formation("won 3-1 in 2-2 weather"))
+        self.assertEqual(len(formation_positions([3, 5, 2])), 11)
+
+    def test_kde_peaks_at_the_events(self):
+        density = kde_grid([[75, 25]] * 5, grid=(100, 100), bandwidth=5)
+        y, x = np.unravel_index(density.argmax(), density.shape)
+        self.assertEqual((x, y), (74, 24))
+        self.assertAlmostEqual(density.max(), 1.0)
+
+    def test_every_type_renders_fast_and_deterministically(self):
+        for diagram_type in DIAGRAM_TYPES:
+            with self.subTest(diagram_type=diagram_type):
+                paths = [os.path.join(self.tmp, f"{diagram_type}_{i}.jpg") for i in range(2)]
+                start = time.time()
+                events = [[62, 40], [70, 55], [30, 50]] if diagram_type == "heat_map" else None
+                for path in paths:
+                    self.assertTrue(render_tactical_diagram(diagram_type, path, formation="4-3-3", events=events))
+                self.assertLess((time.time() - start) / 2, 1.0)
+                with open(paths[0], "rb") as a, open(paths[1], "rb") as b:
+                    self.assertEqual(a.read(), b.read())
+
+    def test_unsupported_type_falls_through(self):
+        self.assertFalse(render_tactical_diagram("comparison_chart", os.path.join(self.tmp, "c.jpg")))
+
+    def test_heat_map_needs_event_data(self):
+        path = os.path.join(self.tmp, "heat.jpg")
+        self.assertFalse(render_tactical_diagram("heat_map", path, formation="4-3-3"))
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
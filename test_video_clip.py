@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.media.media_sourcer import MediaSourcer
+from footybitez.media.video_clip import select_rendition, stage_clip, trim_clip
+
+
+def _file(width, height, fps=25, file_type="video/mp4", size=None):
+    return {"width": width, "height": height, "fps": fps, "file_type": file_type,
+            "link": f"https://example.com/{width}x{height}@{fps}", "size": size}
+
+
+class TestSelectRendition(unittest.TestCase):
+
+    def test_smallest_rendition_covering_the_target(self):
+        files = [_file(3840, 2160), _file(2560, 1440), _file(1920, 1080, fps=50),
+                 _file(1920, 1080, fps=25), _file(1280, 720), _file(640, 360)]
+        chosen = select_rendition(files, target_size=(1920, 1080), min_fps=24)
+        self.assertEqual((chosen["width"], chosen["fps"]), (1920, 25))
+
+    def test_cinematic_crop_counts_and_low_fps_does_not(self):
+        files = [_file(3840, 2024), _file(1920, 1012), _file(1920, 1080, fps=15)]
+        chosen = select_rendition(files, target_size=(1920, 1080), min_fps=24)
+        self.assertEqual((chosen["width"], chosen["height"]), (1920, 1012))
+
+    def test_falls_back_to_largest_hd_when_nothing_covers_the_target(self):
+        files = [_file(1280, 720), _file(1366, 768), _file(640, 360), _file(3840, 2160, file_type="video/webm")]
+        self.assertEqual(select_rendition(files, target_size=(1920, 1080), min_fps=24)["width"], 1366)
+        self.assertIsNone(select_rendition([_file(640, 360)], target_size=(1920, 1080), min_fps=24))
+
+
+class TestTrimClip(unittest.TestCase):
+
+    def test_missing_ffmpeg_keeps_the_source(self):
+        tmp = tempfile.mkdtemp()
+        src, dst = os.path.join(tmp, "in.mp4"), os.path.join(tmp, "out.mp4")
+        with open(src, "wb") as f:
+            f.write(b"\0" * 100)
+        with mock.patch("subprocess.run", side_effect=FileNotFoundError):
+            self.assertFalse(trim_clip(src, dst, 5))
+        self.assertTrue(os.path.exists(src))
+        self.assertFalse(os.path.exists(dst))
+
+
+class TestStageClip(unittest.TestCase):
+
+    def test_cached_clip_keeps_its_credit_sidecar(self):
+        tmp = tempfile.mkdtemp()
+        src, dst = os.path.join(tmp, "cache", "clip.mp4"), os.path.join(tmp, "job", "out.mp4")
+        os.makedirs(os.path.dirname(src))
+        with open(src, "wb") as f:
+            f.write(b"\0" * 100)
+        with open(src + ".json", "w") as f:
+            f.write('{"source": "Pexels", "artist": "Jane Doe"}')
+        stage_clip(src, dst)
+        self.assertTrue(os.path.exists(dst))
+        with open(dst + ".json") as f:
+            self.assertIn("Jane Doe", f.read())
+
+
+class _Response:
+    def __init__(self, chunks, headers=None):
+        self.status_code = 200
+        self.headers = headers or {}
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+class TestPexelsDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmp, "clip.mp4")
+        self.sourcer = MediaSourcer.__new__(MediaSourcer)
+        self.sourcer.pexels_api_key = "key"
+        self.sourcer._cached_search = lambda *a, **k: {"videos": [
+            {"id": None, "video_files": [_file(1920, 1080)]}]}
+
+    def test_oversized_download_is_abandoned_and_closed(self):
+        response = _Response([b"\0" * (1024 * 1024)] * 3)
+        with mock.patch.dict(os.environ, {"PEXELS_VIDEO_MAX_MB": "2"}), \
+                mock.patch("footybitez.media.media_sourcer.http.get", return_value=response):
+            self.assertFalse(self.sourcer.fetch_pexels_video("goal", self.output, seconds=5))
+        self.assertTrue(response.closed)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_part_file_is_removed_when_the_stream_fails(self):
+        def broken():
+            yield b"\0" * 1024
+            raise ConnectionError("reset")
+        response = _Response(None)
+        response.iter_content = lambda chunk_size=None: broken()
+        with mock.patch("footybitez.media.media_sourcer.http.get", return_value=response):
+            self.assertFalse(self.sourcer.fetch_pexels_video("goal", self.output, seconds=5))
+        self.assertTrue(response.closed)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from PIL import Image, ImageDraw
+
+from footybitez.media.image_hash import phash, hamming
+from footybitez.media.vision_verdicts import VisionVerdictCache
+
+
+def _draw_pitch(path, size=(640, 480)):
+    img = Image.new("RGB", size, (30, 140, 40))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((100, 100, 300, 300), fill=(250, 250, 250))
+    draw.rectangle((400, 50, 600, 400), fill=(10, 10, 10))
+    img.save(path)
+    return img
+
+
+class TestVisionVerdictCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.original = os.path.join(self.tmp, "original.png")
+        self.reencoded = os.path.join(self.tmp, "reencoded.jpg")
+        img = _draw_pitch(self.original)
+        img.resize((320, 240)).save(self.reencoded, quality=60)
+        self.cache = VisionVerdictCache(path=os.path.join(self.tmp, "verdicts.json"))
+
+    def test_reencoded_copy_hashes_alike(self):
+        self.assertLessEqual(hamming(phash(self.original), phash(self.reencoded)), 4)
+
+    def test_context_verdict_reused_for_reencoded_copy(self):
+        self.cache.record(phash(self.original), "Lionel Messi (football player)", False, True, True)
+        verdict = self.cache.lookup(phash(self.reencoded), "lionel messi")
+        self.assertIsNotNone(verdict)
+        self.assertTrue(verdict["matches_context"])
+
+    def test_unknown_context_still_needs_api(self):
+        self.cache.record(phash(self.original), "Lionel Messi", False, True, True)
+        self.assertIsNone(self.cache.lookup(phash(self.original), "Kylian Mbappe"))
+
+    def test_nsfw_verdict_applies_to_any_context(self):
+        self.cache.record(phash(self.original), "", True, True, True)
+        verdict = self.cache.lookup(phash(self.original), "Kylian Mbappe")
+        self.assertTrue(verdict["is_nsfw"])
+
+    def test_verdicts_persist_to_disk(self):
+        self.cache.record(phash(self.original), "Lionel Messi", False, True, False)
+        reloaded = VisionVerdictCache(path=self.cache.path)
+        self.assertFalse(reloaded.lookup(phash(self.original), "Lionel Messi")["matches_context"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ensure workspace root is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from footybitez.content.grounding_index import GroundingIndex
+from footybitez.content.wiki_grounding import WikiGrounding, split_sections
+
+MESSI_EXTRACT = (
+    "Lionel Messi is an Argentine professional footballer.\n\n"
+    "== Early life ==\nBorn in Rosario.\n\n"
+    "== Club career ==\n=== Barcelona ===\nDebuted in 2004.\n\n"
+    "== Honours ==\nFIFA World Cup: 2022\n"
+)
+
+
+def _response(payload):
+    r = mock.MagicMock()
+    r.json.return_value = payload
+    return r
+
+
+def fake_wiki_api(url, params=None, **kwargs):
+    if params.get("list") == "search":
+        if "nwsl" in params["srsearch"]:
+            return _response({"query": {"search": [{"title": "NWSL records"}, {"title": "Attendance records"}]}})
+        return _response({"query": {"search": [{"title": "Lionel Messi"}, {"title": "Messi (film)"}]}})
+    title = params["titles"]
+    if title == "Messi (film)":
+        return _response({"query": {"pages": [{"title": title, "extract": "A film.",
+                                               "pageprops": {"disambiguation": ""}}]}})
+    return _response({"query": {"pages": [{"title": title, "extract": MESSI_EXTRACT}]}})
+
+
+class TestWikiGrounding(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        # An index that was never built, so every lookup takes the network path.
+        self.index = GroundingIndex(db_path=os.path.join(self.cache_dir, "index.db"))
+        self.grounding = WikiGrounding(cache_dir=self.cache_dir, workers=2, index=self.index)
+
+    def test_split_sections_keeps_subsections(self):
+        intro, sections = split_sections(MESSI_EXTRACT)
+        self.assertEqual(intro, "Lionel Messi is an Argentine professional footballer.")
+        self.assertEqual(dict(sections)["Club career"], "Barcelona:\nDebuted in 2004.")
+
+    def test_context_format_and_disk_cache(self):
+        with mock.patch("footybitez.content.wiki_grounding.http.get", side_effect=fake_wiki_api) as get:
+            context = self.grounding.fetch_context(["lionel messi"])
+            first_calls = get.call_count
+            # A fresh instance (next run) reads everything from disk.
+            again = WikiGrounding(cache_dir=self.cache_dir, index=self.index).fetch_context(["lionel messi"])
+
+        self.assertIn("ENTITY: Lionel Messi\nSUMMARY: Lionel Messi is an Argentine", context)
+        self.assertIn("--- HONOURS ---\nFIFA World Cup: 2022", context)
+        self.assertIn("--- CLUB CAREER ---", context)
+        self.assertEqual(first_calls, 3)   # one search + two candidate pages, fetched together
+        self.assertEqual(get.call_count, first_calls)
+        self.assertEqual(again, context)
+
+    def test_banned_candidates_and_disambiguation_pages_are_skipped(self):
+        with mock.patch("footybitez.content.wiki_grounding.http.get", side_effect=fake_wiki_api):
+            self.assertIsNone(self.grounding.page("Messi (film)"))
+            context = self.grounding.fetch_context(["nwsl attendance"])
+        self.assertNotIn("NWSL records", context)
+        self.assertIn("ENTITY: Attendance records", context)
+
+    def test_http_failure_gives_no_context(self):
+        with mock.patch("footybitez.content.wiki_grounding.http.get", side_effect=OSError("offline")):
+            self.assertIsNone(self.grounding.fetch_context(["lionel messi"]))
+
+
+if __name__ == "__main__":
+    unittest.main()